@@ -0,0 +1,151 @@
+import asyncio
+import functools
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, FrozenSet, Optional, Union
+
+from sqlmodel import SQLModel
+
+from app.metrics import REGISTRY, Counter, Gauge, Histogram
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Partidas cuyo turno tiene el request actual: un comando que llama a otro de la misma partida no vuelve a encolarse
+HELD_GAMES: ContextVar[FrozenSet[int]] = ContextVar("held_games", default=frozenset())
+
+GAME_COMMANDS = REGISTRY.register(Counter(
+    "game_commands_total", "Comandos que mutan una partida ejecutados por su actor", ("command",)))
+GAME_COMMAND_WAIT = REGISTRY.register(Histogram(
+    "game_command_wait_seconds", "Espera en la cola de la partida antes de ejecutar un comando", ("command",),
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)))
+
+
+class GameActor:
+    """ Cola de una partida: sus comandos se ejecutan de a uno y en orden de llegada (asyncio.Lock es FIFO) """
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.waiting = 0
+        # Comandos que pueden entrar mientras el que tiene el turno espera en una ventana, y su propia fila
+        self.window: Optional[FrozenSet[str]] = None
+        self.window_lock = asyncio.Lock()
+
+
+class GameActors:
+    """
+    Un actor por partida. Los comandos de una misma partida quedan en fila y los de partidas distintas corren en
+    paralelo; cada comando corre en la tarea de su request, asi que el tracing y las metricas de la base no cambian.
+    Los actores sin comandos pendientes se descartan.
+    """
+
+    def __init__(self):
+        self.actors: Dict[int, GameActor] = {}
+
+    def pending(self) -> int:
+        return sum(actor.waiting + actor.lock.locked() for actor in self.actors.values())
+
+    async def _acquire(self, game_id: int) -> bool:
+        """ Espera el turno de la partida; devuelve si tuvo que esperar a otro comando """
+        actor = self.actors.setdefault(game_id, GameActor())
+        queued = actor.lock.locked()
+        actor.waiting += 1
+        try:
+            await actor.lock.acquire()
+        except BaseException:
+            actor.waiting -= 1
+            if not actor.waiting and not actor.lock.locked():
+                self.actors.pop(game_id, None)
+            raise
+        actor.waiting -= 1
+        return queued
+
+    def _release(self, game_id: int):
+        actor = self.actors[game_id]
+        actor.lock.release()
+        if not actor.waiting and not actor.lock.locked():
+            del self.actors[game_id]
+
+    @asynccontextmanager
+    async def run(self, game_id: Optional[int], command: str):
+        """ Ejecuta el bloque con el turno de la partida; devuelve si antes corrio otro comando de la misma partida """
+        held = HELD_GAMES.get()
+        if game_id is None or game_id in held:
+            yield False
+            return
+        actor = self.actors.get(game_id)
+        if actor is not None and actor.window is not None and command in actor.window:
+            async with self._in_window(actor, game_id, command, held):
+                # El comando que abrio la ventana ya cambio la partida: siempre se vuelve a leer
+                yield True
+            return
+        start = time.perf_counter()
+        queued = await self._acquire(game_id)
+        GAME_COMMAND_WAIT.observe(time.perf_counter() - start, command)
+        GAME_COMMANDS.inc(command)
+        token = HELD_GAMES.set(held | {game_id})
+        try:
+            yield queued
+        finally:
+            HELD_GAMES.reset(token)
+            self._release(game_id)
+
+    @asynccontextmanager
+    async def _in_window(self, actor: GameActor, game_id: int, command: str, held: FrozenSet[int]):
+        start = time.perf_counter()
+        async with actor.window_lock:
+            GAME_COMMAND_WAIT.observe(time.perf_counter() - start, command)
+            GAME_COMMANDS.inc(command)
+            token = HELD_GAMES.set(held | {game_id})
+            try:
+                yield
+            finally:
+                HELD_GAMES.reset(token)
+
+    @asynccontextmanager
+    async def window(self, game_id: int, commands: FrozenSet[str]):
+        """
+        Mientras dura el bloque (ventana de NOT SO FAST) solo `commands` entran a la partida, de a uno; el resto
+        sigue en la fila hasta que termine el comando que abrio la ventana. Al salir espera a los que ya entraron
+        """
+        actor = self.actors.get(game_id)
+        if game_id not in HELD_GAMES.get() or actor is None:
+            yield
+            return
+        actor.window = commands
+        try:
+            yield
+        finally:
+            actor.window = None
+            async with actor.window_lock:
+                pass
+
+
+GAME_ACTORS = GameActors()
+
+GAME_COMMANDS_PENDING = REGISTRY.register(Gauge(
+    "game_commands_pending", "Comandos ejecutandose o esperando en la cola de su partida",
+    collector=lambda: {(): GAME_ACTORS.pending()}))
+
+
+def serialized(load: Callable[..., Awaitable[Union[SQLModel, int, None]]]):
+    """
+    Corre el endpoint dentro del actor de su partida. `load` recibe los mismos argumentos que el endpoint y devuelve
+    el id de la partida o una fila con `game_id`; si devuelve None (no existe) el endpoint corre sin encolarse y
+    responde el 404.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(*args, **kwargs):
+            row = await load(**kwargs)
+            game_id = row if row is None or isinstance(row, int) else row.game_id
+            async with GAME_ACTORS.run(game_id, handler.__name__) as queued:
+                session = kwargs.get("session")
+                if queued and session is not None:
+                    # La fila pudo cambiar mientras esperaba a otro comando de la partida: se vuelve a leer de la base
+                    session.expire_all()
+                return await handler(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlmodel import Session
+
+from app.database.engine import db_read_session
+from app.services.archive import ArchiveService
+
+archive_router = APIRouter(prefix="/api/archive")
+
+
+@archive_router.get('/{gid}')
+def get_archived_game(gid: int, session: Session = Depends(db_read_session)):
+    """ Partida finalizada ya archivada: la partida, jugadores, cartas, secretos, eventos, chat y sets """
+    service = ArchiveService()
+    archived = service.read_by_game(session=session, gid=gid)
+
+    if not archived:
+        raise HTTPException(404, detail="Partida archivada no encontrada")
+    return service.load(archived)
@@ -8,6 +8,7 @@ from typing import Optional, List, Dict, Callable
 from sqlmodel import Session
 from pydantic import BaseModel
 
+from app.controllers.card_effects.context import GameContext
 from app.controllers.card_effects.ariadne_oliver import ariadne_oliver
 from app.controllers.card_effects.card_trade import card_trade
 from app.controllers.card_effects.dead_card_folly import dead_card_folly
@@ -20,10 +21,11 @@ from app.controllers.card_effects.and_then_there_was_one_more import and_then_th
 from app.controllers.card_effects.another_victim import another_victim
 from app.controllers.card_effects.blackmailed import blackmailed
 from app.controllers.card_effects.social_faux_pas import social_faux_pas
-from app.controllers.utils import PlayerOrders
-from app.database.engine import db_session
-from app.models.card import PublicCard
-from app.models.event_table import EventTable
+from app.actors import serialized
+from app.controllers.utils import PlayerOrders, load_card, load_first_card, load_event
+from app.database.engine import db_session, db_read_session
+from app.models.card import PublicCard, CardState
+from app.models.event_table import EventTable, EventAction
 from app.models.game import GameStatus
 from app.models.websocket import notify_game_players, WebsocketMessage
 from app.services.card import CardService, CardFilter, get_new_discarded_order
@@ -31,8 +33,10 @@ from app.services.event_table import EventTableService
 from app.services.game import GameService, not_so_fast_status, NOT_SO_FAST_TIME
 from app.services.player import PlayerService
 from app.services.detective_set import DetectiveSetService
+from app.services.seating import game_seating
 from app.services.secret import SecretService
 from app.services.chat import ChatService
+from app.tracing import trace_card_effect
 
 
 card_router = APIRouter(prefix="/api/card")
@@ -50,7 +54,7 @@ class CancelActionDTO(BaseModel):
     token: str
 
 @card_router.get('/{cid}', response_model = PublicCard)
-def get_card(cid: int, session: Session = Depends(db_session)):
+def get_card(cid: int, session: Session = Depends(db_read_session)):
     service = CardService()
     card = service.read(session = session, oid = cid)
 
@@ -60,6 +64,7 @@ def get_card(cid: int, session: Session = Depends(db_session)):
     return card
 
 @card_router.patch('', response_model= List[PublicCard])
+@serialized(load_first_card)
 async def update_cards(cids:List[int] = Body(...), dto:UpdateCardsDTO = Body(...), session: Session = Depends(db_session)):
     card_service = CardService()
     player_service = PlayerService()
@@ -103,9 +108,8 @@ async def update_cards(cids:List[int] = Body(...), dto:UpdateCardsDTO = Body(...
         raise (HTTPException(status_code=400, detail="Se debe descartar en el turno actual"))
 
     player = player_service.read(session=session, oid=cards[0].owner)
-    amount_players = len(player_service.search(session=session,filterby={"game_id__eq":game.id}))
 
-    if player.position != game.current_turn % amount_players:
+    if game_seating(session, game).turn_owner(game.current_turn) != player.id:
         raise HTTPException(status_code=412, detail="No se puede descartar la carta: No es tu turno")
 
     if player.social_disgrace and len(cards) > 1:
@@ -130,7 +134,8 @@ async def update_cards(cids:List[int] = Body(...), dto:UpdateCardsDTO = Body(...
     action_in_discard = [c for c in updated_cards if c.name == "early-train-to-paddington" ]
 
     for c in action_in_discard:
-        await early_train_to_paddington(c,session,True)
+        with trace_card_effect(c.name, game.status.value, game_id=game.id, card_id=c.id, discarded=True):
+            await early_train_to_paddington(c,session,True)
 
     if game.status in {GameStatus.TURN_START,GameStatus.FINALIZE_TURN, GameStatus.WAITING_FOR_CANCEL_ACTION}:
         await game_service.update(session=session, oid=game.id, data={"status": GameStatus.FINALIZE_TURN_DRAFT})
@@ -138,6 +143,7 @@ async def update_cards(cids:List[int] = Body(...), dto:UpdateCardsDTO = Body(...
     return updated_cards
 
 @card_router.patch('/{cid}', response_model= PublicCard)
+@serialized(load_card)
 async def update_card(cid:int, dto:UpdateCardDTO, session: Session = Depends(db_session)):
     card_service = CardService()
     player_service = PlayerService()
@@ -170,10 +176,7 @@ async def update_card(cid:int, dto:UpdateCardDTO, session: Session = Depends(db_
     if player.token != dto.token:
         raise HTTPException(401, detail="No se puede agarrar la carta: Token invalido")
 
-    amount_players = len(player_service.search(session=session, filterby={"game_id__eq": game.id}))
-    actual_turn = game.current_turn % amount_players
-
-    if player.position != actual_turn:
+    if game_seating(session, game).turn_owner(game.current_turn) != player.id:
         raise HTTPException(status_code=412, detail="No se puede agarrar la carta: No es tu turno")
 
 
@@ -184,7 +187,8 @@ async def update_card(cid:int, dto:UpdateCardDTO, session: Session = Depends(db_
         raise HTTPException(status_code=412, detail="No se pueden agarrar mas cartas")
 
     draft_cards = card_service.search(session=session,filterby={'game_id__eq': game.id, 'turn_discarded__is_null': True,
-                                                                'owner__is_null': True, 'content__eq':""}, limit=3)
+                                                                'owner__is_null': True, 'state__eq': CardState.AVAILABLE},
+                                      sortby="pile_order__desc", limit=3)
 
     if not card in draft_cards:
         raise HTTPException(status_code=400, detail="Solo se pueden agarrar cartas del draft")
@@ -197,13 +201,14 @@ async def update_card(cid:int, dto:UpdateCardDTO, session: Session = Depends(db_
     return updated_card
 
 @card_router.post('/search', response_model=List[PublicCard])
-def search_card(dto:CardFilter, session: Session = Depends(db_session)):
+def search_card(dto:CardFilter, session: Session = Depends(db_read_session)):
     service = CardService()
     cards = service.search(session=session, filterby=dto.model_dump(exclude_none=True), sortby="pile_order__desc")
     return cards
 
 
 @card_router.post('/cancel_action/{oid}')
+@serialized(load_event)
 async def cancel_action(oid:int,dto:CancelActionDTO,session: Session = Depends(db_session)):
     card_service = CardService()
     game_service = GameService()
@@ -235,11 +240,11 @@ async def cancel_action(oid:int,dto:CancelActionDTO,session: Session = Depends(d
 
 
     last_event = event_service.search(session=session, filterby={"game_id__eq": game.id, "turn_played__eq": game.current_turn,
-                                                                 "action__eq": "to_cancel", "completed_action__eq": False,},
+                                                                 "action__eq": EventAction.TO_CANCEL, "completed_action__eq": False,},
                                                                  sortby="id__desc", limit=1)
 
     canceled_times_event = event_service.search(session=session, filterby={"game_id__eq": game.id, "turn_played__eq": game.current_turn,
-                                                                           "action__eq": "canceled_times"},sortby="id__desc", limit=1)[0]
+                                                                           "action__eq": EventAction.CANCELED_TIMES},sortby="id__desc", limit=1)[0]
 
     if not last_event or last_event[0].id != cancel_event.id:
         print(last_event)
@@ -248,18 +253,19 @@ async def cancel_action(oid:int,dto:CancelActionDTO,session: Session = Depends(d
 
     game.timestamp = datetime.now()
 
-    # Necesito que esto sea atomico, si hago un update con await puede tomar otros endpoint
+    # Todo va en un solo commit: si otro NOT SO FAST cambio la partida despues de leerla, el UPDATE de la version
+    # falla, no se aplica nada y este request recibe un 409
     cancel_event.completed_action = True
-    canceled_times_event.target_card +=1
+    canceled_times_event.counter +=1
 
     session.commit()
 
     await chat_service.create(session=session, data={"game_id":game.id, "content": "Se jugó un NOT SO FAST para cancelar la acción"})
 
     await event_service.create(session=session, data={"game_id": game.id, "turn_played": game.current_turn,
-                                                      "target_card": not_so_fast.id, "action": "to_cancel",},)
+                                                      "target_card": not_so_fast.id, "action": EventAction.TO_CANCEL,},)
 
-    await card_service.update(session=session,oid=not_so_fast.id,data={"owner": None, "content":"nsf"})
+    await card_service.update(session=session,oid=not_so_fast.id,data={"owner": None, "state": CardState.CANCELING})
 
     return 200
 
@@ -286,6 +292,7 @@ class PlayCardDTO(BaseModel):
     player_order: Optional[PlayerOrders] = None
 
 @card_router.post("/play_card/{cid}")
+@serialized(load_card)
 async def play_card(
     cid: int,
     dto: PlayCardDTO,
@@ -325,6 +332,10 @@ async def play_card(
         raise HTTPException(status_code=404, detail=f"No se encontró una acción para la carta '{card_name}'")
 
     # TODO: Capaz queremos retornar algo del resultado de la acción
-    await action(card, session, issuer_player=issuer_player, **dto.model_dump())
+    # La fase del efecto queda dada por el estado de la partida antes de ejecutarlo
+    # Lo ya leido se pasa al efecto para que no vuelva a buscar la partida ni los jugadores
+    ctx = GameContext(session, card, game, owner=player, issuer=issuer_player)
+    with trace_card_effect(card_name, game.status.value, game_id=game.id, card_id=card.id):
+        await action(card, session, issuer_player=issuer_player, ctx=ctx, **dto.model_dump())
 
     return 200
@@ -1,7 +1,8 @@
 from fastapi import HTTPException
-from typing import List
+from typing import List, Optional
 from sqlmodel import Session
 
+from app.controllers.card_effects.context import GameContext
 from app.models.card import Card
 from app.models.game import GameStatus
 from app.services.card import CardService, get_new_discarded_order
@@ -12,15 +13,16 @@ from app.services.chat import ChatService
 
 
 async def and_then_there_was_one_more(card: Card, session: Session, target_players: List[int]=[],
-                                    target_secrets: List[int]=[], target_cards: List[int]=[], target_sets: List[int]=[], **kwargs):
+                                    target_secrets: List[int]=[], target_cards: List[int]=[], target_sets: List[int]=[], ctx: Optional[GameContext] = None, **kwargs):
     game_service = GameService()
     card_service = CardService()
     player_service = PlayerService()
     secret_service = SecretService()
     chat_service = ChatService()
 
-    game = game_service.read(session=session, oid=card.game_id)
-    player_card = player_service.read(session=session, oid=card.owner)
+    ctx = GameContext.load(session, card, ctx)
+    game = ctx.game
+    player_card = ctx.owner
 
     if card.turn_played is None and game.status == GameStatus.TURN_START:
 
@@ -61,13 +63,13 @@ async def and_then_there_was_one_more(card: Card, session: Session, target_playe
         if not secret:
             raise HTTPException(404, "Secreto no existente")
         
-        player = player_service.read(session=session, oid=target_players[0])
+        player = ctx.player(target_players[0])
         if not player:
             raise HTTPException(404, "Jugador objetivo no existente")
         
         if secret.game_id != game.id:
             raise HTTPException(400, "No se puede robar un secreto de otra partida")
-        secrets_player = player_service.read(session=session, oid=secret.owner)
+        secrets_player = ctx.player(secret.owner)
         if not secret.revealed:
             raise HTTPException(400, "No se puede robar un secreto oculto")
         
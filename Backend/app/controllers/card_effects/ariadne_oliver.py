@@ -1,30 +1,30 @@
 from fastapi import HTTPException
-from typing import List
+from typing import List, Optional
 from sqlmodel import Session
 
 from app.services.detective_set import set_next_game_status
+from app.controllers.card_effects.context import GameContext
 from app.models.card import Card
 from app.models.game import GameStatus
 from app.services.card import CardService, get_new_discarded_order
 from app.services.detective_set import DetectiveSetService
 from app.services.game import GameService, not_so_fast_status
 from app.services.chat import ChatService
-from app.services.player import PlayerService
 
 async def ariadne_oliver(card: Card, session: Session, target_players: List[int]=[],
-                        target_secrets: List[int]=[], target_cards: List[int]=[], target_sets: List[int]=[], **kwargs):
+                        target_secrets: List[int]=[], target_cards: List[int]=[], target_sets: List[int]=[], ctx: Optional[GameContext] = None, **kwargs):
     game_service = GameService()
     card_service = CardService()
     set_service = DetectiveSetService()
-    player_service = PlayerService()
     chat_service = ChatService()
 
-    game = game_service.read(session=session, oid=card.game_id)
-    player = player_service.read(session=session, oid=card.owner)
+    ctx = GameContext.load(session, card, ctx)
+    game = ctx.game
+    player = ctx.owner
 
     if card.turn_played is None and game.status == GameStatus.TURN_START:
 
-        sets_in_game = set_service.search(session=session, filterby={"game_id__eq": game.id})
+        sets_in_game = ctx.sets
         other_players_sets = [s for s in sets_in_game if s.owner != card.owner]
 
         if not other_players_sets:
@@ -59,7 +59,7 @@ async def ariadne_oliver(card: Card, session: Session, target_players: List[int]
         if detective_set.game_id != game.id:
             raise HTTPException(400, "El set seleccionado no se encuentra en esta partida")
         
-        stolen_player = player_service.read(session=session, oid=detective_set.owner)
+        stolen_player = ctx.player(detective_set.owner)
 
         await set_service.update(session=session,data={"turn_played":game.current_turn,"detectives":card},id=detective_set.id)
 
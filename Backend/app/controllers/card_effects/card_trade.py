@@ -3,25 +3,26 @@ from typing import List, Optional
 from fastapi import HTTPException
 from sqlmodel import Session
 
+from app.models.event_table import EventAction
 from app.models.game import GameStatus
 from app.models.player import Player
 from app.services.card import CardService, get_new_discarded_order
 from app.services.event_table import EventTableService
 from app.services.game import GameService, not_so_fast_status
+from app.controllers.card_effects.context import GameContext
 from app.models.card import Card, CardType
-from app.services.player import PlayerService
 from app.services.chat import ChatService
 from app.controllers.card_effects.devious_detect import devious_detect
 
 
-async def card_trade(card: Card, session:Session=None, issuer_player: Optional[Player] = None, target_players: List[int]=[], target_cards: List[int]=[], **kwargs):
+async def card_trade(card: Card, session:Session=None, issuer_player: Optional[Player] = None, target_players: List[int]=[], target_cards: List[int]=[], ctx: Optional[GameContext] = None, **kwargs):
     game_service = GameService()
     event_table_service = EventTableService()
-    player_service = PlayerService()
     chat_service = ChatService()
 
-    game = game_service.read(session=session, oid=card.game_id)
-    player = player_service.read(session=session, oid=card.owner)
+    ctx = GameContext.load(session, card, ctx)
+    game = ctx.game
+    player = ctx.owner
 
     if game.status == GameStatus.TURN_START:
         # Pongo la carta en juego y cambio el estado del juego
@@ -52,12 +53,12 @@ async def card_trade(card: Card, session:Session=None, issuer_player: Optional[P
         await event_table_service.create(session=session, data={
             "game_id": game.id,
             "player_id": card.owner,
-            "action": "card_trade",
+            "action": EventAction.CARD_TRADE,
             "turn_played": game.current_turn,
             "target_player": target_players[0],
             "completed_action": True
         })
-        target_player = player_service.read(session=session, oid=target_players[0])
+        target_player = ctx.player(target_players[0])
         await chat_service.create(session=session, data={"game_id": game.id, 
                                                          "content": f"{player.name} eligió a {target_player.name} para intercambiar una carta"})
         await game_service.update(session=session, oid=game.id, data={"status": GameStatus.SELECT_CARD_TO_TRADE})
@@ -74,14 +75,14 @@ async def card_trade(card: Card, session:Session=None, issuer_player: Optional[P
         first_event_table = event_table_service.search(session=session, filterby={
             "game_id__eq": card.game_id,
             "turn_played__eq": game.current_turn,
-            "action__eq": "card_trade",
+            "action__eq": EventAction.CARD_TRADE,
             "target_card__is_null": True
         })
 
         await event_table_service.create(session=session, data={
             "game_id": game.id,
             "player_id": issuer_player.id,
-            "action": "card_trade",
+            "action": EventAction.CARD_TRADE,
             "turn_played": game.current_turn,
             "target_card": target_cards[0],
             "target_player": first_event_table[0].target_player if issuer_player.id == first_event_table[0].player_id else first_event_table[0].player_id,
@@ -91,7 +92,7 @@ async def card_trade(card: Card, session:Session=None, issuer_player: Optional[P
         selected_cards_event = event_table_service.search(session=session, filterby={
             "game_id__eq": card.game_id,
             "turn_played__eq": game.current_turn,
-            "action__eq": "card_trade",
+            "action__eq": EventAction.CARD_TRADE,
             "target_card__is_null": False
         })
 
@@ -1,29 +1,29 @@
 from fastapi import HTTPException
-from typing import List
+from typing import List, Optional
 from sqlmodel import Session
 
 
+from app.controllers.card_effects.context import GameContext
 from app.models.card import Card
 from app.models.game import GameStatus
 from app.services.card import CardService, get_new_discarded_order
 from app.services.game import GameService
-from app.services.player import PlayerService
 from app.services.chat import ChatService
 
 
 async def cards_off_the_table(card: Card, session: Session, target_players: List[int],
-                            target_secrets: List[int] = [], target_cards: List[int]=[], target_sets: List[int]=[], **kwargs):
+                            target_secrets: List[int] = [], target_cards: List[int]=[], target_sets: List[int]=[], ctx: Optional[GameContext] = None, **kwargs):
 
     card_service = CardService()
-    player_service = PlayerService()
     game_service = GameService()
     chat_service = ChatService()
 
-    game = game_service.read(session=session, oid=card.game_id)
+    ctx = GameContext.load(session, card, ctx)
+    game = ctx.game
 
     if card.turn_played is None and game.status == GameStatus.TURN_START:
 
-        player = player_service.read(session=session, oid=card.owner)
+        player = ctx.owner
         await card_service.update(session=session, oid=card.id, data={"turn_played": game.current_turn})
         await game_service.update(session=session, oid=game.id, data={"status": GameStatus.WAITING_FOR_CHOOSE_PLAYER, "player_in_action":player.id})
         await chat_service.create(session=session, data={"game_id": game.id, 
@@ -37,7 +37,7 @@ async def cards_off_the_table(card: Card, session: Session, target_players: List
             raise HTTPException(400, "No se puede relanzar una carta jugada")
 
         target_player_id = target_players[0]
-        target_player = player_service.read(session=session, oid=target_player_id)
+        target_player = ctx.player(target_player_id)
 
         if not target_player:
             raise HTTPException(404, "Jugador objetivo no existente")
@@ -46,7 +46,8 @@ async def cards_off_the_table(card: Card, session: Session, target_players: List
             raise HTTPException(400, "Jugador no existente en esta partida")
 
         cards_to_discard = card_service.search(session=session, filterby={"owner__eq":target_player_id,
-                                                                            "name__eq": "not-so-fast"})
+                                                                            "name__eq": "not-so-fast"},
+                                               sortby="id__asc")
         cards_discarded = 0
         if len(cards_to_discard) != 0:
 
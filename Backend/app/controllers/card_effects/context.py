@@ -0,0 +1,79 @@
+from typing import Dict, List, Optional
+
+from sqlmodel import Session
+
+from app.models.card import Card
+from app.models.detective_set import DetectiveSet
+from app.models.game import Game
+from app.models.player import Player
+from app.services.card import CardService
+from app.services.detective_set import DetectiveSetService
+from app.services.game import GameService
+from app.services.player import PlayerService
+
+
+class GameContext:
+    """
+    Lo que un efecto de carta necesita de su partida, leido una sola vez por request: la partida, la carta que lo
+    dispara, su dueño, quien la juega y los jugadores. El descarte y los sets se leen la primera vez que se piden
+    """
+
+    def __init__(self, session: Session, card: Card, game: Game, owner: Optional[Player] = None,
+                 issuer: Optional[Player] = None):
+        self.session = session
+        self.card = card
+        self.game = game
+        self.issuer = issuer
+        self._owner = owner
+        self._players: Optional[List[Player]] = None
+        self._discard: Optional[List[Card]] = None
+        self._sets: Optional[List[DetectiveSet]] = None
+
+    @classmethod
+    def load(cls, session: Session, card: Card, ctx: Optional["GameContext"] = None,
+             issuer_player: Optional[Player] = None) -> "GameContext":
+        """ El contexto que armo play_card; si el efecto se llama desde otro lado se arma leyendo la partida """
+        if ctx is not None:
+            return ctx
+        return cls(session, card, GameService().read(session=session, oid=card.game_id), issuer=issuer_player)
+
+    @property
+    def owner(self) -> Optional[Player]:
+        if self._owner is None:
+            self._owner = self.player(self.card.owner)
+        return self._owner
+
+    @property
+    def players(self) -> List[Player]:
+        if self._players is None:
+            self._players = PlayerService().search(session=self.session, filterby={"game_id__eq": self.game.id})
+        return self._players
+
+    @property
+    def players_by_id(self) -> Dict[int, Player]:
+        return {p.id: p for p in self.players}
+
+    def player(self, pid: Optional[int]) -> Optional[Player]:
+        """ Un jugador por id, sin consultas si ya esta cargado en el contexto """
+        if pid is None:
+            return None
+        if self._players is not None:
+            return self.players_by_id.get(pid)
+        for known in (self._owner, self.issuer):
+            if known is not None and known.id == pid:
+                return known
+        return PlayerService().read(session=self.session, oid=pid)
+
+    @property
+    def discard(self) -> List[Card]:
+        """ Pila de descarte, la ultima descartada primero """
+        if self._discard is None:
+            self._discard = CardService().search(session=self.session, filterby={
+                "game_id__eq": self.game.id, "discarded_order__is_null": False}, sortby="discarded_order__desc")
+        return self._discard
+
+    @property
+    def sets(self) -> List[DetectiveSet]:
+        if self._sets is None:
+            self._sets = DetectiveSetService().search(session=self.session, filterby={"game_id__eq": self.game.id})
+        return self._sets
@@ -9,21 +9,27 @@ from app.models.player import Player
 from app.services.card import CardService, get_new_discarded_order
 from app.services.event_table import EventTableService
 from app.services.game import GameService, not_so_fast_status
+from app.controllers.card_effects.context import GameContext
 from app.models.card import Card, CardType
-from app.services.player import PlayerService
+from app.services.seating import game_seating
 from app.services.chat import ChatService
 from app.controllers.card_effects.devious_detect import devious_detect
+from app.models.event_table import EventAction
 
+ORDER_ACTIONS = {
+    PlayerOrders.CLOCKWISE: EventAction.DEAD_CARD_FOLLY_CLOCKWISE,
+    PlayerOrders.COUNTER_CLOCKWISE: EventAction.DEAD_CARD_FOLLY_COUNTER_CLOCKWISE,
+}
 
-async def dead_card_folly(card: Card,  session:Session=None,     player_order: Optional[PlayerOrders] = None, target_cards: List[int]=[], issuer_player: Optional[Player]=None, **kwargs):
+
+async def dead_card_folly(card: Card,  session:Session=None,     player_order: Optional[PlayerOrders] = None, target_cards: List[int]=[], issuer_player: Optional[Player]=None, ctx: Optional[GameContext] = None, **kwargs):
     game_service = GameService()
-    player_service = PlayerService()
     event_table_service = EventTableService()
     chat_service = ChatService()
 
-    game = game_service.read(session=session, oid=card.game_id)
-    players = player_service.search(session=session, filterby={"game_id__eq": card.game_id})
-    player = player_service.read(session=session, oid=card.owner)
+    ctx = GameContext.load(session, card, ctx)
+    game = ctx.game
+    player = ctx.owner
 
     if game.status == GameStatus.TURN_START:
         # Pongo la carta en juego y cambio el estado del juego
@@ -49,7 +55,7 @@ async def dead_card_folly(card: Card,  session:Session=None,     player_order: O
         await event_table_service.create(session=session, data={
             "game_id": game.id,
             "player_id": issuer_player.id,
-            "action": f"dead_card_folly_{player_order.value}",
+            "action": ORDER_ACTIONS[player_order],
             "turn_played": game.current_turn,
         })
 
@@ -68,27 +74,26 @@ async def dead_card_folly(card: Card,  session:Session=None,     player_order: O
         if not target_card or target_card.owner != issuer_player.id:
             raise HTTPException(status_code=400, detail="Carta no válida")
 
-        choosen_order_event = event_table_service.search(session=session, filterby={"game_id__eq": game.id, "turn_played__eq": game.current_turn, "action__in": ["dead_card_folly_clockwise", "dead_card_folly_counter-clockwise"]})
+        choosen_order_event = event_table_service.search(session=session, filterby={"game_id__eq": game.id, "turn_played__eq": game.current_turn, "action__in": list(ORDER_ACTIONS.values())})
 
-        next_player_position = (issuer_player.position + 1) % len(players) if choosen_order_event[0].action == "dead_card_folly_clockwise" else (issuer_player.position - 1) % len(players)
-        next_player = filter(lambda p: p.position == next_player_position, players)
-        next_player = list(next_player)[0]
+        seating = game_seating(session, game)
+        next_player_id = seating.neighbour(issuer_player.id, clockwise=choosen_order_event[0].action == EventAction.DEAD_CARD_FOLLY_CLOCKWISE)
 
         await event_table_service.create(session=session, data={
             "game_id": game.id,
             "player_id": issuer_player.id,
-            "action": f"dead_card_folly_trade",
+            "action": EventAction.DEAD_CARD_FOLLY_TRADE,
             "turn_played": game.current_turn,
             "target_card": target_card.id,
-            "target_player": next_player.id,
+            "target_player": next_player_id,
             "completed_action": False
         })
 
         # Aca me interesan los trades no resueltos por si se interrumpio esto con la ejecucion de un devious
-        trade_events = event_table_service.search(session=session, filterby={"game_id__eq": game.id, "turn_played__eq": game.current_turn, "action__eq": "dead_card_folly_trade"})
+        trade_events = event_table_service.search(session=session, filterby={"game_id__eq": game.id, "turn_played__eq": game.current_turn, "action__eq": EventAction.DEAD_CARD_FOLLY_TRADE})
         pending_solve_events = list(filter(lambda e: not e.completed_action, trade_events))
 
-        if len(trade_events) >= len(players):
+        if len(trade_events) >= len(seating):
 
             for event in pending_solve_events:
                 await CardService().update(session=session, oid=event.target_card, data={"owner": event.target_player})
@@ -102,7 +107,7 @@ async def dead_card_folly(card: Card,  session:Session=None,     player_order: O
                                                                      "owner": None,
                                                                      "turn_played":None})
             
-            side = "derecha" if choosen_order_event[0].action == "dead_card_folly_clockwise" else "izquierda"
+            side = "derecha" if choosen_order_event[0].action == EventAction.DEAD_CARD_FOLLY_CLOCKWISE else "izquierda"
             
             await chat_service.create(session=session, data={"game_id": game.id, 
                                                              "content": f"La carta DEAD CARD FOLLY realizó todos los intercambios a la {side}"})
@@ -1,5 +1,5 @@
 import random
-from typing import List
+from typing import List, Optional
 
 from fastapi import HTTPException
 from sqlmodel import Session
@@ -8,19 +8,19 @@ from app.models.game import GameStatus
 from app.models.websocket import notify_game_players, WebsocketMessage
 from app.services.card import CardService, get_new_discarded_order
 from app.services.game import GameService, not_so_fast_status
-from app.models.card import Card
+from app.controllers.card_effects.context import GameContext
+from app.models.card import Card, CardState
 from app.services.chat import ChatService
-from app.services.player import PlayerService
 
 
-async def delay_the_murderers_escape(card: Card,  session:Session=None, target_cards: List[int] = [], **kwargs):
+async def delay_the_murderers_escape(card: Card,  session:Session=None, target_cards: List[int] = [], ctx: Optional[GameContext] = None, **kwargs):
     card_service = CardService()
     game_service = GameService()
     chat_service = ChatService()
-    player_service = PlayerService()
 
-    game = game_service.read(session=session, oid=card.game_id)
-    player = player_service.read(session=session, oid=card.owner)
+    ctx = GameContext.load(session, card, ctx)
+    game = ctx.game
+    player = ctx.owner
 
     if game.status == GameStatus.TURN_START:
         await card_service.update(session=session, oid=card.id, data={"turn_played": game.current_turn})
@@ -41,11 +41,11 @@ async def delay_the_murderers_escape(card: Card,  session:Session=None, target_c
         if not target_cards:
             raise HTTPException(status_code=412, detail="Se deben seleccionar cartas")
 
-        cards = card_service.search(session=session, filterby={"game_id__eq": card.game_id,"turn_discarded__is_null": True, "owner__is_null": True, "content__eq":""}, sortby="pile_order__desc")
+        cards = card_service.search(session=session, filterby={"game_id__eq": card.game_id,"turn_discarded__is_null": True, "owner__is_null": True, "state__eq": CardState.AVAILABLE}, sortby="pile_order__desc")
         draft = cards[0:3]
         not_draft = cards[3:]
 
-        discarded_cards = card_service.search(session=session, filterby={"game_id__eq": card.game_id, "discarded_order__is_null": False}, sortby="discarded_order__desc")
+        discarded_cards = ctx.discard
         last_5 = discarded_cards[0:min(5, len(discarded_cards))]
 
         last_5.sort(key=lambda c: target_cards.index(c.id) if c.id in target_cards else len(target_cards))
@@ -56,7 +56,7 @@ async def delay_the_murderers_escape(card: Card,  session:Session=None, target_c
             c.turn_discarded = None
             c.turn_played = None
             c.owner = None
-            c.content = ""
+            c.state = CardState.AVAILABLE
 
         not_draft.extend(last_5)
 
@@ -5,6 +5,7 @@ from app.services.game import GameService
 from app.services.card import CardService, get_new_discarded_order
 from app.services.chat import ChatService
 
+from app.models.event_table import EventAction
 from app.models.game import Game, GameStatus
 
 from app.services.game import not_so_fast_status
@@ -20,7 +21,7 @@ async def devious_detect(session: Session, game: Game):
 
     current_events = event_table_service.search(session=session, filterby={"game_id__eq":game.id, 
                                                                            "turn_played__eq": game.current_turn,
-                                                                           "action__in": ["card_trade","dead_card_folly_trade"],
+                                                                           "action__in": [EventAction.CARD_TRADE, EventAction.DEAD_CARD_FOLLY_TRADE],
                                                                            "completed_action__eq": False})
 
     
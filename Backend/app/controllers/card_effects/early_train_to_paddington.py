@@ -1,7 +1,8 @@
-from typing import List
+from typing import List, Optional
 from sqlmodel import Session
 
 
+from app.controllers.card_effects.context import GameContext
 from app.models.card import Card
 from app.models.game import GameStatus
 from app.services.card import CardService, get_new_discarded_order
@@ -10,12 +11,13 @@ from app.services.chat import ChatService
 
 
 async def early_train_to_paddington(card:Card,session: Session=None,in_discard:bool=False,target_players: List[int] = [],
-                              target_secrets: List[int] = [], target_cards: List[int]=[], target_sets: List[int]=[], **kwargs):
+                              target_secrets: List[int] = [], target_cards: List[int]=[], target_sets: List[int]=[], ctx: Optional[GameContext] = None, **kwargs):
     card_service = CardService()
     game_service = GameService()
     chat_service = ChatService()
 
-    game = game_service.read(session=session, oid=card.game_id)
+    ctx = GameContext.load(session, card, ctx)
+    game = ctx.game
 
     await card_service.update(session=session,oid=card.id,data={"turn_played":game.current_turn})
 
@@ -37,7 +39,7 @@ async def early_train_to_paddington(card:Card,session: Session=None,in_discard:b
     # Las 3 primeras son del draft, y traemos una mas para ver si se acabo el mazo
     cards_to_update = card_service.search(session=session,
                                           filterby={'game_id__eq': card.game_id, 'discarded_order__is_null': True,
-                                                    'owner__is_null': True}, limit=7, offset=3)
+                                                    'owner__is_null': True}, sortby="pile_order__desc", limit=7, offset=3)
 
     new_discarded_order = get_new_discarded_order(session=session, game_id=card.game_id)
 
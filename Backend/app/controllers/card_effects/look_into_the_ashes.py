@@ -1,23 +1,23 @@
 from fastapi import HTTPException
-from typing import List
+from typing import List, Optional
 from sqlmodel import Session
 
-from app.models.card import Card
+from app.controllers.card_effects.context import GameContext
+from app.models.card import Card, CardState
 from app.models.game import GameStatus
 from app.services.card import CardService,get_new_discarded_order
 from app.services.game import GameService, not_so_fast_status
-from app.services.player import PlayerService
 from app.services.chat import ChatService
 
 
 async def look_into_the_ashes(card: Card, session: Session, target_players: List[int]=[],
-                            target_secrets: List[int] = [], target_cards: List[int]=[], target_sets: List[int]=[], **kwargs):
+                            target_secrets: List[int] = [], target_cards: List[int]=[], target_sets: List[int]=[], ctx: Optional[GameContext] = None, **kwargs):
     card_service = CardService()
-    player_service = PlayerService()
     game_service = GameService()
     chat_service = ChatService()
 
-    game = game_service.read(session=session, oid=card.game_id)
+    ctx = GameContext.load(session, card, ctx)
+    game = ctx.game
 
     last_five_discarded = card_service.search(session=session,
                                              filterby={"game_id__eq": card.game_id, 'discarded_order__is_null': False},
@@ -27,7 +27,7 @@ async def look_into_the_ashes(card: Card, session: Session, target_players: List
     if not len(last_five_discarded):
         raise HTTPException(status_code=412, detail= "No hay cartas en la pila de descarte, no se puede jugar")
 
-    player = player_service.read(session=session, oid=card.owner)
+    player = ctx.owner
 
     if card.turn_played is None and game.status == GameStatus.TURN_START:
 
@@ -71,7 +71,7 @@ async def look_into_the_ashes(card: Card, session: Session, target_players: List
 
         await card_service.update(session=session, oid=target_card_id, data={"turn_discarded": None,"turn_played":None,
                                                                              "discarded_order": None,"owner": player.id,
-                                                                             "content":""})
+                                                                             "state": CardState.AVAILABLE})
 
         new_discarded_order = get_new_discarded_order(session=session, game_id=card.game_id)
 
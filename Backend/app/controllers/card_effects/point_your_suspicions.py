@@ -4,28 +4,29 @@ from fastapi import HTTPException
 from sqlmodel import Session
 
 from app.controllers.utils import reveal_secret
+from app.models.event_table import EventAction
 from app.models.game import GameStatus
 from app.models.player import Player
 from app.models.websocket import notify_game_players, WebsocketMessage
 from app.services.card import CardService, get_new_discarded_order
 from app.services.event_table import EventTableService
 from app.services.game import GameService, not_so_fast_status
+from app.controllers.card_effects.context import GameContext
 from app.models.card import Card
-from app.services.player import PlayerService
 from app.services.secret import SecretService
 from app.services.chat import ChatService
 
 
-async def point_your_suspicions(card: Card,  session:Session=None, target_players: List[int]=[], target_secrets: List[int]=[], issuer_player: Optional[Player]=None, **kwargs):
+async def point_your_suspicions(card: Card,  session:Session=None, target_players: List[int]=[], target_secrets: List[int]=[], issuer_player: Optional[Player]=None, ctx: Optional[GameContext] = None, **kwargs):
     game_service = GameService()
-    player_service = PlayerService()
     event_table_service = EventTableService()
     chat_service = ChatService()
 
-    game = game_service.read(session=session, oid=card.game_id)
-    player = player_service.read(session=session, oid=card.owner)
-    players = player_service.search(session=session, filterby={"game_id__eq": card.game_id})
-    votos_filter = {"game_id__eq": card.game_id, "turn_played__eq": game.current_turn, "action__eq": "point_your_suspicions", "target_player__is_null": False}
+    ctx = GameContext.load(session, card, ctx)
+    game = ctx.game
+    players = ctx.players
+    player = ctx.owner
+    votos_filter = {"game_id__eq": card.game_id, "turn_played__eq": game.current_turn, "action__eq": EventAction.POINT_YOUR_SUSPICIONS, "target_player__is_null": False}
     events = event_table_service.search(session=session, filterby=votos_filter)
 
     if game.status == GameStatus.TURN_START:
@@ -55,11 +56,11 @@ async def point_your_suspicions(card: Card,  session:Session=None, target_player
         await event_table_service.create(session=session, data={
             "game_id": game.id,
             "player_id": issuer_player.id,
-            "action": "point_your_suspicions",
+            "action": EventAction.POINT_YOUR_SUSPICIONS,
             "turn_played": game.current_turn,
             "target_player": target_players[0],
         })
-        target_player = player_service.read(session=session, oid=target_players[0])
+        target_player = ctx.player(target_players[0])
         await chat_service.create(session=session, data={"game_id": game.id, 
                                                          "content": f"{issuer_player.name} apuntó a {target_player.name} como sospechoso"})
 
@@ -80,14 +81,14 @@ async def point_your_suspicions(card: Card,  session:Session=None, target_player
             if len(most_voted_players) > 1:
                 names = ""
                 for voted_player in most_voted_players:
-                    actual_player = player_service.read(session=session, oid=voted_player)
+                    actual_player = ctx.player(voted_player)
                     names = names + f"{actual_player.name}, "
                 await chat_service.create(session=session, data={"game_id": game.id, 
                                                                  "content": f"{names} empataron, {player.name} desempata"})
                 await game_service.update(session=session, oid=game.id, data={"player_in_action": card.owner, "status": GameStatus.WAITING_FOR_CHOOSE_PLAYER})
             else:
                 most_voted_player_id = most_voted_players[0]
-                player_suspicious = player_service.read(session=session, oid=most_voted_player_id)
+                player_suspicious = ctx.player(most_voted_player_id)
                 await chat_service.create(session=session, data={"game_id": game.id, 
                                                                  "content": f"{player_suspicious.name} fue elegido como sospechoso, debe revelar un secreto"})
                 await game_service.update(session=session, oid=game.id, data={"player_in_action": most_voted_player_id, "status": GameStatus.WAITING_FOR_CHOOSE_SECRET})
@@ -3,12 +3,11 @@ from typing import List, Optional
 from fastapi import HTTPException
 
 from app.models.websocket import notify_game_players, WebsocketMessage
+from app.controllers.card_effects.context import GameContext
 from app.models.card import Card
 from app.models.game import GameStatus
 
-from app.services.game import GameService
 from app.services.event_table import EventTableService
-from app.services.player import PlayerService
 from app.services.card import CardService, get_new_discarded_order
 from app.controllers.chat import ChatService
 from app.services.secret import SecretService
@@ -17,17 +16,16 @@ from app.controllers.utils import reveal_secret
 from app.controllers.card_effects.devious_detect import devious_detect
 
 async def social_faux_pas(card: Card, session: Session, target_players: List[int]=[],
-                          target_secrets: List[int]=[], target_cards: List[int]=[], target_sets: List[int]=[], **kwargs):
+                          target_secrets: List[int]=[], target_cards: List[int]=[], target_sets: List[int]=[], ctx: Optional[GameContext] = None, **kwargs):
     
-    game_service = GameService()
-    player_service = PlayerService()
     card_service = CardService()
     chat_service = ChatService()
     event_table_service = EventTableService()
     secret_service = SecretService()
 
 
-    game = game_service.read(session=session, oid=card.game_id)
+    ctx = GameContext.load(session, card, ctx)
+    game = ctx.game
     
     if card.turn_played != game.current_turn:
         raise HTTPException(400, "La devious no esta en juego")
@@ -42,7 +40,7 @@ async def social_faux_pas(card: Card, session: Session, target_players: List[int
                                                                       "turn_played__eq": game.current_turn,
                                                                       "completed_action__eq": True})
         
-        player_to_reveal = player_service.read(session=session, oid=event[0].target_player)
+        player_to_reveal = ctx.player(event[0].target_player)
 
         if game.player_in_action != player_to_reveal.id:
             raise HTTPException(400, "Evento devious incorrecto")
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session
 from pydantic import BaseModel
 from typing import List
-from app.database.engine import db_session
+from app.database.engine import db_session, db_read_session
 
 from app.models.chat import Chat
 from app.models.game import GameStatus
@@ -48,7 +48,7 @@ async def create_chat_message(dto: CreateChatMessageDTO, session: Session = Depe
     return message
 
 @chat_router.get("/{gid}", response_model=List[Chat])
-def search_messages(gid: int, session: Session = Depends(db_session)):
+def search_messages(gid: int, session: Session = Depends(db_read_session)):
 
     chat_service = ChatService()
     game_service = GameService()
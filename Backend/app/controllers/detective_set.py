@@ -3,8 +3,9 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Header
 from sqlmodel import Session
 from pydantic import BaseModel
 
-from app.controllers.utils import reveal_secret
-from app.database.engine import db_session
+from app.actors import serialized
+from app.controllers.utils import reveal_secret, load_set, load_token_player
+from app.database.engine import db_session, db_read_session
 from app.models.detective_set import DetectiveSet, PublicDetectiveSet
 from app.models.game import GameStatus
 
@@ -40,6 +41,7 @@ class SetActionDTO(BaseModel):
 TUPPENCE = ["tuppence-beresford","tommy-beresford"]
 
 @set_router.post("/", response_model=PublicDetectiveSet)
+@serialized(load_token_player)
 async def create_detective_set(
     dto: CreateDetectiveSetDTO,
     token: str = Query(...),
@@ -65,8 +67,9 @@ async def create_detective_set(
 
     # Verificar que todas las cartas sean del tipo detective y del mismo jugador
     cards: List[Card] = []
+    detectives = card_service.read_many(session, dto.detectives)
     for cid in dto.detectives:
-        card = card_service.read(session, cid)
+        card = detectives.get(cid)
         if not card:
             raise HTTPException(status_code=404, detail=f"Carta {cid} no encontrada")
         if card.card_type != CardType.DETECTIVE:
@@ -109,6 +112,7 @@ async def create_detective_set(
     return detective_set
 
 @set_router.post("/update/{sid}", response_model=PublicDetectiveSet)
+@serialized(load_set)
 async def update_detective_sets(sid:int,dto:UpdateDetectiveSetDTO,session: Session = Depends(db_session)):
     set_service = DetectiveSetService()
     game_service = GameService()
@@ -180,7 +184,7 @@ async def update_detective_sets(sid:int,dto:UpdateDetectiveSetDTO,session: Sessi
 async def search_detective_sets(
     filter: DetectiveSetFilter,
     token: str = Query(...),
-    session: Session = Depends(db_session),
+    session: Session = Depends(db_read_session),
 ):
     player_service = PlayerService()
     set_service = DetectiveSetService()
@@ -197,7 +201,7 @@ async def search_detective_sets(
 async def get_detective_set(
     sid: int,
     token: str = Query(...),
-    session: Session = Depends(db_session),
+    session: Session = Depends(db_read_session),
 ):
     player_service = PlayerService()
     set_service = DetectiveSetService()
@@ -216,6 +220,7 @@ def detectives_in_set(name:List[str],d_set:DetectiveSet):
     return all([any(detective.name == d_name for detective in d_set.detectives) for d_name in name])
 
 @set_router.post("/{sid}")
+@serialized(load_set)
 async def post_detective_set_action(sid:int,dto:SetActionDTO,session: Session = Depends(db_session)):
     set_service = DetectiveSetService()
     game_service = GameService()
@@ -7,51 +7,24 @@ from fastapi import Depends, APIRouter, HTTPException
 from pydantic import BaseModel
 from sqlmodel import Session
 
-from app.database.engine import db_session
-from app.models.card import CardType
+from app.actors import serialized
+from app.controllers.utils import game_of_path
+from app.database.engine import db_session, db_read_session
+from app.engine.setup import CARD_KINDS, MURDER_SECRET, agatha_distance, deal_cards, deal_secrets
+from app.models.card import CardState
+from app.models.event_table import EventAction
 from app.models.game import PublicGame, GameStatus
 from app.models.player import Player
-from app.models.secret import SecretType
-from app.services.card import CreateCard, get_new_discarded_order
+from app.services.card import get_new_discarded_order
 from app.services.detective_set import DetectiveSetService
 from app.services.event_table import EventTableService
 from app.services.game import GameService, CreateGame, GameFilter
+from app.services.seating import game_seating
 from app.services.secret import CreateSecret, SecretService
+from app.services.secret_tally import tally_secrets
 from app.services.player import PlayerService, CreatePlayer
 from app.services.card import CardService
 
-# {"name":"", "content":"", "card_type":CardType,"amount":1},
-CARDS = [
-    #DEVIOUS
-    {"name":"blackmailed", "content":"", "card_type":CardType.DEVIOUS,"amount":1},
-    {"name":"social-faux-pas", "content":"", "card_type":CardType.DEVIOUS,"amount":3},
-    #DETECTIVES
-    {"name":"harley-quin-wildcard", "content":"", "card_type":CardType.DETECTIVE,"amount":4},
-    {"name":"ariadne-oliver", "content":"", "card_type":CardType.DETECTIVE,"amount":3},
-    {"name":"miss-marple", "content":"", "card_type":CardType.DETECTIVE,"amount":3},
-    {"name":"parker-pyne", "content":"", "card_type":CardType.DETECTIVE,"amount":3},
-    {"name":"tommy-beresford", "content":"", "card_type":CardType.DETECTIVE,"amount":2},
-    {"name":"lady-eileen-bundle-brent", "content":"", "card_type":CardType.DETECTIVE,"amount":3},
-    {"name":"tuppence-beresford", "content":"", "card_type":CardType.DETECTIVE,"amount":2},
-    {"name":"hercule-poirot", "content":"", "card_type":CardType.DETECTIVE,"amount":3},
-    {"name":"mr-satterthwaite", "content":"", "card_type":CardType.DETECTIVE,"amount":2},
-    #EVENT
-    {"name":"delay-the-murderers-escape", "content":"", "card_type":CardType.EVENT,"amount":3},
-    {"name":"point-your-suspicions", "content":"", "card_type":CardType.EVENT,"amount":3},
-    {"name":"dead-card-folly", "content":"", "card_type":CardType.EVENT,"amount":3},
-    {"name":"another-victim", "content":"", "card_type":CardType.EVENT,"amount":2},
-    {"name":"look-into-the-ashes", "content":"", "card_type":CardType.EVENT,"amount":3},
-    {"name":"card-trade", "content":"", "card_type":CardType.EVENT,"amount":3},
-    {"name":"and-then-there-was-one-more", "content":"", "card_type":CardType.EVENT,"amount":2},
-    {"name":"early-train-to-paddington", "content":"", "card_type":CardType.EVENT,"amount":2},
-    {"name":"cards-off-the-table", "content":"", "card_type":CardType.EVENT,"amount":1}
-]
-
-INSTANT_CARDS ={"name":"not-so-fast", "content":"", "card_type":CardType.INSTANT,"amount":10}
-DEFAULT_SECRET={"name":"varios", "content":"", "type":SecretType.OTHER}
-MURDER_SECRET={"name":"youre-the-murderer", "content":"", "type":SecretType.MURDERER}
-ACCOMPLICE_SECRET= {"name":"youre-the-accomplice", "content":"", "type":SecretType.ACCOMPLICE}
-AGATHA_DOY=259
 game_router = APIRouter(prefix="/api/game")
 
 
@@ -77,7 +50,7 @@ class DeleteGameDTO(BaseModel):
     token: str
 
 @game_router.get('/{gid}', response_model=PublicGame)
-def get_game(gid: int, session: Session = Depends(db_session)):
+def get_game(gid: int, session: Session = Depends(db_read_session)):
     service = GameService()
     game = service.read(session=session, oid=gid)
 
@@ -143,34 +116,10 @@ async def delete_game(gid: int,dto: DeleteGameDTO, session: Session = Depends(db
     did = await game_service.delete(session=session,oid=gid)
     return did
 
-def create_cards_for_game(gid:int, players: List[Player]):
-    players_amount = len(players)
-    expanded_cards = [c for c in CARDS for _ in range(c["amount"])]
-    expanded_instant_cards = [INSTANT_CARDS for _ in range(INSTANT_CARDS["amount"]-players_amount)]
-    prepare_cards_to_create = [*expanded_cards, *expanded_instant_cards]
-    random.shuffle(prepare_cards_to_create)
-    cards_to_create = [
-        CreateCard(
-            game_id=gid,
-            name=card["name"],
-            content=card["content"],
-            card_type=card["card_type"],
-            pile_order=i
-        ) for i, card in enumerate(prepare_cards_to_create)]
-
-    for i in range(players_amount*5):
-        cards_to_create[-(i+1)].owner = players[i % players_amount].id
-
-    cards_to_create.extend([CreateCard(
-            game_id=gid,
-            name=INSTANT_CARDS["name"],
-            content=INSTANT_CARDS["content"],
-            card_type=INSTANT_CARDS["card_type"],
-            pile_order=i + len(prepare_cards_to_create),
-            owner=players[(i+1) % players_amount].id
-        ) for i in range(players_amount)])
-
-    return cards_to_create
+def create_cards_for_game(gid:int, players: List[Player]) -> List[dict]:
+    """ Filas de las cartas de la partida en orden de pila, segun el reparto del motor """
+    return [{**CARD_KINDS[kind], "game_id": gid, "pile_order": i, "owner": owner}
+            for i, (kind, owner) in enumerate(deal_cards([p.id for p in players]))]
 
 def create_murder_for_game(gid:int,pid:int):
     return CreateSecret(
@@ -183,40 +132,15 @@ def create_murder_for_game(gid:int,pid:int):
             )
 
 def create_secrets_for_game(gid:int,players:list[Player]):
-    game_secrets = []
     random.shuffle(players)
-    murder= players[0]
-    accomplice = players[1]
-
-    for p in players:
-        has_secret = 1 if p == murder or p == accomplice else 0
-        for i in range(3 - has_secret):
-            game_secrets.append(
-                CreateSecret(
-                    game_id=gid,
-                    owner=p.id,
-                    name=DEFAULT_SECRET["name"],
-                    content=DEFAULT_SECRET["content"],
-                    revealed=False,
-                    type=DEFAULT_SECRET["type"]
-                )
-            )
-
-    game_secrets.append(create_murder_for_game(gid=gid,pid=murder.id))
-    secret_data = ACCOMPLICE_SECRET if len(players) > 4 else DEFAULT_SECRET
-    game_secrets.append(CreateSecret(
-            game_id=gid,
-            owner=accomplice.id,
-            name=secret_data["name"],
-            content=secret_data["content"],
-            revealed=False,
-            type=secret_data["type"]
-            ))
-    return game_secrets
+    return [CreateSecret(game_id=gid, owner=owner, name=secret["name"], content=secret["content"], revealed=False,
+                         type=secret["type"])
+            for owner, secret in deal_secrets([p.id for p in players])]
 
 
 
 @game_router.patch('/{gid}', response_model=PublicGame)
+@serialized(game_of_path)
 async def update_game(gid: int, dto: UpdateGameDTO, session: Session = Depends(db_session)):
     game_service = GameService()
     player_service = PlayerService()
@@ -240,9 +164,10 @@ async def update_game(gid: int, dto: UpdateGameDTO, session: Session = Depends(d
             raise HTTPException(401, "Token invalido")
 
         # Sorteo posiciones
-        players.sort(key=lambda player: abs(player.date_of_birth.timetuple().tm_yday - AGATHA_DOY))
+        players.sort(key=lambda player: agatha_distance(player.date_of_birth))
         for i in range(len(players)):
             players[i].position = i
+        seating = [p.id for p in players]
 
         # Reparto secretos
         secrets = create_secrets_for_game(gid=gid,players=players)
@@ -252,14 +177,15 @@ async def update_game(gid: int, dto: UpdateGameDTO, session: Session = Depends(d
         # Reparto cartas
         cards = create_cards_for_game(gid=gid, players=players)
         card_service=CardService()
-        await card_service.create_bulk(session=session, data=[c.model_dump(exclude_none=True) for c in cards])
+        await card_service.create_bulk(session=session, data=cards)
 
         first_discarded = card_service.search(session=session,
                                               filterby={'game_id__eq': game.id,'turn_discarded__is_null': True,'owner__is_null': True},
                                               sortby="pile_order__desc",
                                               limit=1)[0]
         await card_service.update(session=session, oid=first_discarded.id, data={"turn_discarded":-1, "discarded_order":0})
-        await game_service.update(session=session,oid=game.id,data={"status":GameStatus.STARTED})
+        await game_service.update(session=session,oid=game.id,data={"status":GameStatus.STARTED, "seating": seating,
+                                                                    "secret_tally": tally_secrets(secrets)})
 
         updated_game = await game_service.update(session=session, oid=gid, data={"status": GameStatus.TURN_START})
         return updated_game
@@ -269,28 +195,28 @@ async def update_game(gid: int, dto: UpdateGameDTO, session: Session = Depends(d
         if game.status not in {GameStatus.FINALIZE_TURN,GameStatus.FINALIZE_TURN_DRAFT}:
             raise HTTPException(428, "No se puede terminar turno sin descartar o jugar una carta")
 
-        amount_players = len(players)
-        current_player = player_service.search(session=session,
-                                               filterby={'position__eq':(game.current_turn % amount_players), 'game_id__eq': game.id})
+        turn_owner = game_seating(session, game, players).turn_owner(game.current_turn)
+        current_player = next((p for p in players if p.id == turn_owner), None)
 
-        if current_player[0].token != dto.token:
+        if not current_player or current_player.token != dto.token:
             raise HTTPException(401, "Token invalido")
 
         current_player_cards = len(card_service.search(session=session,
-                                                       filterby={'owner__eq':current_player[0].id, 'game_id__eq':game.id, "set_id__is_null":True}))
+                                                       filterby={'owner__eq':current_player.id, 'game_id__eq':game.id, "set_id__is_null":True}))
 
         if current_player_cards < 6:
             cards_to_pick = 6 - current_player_cards
             cards_to_update = card_service.search(session=session,
-                                                  filterby={'game_id__eq': game.id, 'discarded_order__is_null': True, 'content__eq':"" ,
-                                                            'owner__is_null': True}, limit=cards_to_pick,offset=3)
+                                                  filterby={'game_id__eq': game.id, 'discarded_order__is_null': True, 'state__eq': CardState.AVAILABLE,
+                                                            'owner__is_null': True}, sortby="pile_order__desc", limit=cards_to_pick,offset=3)
 
             for card in cards_to_update:
-                await card_service.update(session=session, oid=card.id, data={'owner': current_player[0].id})
+                await card_service.update(session=session, oid=card.id, data={'owner': current_player.id})
 
             if cards_to_update:
                 cards_filter = card_service.search(session=session, filterby={"game_id__eq": gid,"owner__is_null": True,
-                                                                              "turn_discarded__is_null": True,  'content__eq':""}, offset=3)
+                                                                              "turn_discarded__is_null": True,  'state__eq': CardState.AVAILABLE},
+                                                   sortby="pile_order__desc", offset=3)
 
                 if len(cards_filter) == 0:
                     dto.status = GameStatus.FINALIZED
@@ -298,7 +224,7 @@ async def update_game(gid: int, dto: UpdateGameDTO, session: Session = Depends(d
         dto.status = GameStatus.FINALIZED if dto.status == GameStatus.FINALIZED else GameStatus.TURN_START
 
         not_so_fast_events = event_service.search(session=session, filterby={"game_id__eq": game.id, "turn_played__eq": game.current_turn,
-                                                                             "action__eq": "to_cancel", "target_card__is_null":False})
+                                                                             "action__eq": EventAction.TO_CANCEL, "target_card__is_null":False})
 
         if not_so_fast_events:
             new_discarded_order = get_new_discarded_order(session=session, game_id=game.id)
@@ -310,14 +236,19 @@ async def update_game(gid: int, dto: UpdateGameDTO, session: Session = Depends(d
 
             updated_cards = await card_service.bulk_update(session=session, oids=played_not_so_fast_cards, data=update_data)
 
-        updated_game = await game_service.update(session=session, oid=gid,data={"current_turn":dto.current_turn, "status": dto.status})
+        update_data = {"current_turn":dto.current_turn, "status": dto.status}
+        if dto.status == GameStatus.FINALIZED:
+            # Igual que en reveal_secret: una partida terminada no tiene jugador en accion
+            update_data["player_in_action"] = None
+
+        updated_game = await game_service.update(session=session, oid=gid,data=update_data)
         return updated_game
 
     else:
         raise HTTPException(status_code=400, detail="Actualizacion de partida invalida")
 
 @game_router.post('/search', response_model=list[PublicGame])
-def search_game(dto: GameFilter, session: Session = Depends(db_session)):
+def search_game(dto: GameFilter, session: Session = Depends(db_read_session)):
     service = GameService()
     games = service.search(session=session, filterby=dto.model_dump(exclude_none=True))
     return games
\ No newline at end of file
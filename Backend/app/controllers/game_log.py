@@ -0,0 +1,27 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import Session
+
+from app.controllers.profiler import check_admin_token
+from app.database.engine import db_read_session
+from app.models.game_log import GameLogEntry
+from app.services.game_log import GameLogService
+
+# El log tiene las manos y los secretos de todos los jugadores, por eso solo se expone con el token de administrador
+game_log_router = APIRouter(prefix="/api/admin/game")
+
+
+@game_log_router.get('/{gid}/log', response_model=List[GameLogEntry])
+def get_game_log(gid: int, token: str, since: int = 0, limit: Optional[int] = Query(None, gt=0),
+                 session: Session = Depends(db_read_session)):
+    """ Entradas del log de la partida posteriores a `since` """
+    check_admin_token(token)
+    return GameLogService().entries(session, gid, since=since, limit=limit)
+
+
+@game_log_router.get('/{gid}/replay')
+def replay_game(gid: int, token: str, turn: Optional[int] = Query(None, ge=0), session: Session = Depends(db_read_session)):
+    """ Estado de la partida al final de `turn` reconstruido desde el log """
+    check_admin_token(token)
+    return GameLogService().replay(session, gid, turn=turn)
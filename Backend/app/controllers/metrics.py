@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from app.database.engine import db_engine, db_read_session
+from app.metrics import REGISTRY, Gauge
+from app.models.game import Game, GameStatus
+from app.models.websocket import GAME_CONNECTIONS, LOBBY_CONNECTIONS
+from app.settings import settings
+
+metrics_router = APIRouter()
+
+GAMES = REGISTRY.register(Gauge("games", "Partidas por estado", ("status",)))
+WS_CONNECTIONS = REGISTRY.register(Gauge(
+    "ws_connections_open", "Websockets abiertos", ("kind",),
+    collector=lambda: {("game",): sum(len(c) for c in GAME_CONNECTIONS.values()), ("lobby",): len(LOBBY_CONNECTIONS)}))
+
+
+def _pool_gauge(method: str):
+    # El StaticPool de SQLite en memoria es una sola conexion compartida, no expone size/checkedout/overflow
+    return lambda: {(): max(getattr(db_engine.pool, method)(), 0)} if hasattr(db_engine.pool, method) else {}
+
+
+DB_POOL_CHECKED_OUT = REGISTRY.register(Gauge(
+    "db_pool_checked_out", "Conexiones del pool en uso", collector=_pool_gauge("checkedout")))
+DB_POOL_OVERFLOW = REGISTRY.register(Gauge(
+    "db_pool_overflow", "Conexiones abiertas por encima del tamaño del pool", collector=_pool_gauge("overflow")))
+DB_POOL_SIZE = REGISTRY.register(Gauge(
+    "db_pool_size", "Tamaño del pool de conexiones", collector=_pool_gauge("size")))
+DB_POOL_MAX_OVERFLOW = REGISTRY.register(Gauge(
+    "db_pool_max_overflow", "Conexiones que se pueden abrir por encima del tamaño del pool",
+    collector=lambda: {(): settings.DB_MAX_OVERFLOW} if hasattr(db_engine.pool, "size") else {}))
+
+
+def count_games_by_status(session: Session):
+    rows = session.exec(select(Game.status, func.count()).group_by(Game.status)).all()
+    counts = {(status.value,): 0 for status in GameStatus}
+    for status, amount in rows:
+        counts[(GameStatus(status).value,)] = amount
+    return counts
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(session: Session = Depends(db_read_session)):
+    # La unica consulta a la base va al threadpool, el resto se lee desde el event loop
+    GAMES.values = await run_in_threadpool(count_games_by_status, session)
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
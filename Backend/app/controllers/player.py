@@ -2,7 +2,7 @@ import secrets
 from datetime import datetime, timezone
 from app.models.game import GameStatus
 
-from app.database.engine import db_session
+from app.database.engine import db_session, db_read_session
 from fastapi import APIRouter,Depends,HTTPException
 from pydantic import BaseModel
 from sqlmodel import Session
@@ -23,7 +23,7 @@ class DeletePlayerDTO(BaseModel):
 player_router=APIRouter(prefix="/api/player")
 
 @player_router.get(path='/{pid}', response_model=PublicPlayer)
-def get_player(pid:int, session: Session = Depends(db_session)):
+def get_player(pid:int, session: Session = Depends(db_read_session)):
     service = PlayerService()
     player = service.read(session=session,oid=pid)
 
@@ -33,7 +33,7 @@ def get_player(pid:int, session: Session = Depends(db_session)):
     return player
 
 @player_router.post('/search', response_model=list[PublicPlayer])
-def search_player(dto: PlayerFilter, session: Session = Depends(db_session)):
+def search_player(dto: PlayerFilter, session: Session = Depends(db_read_session)):
     service = PlayerService()
     players = service.search(session=session, filterby=dto.model_dump(exclude_none=True))
     return players
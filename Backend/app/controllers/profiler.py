@@ -0,0 +1,60 @@
+import secrets
+import threading
+from enum import Enum
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.profiler import SamplingProfiler
+from app.settings import settings
+from app.watchdog import WATCHDOG
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+profiler_router = APIRouter()
+
+PROFILE_LOCK = threading.Lock()
+
+
+class ProfileFormat(str, Enum):
+    COLLAPSED = "collapsed"
+    SPEEDSCOPE = "speedscope"
+
+
+def check_admin_token(token: str):
+    if not settings.ADMIN_TOKEN or not secrets.compare_digest(token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Token de administrador invalido")
+
+
+@profiler_router.get("/api/admin/profile")
+async def profile(token: str, seconds: float = Query(10, gt=0, le=60), rate: int = Query(100, ge=1, le=1000),
+                  stall_ms: float = Query(100, gt=0), format: ProfileFormat = ProfileFormat.SPEEDSCOPE):
+    """ Perfila el event loop durante `seconds` y devuelve los stacks muestreados y los bloqueos de mas de `stall_ms` """
+    check_admin_token(token)
+
+    if not PROFILE_LOCK.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="Ya hay un perfilado en curso")
+
+    try:
+        # El endpoint es async, asi que corre en el thread del event loop que se quiere muestrear
+        result = await SamplingProfiler(threading.get_ident(), rate=rate, stall_ms=stall_ms).run(seconds)
+    finally:
+        PROFILE_LOCK.release()
+
+    for stall in result.stalls:
+        _logger.warning(f"Event loop bloqueado {stall['duration_ms']}ms en {stall['call_site']}")
+
+    headers = {"X-Stalls": str(len(result.stalls))}
+    if format == ProfileFormat.COLLAPSED:
+        stalls = "".join(f"# stall {s['duration_ms']}ms {s['call_site']}\n" for s in result.stalls)
+        return PlainTextResponse(stalls + result.collapsed(), headers=headers)
+    return JSONResponse({**result.speedscope(), "stalls": result.stalls}, headers=headers)
+
+
+@profiler_router.get("/api/admin/stalls")
+async def stalls(token: str):
+    """ Bloqueos del event loop detectados por el watchdog desde el arranque, agrupados por punto de llamada """
+    check_admin_token(token)
+    return WATCHDOG.summary()
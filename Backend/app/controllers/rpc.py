@@ -0,0 +1,115 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy.orm.exc import StaleDataError
+from sqlmodel import Session
+
+from app.controllers.card import play_card, PlayCardDTO, update_cards, UpdateCardsDTO, update_card, UpdateCardDTO, \
+    cancel_action, CancelActionDTO
+from app.controllers.detective_set import create_detective_set, CreateDetectiveSetDTO
+from app.controllers.game import update_game, UpdateGameDTO
+from app.database.concurrency import CONFLICT_DETAIL, GAME_VERSION_CONFLICTS
+from app.database.engine import db_session
+from app.database.instrumentation import track_queries
+from app.database.pool import PoolTimeoutError
+from app.models.card import PublicCard
+from app.models.detective_set import PublicDetectiveSet
+from app.models.game import PublicGame
+from app.models.player import Player
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class RpcRequest(BaseModel):
+    """ Pedido de accion enviado por un jugador sobre su websocket """
+    rpc: str
+    id: Optional[Union[int, str]] = None
+    params: Dict[str, Any] = {}
+
+
+class RpcResponse(BaseModel):
+    """ Respuesta a un RpcRequest, solo se envia al websocket que hizo el pedido """
+    model: str = "rpc"
+    action: str = "response"
+    id: Optional[Union[int, str]] = None
+    status: int
+    data: Any = None
+    detail: Optional[str] = None
+
+
+def _dump(model, obj):
+    adapter = TypeAdapter(model)
+    return adapter.dump_python(adapter.validate_python(obj, from_attributes=True), mode="json")
+
+
+# Cada handler recibe el jugador autenticado de la conexion, asi que el token nunca viaja en params
+async def _play_card(player: Player, session: Session, params: dict):
+    return await play_card(cid=params["cid"], dto=PlayCardDTO(**params), token=player.token, session=session)
+
+async def _update_cards(player: Player, session: Session, params: dict):
+    dto = UpdateCardsDTO(turn_discarded=params.get("turn_discarded"), token=player.token)
+    cards = await update_cards(cids=params["cids"], dto=dto, session=session)
+    return _dump(List[PublicCard], cards)
+
+async def _update_card(player: Player, session: Session, params: dict):
+    dto = UpdateCardDTO(owner=player.id, token=player.token)
+    card = await update_card(cid=params["cid"], dto=dto, session=session)
+    return _dump(PublicCard, card)
+
+async def _cancel_action(player: Player, session: Session, params: dict):
+    dto = CancelActionDTO(not_so_fast=params["not_so_fast"], token=player.token)
+    return await cancel_action(oid=params["oid"], dto=dto, session=session)
+
+async def _create_detective_set(player: Player, session: Session, params: dict):
+    dto = CreateDetectiveSetDTO(detectives=params["detectives"])
+    detective_set = await create_detective_set(dto=dto, token=player.token, session=session)
+    return _dump(PublicDetectiveSet, detective_set)
+
+async def _update_game(player: Player, session: Session, params: dict):
+    dto = UpdateGameDTO(status=params.get("status"), current_turn=params.get("current_turn"), token=player.token)
+    game = await update_game(gid=player.game_id, dto=dto, session=session)
+    return _dump(PublicGame, game)
+
+
+RPC_METHODS: Dict[str, Callable[[Player, Session, dict], Awaitable[Any]]] = {
+    "play_card": _play_card,
+    "update_cards": _update_cards,
+    "update_card": _update_card,
+    "cancel_action": _cancel_action,
+    "create_detective_set": _create_detective_set,
+    "update_game": _update_game,
+}
+
+
+async def dispatch_rpc(player: Player, request: RpcRequest) -> RpcResponse:
+    method = RPC_METHODS.get(request.rpc)
+    if not method:
+        return RpcResponse(id=request.id, status=404, detail=f"No existe la accion '{request.rpc}'")
+
+    session_generator = db_session()
+    with track_queries() as stats:
+        try:
+            # Como en los endpoints, la espera por una conexion del pool se hace fuera del event loop
+            session = await run_in_threadpool(next, session_generator)
+            data = await method(player, session, request.params)
+            return RpcResponse(id=request.id, status=200, data=data)
+        except HTTPException as e:
+            return RpcResponse(id=request.id, status=e.status_code, detail=e.detail)
+        except (KeyError, ValidationError) as e:
+            return RpcResponse(id=request.id, status=422, detail=f"Parametros invalidos: {e}")
+        except PoolTimeoutError:
+            return RpcResponse(id=request.id, status=503, detail="Servidor ocupado, reintentar en unos segundos")
+        except StaleDataError:
+            GAME_VERSION_CONFLICTS.inc("rejected")
+            return RpcResponse(id=request.id, status=409, detail=CONFLICT_DETAIL)
+        except Exception as e:
+            _logger.exception(f"Error ejecutando rpc '{request.rpc}' del jugador {player.id}: {e}")
+            return RpcResponse(id=request.id, status=500, detail="Error interno")
+        finally:
+            session_generator.close()
+            _logger.info(f"RPC {request.rpc} {stats!r}",
+                         extra={"db_queries": stats.queries, "db_time": stats.db_time, "db_commits": stats.commits})
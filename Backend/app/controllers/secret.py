@@ -4,7 +4,7 @@ from sqlmodel import Session
 from pydantic import BaseModel
 
 from app.controllers.utils import reveal_secret
-from app.database.engine import db_session
+from app.database.engine import db_session, db_read_session
 from app.models.game import GameStatus
 from app.models.secret import Secret
 from app.services.game import GameService
@@ -17,7 +17,7 @@ class UpdateSecretDTO(BaseModel):
     revealed: Optional[bool] = None
 
 @secret_router.get("/{sid}", response_model=Secret)
-def get_secret(sid: int, session: Session = Depends(db_session)):
+def get_secret(sid: int, session: Session = Depends(db_read_session)):
     service = SecretService()
     secret = service.read(session=session, oid=sid)
 
@@ -48,7 +48,7 @@ async def update_secret(sid: int, token: str, dto: UpdateSecretDTO, session: Ses
     return secret_updated
 
 @secret_router.post("/search", response_model=List[Secret])
-def search_secret(dto: SecretFilter, session:Session = Depends(db_session)):
+def search_secret(dto: SecretFilter, session:Session = Depends(db_read_session)):
     service = SecretService()
     secret = service.search(session=session, filterby=dto.model_dump(exclude_none=True))
     return secret
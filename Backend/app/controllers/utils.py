@@ -1,10 +1,21 @@
 from enum import Enum
+from typing import List, Optional
 
+from sqlmodel import Session
+
+from app.models.card import Card
+from app.models.detective_set import DetectiveSet
+from app.models.event_table import EventTable
 from app.models.game import GameStatus
+from app.models.player import Player
 from app.models.secret import Secret, SecretType
+from app.services.card import CardService
+from app.services.detective_set import DetectiveSetService
+from app.services.event_table import EventTableService
 from app.services.game import GameService
 from app.services.player import PlayerService
 from app.services.secret import SecretService
+from app.services.secret_tally import culprits_cornered, hidden_secrets
 
 
 async def reveal_secret(session, secret: Secret):
@@ -18,18 +29,26 @@ async def reveal_secret(session, secret: Secret):
                                                                       "player_in_action": None})
         return "game_finalized"
 
-    secrets_left = secret_service.search(session=session,
-                                         filterby={"owner__eq": secret.owner, "revealed__eq": False})
+    game = game_service.read(session=session, oid=secret.game_id)
+    if game and game.secret_tally is not None:
+        # El conteo ya incluye este secreto revelado (se guardo en el mismo commit)
+        disgraced = not hidden_secrets(game.secret_tally, secret.owner)
+        cornered = culprits_cornered(game.secret_tally)
+    else:
+        secrets_left = secret_service.search(session=session,
+                                             filterby={"owner__eq": secret.owner, "revealed__eq": False})
+        disgraced = not secrets_left
 
-    if not secrets_left:
-        await player_service.update(session=session, oid=secret.owner, data={"social_disgrace": True})
+        game_hidden_secrets = secret_service.search(session=session,filterby={"game_id__eq": secret.game_id, "revealed__eq": False})
 
-    game_hidden_secrets = secret_service.search(session=session,filterby={"game_id__eq": secret.game_id, "revealed__eq": False})
+        murder_accomplice = {s.owner for s in game_hidden_secrets if
+                             s.type == SecretType.MURDERER or s.type == SecretType.ACCOMPLICE}
+        cornered = all(s.owner in murder_accomplice for s in game_hidden_secrets)
 
-    murder_accomplice = {s.owner for s in game_hidden_secrets if
-                         s.type == SecretType.MURDERER or s.type == SecretType.ACCOMPLICE}
+    if disgraced:
+        await player_service.update(session=session, oid=secret.owner, data={"social_disgrace": True})
 
-    if all(s.owner in murder_accomplice for s in game_hidden_secrets):
+    if cornered:
 
         await game_service.update(session=session, oid=secret.game_id,data={"status": GameStatus.FINALIZED, "player_in_action": None})
 
@@ -37,6 +56,31 @@ async def reveal_secret(session, secret: Secret):
 
     return "effect_applied"
 
+# Fila de la que sale la partida de cada comando, para serializarlo en su actor. `serialized` la mantiene viva
+# durante el request, asi el comando la reusa desde la sesion sin otra consulta
+async def load_card(cid: int, session: Session, **kwargs) -> Optional[Card]:
+    return CardService().read(session, cid)
+
+
+async def load_first_card(cids: List[int], session: Session, **kwargs) -> Optional[Card]:
+    return CardService().read(session, cids[0]) if cids else None
+
+
+async def load_event(oid: int, session: Session, **kwargs) -> Optional[EventTable]:
+    return EventTableService().read(session, oid)
+
+
+async def load_set(sid: int, session: Session, **kwargs) -> Optional[DetectiveSet]:
+    return await DetectiveSetService().read(session, sid)
+
+
+async def load_token_player(token: str, session: Session, **kwargs) -> Optional[Player]:
+    return await PlayerService().read_by_token(session, token)
+
+
+async def game_of_path(gid: int, **kwargs) -> int:
+    return gid
+
 class PlayerOrders(Enum):
     CLOCKWISE = "clockwise"
     COUNTER_CLOCKWISE = "counter-clockwise"
\ No newline at end of file
@@ -1,11 +1,15 @@
-from typing import Dict, List, Optional
+import asyncio
+from typing import Dict, List, Optional, Set
 
 from fastapi import APIRouter, WebSocket, Depends
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
 from sqlmodel import Session
 import json
 
 from starlette.websockets import WebSocketDisconnect
 
+from app.controllers.rpc import RpcRequest, RpcResponse, dispatch_rpc
 from app.database.engine import db_session
 from app.models.websocket import WebsocketMessage, GAME_CONNECTIONS, LOBBY_CONNECTIONS
 from app.services.player import PlayerService
@@ -15,36 +19,69 @@ ws_router = APIRouter(prefix="/ws")
 import logging
 _logger = logging.getLogger(__name__)
 
+# Referencias a los rpc en curso para que el event loop no los descarte antes de terminar
+RPC_TASKS: Set[asyncio.Task] = set()
+
+
+async def answer_rpc(connection: WebSocket, player, payload: dict):
+    try:
+        request = RpcRequest.model_validate(payload)
+    except ValidationError as e:
+        # Pedido mal armado (sin `rpc`, `params` que no es un objeto...): se contesta como parametros invalidos
+        rid = payload.get("id")
+        response = RpcResponse(id=rid if isinstance(rid, (int, str)) else None, status=422,
+                               detail=f"Pedido invalido: {e}")
+    else:
+        response = await dispatch_rpc(player, request)
+    try:
+        await connection.send_text(response.model_dump_json())
+    except Exception as e:
+        _logger.warning(f"Error respondiendo rpc '{payload.get('rpc')}' a user {player.id}: {e}")
+
 
 @ws_router.websocket("/monolithic")
 async def websocket(connection: WebSocket, token: Optional[str] = None):
     await connection.accept()
     if token: # TODO: No deberia tener comportamiento condicional
-        session: Session = next(db_session())
+        session_generator = db_session()
+        session: Session = await run_in_threadpool(next, session_generator)
         player = await PlayerService().read_by_token(session=session, token=token)
+        # Se cierra el generador y no solo la sesion, para devolver la conexion al pool
+        session_generator.close()
         if player is not None:
             if player.game_id not in GAME_CONNECTIONS:
                 GAME_CONNECTIONS[player.game_id] = {}
             GAME_CONNECTIONS[player.game_id][player.id] = connection
-            session.close()
             while True:
                 try:
                     data = await connection.receive_text()
-                    parsed_message = WebsocketMessage(**json.loads(data))
+                    payload = json.loads(data)
+                    if isinstance(payload, dict) and "rpc" in payload:
+                        # Se ejecuta aparte para seguir recibiendo (ej: un NOT SO FAST mientras corre el timer)
+                        task = asyncio.create_task(answer_rpc(connection, player, payload))
+                        RPC_TASKS.add(task)
+                        task.add_done_callback(RPC_TASKS.discard)
+                        continue
+                    parsed_message = WebsocketMessage(**payload)
                     if parsed_message.dest_game:
                         if parsed_message.dest_game in GAME_CONNECTIONS:
                             users: Dict[int, WebSocket] = GAME_CONNECTIONS[parsed_message.dest_game]
                             for k, v in users.items():
                                 await v.send_text(parsed_message.model_dump_json())
                 except WebSocketDisconnect:
-                    del GAME_CONNECTIONS[player.game_id][player.id]
+                    GAME_CONNECTIONS[player.game_id].pop(player.id, None)
                     break
                 except Exception as e:
+                    # Se cierra igual que una desconexion: si no, la partida queda con una conexion muerta
                     _logger.warning(f"Error en websocket: {e}")
+                    GAME_CONNECTIONS[player.game_id].pop(player.id, None)
+                    try:
+                        await connection.close()
+                    except Exception:
+                        pass
                     break
         else:
             await connection.close()
-            session.close()
     else: # Aca tenemos conexiones generales, sin Jugador
         LOBBY_CONNECTIONS.append(connection)
         while True:
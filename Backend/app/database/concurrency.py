@@ -0,0 +1,22 @@
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.metrics import REGISTRY, Counter
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+CONFLICT_DETAIL = "La partida cambio mientras se procesaba el pedido, volver a intentar"
+
+GAME_VERSION_CONFLICTS = REGISTRY.register(Counter(
+    "game_version_conflicts_total", "UPDATEs de partidas que encontraron otra version (rejected: 409)",
+    ("outcome",)))
+
+
+async def stale_data_handler(request: Request, exc: StaleDataError):
+    """ Otro request cambio la partida entre la lectura y el UPDATE: no se aplica nada y se responde 409 """
+    _logger.info(f"Conflicto de version en {request.method} {request.url.path}: {exc}")
+    GAME_VERSION_CONFLICTS.inc("rejected")
+    return JSONResponse(status_code=409, content={"detail": CONFLICT_DETAIL})
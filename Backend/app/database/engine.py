@@ -1,9 +1,79 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
 from sqlmodel import Session
+from app.database.instrumentation import instrument_engine
+from app.database.pool import InstrumentedQueuePool
 from app.settings import settings
 
-db_engine = create_engine(url=settings.db_url, max_overflow=0, pool_size=30)
+# WAL deja leer mientras otra conexion escribe; con synchronous=NORMAL solo se sincroniza el disco en los checkpoints
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "foreign_keys=ON",
+    "temp_store=MEMORY",
+    "cache_size=-16000",
+)
 
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+
+def _pool_args() -> dict:
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def create_db_engine(url: str) -> Engine:
+    if not url.startswith("sqlite"):
+        return create_engine(url=url, query_cache_size=settings.DB_QUERY_CACHE_SIZE, **_pool_args())
+
+    # Los endpoints sincronicos usan la conexion desde el threadpool; timeout es cuanto espera un escritor el lock
+    connect_args = {"check_same_thread": False, "timeout": 15}
+    if url == "sqlite://":
+        # En memoria la base vive en la conexion, asi que todas las sesiones tienen que compartir la misma
+        engine = create_engine(url, connect_args=connect_args, poolclass=StaticPool,
+                               query_cache_size=settings.DB_QUERY_CACHE_SIZE)
+    else:
+        engine = create_engine(url, connect_args=connect_args, query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+                               **_pool_args())
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+class ReadOnlySession(Session):
+    """ Sesion de las rutas de consulta: falla si se intenta escribir, para que nada termine en la replica """
+
+    def flush(self, objects=None):
+        if self.new or self.dirty or self.deleted:
+            raise RuntimeError("No se puede escribir desde una sesion de solo lectura")
+        super().flush(objects)
+
+
+db_engine = create_db_engine(settings.db_url)
+instrument_engine(db_engine)
+
+db_replica_engine = create_db_engine(settings.db_replica_url) if settings.db_replica_url else db_engine
+instrument_engine(db_replica_engine)
+
+# La conexion se pide al pool al abrir la sesion y no en la primera consulta: FastAPI corre las dependencias
+# sincronicas en el threadpool, asi que esperar por el pool (hasta DB_POOL_TIMEOUT) no frena el event loop aunque el
+# endpoint sea async. La sesion usa esa conexion todo el request, tambien despues de cada commit
 def db_session():
-    with Session(db_engine) as session:
-            yield session
\ No newline at end of file
+    with db_engine.connect() as connection, Session(connection) as session:
+            yield session
+
+def db_read_session():
+    """ Sesion para busquedas y GETs: usa la replica si esta configurada, puede estar un poco atrasada """
+    with db_replica_engine.connect() as connection, ReadOnlySession(connection) as session:
+            yield session
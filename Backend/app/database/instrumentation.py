@@ -0,0 +1,116 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.tracing import record_query
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """ Sentencias, tiempo en la base de datos y commits de un request """
+    __slots__ = ("queries", "db_time", "commits")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.commits = 0
+
+    def headers(self) -> list:
+        return [
+            (b"x-db-queries", str(self.queries).encode()),
+            (b"x-db-time-ms", f"{self.db_time * 1000:.1f}".encode()),
+            (b"x-db-commits", str(self.commits).encode()),
+        ]
+
+    def __repr__(self):
+        return f"db_queries={self.queries} db_time_ms={self.db_time * 1000:.1f} db_commits={self.commits}"
+
+
+QUERY_STATS: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    stats = QUERY_STATS.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+    record_query(elapsed)
+
+
+def _commit(conn):
+    stats = QUERY_STATS.get()
+    if stats is not None:
+        stats.commits += 1
+
+
+def instrument_engine(engine: Engine):
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "commit", _commit)
+
+
+def uninstrument_engine(engine: Engine):
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+    event.remove(engine, "after_cursor_execute", _after_cursor_execute)
+    event.remove(engine, "commit", _commit)
+
+
+@contextmanager
+def track_queries():
+    """ Cuenta las sentencias ejecutadas dentro del bloque (incluye el threadpool de endpoints sincronicos) """
+    stats = QueryStats()
+    reset_token = QUERY_STATS.set(stats)
+    try:
+        yield stats
+    finally:
+        QUERY_STATS.reset(reset_token)
+
+
+@contextmanager
+def query_budget(max_queries: int, engine: Optional[Engine] = None, max_commits: Optional[int] = None):
+    """ Helper de tests: falla si el bloque ejecuta mas sentencias (o commits) que el presupuesto """
+    if engine is not None:
+        instrument_engine(engine)
+    with track_queries() as stats:
+        yield stats
+    assert stats.queries <= max_queries, f"Se esperaban como maximo {max_queries} sentencias, se ejecutaron {stats.queries}"
+    if max_commits is not None:
+        assert stats.commits <= max_commits, f"Se esperaban como maximo {max_commits} commits, se ejecutaron {stats.commits}"
+
+
+class QueryStatsMiddleware:
+    """ Expone las estadisticas de base de datos de cada request HTTP en headers X-DB-* y en el log """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        with track_queries() as stats:
+            async def send_with_stats(message):
+                if message["type"] == "http.response.start":
+                    message.setdefault("headers", [])
+                    message["headers"] = [*message["headers"], *stats.headers()]
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
+            _logger.info(f"{scope['method']} {scope['path']} {stats!r}",
+                         extra={"db_queries": stats.queries, "db_time": stats.db_time, "db_commits": stats.commits})
@@ -0,0 +1,47 @@
+import threading
+import time
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app.metrics import REGISTRY, Counter, Histogram
+from app.settings import settings
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+DB_POOL_WAIT = REGISTRY.register(Histogram(
+    "db_pool_wait_seconds", "Espera para obtener una conexion del pool",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)))
+DB_POOL_CHECKOUTS = REGISTRY.register(Counter(
+    "db_pool_checkouts_total", "Conexiones entregadas por el pool"))
+DB_POOL_TIMEOUTS = REGISTRY.register(Counter(
+    "db_pool_timeouts_total", "Pedidos de conexion que superaron el tiempo de espera del pool"))
+
+
+class InstrumentedQueuePool(QueuePool):
+    """ QueuePool que mide cuanto se espera por cada conexion (se llama desde el event loop y desde el threadpool) """
+    _metrics_lock = threading.Lock()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            with self._metrics_lock:
+                DB_POOL_TIMEOUTS.inc()
+            raise
+        with self._metrics_lock:
+            DB_POOL_WAIT.observe(time.perf_counter() - start)
+            DB_POOL_CHECKOUTS.inc()
+        return connection
+
+
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    """ Pool agotado: se responde enseguida con 503 para que el cliente reintente en vez de encolar mas requests """
+    _logger.warning(f"Pool de conexiones agotado en {request.method} {request.url.path}")
+    return JSONResponse(status_code=503, content={"detail": "Servidor ocupado, reintentar en unos segundos"},
+                        headers={"Retry-After": str(settings.DB_POOL_RETRY_AFTER)})
@@ -0,0 +1,13 @@
+from app.engine.state import (DETECTIVES_CHOOSE_PLAYERS, EngineCard, EnginePlayer, EngineSecret, EngineSet, GameState,
+                              RuleError, Trade, Window)
+from app.engine.setup import deal_cards, deal_secrets, new_game
+from app.engine.rules import (cancel_action, close_window, create_set, discard, end_turn, extend_set, play_card,
+                              set_action, take_draft)
+
+__all__ = [
+    "DETECTIVES_CHOOSE_PLAYERS", "EngineCard", "EnginePlayer", "EngineSecret", "EngineSet", "GameState", "RuleError",
+    "Trade", "Window",
+    "deal_cards", "deal_secrets", "new_game",
+    "cancel_action", "close_window", "create_set", "discard", "end_turn", "extend_set", "play_card", "set_action",
+    "take_draft",
+]
@@ -0,0 +1,474 @@
+from typing import Callable, Dict, List, Optional, Sequence
+
+from app.engine.state import EngineCard, GameState, RuleError, Trade, Window
+from app.models.card import CardState, CardType
+from app.models.game import GameStatus
+
+# Efectos de las cartas sobre el estado en memoria. Cada uno sigue las fases de su archivo en
+# `app/controllers/card_effects`: la primera llamada pone la carta en juego (y abre la ventana de NOT SO FAST) y las
+# siguientes reciben los objetivos. Lo que pasa al cerrar la ventana esta en el `resolve_*` de la carta
+
+NOT_SO_FAST = "not-so-fast"
+EARLY_TRAIN = "early-train-to-paddington"
+CARD_TRADE = "card-trade"
+DEAD_CARD_FOLLY = "dead-card-folly"
+BLACKMAILED = "blackmailed"
+SOCIAL_FAUX_PAS = "social-faux-pas"
+
+
+def _discard_and_finish(state: GameState, card: EngineCard):
+    state.discard(card)
+    state.finish_turn()
+
+
+def _undealt(state: GameState) -> List[EngineCard]:
+    """ Cartas sin dueño fuera del descarte, la de arriba primero (el filtro de EARLY TRAIN no mira el estado) """
+    return sorted((c for c in state.cards.values() if c.owner is None and c.discarded_order is None),
+                  key=lambda c: c.pile_order, reverse=True)
+
+
+def _resolve_discard_on_cancel(state: GameState, card: EngineCard, window: Window):
+    """ Cancelada se descarta y termina el turno; si no, la carta espera sus objetivos en `next_status` """
+    if window.canceled:
+        _discard_and_finish(state, card)
+        return
+    state.status = NEXT_STATUS[card.name]
+    state.player_in_action = card.owner
+
+
+def early_train_to_paddington(state: GameState, card: EngineCard, issuer: int, in_discard: bool = False,
+                              pending: Sequence[int] = (), **kwargs):
+    card.turn_played = state.current_turn
+    state.open_window(card.name, card_id=card.id, in_discard=in_discard, pending=list(pending))
+
+
+def resolve_early_train_to_paddington(state: GameState, card: EngineCard, window: Window):
+    if window.canceled:
+        del state.cards[card.id]
+        if not window.in_discard:
+            state.finish_turn()
+        return
+
+    # Las 3 primeras son del draft, y traemos una mas para ver si se acabo el mazo
+    cards_to_update = _undealt(state)[3:10]
+    new_discarded_order = state.new_discarded_order()
+    for i, c in enumerate(cards_to_update[:6]):
+        c.owner = None
+        c.turn_discarded = -1
+        c.discarded_order = new_discarded_order + i
+    del state.cards[card.id]
+
+    if len(cards_to_update) < 7:
+        state.finish("early_train_exhausted")
+    elif not window.in_discard:
+        state.finish_turn()
+
+
+def cards_off_the_table(state: GameState, card: EngineCard, issuer: int, target_players: Sequence[int] = (), **kwargs):
+    if card.turn_played is None and state.status == GameStatus.TURN_START:
+        card.turn_played = state.current_turn
+        state.status = GameStatus.WAITING_FOR_CHOOSE_PLAYER
+        state.player_in_action = card.owner
+
+    elif card.turn_played is not None and state.status == GameStatus.WAITING_FOR_CHOOSE_PLAYER:
+        if len(target_players) != 1:
+            raise RuleError(400, "Cantidad erronea de jugadores objetivos")
+        if card.turn_played != state.current_turn:
+            raise RuleError(400, "No se puede relanzar una carta jugada")
+        if target_players[0] not in state.players:
+            raise RuleError(404, "Jugador objetivo no existente")
+
+        new_discarded_order = state.new_discarded_order()
+        cards_to_discard = [c for c in state.cards.values() if c.owner == target_players[0] and c.name == NOT_SO_FAST]
+        for i, c in enumerate(cards_to_discard):
+            state.discard(c, new_discarded_order + i)
+        _discard_and_finish(state, card)
+    else:
+        raise RuleError(400, "Ya no se puede jugar eventos")
+
+
+def look_into_the_ashes(state: GameState, card: EngineCard, issuer: int, target_cards: Sequence[int] = (), **kwargs):
+    last_five_discarded = state.discard_pile()[:5]
+    if not last_five_discarded:
+        raise RuleError(412, "No hay cartas en la pila de descarte, no se puede jugar")
+
+    if card.turn_played is None and state.status == GameStatus.TURN_START:
+        card.turn_played = state.current_turn
+        state.open_window(card.name, card_id=card.id)
+
+    elif card.turn_played is not None and state.status == GameStatus.WAITING_FOR_CHOOSE_DISCARDED:
+        if len(target_cards) != 1:
+            raise RuleError(400, "Cantidad erronea de cartas objetivos")
+        if card.turn_played != state.current_turn:
+            raise RuleError(400, "No se puede relanzar una carta jugada")
+        if target_cards[0] not in state.cards:
+            raise RuleError(404, "Carta objetivo no existente")
+
+        target_card = state.cards[target_cards[0]]
+        if target_card not in last_five_discarded:
+            raise RuleError(400, "Solo se puede agarrar una de las 5 ultimas descartadas")
+
+        target_card.turn_discarded = None
+        target_card.turn_played = None
+        target_card.discarded_order = None
+        target_card.owner = card.owner
+        target_card.state = CardState.AVAILABLE
+        _discard_and_finish(state, card)
+    else:
+        raise RuleError(400, "Ya no se puede jugar eventos")
+
+
+def and_then_there_was_one_more(state: GameState, card: EngineCard, issuer: int, target_players: Sequence[int] = (),
+                                target_secrets: Sequence[int] = (), **kwargs):
+    if card.turn_played is None and state.status == GameStatus.TURN_START:
+        card.turn_played = state.current_turn
+        if not any(s.revealed for s in state.secrets.values()):
+            _discard_and_finish(state, card)
+            return
+        state.open_window(card.name, card_id=card.id)
+
+    elif card.turn_played is not None and state.status == GameStatus.WAITING_FOR_CHOOSE_PLAYER_AND_SECRET:
+        if not target_secrets:
+            raise RuleError(400, "Se debe mandar un secreto a revelar")
+        if not target_players:
+            raise RuleError(400, "Se debe mandar un jugador objetivo")
+        if target_secrets[0] not in state.secrets:
+            raise RuleError(404, "Secreto no existente")
+        if target_players[0] not in state.players:
+            raise RuleError(404, "Jugador objetivo no existente")
+
+        secret = state.secrets[target_secrets[0]]
+        if not secret.revealed:
+            raise RuleError(400, "No se puede robar un secreto oculto")
+
+        secret.owner = target_players[0]
+        secret.revealed = False
+        state.players[target_players[0]].social_disgrace = False
+        _discard_and_finish(state, card)
+    else:
+        raise RuleError(400, "Ya no se puede jugar eventos")
+
+
+def another_victim(state: GameState, card: EngineCard, issuer: int, target_sets: Sequence[int] = (), **kwargs):
+    if card.turn_played is None and state.status == GameStatus.TURN_START:
+        if not any(s.owner != card.owner for s in state.sets.values()):
+            _discard_and_finish(state, card)
+            return
+        card.turn_played = state.current_turn
+        state.open_window(card.name, card_id=card.id)
+
+    elif card.turn_played is not None and state.status == GameStatus.WAITING_FOR_CHOOSE_SET:
+        if not target_sets:
+            raise RuleError(400, "No fue seleccionado el set a robar")
+        if target_sets[0] not in state.sets:
+            raise RuleError(404, "No se encontro el set a robar")
+
+        stolen_set = state.sets[target_sets[0]]
+        if stolen_set.owner == card.owner:
+            raise RuleError(400, "No se puede robar un set propio")
+
+        stolen_set.owner = card.owner
+        stolen_set.turn_played = state.current_turn
+        state.status = state.next_set_status(stolen_set)
+        state.player_in_action = card.owner
+        state.discard(card)
+    else:
+        raise RuleError(400, "Ya no se puede jugar eventos")
+
+
+def ariadne_oliver(state: GameState, card: EngineCard, issuer: int, target_sets: Sequence[int] = (), **kwargs):
+    if card.turn_played is None and state.status == GameStatus.TURN_START:
+        if not any(s.owner != card.owner for s in state.sets.values()):
+            raise RuleError(400, "No se puede jugar el set Ariadne Oliver: No hay sets para agregarse")
+        card.turn_played = state.current_turn
+        state.open_window(card.name, card_id=card.id)
+
+    elif card.turn_played is not None and state.status == GameStatus.WAITING_FOR_CHOOSE_SET:
+        if not target_sets:
+            raise RuleError(400, "No fue seleccionado el set a robar")
+        if target_sets[0] not in state.sets:
+            raise RuleError(404, "No se encontro el set a robar")
+
+        detective_set = state.sets[target_sets[0]]
+        detective_set.turn_played = state.current_turn
+        detective_set.detectives.append(card.id)
+        card.set_id = detective_set.id
+        state.status = GameStatus.WAITING_FOR_CHOOSE_SECRET
+        state.player_in_action = detective_set.owner
+    else:
+        raise RuleError(400, "No se puede bajar el set Ariadne Oliver")
+
+
+def delay_the_murderers_escape(state: GameState, card: EngineCard, issuer: int, target_cards: Sequence[int] = (), **kwargs):
+    if state.status == GameStatus.TURN_START:
+        card.turn_played = state.current_turn
+        state.open_window(card.name, card_id=card.id)
+
+    elif state.status == GameStatus.WAITING_FOR_ORDER_DISCARD:
+        if not target_cards:
+            raise RuleError(412, "Se deben seleccionar cartas")
+
+        cards = state.deck()
+        draft = cards[0:3]
+        not_draft = cards[3:]
+
+        last_5 = state.discard_pile()[0:5]
+        last_5.sort(key=lambda c: target_cards.index(c.id) if c.id in target_cards else len(target_cards))
+        for c in last_5:
+            c.discarded_order = None
+            c.turn_discarded = None
+            c.turn_played = None
+            c.owner = None
+            c.state = CardState.AVAILABLE
+
+        # Mismo reacomodo que el endpoint: el draft queda arriba y el resto del mazo se numera en el orden leido
+        not_draft.extend(last_5)
+        for i, c in enumerate(reversed(draft)):
+            c.pile_order = len(not_draft) + i
+        for i, c in enumerate(not_draft):
+            c.pile_order = i
+
+        del state.cards[card.id]
+        state.status = GameStatus.FINALIZE_TURN
+
+
+def resolve_delay_the_murderers_escape(state: GameState, card: EngineCard, window: Window):
+    if window.canceled:
+        del state.cards[card.id]
+        state.finish_turn()
+        return
+    state.status = GameStatus.WAITING_FOR_ORDER_DISCARD
+    state.player_in_action = card.owner
+
+
+def point_your_suspicions(state: GameState, card: EngineCard, issuer: int, target_players: Sequence[int] = (),
+                          target_secrets: Sequence[int] = (), **kwargs):
+    if state.status == GameStatus.TURN_START:
+        card.turn_played = state.current_turn
+        state.open_window(card.name, card_id=card.id)
+
+    elif state.status == GameStatus.WAITING_FOR_CHOOSE_PLAYER:
+        if not target_players:
+            raise RuleError(400, "Debes señalar a un jugador")
+        if target_players[0] not in state.players:
+            raise RuleError(400, "El jugador señalado no está en la partida")
+
+        state.votes.append((issuer, target_players[0]))
+        if len(state.votes) < len(state.players):
+            return
+
+        vote_count: Dict[int, int] = {}
+        for _, voted in state.votes:
+            vote_count[voted] = vote_count.get(voted, 0) + 1
+        max_votes = max(vote_count.values())
+        most_voted_players = [pid for pid, count in vote_count.items() if count == max_votes]
+
+        # Empate: desempata quien jugo la carta con un voto mas
+        if len(most_voted_players) > 1:
+            state.player_in_action = card.owner
+        else:
+            state.player_in_action = most_voted_players[0]
+            state.status = GameStatus.WAITING_FOR_CHOOSE_SECRET
+
+    elif state.status == GameStatus.WAITING_FOR_CHOOSE_SECRET:
+        if not target_secrets:
+            raise RuleError(400, "Debes señalar un secreto")
+
+        secret = state.secrets.get(target_secrets[0])
+        if secret is None or secret.owner != state.player_in_action:
+            raise RuleError(400, "El secreto señalado no pertenece al jugador en acción")
+        if secret.revealed:
+            raise RuleError(400, "El secreto señalado ya fue revelado")
+        if state.reveal(secret) == "effect_applied":
+            _discard_and_finish(state, card)
+
+
+def resolve_point_your_suspicions(state: GameState, card: EngineCard, window: Window):
+    if window.canceled:
+        _discard_and_finish(state, card)
+        return
+    state.status = GameStatus.WAITING_FOR_CHOOSE_PLAYER
+    state.player_in_action = None
+
+
+def card_trade(state: GameState, card: EngineCard, issuer: int, target_players: Sequence[int] = (),
+               target_cards: Sequence[int] = (), **kwargs):
+    if state.status == GameStatus.TURN_START:
+        card.turn_played = state.current_turn
+        state.open_window(card.name, card_id=card.id)
+
+    elif state.status == GameStatus.WAITING_FOR_CHOOSE_PLAYER:
+        if not target_players:
+            raise RuleError(400, "Debes señalar a un jugador")
+        if target_players[0] == card.owner:
+            raise RuleError(400, "No puedes señalarte a ti mismo")
+        state.player(target_players[0])
+
+        state.trades.append(Trade(kind=CARD_TRADE, player=card.owner, target_player=target_players[0]))
+        state.status = GameStatus.SELECT_CARD_TO_TRADE
+
+    elif state.status == GameStatus.SELECT_CARD_TO_TRADE:
+        if not target_cards:
+            raise RuleError(400, "Debes señalar una carta")
+        my_cards = [c.id for c in state.cards.values() if c.owner == issuer and c.turn_discarded is None]
+        if target_cards[0] not in my_cards:
+            raise RuleError(400, "La carta señalada no te pertenece")
+
+        target_card = state.cards[target_cards[0]]
+        chosen = next(t for t in state.trades if t.kind == CARD_TRADE and t.card is None)
+        state.trades.append(Trade(kind=CARD_TRADE, player=issuer, card=target_card.id,
+                                  target_player=chosen.target_player if issuer == chosen.player else chosen.player,
+                                  completed=target_card.card_type != CardType.DEVIOUS))
+
+        selected = [t for t in state.trades if t.kind == CARD_TRADE and t.card is not None]
+        if len(selected) >= 2:
+            card1, card2 = state.cards[selected[0].card], state.cards[selected[1].card]
+            card1.owner, card2.owner = card2.owner, card1.owner
+            state.discard(card)
+            card.turn_played = None
+            devious_detect(state)
+
+
+def dead_card_folly(state: GameState, card: EngineCard, issuer: int, target_cards: Sequence[int] = (),
+                    clockwise: Optional[bool] = None, **kwargs):
+    if state.status == GameStatus.TURN_START:
+        card.turn_played = state.current_turn
+        state.open_window(card.name, card_id=card.id)
+
+    elif state.status == GameStatus.WAITING_TO_CHOOSE_DIRECTION:
+        if clockwise is None:
+            raise RuleError(400, "Debes elegir un orden")
+        state.trade_clockwise = clockwise
+        state.status = GameStatus.SELECT_CARD_TO_TRADE
+        state.player_in_action = None
+
+    elif state.status == GameStatus.SELECT_CARD_TO_TRADE:
+        if not target_cards:
+            raise RuleError(400, "Debes elegir una carta")
+        target_card = state.cards.get(target_cards[0])
+        if not target_card or target_card.owner != issuer:
+            raise RuleError(400, "Carta no válida")
+
+        state.trades.append(Trade(kind=DEAD_CARD_FOLLY, player=issuer, card=target_card.id, completed=False,
+                                  target_player=state.neighbour(issuer, clockwise=state.trade_clockwise)))
+
+        # Las cartas pasan cuando eligieron todos, las devious se ponen en juego despues
+        folly_trades = [t for t in state.trades if t.kind == DEAD_CARD_FOLLY]
+        if len(folly_trades) >= len(state.seating):
+            for trade in folly_trades:
+                if trade.completed:
+                    continue
+                traded = state.cards[trade.card]
+                traded.owner = trade.target_player
+                trade.completed = traded.card_type != CardType.DEVIOUS
+            state.discard(card)
+            card.turn_played = None
+            devious_detect(state)
+
+
+def devious_detect(state: GameState):
+    """ Pone en juego la primera devious recibida en un intercambio del turno; sin ninguna el turno termina """
+    pending = [t for t in state.trades if not t.completed]
+    if not pending:
+        state.status = GameStatus.FINALIZE_TURN
+        return
+
+    trade = pending[0]
+    trade.completed = True
+    card = state.cards[trade.card]
+    card.turn_played = state.current_turn
+
+    if card.name == SOCIAL_FAUX_PAS:
+        state.open_window(card.name, card_id=card.id)
+    elif card.name == BLACKMAILED:
+        state.status = GameStatus.WAITING_FOR_CHOOSE_SECRET
+        state.player_in_action = trade.player
+
+
+def resolve_social_faux_pas(state: GameState, card: EngineCard, window: Window):
+    if window.canceled:
+        state.discard(card)
+        card.turn_played = None
+        state.finish_turn()
+        devious_detect(state)
+        return
+    state.status = GameStatus.WAITING_FOR_CHOOSE_SECRET
+    state.player_in_action = _devious_trade(state, card).target_player
+
+
+def _devious_trade(state: GameState, card: EngineCard) -> Trade:
+    """ Intercambio por el que llego la devious que esta en juego """
+    return next(t for t in state.trades if t.card == card.id and t.completed)
+
+
+def blackmailed(state: GameState, card: EngineCard, issuer: int, target_secrets: Sequence[int] = (), **kwargs):
+    """ Quien recibio la carta le muestra un secreto en privado a quien se la dio: no cambia el estado """
+    if card.turn_played != state.current_turn:
+        raise RuleError(400, "La devious no esta en juego")
+    if state.status != GameStatus.WAITING_FOR_CHOOSE_SECRET:
+        return
+
+    if not target_secrets:
+        raise RuleError(412, "Debes seleccionar secretos a revelar en privado")
+    trade = _devious_trade(state, card)
+    if state.player_in_action != trade.player:
+        raise RuleError(400, "Evento devious incorrecto")
+
+    state.discard(card)
+    card.turn_played = None
+    devious_detect(state)
+
+
+def social_faux_pas(state: GameState, card: EngineCard, issuer: int, target_secrets: Sequence[int] = (), **kwargs):
+    if card.turn_played != state.current_turn:
+        raise RuleError(400, "La devious no esta en juego")
+    if state.status != GameStatus.WAITING_FOR_CHOOSE_SECRET:
+        return
+
+    if not target_secrets:
+        raise RuleError(412, "Debes seleccionar secretos a revelar en privado")
+    trade = _devious_trade(state, card)
+    if state.player_in_action != trade.target_player:
+        raise RuleError(400, "Evento devious incorrecto")
+    if target_secrets[0] not in state.secrets:
+        raise RuleError(404, "Secreto no existente")
+
+    state.discard(card)
+    card.turn_played = None
+    if state.reveal(state.secrets[target_secrets[0]]) == "game_finalized":
+        return
+    devious_detect(state)
+
+
+# Estado al que pasa la partida cuando la ventana se cierra sin cancelar la carta
+NEXT_STATUS: Dict[str, GameStatus] = {
+    "look-into-the-ashes": GameStatus.WAITING_FOR_CHOOSE_DISCARDED,
+    "and-then-there-was-one-more": GameStatus.WAITING_FOR_CHOOSE_PLAYER_AND_SECRET,
+    "another-victim": GameStatus.WAITING_FOR_CHOOSE_SET,
+    "ariadne-oliver": GameStatus.WAITING_FOR_CHOOSE_SET,
+    CARD_TRADE: GameStatus.WAITING_FOR_CHOOSE_PLAYER,
+    DEAD_CARD_FOLLY: GameStatus.WAITING_TO_CHOOSE_DIRECTION,
+}
+
+CARD_EFFECTS: Dict[str, Callable] = {
+    EARLY_TRAIN: early_train_to_paddington,
+    "cards-off-the-table": cards_off_the_table,
+    "look-into-the-ashes": look_into_the_ashes,
+    "and-then-there-was-one-more": and_then_there_was_one_more,
+    "another-victim": another_victim,
+    "delay-the-murderers-escape": delay_the_murderers_escape,
+    "point-your-suspicions": point_your_suspicions,
+    "ariadne-oliver": ariadne_oliver,
+    CARD_TRADE: card_trade,
+    DEAD_CARD_FOLLY: dead_card_folly,
+    BLACKMAILED: blackmailed,
+    SOCIAL_FAUX_PAS: social_faux_pas,
+}
+
+WINDOW_RESOLVERS: Dict[str, Callable] = {
+    EARLY_TRAIN: resolve_early_train_to_paddington,
+    "delay-the-murderers-escape": resolve_delay_the_murderers_escape,
+    "point-your-suspicions": resolve_point_your_suspicions,
+    SOCIAL_FAUX_PAS: resolve_social_faux_pas,
+    **{name: _resolve_discard_on_cancel for name in NEXT_STATUS},
+}
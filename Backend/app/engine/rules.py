@@ -0,0 +1,307 @@
+from typing import Optional, Sequence
+
+from app.engine.effects import CARD_EFFECTS, EARLY_TRAIN, NOT_SO_FAST, WINDOW_RESOLVERS, early_train_to_paddington
+from app.engine.setup import HAND_SIZE
+from app.engine.state import DETECTIVES_CHOOSE_PLAYERS, EngineSet, GameState, RuleError, Window
+from app.models.card import CardState, CardType
+from app.models.game import GameStatus
+
+# Comandos de la partida sobre el estado en memoria, con las mismas validaciones y mensajes que los endpoints de
+# `update_cards`, `update_card`, `update_game`, los sets y `play_card`. Los controllers hacen lo mismo contra la base
+
+TUPPENCE = ["tuppence-beresford","tommy-beresford"]
+CREATE_SET = "create-set"
+EXTEND_SET = "extend-set"
+
+
+def _require_turn_owner(state: GameState, pid: int, code: int, detail: str):
+    if state.turn_owner() != pid:
+        raise RuleError(code, detail)
+
+
+def _after_discard(state: GameState):
+    if state.status in {GameStatus.TURN_START, GameStatus.FINALIZE_TURN, GameStatus.WAITING_FOR_CANCEL_ACTION}:
+        state.status = GameStatus.FINALIZE_TURN_DRAFT
+
+
+def discard(state: GameState, pid: int, cids: Sequence[int]):
+    """ `update_cards`: descarta cartas de la mano; un EARLY TRAIN descartado abre su ventana """
+    if not len(cids):
+        raise RuleError(422, "No se mandaron cartas a descartar")
+
+    cards = []
+    for cid in cids:
+        card = state.card(cid)
+        if card.owner is None:
+            raise RuleError(404, "La carta no tiene dueño")
+        if card.turn_discarded is not None:
+            raise RuleError(400, "No se puede descartar una carta descartada")
+        if card.set_id:
+            raise RuleError(400, "No se puede descartar una carta en set")
+        if card.owner != pid:
+            raise RuleError(401, "No se puede descartar la carta: Token invalido")
+        cards.append(card)
+
+    if state.status not in {GameStatus.FINALIZE_TURN, GameStatus.TURN_START}:
+        raise RuleError(400, "No se puede descartar la carta: Estado de partida invalida")
+    _require_turn_owner(state, pid, 412, "No se puede descartar la carta: No es tu turno")
+
+    if state.player(pid).social_disgrace and len(cards) > 1:
+        raise RuleError(400, "En desgracia social solo se permite descartar una carta")
+    if len(cards) > len(state.hand(pid)):
+        raise RuleError(400, "No se pueden descartar las cartas: No tenes esa cantidad en mano")
+
+    new_discarded_order = state.new_discarded_order()
+    for i, card in enumerate(cards):
+        state.discard(card, new_discarded_order + i)
+
+    trains = [c.id for c in cards if c.name == EARLY_TRAIN]
+    if trains:
+        early_train_to_paddington(state, state.cards[trains[0]], pid, in_discard=True, pending=trains[1:])
+        return
+    _after_discard(state)
+
+
+def take_draft(state: GameState, pid: int, cid: int):
+    """ `update_card`: agarra una carta del draft """
+    card = state.card(cid)
+    if state.status not in {GameStatus.FINALIZE_TURN_DRAFT, GameStatus.FINALIZE_TURN}:
+        raise RuleError(400, "No se puede agarrar la carta: Estado de partida invalido")
+    state.player(pid)
+    _require_turn_owner(state, pid, 412, "No se puede agarrar la carta: No es tu turno")
+
+    if len(state.hand(pid)) > HAND_SIZE - 1:
+        raise RuleError(412, "No se pueden agarrar mas cartas")
+    if card not in state.draft():
+        raise RuleError(400, "Solo se pueden agarrar cartas del draft")
+
+    card.owner = pid
+    state.status = GameStatus.FINALIZE_TURN_DRAFT
+
+
+def end_turn(state: GameState, pid: int):
+    """ `update_game` con `current_turn`: completa la mano desde abajo del draft y pasa el turno """
+    if state.status not in {GameStatus.FINALIZE_TURN, GameStatus.FINALIZE_TURN_DRAFT}:
+        raise RuleError(428, "No se puede terminar turno sin descartar o jugar una carta")
+    _require_turn_owner(state, pid, 401, "Token invalido")
+
+    deck_exhausted = False
+    hand_size = len(state.hand(pid))
+    if hand_size < HAND_SIZE:
+        cards_to_update = state.deck()[3:3 + HAND_SIZE - hand_size]
+        for card in cards_to_update:
+            card.owner = pid
+        if cards_to_update and not state.deck()[3:]:
+            deck_exhausted = True
+
+    # Los NOT SO FAST jugados en el turno van al descarte
+    canceling = [c for c in state.cards.values() if c.state == CardState.CANCELING and c.discarded_order is None]
+    new_discarded_order = state.new_discarded_order()
+    for i, card in enumerate(sorted(canceling, key=lambda c: c.id)):
+        state.discard(card, new_discarded_order + i)
+
+    state.current_turn += 1
+    state.votes = []
+    state.trades = []
+    state.trade_clockwise = None
+    if deck_exhausted:
+        state.finish("deck_exhausted")
+    else:
+        state.status = GameStatus.TURN_START
+
+
+def cancel_action(state: GameState, pid: int, nsf_id: int):
+    """ `cancel_action`: juega un NOT SO FAST sobre la ultima accion cancelable """
+    card = state.card(nsf_id)
+    if state.status != GameStatus.WAITING_FOR_CANCEL_ACTION or state.window is None:
+        raise RuleError(400, "No se puede cancelar la accion: Estado de partida invalido")
+    if card.owner != pid or card.name != NOT_SO_FAST:
+        raise RuleError(401, "No se puede cancelar la accion: Token inválido")
+
+    card.owner = None
+    card.state = CardState.CANCELING
+    state.window.cancels += 1
+
+
+def close_window(state: GameState):
+    """ Vence la ventana de NOT SO FAST: se resuelve la jugada que la abrio, cancelada o no """
+    window = state.window
+    if window is None:
+        raise RuleError(400, "No hay una accion esperando NOT SO FAST")
+    state.window = None
+
+    if window.kind in (CREATE_SET, EXTEND_SET):
+        _resolve_set(state, window)
+        return
+
+    card = state.cards[window.card_id]
+    WINDOW_RESOLVERS[window.kind](state, card, window)
+
+    if window.in_discard:
+        if window.pending and state.status != GameStatus.FINALIZED:
+            early_train_to_paddington(state, state.cards[window.pending[0]], state.turn_owner(), in_discard=True,
+                                      pending=window.pending[1:])
+            return
+        _after_discard(state)
+
+
+def create_set(state: GameState, pid: int, cids: Sequence[int]) -> EngineSet:
+    """ `create_detective_set` """
+    player = state.player(pid)
+    if player.social_disgrace:
+        raise RuleError(400, "En desgracia social no se puede jugar un set")
+    if state.status != GameStatus.TURN_START:
+        raise RuleError(400, "No se puede crear el set: Ya se realizo una accion")
+
+    for cid in cids:
+        if cid not in state.cards:
+            raise RuleError(404, f"Carta {cid} no encontrada")
+        card = state.cards[cid]
+        if card.card_type != CardType.DETECTIVE:
+            raise RuleError(400, "Solo se pueden crear sets con cartas detective")
+        if card.owner != pid:
+            raise RuleError(401, "No puedes usar cartas que no te pertenecen")
+        if card.set_id:
+            raise RuleError(400, "Alguna de las cartas ya se encuentra en un set")
+
+    detective_set = EngineSet(id=max(state.sets, default=0) + 1, owner=pid, turn_played=state.current_turn,
+                              detectives=list(cids))
+    state.sets[detective_set.id] = detective_set
+    for cid in cids:
+        state.cards[cid].set_id = detective_set.id
+
+    _set_played(state, detective_set, CREATE_SET)
+    return detective_set
+
+
+def extend_set(state: GameState, pid: int, sid: int, cid: Optional[int]) -> EngineSet:
+    """ `update_detective_sets`: agrega un detective a un set propio """
+    detective_set = state.sets.get(sid)
+    if detective_set is None:
+        raise RuleError(404, "No se puede actualizar el set: Set no encontrado")
+    if state.status != GameStatus.TURN_START:
+        raise RuleError(412, "No se puede actualizar el set: No es el comienzo de turno")
+    if detective_set.owner != pid:
+        raise RuleError(401, "No se puede actualizar el set: Token invalido")
+    if cid not in state.cards:
+        raise RuleError(404, "No se puede actualizar el set: Detective no encontrado")
+
+    detective = state.cards[cid]
+    if detective.set_id:
+        raise RuleError(400, "No se puede actualizar el set: Detective en set")
+    if detective.owner != pid:
+        raise RuleError(400, "No se puede actualizar el set: No es dueño de la carta")
+
+    is_tuppence_set = state.set_has(detective_set, TUPPENCE) and detective.name in TUPPENCE
+    if not state.set_has(detective_set, [detective.name]) and not is_tuppence_set:
+        raise RuleError(400, "No se puede actualizar el set: El detective corresponde al set")
+
+    detective.set_id = detective_set.id
+    detective_set.detectives.append(detective.id)
+    detective_set.turn_played = state.current_turn
+
+    _set_played(state, detective_set, EXTEND_SET)
+    return detective_set
+
+
+def _set_played(state: GameState, detective_set: EngineSet, kind: str):
+    # Tommy y Tuppence juntos no se pueden cancelar
+    if {"tommy-beresford", "tuppence-beresford"} <= set(state.set_names(detective_set)):
+        _resolve_set(state, Window(kind=kind, set_id=detective_set.id))
+    else:
+        state.open_window(kind, set_id=detective_set.id)
+
+
+def _resolve_set(state: GameState, window: Window):
+    detective_set = state.sets[window.set_id]
+    if not window.canceled:
+        state.status = state.next_set_status(detective_set)
+        state.player_in_action = detective_set.owner
+        return
+
+    # Lady Eileen cancelada vuelve a la mano
+    if state.set_has(detective_set, ["lady-eileen-bundle-brent"]):
+        for cid in detective_set.detectives:
+            state.cards[cid].set_id = None
+        detective_set.detectives = []
+        if window.kind == CREATE_SET:
+            del state.sets[detective_set.id]
+    state.finish_turn()
+
+
+def set_action(state: GameState, pid: int, sid: int, target_player: Optional[int] = None,
+               target_secret: Optional[int] = None):
+    """ `post_detective_set_action`: elegir al jugador y despues el secreto a revelar (u ocultar con Parker Pyne) """
+    played_set = state.sets.get(sid)
+    if played_set is None:
+        raise RuleError(404, "No se puede realizar la accion: Set no encontrado")
+    if played_set.turn_played != state.current_turn:
+        raise RuleError(412, "No se puede realizar la accion: Turno invalido")
+
+    if state.status == GameStatus.WAITING_FOR_CHOOSE_PLAYER:
+        if not target_player:
+            raise RuleError(400, "No se puede realizar la accion: Es necesario elegir un jugador")
+        if target_player == played_set.owner:
+            raise RuleError(406, "No se puede realizar la accion: No se puede seleccionar a uno mismo")
+        if target_player not in state.players:
+            raise RuleError(400, "No se puede realizar la accion: Es necesario seleccionar un jugador")
+        if pid != state.player_in_action:
+            raise RuleError(412, "No se puede realizar la accion: Token invalido")
+
+        state.status = GameStatus.WAITING_FOR_CHOOSE_SECRET
+        state.player_in_action = target_player
+
+    elif state.status == GameStatus.WAITING_FOR_CHOOSE_SECRET:
+        if not target_secret:
+            raise RuleError(400, "No se puede realizar la accion: Es necesario elegir un secreto")
+        if pid != state.player_in_action:
+            raise RuleError(412, "No se puede realizar la accion: Token invalido")
+        if target_secret not in state.secrets:
+            raise RuleError(404, "No se puede realizar la accion: Secreto no encontrado")
+
+        secret = state.secrets[target_secret]
+        ariadne_played_this_turn = any(state.cards[cid].name == "ariadne-oliver"
+                                       and state.cards[cid].turn_played == state.current_turn
+                                       for cid in played_set.detectives)
+
+        # Si es un set en el que se elige un jugador, el secreto a elegir debe ser propio
+        if ((state.set_has(played_set, DETECTIVES_CHOOSE_PLAYERS) or ariadne_played_this_turn)
+                and secret.owner != state.player_in_action):
+            raise RuleError(412, "No se puede realizar la accion: Se debe seleccionar un secreto propio")
+
+        if state.set_has(played_set, ["parker-pyne"]) and not ariadne_played_this_turn:
+            state.players[secret.owner].social_disgrace = False
+            secret.revealed = False
+        else:
+            if state.reveal(secret) == "game_finalized":
+                return
+            if all(state.set_has(played_set, [name]) for name in ("mr-satterthwaite", "harley-quin-wildcard")):
+                secret.owner = played_set.owner
+                secret.revealed = False
+
+        state.finish_turn()
+
+    else:
+        raise RuleError(400, "No se puede realizar la accion: Estado de partida invalido")
+
+
+def play_card(state: GameState, pid: int, cid: int, target_players: Sequence[int] = (),
+              target_secrets: Sequence[int] = (), target_cards: Sequence[int] = (), target_sets: Sequence[int] = (),
+              clockwise: Optional[bool] = None):
+    """
+    `play_card`: `pid` es quien manda el comando, que no siempre es el dueño de la carta (los votos, los
+    intercambios). `clockwise` es el `player_order` de DEAD CARD FOLLY
+    """
+    card = state.card(cid)
+    owner = state.player(card.owner)
+    state.player(pid)
+
+    if owner.social_disgrace and state.status == GameStatus.TURN_START:
+        raise RuleError(400, "No se pueden jugar cartas en desgracia social")
+
+    effect = CARD_EFFECTS.get(card.name)
+    if not effect:
+        raise RuleError(404, f"No se encontró una acción para la carta '{card.name}'")
+
+    effect(state, card, pid, target_players=list(target_players), target_secrets=list(target_secrets),
+           target_cards=list(target_cards), target_sets=list(target_sets), clockwise=clockwise)
@@ -0,0 +1,79 @@
+import random
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from app.engine.state import EngineCard, EnginePlayer, EngineSecret, GameState
+from app.models.card import CARD_CATALOGUE, CARD_DEF_IDS, INSTANT_CARDS, CardState
+from app.models.game import GameStatus
+from app.models.secret import SecretType
+
+DEFAULT_SECRET={"name":"varios", "content":"", "type":SecretType.OTHER}
+MURDER_SECRET={"name":"youre-the-murderer", "content":"", "type":SecretType.MURDERER}
+ACCOMPLICE_SECRET= {"name":"youre-the-accomplice", "content":"", "type":SecretType.ACCOMPLICE}
+AGATHA_DOY=259
+HAND_SIZE = 6
+
+# Mazo de cada cantidad de jugadores armado una sola vez: cada carta es un id del catalogo. Los NOT SO FAST del
+# mazo son los que sobran despues de darle uno a cada jugador
+CARD_KINDS = tuple({"name": d.name, "state": CardState.AVAILABLE} for d in CARD_CATALOGUE)
+INSTANT_KIND = CARD_DEF_IDS[INSTANT_CARDS["name"]]
+DECKS = {
+    players_amount: tuple([d.id for d in CARD_CATALOGUE if d.id != INSTANT_KIND for _ in range(d.amount)]
+                          + [INSTANT_KIND] * (INSTANT_CARDS["amount"] - players_amount))
+    for players_amount in range(2, 7)
+}
+
+
+def agatha_distance(date_of_birth: date) -> int:
+    """ Orden de la ronda: empieza quien cumple años mas cerca del cumpleaños de Agatha Christie """
+    return abs(date_of_birth.timetuple().tm_yday - AGATHA_DOY)
+
+
+def deal_secrets(pids: List[int]) -> List[Tuple[int, dict]]:
+    """ (dueño, secreto) de cada secreto. `pids` ya viene mezclado: el primero es el asesino y el segundo el complice """
+    murderer, accomplice = pids[0], pids[1]
+    dealt = []
+    for pid in pids:
+        has_secret = 1 if pid == murderer or pid == accomplice else 0
+        dealt.extend((pid, DEFAULT_SECRET) for _ in range(3 - has_secret))
+    dealt.append((murderer, MURDER_SECRET))
+    dealt.append((accomplice, ACCOMPLICE_SECRET if len(pids) > 4 else DEFAULT_SECRET))
+    return dealt
+
+
+def deal_cards(pids: List[int], rng: Optional[random.Random] = None) -> List[Tuple[int, Optional[int]]]:
+    """ (id del catalogo, dueño) de cada carta en orden de pila: 5 cartas por jugador de abajo del mazo y un NOT SO FAST """
+    rng = rng or random
+    players_amount = len(pids)
+    deck = list(DECKS[players_amount])
+    rng.shuffle(deck)
+
+    owners: List[Optional[int]] = [None] * len(deck)
+    for i in range(players_amount*5):
+        owners[-(i+1)] = pids[i % players_amount]
+
+    dealt = list(zip(deck, owners))
+    dealt.extend((INSTANT_KIND, pids[(i+1) % players_amount]) for i in range(players_amount))
+    return dealt
+
+
+def new_game(players: Dict[int, date], rng: Optional[random.Random] = None) -> GameState:
+    """ Partida empezada como la deja `update_game` al pasar a STARTED: ronda, secretos, cartas y primer descarte """
+    rng = rng or random
+    seating = sorted(players, key=lambda pid: agatha_distance(players[pid]))
+    shuffled = list(seating)
+    rng.shuffle(shuffled)
+
+    secrets = {sid: EngineSecret(id=sid, owner=owner, type=secret["type"])
+               for sid, (owner, secret) in enumerate(deal_secrets(shuffled), start=1)}
+    cards = {cid: EngineCard(id=cid, name=CARD_CATALOGUE[kind].name, card_type=CARD_CATALOGUE[kind].card_type,
+                             pile_order=cid - 1, owner=owner)
+             for cid, (kind, owner) in enumerate(deal_cards(shuffled, rng), start=1)}
+    state = GameState(status=GameStatus.STARTED, current_turn=0, seating=seating, secrets=secrets, cards=cards,
+                      players={pid: EnginePlayer(id=pid, position=position) for position, pid in enumerate(seating)})
+
+    first_discarded = state.deck()[0]
+    first_discarded.turn_discarded = -1
+    first_discarded.discarded_order = 0
+    state.status = GameStatus.TURN_START
+    return state
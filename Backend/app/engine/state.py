@@ -0,0 +1,198 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from app.models.card import CardState, CardType
+from app.models.game import GameStatus
+from app.models.secret import SecretType
+
+# Sets en los que primero se elige al jugador que revela
+DETECTIVES_CHOOSE_PLAYERS = ["mr-satterthwaite","lady-eileen-bundle-brent","tuppence-beresford","tommy-beresford"]
+
+
+class RuleError(Exception):
+    """ Jugada invalida. Lleva el codigo y el detalle que devuelve el endpoint equivalente """
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass
+class EnginePlayer:
+    id: int
+    position: int
+    social_disgrace: bool = False
+
+
+@dataclass
+class EngineCard:
+    """ Misma forma que la fila de `card`: los adaptadores copian los campos tal cual """
+    id: int
+    name: str
+    card_type: CardType
+    pile_order: int
+    owner: Optional[int] = None
+    state: CardState = CardState.AVAILABLE
+    turn_discarded: Optional[int] = None
+    discarded_order: Optional[int] = None
+    turn_played: Optional[int] = None
+    set_id: Optional[int] = None
+
+
+@dataclass
+class EngineSecret:
+    id: int
+    owner: int
+    type: SecretType
+    revealed: bool = False
+
+
+@dataclass
+class EngineSet:
+    id: int
+    owner: int
+    turn_played: int
+    detectives: List[int] = field(default_factory=list)
+
+
+@dataclass
+class Trade:
+    """ Carta que pasa de mano en un CARD TRADE o DEAD CARD FOLLY, como su fila de `eventtable` """
+    kind: str
+    player: int
+    target_player: int
+    # Sin carta es la eleccion del jugador con quien intercambiar (CARD TRADE)
+    card: Optional[int] = None
+    # Las devious recibidas quedan pendientes hasta que `devious_detect` las pone en juego
+    completed: bool = True
+
+
+@dataclass
+class Window:
+    """ Ventana de NOT SO FAST abierta: la jugada `kind` se resuelve al cerrarla, cancelada si `cancels` es impar """
+    kind: str
+    card_id: Optional[int] = None
+    set_id: Optional[int] = None
+    in_discard: bool = False
+    cancels: int = 0
+    # EARLY TRAIN TO PADDINGTON del mismo descarte que todavia no abrieron su ventana
+    pending: List[int] = field(default_factory=list)
+
+    @property
+    def canceled(self) -> bool:
+        return self.cancels % 2 != 0
+
+
+@dataclass
+class GameState:
+    status: GameStatus
+    current_turn: int
+    # Ids de los jugadores por posicion, como `game.seating`
+    seating: List[int]
+    players: Dict[int, EnginePlayer]
+    cards: Dict[int, EngineCard]
+    secrets: Dict[int, EngineSecret]
+    sets: Dict[int, EngineSet] = field(default_factory=dict)
+    player_in_action: Optional[int] = None
+    window: Optional[Window] = None
+    # Votos de POINT YOUR SUSPICIONS del turno: (quien vota, a quien)
+    votes: List[Tuple[int, int]] = field(default_factory=list)
+    # Intercambios del turno y el sentido elegido para DEAD CARD FOLLY
+    trades: List[Trade] = field(default_factory=list)
+    trade_clockwise: Optional[bool] = None
+    # Por que termino la partida: el asesino revelado, los culpables acorralados o el mazo agotado (al terminar un
+    # turno o por un EARLY TRAIN TO PADDINGTON)
+    outcome: Optional[str] = None
+
+    def turn_owner(self) -> int:
+        return self.seating[self.current_turn % len(self.seating)]
+
+    def player(self, pid: Optional[int]) -> EnginePlayer:
+        if pid not in self.players:
+            raise RuleError(404, "Jugador no encontrado")
+        return self.players[pid]
+
+    def card(self, cid: Optional[int]) -> EngineCard:
+        if cid not in self.cards:
+            raise RuleError(404, "Carta no encontrada")
+        return self.cards[cid]
+
+    def hand(self, pid: int) -> List[EngineCard]:
+        return [c for c in self.cards.values() if c.owner == pid and c.set_id is None]
+
+    def deck(self) -> List[EngineCard]:
+        """ Cartas sin repartir, la de arriba primero; las 3 primeras son el draft """
+        return sorted((c for c in self.cards.values() if c.owner is None and c.turn_discarded is None
+                       and c.state == CardState.AVAILABLE), key=lambda c: c.pile_order, reverse=True)
+
+    def draft(self) -> List[EngineCard]:
+        return self.deck()[:3]
+
+    def neighbour(self, pid: int, clockwise: bool) -> int:
+        position = self.seating.index(pid)
+        return self.seating[(position + (1 if clockwise else -1)) % len(self.seating)]
+
+    def discard_pile(self) -> List[EngineCard]:
+        """ Pila de descarte, la ultima descartada primero """
+        return sorted((c for c in self.cards.values() if c.discarded_order is not None),
+                      key=lambda c: c.discarded_order, reverse=True)
+
+    def new_discarded_order(self) -> int:
+        pile = self.discard_pile()
+        return pile[0].discarded_order + 1 if pile else 0
+
+    def discard(self, card: EngineCard, order: Optional[int] = None):
+        card.owner = None
+        card.turn_discarded = self.current_turn
+        card.discarded_order = self.new_discarded_order() if order is None else order
+
+    def hidden_secrets(self, pid: int) -> List[EngineSecret]:
+        return [s for s in self.secrets.values() if s.owner == pid and not s.revealed]
+
+    def reveal(self, secret: EngineSecret) -> str:
+        """ Como `reveal_secret`: el asesino revelado o los culpables acorralados terminan la partida """
+        secret.revealed = True
+        if secret.type == SecretType.MURDERER:
+            self.finish("murderer_revealed")
+            return "game_finalized"
+
+        if not self.hidden_secrets(secret.owner):
+            self.players[secret.owner].social_disgrace = True
+
+        hidden = [s for s in self.secrets.values() if not s.revealed]
+        culprits = {s.owner for s in hidden if s.type in (SecretType.MURDERER, SecretType.ACCOMPLICE)}
+        if all(s.owner in culprits for s in hidden):
+            self.finish("culprits_cornered")
+            return "game_finalized"
+        return "effect_applied"
+
+    def set_names(self, detective_set: EngineSet) -> List[str]:
+        return [self.cards[cid].name for cid in detective_set.detectives]
+
+    def set_has(self, detective_set: EngineSet, names: List[str]) -> bool:
+        return any(name in names for name in self.set_names(detective_set))
+
+    def next_set_status(self, detective_set: EngineSet) -> GameStatus:
+        """ Como `set_next_game_status` """
+        if self.set_has(detective_set, DETECTIVES_CHOOSE_PLAYERS):
+            return GameStatus.WAITING_FOR_CHOOSE_PLAYER
+        if self.set_has(detective_set, ["parker-pyne"]):
+            revealed = any(s.revealed for s in self.secrets.values())
+            return GameStatus.WAITING_FOR_CHOOSE_SECRET if revealed else GameStatus.FINALIZE_TURN
+        return GameStatus.WAITING_FOR_CHOOSE_SECRET
+
+    def open_window(self, kind: str, card_id: Optional[int] = None, set_id: Optional[int] = None,
+                    in_discard: bool = False, pending: Optional[List[int]] = None):
+        """ Abre la ventana de NOT SO FAST; la jugada queda esperando a `close_window` """
+        self.status = GameStatus.WAITING_FOR_CANCEL_ACTION
+        self.window = Window(kind=kind, card_id=card_id, set_id=set_id, in_discard=in_discard, pending=pending or [])
+
+    def finish(self, outcome: str):
+        self.status = GameStatus.FINALIZED
+        self.player_in_action = None
+        self.outcome = outcome
+
+    def finish_turn(self):
+        self.status = GameStatus.FINALIZE_TURN
+        self.player_in_action = None
@@ -1,18 +1,32 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
+from sqlalchemy.orm.exc import StaleDataError
 from sqlmodel import SQLModel
 
 from app.controllers.detective_set import set_router
 from app.controllers.game import game_router
 from app.controllers.player import player_router
+from app.database.concurrency import stale_data_handler
 from app.database.engine import db_engine
+from app.database.instrumentation import QueryStatsMiddleware
+from app.database.pool import PoolTimeoutError, pool_timeout_handler
 from app.controllers.card import card_router
 from app.controllers.secret import secret_router
 from app.controllers.websocket import ws_router
 from app.controllers.event_table import event_table_router
 from app.controllers.chat import chat_router
+from app.controllers.metrics import metrics_router
+from app.controllers.profiler import profiler_router
+from app.controllers.archive import archive_router
+from app.controllers.game_log import game_log_router
+from app.metrics import MetricsMiddleware
+from app.services.archive import archive_periodically
+from app.services.reaper import REAPER
+from app.settings import settings
+from app.watchdog import WATCHDOG
 
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -25,10 +39,25 @@ authorized_hosts = [
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     SQLModel.metadata.create_all(db_engine)
+    if settings.STALL_THRESHOLD_MS:
+        WATCHDOG.start()
+    tasks = []
+    if settings.ARCHIVE_AFTER_MINUTES is not None:
+        tasks.append(asyncio.create_task(archive_periodically()))
+    if settings.REAPER_INTERVAL_SECONDS:
+        tasks.append(asyncio.create_task(REAPER.run_periodically()))
     yield
+    for task in tasks:
+        task.cancel()
+    await WATCHDOG.stop()
 
 base_app = FastAPI(lifespan=lifespan)
-base_app.add_middleware(middleware_class=CORSMiddleware, allow_origin_regex=authorized_hostsregex, allow_methods=["*"])
+base_app.add_middleware(middleware_class=CORSMiddleware, allow_origin_regex=authorized_hostsregex, allow_methods=["*"],
+                        expose_headers=["X-DB-Queries", "X-DB-Time-Ms", "X-DB-Commits", "Retry-After"])
+base_app.add_middleware(middleware_class=QueryStatsMiddleware)
+base_app.add_middleware(middleware_class=MetricsMiddleware)
+base_app.add_exception_handler(PoolTimeoutError, pool_timeout_handler)
+base_app.add_exception_handler(StaleDataError, stale_data_handler)
 
 
 base_app.include_router(game_router)
@@ -39,6 +68,10 @@ base_app.include_router(set_router)
 base_app.include_router(event_table_router)
 base_app.include_router(chat_router)
 base_app.include_router(ws_router)
+base_app.include_router(metrics_router)
+base_app.include_router(profiler_router)
+base_app.include_router(archive_router)
+base_app.include_router(game_log_router)
 
 def main():
     uvicorn.run(app=base_app, host='0.0.0.0', port=8000)
@@ -0,0 +1,148 @@
+"""
+Metricas del servidor en formato de texto de Prometheus.
+
+Los contadores e histogramas se actualizan siempre desde el thread del event loop (middleware, broadcasts y
+efectos de cartas), asi que no necesitan locks: cada observacion es una busqueda en un dict y un par de sumas.
+Las pocas metricas que se actualizan desde el threadpool (el pool de conexiones) no tienen labels y las protege
+un lock propio. Los valores que ya existen en otro lado (conexiones abiertas, pool de la base, partidas por estado) no se
+duplican, se leen recien cuando se pide /metrics.
+"""
+from bisect import bisect_left
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        # Sin labels hay una unica serie y se expone desde el arranque en 0
+        self.values: Dict[Tuple[str, ...], float] = {} if labels else {(): 0}
+
+    def inc(self, *label_values: str, amount: float = 1):
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def collect(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        for label_values, value in self.values.items():
+            yield f"{self.name}{_format_labels(self.labels, label_values)} {value}"
+
+
+class Gauge(Counter):
+    """ Gauge que se mueve con inc/dec, o que se calcula al momento de leerlo si recibe `collector` """
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 collector: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None):
+        super().__init__(name, documentation, labels)
+        self.collector = collector
+
+    def dec(self, *label_values: str, amount: float = 1):
+        self.inc(*label_values, amount=-amount)
+
+    def collect(self) -> Iterable[str]:
+        values = self.collector() if self.collector else self.values
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} gauge"
+        for label_values, value in values.items():
+            yield f"{self.name}{_format_labels(self.labels, label_values)} {value}"
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = buckets
+        # Por cada combinacion de labels: [cuentas por bucket..., +Inf, suma]. Sin labels la serie existe desde el
+        # arranque, asi que observarla nunca agrega claves al dict
+        self.values: Dict[Tuple[str, ...], List[float]] = {} if labels else {(): [0] * (len(buckets) + 2)}
+
+    def observe(self, value: float, *label_values: str):
+        series = self.values.get(label_values)
+        if series is None:
+            series = self.values[label_values] = [0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def collect(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for label_values, series in self.values.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), series[:-1]):
+                cumulative += count
+                le = f'le="{bound}"'
+                yield f"{self.name}_bucket{_format_labels(self.labels, label_values, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, label_values)} {series[-1]}"
+            yield f"{self.name}_count{_format_labels(self.labels, label_values)} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self.metrics for line in metric.collect()) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "Duracion de los requests HTTP por ruta", ("method", "route", "status")))
+WS_FRAMES_SENT = REGISTRY.register(Counter(
+    "ws_frames_sent_total", "Frames enviados por websocket", ("model", "action")))
+WS_BYTES_SENT = REGISTRY.register(Counter(
+    "ws_bytes_sent_total", "Bytes enviados por websocket", ("model", "action")))
+NOT_SO_FAST_WINDOWS = REGISTRY.register(Gauge(
+    "not_so_fast_windows_open", "Ventanas de NOT SO FAST abiertas"))
+CARD_EFFECT_DURATION = REGISTRY.register(Histogram(
+    "card_effect_duration_seconds", "Duracion de cada ejecucion de un efecto de carta (incluye esperas de cancelacion)",
+    ("card", "status")))
+CARD_EFFECT_PHASE_SECONDS = REGISTRY.register(Counter(
+    "card_effect_phase_seconds_total", "Tiempo de los efectos de cartas repartido en db, broadcast, wait y logic",
+    ("card", "status", "phase")))
+
+
+class MetricsMiddleware:
+    """ Mide la duracion de cada request HTTP con la ruta ya resuelta (ej: /api/game/{gid}) """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(perf_counter() - start, scope["method"],
+                                          route.path if route else "unmatched", str(status[0]))
@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import SQLModel, Field
+
+
+class ArchivedGame(SQLModel, table=True):
+    """ Partida finalizada sacada de las tablas en uso: todas sus filas en un JSON comprimido con zlib """
+    id: Optional[int] = Field(default=None, primary_key=True)
+    # Id que tenia la partida en `game`; es el que se usa en /api/archive/{gid}
+    game_id: int = Field(unique=True, index=True)
+    name: str
+    finished_at: datetime
+    archived_at: datetime
+    players: int
+    data: bytes
@@ -1,7 +1,10 @@
+from pydantic import computed_field
+from sqlalchemy import Column, SmallInteger
+from sqlalchemy.types import TypeDecorator
 from sqlmodel import SQLModel, Field, Relationship
 from enum import Enum
 #from app.models.game import Game
-from typing import Optional
+from typing import Optional, NamedTuple
 
 class CardType(str, Enum):
     EVENT = "event"
@@ -9,26 +12,112 @@ class CardType(str, Enum):
     DEVIOUS = "devious"
     INSTANT = "instant"
 
+class CardState(str, Enum):
+    AVAILABLE = "available"
+    # NOT SO FAST jugado sobre la accion del turno: queda en la mesa, fuera del mazo, hasta que termina el turno
+    CANCELING = "canceling"
+
+# {"name":"", "card_type":CardType,"amount":1},
+CARDS = [
+    #DEVIOUS
+    {"name":"blackmailed", "card_type":CardType.DEVIOUS,"amount":1},
+    {"name":"social-faux-pas", "card_type":CardType.DEVIOUS,"amount":3},
+    #DETECTIVES
+    {"name":"harley-quin-wildcard", "card_type":CardType.DETECTIVE,"amount":4},
+    {"name":"ariadne-oliver", "card_type":CardType.DETECTIVE,"amount":3},
+    {"name":"miss-marple", "card_type":CardType.DETECTIVE,"amount":3},
+    {"name":"parker-pyne", "card_type":CardType.DETECTIVE,"amount":3},
+    {"name":"tommy-beresford", "card_type":CardType.DETECTIVE,"amount":2},
+    {"name":"lady-eileen-bundle-brent", "card_type":CardType.DETECTIVE,"amount":3},
+    {"name":"tuppence-beresford", "card_type":CardType.DETECTIVE,"amount":2},
+    {"name":"hercule-poirot", "card_type":CardType.DETECTIVE,"amount":3},
+    {"name":"mr-satterthwaite", "card_type":CardType.DETECTIVE,"amount":2},
+    #EVENT
+    {"name":"delay-the-murderers-escape", "card_type":CardType.EVENT,"amount":3},
+    {"name":"point-your-suspicions", "card_type":CardType.EVENT,"amount":3},
+    {"name":"dead-card-folly", "card_type":CardType.EVENT,"amount":3},
+    {"name":"another-victim", "card_type":CardType.EVENT,"amount":2},
+    {"name":"look-into-the-ashes", "card_type":CardType.EVENT,"amount":3},
+    {"name":"card-trade", "card_type":CardType.EVENT,"amount":3},
+    {"name":"and-then-there-was-one-more", "card_type":CardType.EVENT,"amount":2},
+    {"name":"early-train-to-paddington", "card_type":CardType.EVENT,"amount":2},
+    {"name":"cards-off-the-table", "card_type":CardType.EVENT,"amount":1}
+]
+
+INSTANT_CARDS ={"name":"not-so-fast", "card_type":CardType.INSTANT,"amount":10}
+
+
+class CardDef(NamedTuple):
+    id: int
+    name: str
+    card_type: CardType
+    amount: int
+
+
+# Catalogo de cartas: el id de cada definicion es su posicion y es lo que se guarda en `card.card_def_id`.
+# Solo se agregan cartas al final, nunca se reordena
+CARD_CATALOGUE = tuple(CardDef(i, c["name"], c["card_type"], c["amount"]) for i, c in enumerate([*CARDS, INSTANT_CARDS]))
+CARD_DEF_IDS = {card_def.name: card_def.id for card_def in CARD_CATALOGUE}
+
+CARD_STATE_CODES = {
+    CardState.AVAILABLE: 0,
+    CardState.CANCELING: 1,
+}
+CARD_STATES_BY_CODE = {code: state for state, code in CARD_STATE_CODES.items()}
+
+
+class CardDefType(TypeDecorator):
+    """ Guarda el id de la definicion como smallint; en Python (y en la API) la carta sigue teniendo su nombre """
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if value not in CARD_DEF_IDS:
+            raise ValueError(f"La carta '{value}' no esta en el catalogo")
+        return CARD_DEF_IDS[value]
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else CARD_CATALOGUE[value].name
+
+
+class CardStateType(TypeDecorator):
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else CARD_STATE_CODES[CardState(value)]
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else CARD_STATES_BY_CODE[value]
+
+
 class Card(SQLModel, table=True):
     id: int = Field(primary_key=True)
     game_id: int = Field(foreign_key="game.id")
     owner: Optional[int] = Field(foreign_key="player.id", default=None)
-    name: str = Field(max_digits=20)
-    content: str = Field(max_digits=100)
+    name: str = Field(sa_column=Column("card_def_id", CardDefType, nullable=False))
+    state: CardState = Field(default=CardState.AVAILABLE, sa_type=CardStateType)
     turn_discarded: Optional[int] = Field(default=None)
     discarded_order: Optional[int] = Field(default=None)
     turn_played: Optional[int] = Field(default=None)
-    card_type: CardType
     pile_order: int
     set_id: Optional[int] = Field(foreign_key="detectiveset.id", default=None)
 
+    @computed_field
+    @property
+    def card_type(self) -> CardType:
+        """ No se guarda: es parte de la definicion de la carta en el catalogo """
+        return CARD_CATALOGUE[CARD_DEF_IDS[self.name]].card_type
+
 class PublicCard(SQLModel):
     id: int
     name: str
     owner: Optional[int]
-    content: str
+    state: CardState
     turn_discarded: Optional[int]
     discarded_order: Optional[int]
     turn_played: Optional[int]
     card_type: CardType
-    set_id: Optional[int]
\ No newline at end of file
+    set_id: Optional[int]
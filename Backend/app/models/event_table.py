@@ -1,16 +1,58 @@
+from enum import Enum
 from typing import Optional
+
+from sqlalchemy import Index, SmallInteger
+from sqlalchemy.types import TypeDecorator
 from sqlmodel import SQLModel, Field
 
+
+class EventAction(str, Enum):
+    TO_CANCEL = "to_cancel"
+    CANCELED_TIMES = "canceled_times"
+    CARD_TRADE = "card_trade"
+    DEAD_CARD_FOLLY_CLOCKWISE = "dead_card_folly_clockwise"
+    DEAD_CARD_FOLLY_COUNTER_CLOCKWISE = "dead_card_folly_counter-clockwise"
+    DEAD_CARD_FOLLY_TRADE = "dead_card_folly_trade"
+    POINT_YOUR_SUSPICIONS = "point_your_suspicions"
+
+
+# Codigo guardado en la base para cada accion. Solo se agregan codigos nuevos, nunca se reusan
+EVENT_ACTION_CODES = {
+    EventAction.TO_CANCEL: 1,
+    EventAction.CANCELED_TIMES: 2,
+    EventAction.CARD_TRADE: 3,
+    EventAction.DEAD_CARD_FOLLY_CLOCKWISE: 4,
+    EventAction.DEAD_CARD_FOLLY_COUNTER_CLOCKWISE: 5,
+    EventAction.DEAD_CARD_FOLLY_TRADE: 6,
+    EventAction.POINT_YOUR_SUSPICIONS: 7,
+}
+EVENT_ACTIONS_BY_CODE = {code: action for action, code in EVENT_ACTION_CODES.items()}
+
+
+class EventActionType(TypeDecorator):
+    """ Guarda la accion como smallint; en Python (y en la API) sigue siendo el string de siempre """
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else EVENT_ACTION_CODES[EventAction(value)]
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else EVENT_ACTIONS_BY_CODE[value]
+
+
 class EventTable(SQLModel, table = True):
+    __table_args__ = (Index("ix_eventtable_game_turn_action", "game_id", "turn_played", "action"),)
+
     id: int = Field(primary_key=True)
     game_id: int = Field(foreign_key="game.id")
-    action: str
+    action: EventAction = Field(sa_type=EventActionType)
     turn_played: int
     player_id: Optional[int] = Field(foreign_key="player.id")
     target_player: Optional[int] = Field(default=None)
     target_set: Optional[int] = Field(default=None)
     target_card: Optional[int] = Field(default=None)
     target_secret: Optional[int] = Field(default=None)
+    # Contador de la accion (canceled_times: cuantos NOT SO FAST se jugaron sobre la ultima accion)
+    counter: int = Field(default=0)
     completed_action: bool = Field(default=False)
-    
-
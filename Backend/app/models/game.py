@@ -2,6 +2,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional, List
 
+from sqlalchemy import JSON, Column, Integer
 from sqlmodel import SQLModel, Field, Relationship
 
 from app.models.player import Player
@@ -37,5 +38,20 @@ class PublicGame(SQLModel):
     timestamp: Optional[datetime] = Field(default=None)
     player_in_action: Optional[int] = Field(foreign_key="player.id")
 
+# Cada UPDATE de la partida lleva WHERE version = ? y la incrementa; si otro request la cambio antes
+# SQLAlchemy levanta StaleDataError en vez de pisar los cambios
+_version_column = Column("version", Integer, nullable=False, default=1)
+
+
 class Game(PublicGame, table=True):
-    password: Optional[str] = Field(default=None)
\ No newline at end of file
+    __mapper_args__ = {"version_id_col": _version_column}
+    # Sin AUTOINCREMENT SQLite reutiliza el id de la ultima partida borrada (ej: al archivarla) y el archivo tendria
+    # dos partidas con el mismo id. En PostgreSQL la secuencia nunca repite
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    password: Optional[str] = Field(default=None)
+    # Ids de los jugadores en el orden de sus posiciones, se fija al empezar la partida
+    seating: Optional[List[int]] = Field(default=None, sa_type=JSON)
+    # Secretos ocultos por jugador (ver app.services.secret_tally), se actualiza con cada cambio de un secreto
+    secret_tally: Optional[dict] = Field(default=None, sa_type=JSON)
+    version: int = Field(default=1, sa_column=_version_column)
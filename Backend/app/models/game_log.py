@@ -0,0 +1,32 @@
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import JSON
+from sqlmodel import SQLModel, Field
+
+
+class LogOperation(str, Enum):
+    INSERT = "insert"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class GameLogEntry(SQLModel, table=True):
+    """ Cambio de una fila de la partida: en un insert la fila completa, en un update solo las columnas que cambiaron """
+    id: int = Field(default=None, primary_key=True)
+    game_id: int = Field(index=True)
+    turn: int
+    table_name: str
+    row_id: int
+    operation: LogOperation
+    data: dict = Field(default_factory=dict, sa_type=JSON)
+    created_at: datetime = Field(default_factory=datetime.now)
+
+
+class GameSnapshot(SQLModel, table=True):
+    """ Estado completo de la partida al empezar `turn`, incluye todas las entradas del log hasta `last_entry_id` """
+    id: int = Field(default=None, primary_key=True)
+    game_id: int = Field(index=True)
+    turn: int
+    last_entry_id: int
+    data: dict = Field(default_factory=dict, sa_type=JSON)
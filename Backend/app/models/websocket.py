@@ -6,6 +6,9 @@ from typing import Dict, List
 
 from starlette.websockets import WebSocket
 
+from app.metrics import WS_FRAMES_SENT, WS_BYTES_SENT
+from app.tracing import span
+
 import logging
 
 _logger = logging.getLogger(__name__)
@@ -22,15 +25,24 @@ class WebsocketMessage(BaseModel):
     data: dict | List[dict]
 
 async def notify_game_players(game_id: int, message: WebsocketMessage):
-    for user_id, connection in GAME_CONNECTIONS.get(game_id, {}).items():
-        try:
-            await connection.send_text(message.model_dump_json())
-        except Exception as e:
-            _logger.warning(f"Error enviando mensaje websocket a user {user_id} en game {game_id}: {e}")
+    # Se serializa una sola vez para todos los destinatarios
+    with span("notify_game_players", "broadcast", model=message.model, action=message.action):
+        payload = message.model_dump_json()
+        for user_id, connection in GAME_CONNECTIONS.get(game_id, {}).items():
+            try:
+                await connection.send_text(payload)
+                WS_FRAMES_SENT.inc(message.model, message.action)
+                WS_BYTES_SENT.inc(message.model, message.action, amount=len(payload))
+            except Exception as e:
+                _logger.warning(f"Error enviando mensaje websocket a user {user_id} en game {game_id}: {e}")
 
 async def notify_lobby(message: WebsocketMessage):
-    for connection in LOBBY_CONNECTIONS:
-        try:
-            await connection.send_text(message.model_dump_json())
-        except Exception as e:
-            _logger.warning(f"Error enviando mensaje websocket a lobby: {e}")
\ No newline at end of file
+    with span("notify_lobby", "broadcast", model=message.model, action=message.action):
+        payload = message.model_dump_json()
+        for connection in LOBBY_CONNECTIONS:
+            try:
+                await connection.send_text(payload)
+                WS_FRAMES_SENT.inc(message.model, message.action)
+                WS_BYTES_SENT.inc(message.model, message.action, amount=len(payload))
+            except Exception as e:
+                _logger.warning(f"Error enviando mensaje websocket a lobby: {e}")
\ No newline at end of file
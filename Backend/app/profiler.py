@@ -0,0 +1,191 @@
+"""
+Profiler por muestreo del thread del event loop.
+
+Un thread aparte toma el stack del event loop con `sys._current_frames()` a una frecuencia fija, sin instrumentar
+nada ni reiniciar el proceso. Mientras tanto `HEARTBEAT` marca latidos en el loop: si pasa mas de `stall_ms` sin un
+latido el loop esta bloqueado (ej: una consulta de psycopg2 dentro de un metodo `async def`) y las muestras de ese
+intervalo se agrupan en un stall con su duracion y el punto del codigo de la app que lo causo. El watchdog
+(`app.watchdog`) usa el mismo latido y el mismo `call_site`, asi los dos atribuyen los bloqueos igual.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.metrics import REGISTRY, Histogram
+
+Frame = Tuple[str, str, int]
+Stack = Tuple[Frame, ...]
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(APP_DIR)
+
+EVENT_LOOP_LAG = REGISTRY.register(Histogram(
+    "event_loop_lag_seconds", "Atraso de los latidos del event loop",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)))
+
+
+def short_path(filename: str) -> str:
+    return os.path.relpath(filename, ROOT_DIR) if filename.startswith(ROOT_DIR) else os.path.basename(filename)
+
+
+def _frame_name(frame) -> str:
+    """ Los metodos llevan la clase del objeto y no la que los define: `CardService.search`, no `BaseService.search` """
+    code = frame.f_code
+    if code.co_argcount and code.co_varnames[0] == "self":
+        owner = frame.f_locals.get("self")
+        if owner is not None:
+            return f"{type(owner).__name__}.{code.co_name}"
+    return code.co_qualname
+
+
+def capture_stack(frame) -> Stack:
+    """ Stack desde la raiz hasta `frame` como (funcion, archivo, linea) """
+    stack = []
+    while frame is not None:
+        stack.append((_frame_name(frame), short_path(frame.f_code.co_filename), frame.f_lineno))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+def call_site(stack: Stack) -> str:
+    """ "funcion (archivo:linea) -> funcion_externa": el frame mas profundo de la app y lo que estaba corriendo """
+    callee = None
+    for name, filename, line in reversed(stack):
+        if filename.startswith("app" + os.sep) and not filename.startswith(os.path.join("app", "profiler")):
+            site = f"{name} ({filename}:{line})"
+            return f"{site} -> {callee}" if callee else site
+        callee = name
+    name, filename, line = stack[-1] if stack else ("?", "?", 0)
+    return f"{name} ({filename}:{line})"
+
+
+class Heartbeat:
+    """ Tarea en el event loop que marca un latido cada `interval`; la comparten todos los que vigilan el loop """
+
+    def __init__(self):
+        self.last_beat = time.perf_counter()
+        self._intervals: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def interval(self) -> float:
+        return min(self._intervals)
+
+    def acquire(self, interval: float):
+        """ Se llama desde el event loop; con varios usuarios late al intervalo mas corto """
+        self._intervals.append(interval)
+        if self._task is None or self._task.done() or self._task.get_loop() is not asyncio.get_running_loop():
+            self.last_beat = time.perf_counter()
+            self._task = asyncio.create_task(self._beat())
+
+    def release(self, interval: float):
+        self._intervals.remove(interval)
+        if not self._intervals and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _beat(self):
+        while True:
+            self.last_beat = time.perf_counter()
+            interval = self.interval
+            await asyncio.sleep(interval)
+            EVENT_LOOP_LAG.observe(max(time.perf_counter() - self.last_beat - interval, 0))
+
+
+HEARTBEAT = Heartbeat()
+
+
+class Profile:
+    def __init__(self, rate: int, stall_ms: float):
+        self.rate = rate
+        self.stall_ms = stall_ms
+        self.samples: List[Stack] = []
+        self.stalls: List[dict] = []
+        self.duration = 0.0
+
+    def collapsed(self) -> str:
+        """ Formato "a;b;c cantidad" de flamegraph.pl / speedscope """
+        counts: Dict[Stack, int] = {}
+        for stack in self.samples:
+            counts[stack] = counts.get(stack, 0) + 1
+        return "\n".join(";".join(f"{name} ({filename}:{line})" for name, filename, line in stack) + f" {count}"
+                         for stack, count in counts.items()) + "\n"
+
+    def speedscope(self) -> dict:
+        frames: Dict[Frame, int] = {}
+        samples = [[frames.setdefault(f, len(frames)) for f in stack] for stack in self.samples]
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": [{"name": name, "file": filename, "line": line} for name, filename, line in frames]},
+            "profiles": [{
+                "type": "sampled",
+                "name": "event loop",
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": self.duration,
+                "samples": samples,
+                "weights": [1 / self.rate] * len(samples),
+            }],
+            "name": f"acdoc-backend {self.rate}Hz",
+            "exporter": __name__,
+        }
+
+
+class SamplingProfiler:
+    def __init__(self, thread_id: int, rate: int = 100, stall_ms: float = 100):
+        self.thread_id = thread_id
+        self.profile = Profile(rate, stall_ms)
+        self._stop = threading.Event()
+
+    def _sample(self):
+        interval = 1 / self.profile.rate
+        threshold = self.profile.stall_ms / 1000
+        stalled_since: Optional[float] = None
+        stall_stacks: List[Stack] = []
+        while not self._stop.wait(interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = capture_stack(frame)
+            self.profile.samples.append(stack)
+
+            last_beat = HEARTBEAT.last_beat
+            if stalled_since is not None and last_beat > stalled_since:
+                self._record_stall(stalled_since, last_beat, stall_stacks)
+                stalled_since, stall_stacks = None, []
+            if time.perf_counter() - last_beat > threshold:
+                stalled_since = last_beat
+                stall_stacks.append(stack)
+        if stalled_since is not None:
+            self._record_stall(stalled_since, time.perf_counter(), stall_stacks)
+
+    def _record_stall(self, start: float, end: float, stacks: List[Stack]):
+        sites: Dict[str, int] = {}
+        for stack in stacks:
+            site = call_site(stack)
+            sites[site] = sites.get(site, 0) + 1
+        self.profile.stalls.append({
+            "duration_ms": round((end - start) * 1000, 1),
+            "call_site": max(sites, key=sites.get),
+            "samples": len(stacks),
+        })
+
+    async def run(self, seconds: float) -> Profile:
+        """ Muestrea durante `seconds`; se tiene que llamar desde el event loop que se quiere perfilar """
+        sampler = threading.Thread(target=self._sample, name="sampling-profiler", daemon=True)
+        beat_interval = max(self.profile.stall_ms / 4000, 0.001)
+        start = time.perf_counter()
+        HEARTBEAT.acquire(beat_interval)
+        sampler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            self._stop.set()
+            await asyncio.to_thread(sampler.join)
+            HEARTBEAT.release(beat_interval)
+            self.profile.duration = time.perf_counter() - start
+        return self.profile
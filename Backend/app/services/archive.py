@@ -0,0 +1,100 @@
+import asyncio
+import json
+import zlib
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from app.database.engine import db_engine
+from app.models.archived_game import ArchivedGame
+from app.models.card import Card
+from app.models.chat import Chat
+from app.models.detective_set import DetectiveSet
+from app.models.event_table import EventTable
+from app.models.game import Game, GameStatus
+from app.models.game_log import GameLogEntry
+from app.models.player import Player
+from app.models.secret import Secret
+from app.services.base import BaseService
+from app.services.game import delete_game_rows
+from app.settings import settings
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Tablas que se guardan en el archivo, con lo que no tiene que salir de la base (tokens y contraseñas)
+ARCHIVED_TABLES = {
+    "players": (Player, {"token"}),
+    "cards": (Card, set()),
+    "secrets": (Secret, set()),
+    "event_table": (EventTable, set()),
+    "chat": (Chat, set()),
+    "detective_sets": (DetectiveSet, set()),
+    "log": (GameLogEntry, set()),
+}
+
+
+class ArchiveService(BaseService[ArchivedGame]):
+    _metaclass = ArchivedGame
+
+    def archive(self, session: Session, game: Game) -> ArchivedGame:
+        """ Mueve la partida y todas sus filas a un unico blob comprimido, en una sola transaccion """
+        session.refresh(game)
+        content = {"game": game.model_dump(mode="json", exclude={"password"})}
+        for key, (model, exclude) in ARCHIVED_TABLES.items():
+            rows = session.exec(select(model).where(model.game_id == game.id).order_by(model.id)).all()
+            content[key] = [row.model_dump(mode="json", exclude=exclude) for row in rows]
+
+        archived = ArchivedGame(game_id=game.id, name=game.name, finished_at=game.timestamp or datetime.now(),
+                                archived_at=datetime.now(), players=len(content["players"]),
+                                data=zlib.compress(json.dumps(content, separators=(",", ":")).encode()))
+        session.add(archived)
+        delete_game_rows(session, [game.id])
+        session.commit()
+        return archived
+
+    def read_by_game(self, session: Session, gid: int) -> Optional[ArchivedGame]:
+        return session.exec(select(ArchivedGame).where(ArchivedGame.game_id == gid)).first()
+
+    def archive_finished(self, session: Session, older_than: timedelta, limit: Optional[int] = None) -> List[int]:
+        """ Archiva las partidas finalizadas hace mas de `older_than` (los jugadores pueden seguir viendo el final) """
+        query = select(Game).where(Game.status == GameStatus.FINALIZED, Game.timestamp < datetime.now() - older_than)
+        if limit:
+            query = query.limit(limit)
+        archived_ids = []
+        for game in session.exec(query).all():
+            gid = game.id
+            try:
+                self.archive(session, game)
+            except IntegrityError as e:
+                # Una base SQLite creada antes de AUTOINCREMENT puede repetir ids: esa partida queda y el lote sigue
+                session.rollback()
+                _logger.error(f"No se pudo archivar la partida {gid}, ya hay una archivada con ese id: {e}")
+                continue
+            archived_ids.append(gid)
+        return archived_ids
+
+    @staticmethod
+    def load(archived: ArchivedGame) -> dict:
+        return json.loads(zlib.decompress(archived.data))
+
+
+def _archive_batch() -> List[int]:
+    with Session(db_engine) as session:
+        return ArchiveService().archive_finished(session, timedelta(minutes=settings.ARCHIVE_AFTER_MINUTES),
+                                                 limit=settings.ARCHIVE_BATCH_SIZE)
+
+
+async def archive_periodically():
+    """ Tarea del lifespan: cada ARCHIVE_INTERVAL_SECONDS archiva un lote en el threadpool, sin trabar el event loop """
+    while True:
+        await asyncio.sleep(settings.ARCHIVE_INTERVAL_SECONDS)
+        try:
+            archived_ids = await asyncio.to_thread(_archive_batch)
+            if archived_ids:
+                _logger.info(f"Partidas archivadas: {archived_ids}")
+        except Exception as e:
+            _logger.exception(f"Error archivando partidas: {e}")
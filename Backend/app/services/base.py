@@ -1,5 +1,7 @@
-from typing import Generic, TypeVar, Optional, List
+from typing import Dict, Generic, TypeVar, Optional, List
 
+from sqlalchemy import inspect
+from sqlalchemy.orm.util import identity_key
 from sqlmodel import SQLModel, Session, select, and_
 
 T = TypeVar("T")
@@ -18,6 +20,19 @@ class BaseService(Generic[T]):
     def read(self, session: Session, oid: int) -> Optional[T]:
         return session.get(self._metaclass, oid)
 
+    def read_many(self, session: Session, oids: List[int]) -> Dict[int, T]:
+        """ Lee varias filas con un solo SELECT ... IN; las que ya estan cargadas en la sesion no se vuelven a pedir """
+        rows = {}
+        for oid in oids:
+            obj = session.identity_map.get(identity_key(self._metaclass, oid))
+            if obj is not None and not inspect(obj).expired:
+                rows[oid] = obj
+        missing = [oid for oid in dict.fromkeys(oids) if oid not in rows]
+        if missing:
+            query = select(self._metaclass).where(self._metaclass.id.in_(missing))
+            rows.update({obj.id: obj for obj in session.exec(query)})
+        return rows
+
     async def update(self, session: Session, oid: int, data: dict) -> Optional[T]:
         updated_object = session.get(self._metaclass, oid)
         if not updated_object:
@@ -1,9 +1,11 @@
 from pydantic import BaseModel
+from sqlalchemy import insert
 from sqlmodel import Session
 
-from app.models.card import CardType, Card
+from app.models.card import CARD_CATALOGUE, CardType, Card, CardState
 from app.models.websocket import WebsocketMessage, notify_game_players
 from app.services.base import BaseService, T
+from app.services.game_log import log_inserts
 from typing import Optional, List
 import logging
 
@@ -13,8 +15,7 @@ class CreateCard(BaseModel):
     game_id: int
     owner: Optional[int] = None
     name: str
-    content: str
-    card_type: CardType
+    state: CardState = CardState.AVAILABLE
     pile_order: int
 
 class CardFilter(BaseModel):
@@ -30,11 +31,20 @@ class CardFilter(BaseModel):
     discarded_order__is_null: Optional[bool] = None
     turn_played__eq: Optional[int] = None
     turn_played__is_null: Optional[bool] = None
-    content__eq:Optional[str] = None
+    name__eq: Optional[str] = None
+    state__eq: Optional[CardState] = None
 
 class CardService(BaseService[Card]):
     _metaclass = Card
 
+    def _build_filter(self, filterby: dict):
+        # card_type no es columna: se filtra por las cartas del catalogo que son de esos tipos
+        card_types = filterby.get("card_type__in")
+        if card_types is not None:
+            filterby = {k: v for k, v in filterby.items() if k != "card_type__in"}
+            filterby["name__in"] = [d.name for d in CARD_CATALOGUE if d.card_type in card_types]
+        return super()._build_filter(filterby)
+
     async def create(self, session, data: dict) -> Optional[Card]:
         result = await super().create(session, data)
         if result:
@@ -43,24 +53,25 @@ class CardService(BaseService[Card]):
         return result
 
     async def create_bulk(self, session, data: List[dict]) -> List[Card]:
-        objs = [self._metaclass(**item) for item in data]
-        session.add_all(objs)
+        """ Inserta todas las cartas en un solo INSERT ... VALUES ... RETURNING, sin armar ni releer cada objeto """
+        # Todas las filas tienen que traer las mismas columnas, si no SQLAlchemy las parte en varios INSERT
+        objs = sorted(session.scalars(insert(self._metaclass).returning(self._metaclass), data), key=lambda o: o.id)
+        log_inserts(session, objs)
+        created = [o.model_dump() for o in objs]
         session.commit()
-        for obj in objs:
-            session.refresh(obj)
-        await notify_game_players(objs[0].game_id, WebsocketMessage(model="card", action="create", data=[o.model_dump() for o in objs], dest_game=objs[0].game_id, dest_user=None))
+        game_id = created[0]["game_id"]
+        await notify_game_players(game_id, WebsocketMessage(model="card", action="create", data=created, dest_game=game_id, dest_user=None))
         return objs
 
     async def bulk_update(self, session: Session, oids: List[int], data:List[dict]) -> Optional[List[Card]]:
-        updated_objects = []
-
-        for i, oid in enumerate(oids):
-            updated_object = session.get(self._metaclass, oid)
-            if not updated_object:
-                return None
-            for k, v in data[i].items():
+        # Un SELECT ... IN para todas y un UPDATE en bloque al hacer el flush
+        rows = self.read_many(session, oids)
+        if any(oid not in rows for oid in oids):
+            return None
+        updated_objects = [rows[oid] for oid in oids]
+        for updated_object, changes in zip(updated_objects, data):
+            for k, v in changes.items():
                 setattr(updated_object, k, v)
-            updated_objects.append(updated_object)
 
         session.commit()
 
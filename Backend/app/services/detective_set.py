@@ -4,6 +4,7 @@ from sqlmodel import Session, select
 from sqlalchemy.orm import joinedload
 import logging
 
+from app.engine.state import DETECTIVES_CHOOSE_PLAYERS
 from app.models.detective_set import DetectiveSet
 from app.models.card import Card, CardType
 from app.models.game import GameStatus, Game
@@ -38,29 +39,21 @@ class DetectiveSetService(BaseService[DetectiveSet]):
         return result
 
     async def create(self, session: Session, data: CreateDetectiveSet) -> DetectiveSet:
-        detective_set = DetectiveSet(owner=data.owner, turn_played=data.turn_played, game_id=data.game_id)
+        # Las cartas se leen con un solo SELECT ... IN (o salen de la sesion si el controller ya las leyo) y el
+        # flush inserta el set y les asigna el set_id en un UPDATE en bloque
+        cards = [card for card in CardService().read_many(session, data.detectives).values()
+                 if card.card_type == CardType.DETECTIVE]
+        detective_set = DetectiveSet(owner=data.owner, turn_played=data.turn_played, game_id=data.game_id, detectives=cards)
         session.add(detective_set)
         session.commit()
         session.refresh(detective_set)
 
-        card_service = CardService()
-        for cid in data.detectives:
-            card = card_service.read(session, cid)
-            if card and card.card_type == CardType.DETECTIVE:
-                card.set_id = detective_set.id  # se asume que Card tiene set_id
-                session.add(card)
-
-        session.commit()
-        session.refresh(detective_set)
-
-        # Notificación vía websocket a todos los jugadores del juego de las cartas
-        for card_id in data.detectives:
-            card = card_service.read(session, card_id)
-            if card:
-                await notify_game_players(
-                    card.game_id,
-                    WebsocketMessage(model="detective_set", action="create", data=detective_set.model_dump(), dest_game=card.game_id)
-                )
+        # Un solo mensaje por set a todos los jugadores del juego
+        if cards:
+            await notify_game_players(
+                data.game_id,
+                WebsocketMessage(model="detective_set", action="create", data=detective_set.model_dump(), dest_game=data.game_id)
+            )
 
         return detective_set
 
@@ -84,11 +77,10 @@ class DetectiveSetService(BaseService[DetectiveSet]):
         session.commit()
         session.refresh(detective_set)
 
-        for card in detective_set.detectives:
-            await notify_game_players(
-                card.game_id,
-                WebsocketMessage(model="detective_set", action="update", data=detective_set.model_dump(), dest_game=card.game_id)
-            )
+        await notify_game_players(
+            detective_set.game_id,
+            WebsocketMessage(model="detective_set", action="update", data=detective_set.model_dump(), dest_game=detective_set.game_id)
+        )
 
         return detective_set
 
@@ -97,18 +89,17 @@ class DetectiveSetService(BaseService[DetectiveSet]):
         if not detective_set:
             return None
 
+        model_data = detective_set.model_dump()
         session.delete(detective_set)
         session.commit()
 
-        for card in detective_set.detectives:
-            await notify_game_players(
-                card.game_id,
-                WebsocketMessage(model="detective_set", action="delete", data=detective_set.model_dump(), dest_game=card.game_id)
-            )
+        await notify_game_players(
+            model_data["game_id"],
+            WebsocketMessage(model="detective_set", action="delete", data=model_data, dest_game=model_data["game_id"])
+        )
 
         return id
 
-DETECTIVES_CHOOSE_PLAYERS = ["mr-satterthwaite","lady-eileen-bundle-brent","tuppence-beresford","tommy-beresford"]
 
 def set_have_detectives(d_set:DetectiveSet,d_names:List[str]):
     return any(d.name in d_names for d in d_set.detectives)
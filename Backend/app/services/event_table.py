@@ -3,19 +3,20 @@ from typing import Optional, List
 from sqlmodel import Session, SQLModel
 
 from app.services.base import BaseService
-from app.models.event_table import EventTable
+from app.models.event_table import EventTable, EventAction
 from app.models.websocket import WebsocketMessage, notify_game_players
 
 class PublicEventTable(SQLModel):
     id : int
     game_id: int
-    action: str
+    action: EventAction
     turn_played: int
     player_id: Optional[int] = None
     target_player: Optional[int]
     target_set: Optional[int]
     target_card: Optional[int]
     target_secret: Optional[int]
+    counter: int = 0
     completed_action: bool
 
 class EventTableFilter(BaseModel):
@@ -23,8 +24,8 @@ class EventTableFilter(BaseModel):
     game_id__eq: Optional[int] = None
     player_id__eq: Optional[int] = None
     completed_action__eq: Optional[bool] = None
-    action__eq: Optional[str] = None
-    action__in: Optional[List[str]] = None
+    action__eq: Optional[EventAction] = None
+    action__in: Optional[List[EventAction]] = None
 
 class EventTableService(BaseService[EventTable]):
     _metaclass = EventTable
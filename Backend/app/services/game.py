@@ -2,14 +2,23 @@ from datetime import datetime, timedelta
 
 import asyncio
 
-from sqlalchemy.sql.expression import delete
-from sqlmodel import Session
+from sqlalchemy.sql.expression import delete, update
+from sqlmodel import Session, select
+from app.actors import GAME_ACTORS
+from app.metrics import NOT_SO_FAST_WINDOWS
+from app.models.card import Card
+from app.models.chat import Chat
+from app.models.detective_set import DetectiveSet
+from app.models.event_table import EventTable, EventAction
 from app.models.player import Player
+from app.models.secret import Secret
 from app.models.websocket import WebsocketMessage, notify_game_players, notify_lobby
 from app.services.base import BaseService, T
 from app.models.game import Game, GameStatus
+from app.models.game_log import GameLogEntry, GameSnapshot
+from app.tracing import span
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 import logging
 
 from app.services.event_table import EventTableService
@@ -17,6 +26,11 @@ from app.services.event_table import EventTableService
 _logger = logging.getLogger(__name__)
 
 NOT_SO_FAST_TIME = 6
+# Unicos comandos de la partida que pueden ejecutarse mientras la ventana de NOT SO FAST esta abierta
+NOT_SO_FAST_COMMANDS = frozenset({"cancel_action"})
+
+# Dice quien tiene los secretos de asesino y complice: no sale en los mensajes a los jugadores
+PRIVATE_FIELDS = {"secret_tally"}
 
 class CreateGame(BaseModel):
     """ Informacion base para crear un Game """
@@ -38,60 +52,96 @@ class GameService(BaseService[Game]):
     _metaclass = Game
 
     async def update(self, session: Session, oid: int, data: dict) -> Optional[Game]:
+        if data.get("status") == GameStatus.FINALIZED:
+            # Despues de finalizar timestamp queda como la hora de fin, la usa el archivado
+            data = {**data, "timestamp": datetime.now()}
+        # Si otro request cambio la partida el UPDATE no encuentra la version leida y el StaleDataError termina en un
+        # 409: el comando entero se decidio sobre lo leido, reaplicar solo estos valores podria pisar ese cambio
         result = await super().update(session, oid, data)
         if result:
             session.refresh(result)
-            await notify_game_players(game_id=result.id, message=WebsocketMessage(model="game", action="update", data=result.model_dump(), dest_game=result.id, dest_user=None))
+            await notify_game_players(game_id=result.id, message=WebsocketMessage(model="game", action="update", data=result.model_dump(exclude=PRIVATE_FIELDS), dest_game=result.id, dest_user=None))
         return result
 
     async def create(self, session: Session, data: dict) -> Optional[T]:
         result = await super().create(session, data)
         if result:
             session.refresh(result)
-            await notify_lobby(message=WebsocketMessage(model="game", action="create", data=result.model_dump(), dest_game=None, dest_user=None))
+            await notify_lobby(message=WebsocketMessage(model="game", action="create", data=result.model_dump(exclude=PRIVATE_FIELDS), dest_game=None, dest_user=None))
         return result
 
     async def delete(self, session: Session, oid: int) -> Optional[int]:
-        session.exec(delete(Player).where(Player.game_id == oid))
-        model_data = session.get(Game, oid).model_dump()
-        result = await super().delete(session, oid)
-        if model_data and result:
-            await notify_game_players(model_data['id'], WebsocketMessage(model="game", action="delete", data=model_data, dest_game=model_data['id'], dest_user=None))
-            await notify_lobby(WebsocketMessage(model="game", action="delete", data=model_data, dest_game=None, dest_user=None))
-        return result
+        game = session.get(Game, oid)
+        if not game:
+            return None
+        model_data = game.model_dump(exclude=PRIVATE_FIELDS)
+        delete_game_rows(session, [oid])
+        session.commit()
+        await notify_game_players(oid, WebsocketMessage(model="game", action="delete", data=model_data, dest_game=oid, dest_user=None))
+        await notify_lobby(WebsocketMessage(model="game", action="delete", data=model_data, dest_game=None, dest_user=None))
+        return oid
+
+    async def delete_many(self, session: Session, oids: List[int]) -> List[int]:
+        """ Borra varias partidas en una transaccion; el lobby recibe un unico mensaje con todos los ids """
+        deleted_ids = list(session.exec(select(Game.id).where(Game.id.in_(oids))).all())
+        if not deleted_ids:
+            return []
+        delete_game_rows(session, deleted_ids)
+        session.commit()
+        for gid in deleted_ids:
+            await notify_game_players(gid, WebsocketMessage(model="game", action="delete", data={"id": gid}, dest_game=gid, dest_user=None))
+        await notify_lobby(WebsocketMessage(model="game", action="delete_many", data={"ids": deleted_ids}, dest_game=None, dest_user=None))
+        return deleted_ids
+
+def delete_game_rows(session: Session, game_ids: List[int]):
+    """ Borra las partidas y todas sus filas con un DELETE por tabla, sin hacer commit """
+    # Game y Player se referencian entre si, primero se corta el ciclo
+    session.exec(update(Game).where(Game.id.in_(game_ids)).values(owner=None, player_in_action=None))
+    for model in (GameLogEntry, GameSnapshot, Card, Secret, EventTable, Chat, DetectiveSet, Player):
+        session.exec(delete(model).where(model.game_id.in_(game_ids)))
+    session.exec(delete(Game).where(Game.id.in_(game_ids)))
 
 async def not_so_fast_status(game: Game, session: Session, obj_id: Optional[int] = None):
     game_service = GameService()
     event_service = EventTableService()
 
-    canceled_times_event= await event_service.create(session=session,data={"game_id":game.id,"turn_played":game.current_turn,"action":"canceled_times", "target_card":0})
+    canceled_times_event= await event_service.create(session=session,data={"game_id":game.id,"turn_played":game.current_turn,"action":EventAction.CANCELED_TIMES, "counter":0})
 
-    await event_service.create(session=session,data={"game_id":game.id,"turn_played":game.current_turn,"action":"to_cancel"})
+    await event_service.create(session=session,data={"game_id":game.id,"turn_played":game.current_turn,"action":EventAction.TO_CANCEL})
 
     game = await game_service.update(session=session, oid=game.id, data={"status": GameStatus.WAITING_FOR_CANCEL_ACTION, "timestamp": datetime.now()})
 
     last_timestamp: Optional[datetime] = None
 
-    while game.timestamp != last_timestamp:
-        last_timestamp = game.timestamp
+    NOT_SO_FAST_WINDOWS.inc()
+    try:
+        # Mientras dura la ventana los NOT SO FAST tienen que poder ejecutarse, el resto espera a que termine la jugada
+        async with GAME_ACTORS.window(game.id, NOT_SO_FAST_COMMANDS):
+            with span("not_so_fast_window", "wait"):
+                while game.timestamp != last_timestamp:
+                    last_timestamp = game.timestamp
+
+                    wake_up = last_timestamp + timedelta(seconds=NOT_SO_FAST_TIME)
 
-        wake_up = last_timestamp + timedelta(seconds=NOT_SO_FAST_TIME)
+                    while True:
 
-        while True:
+                        seconds_left = max((wake_up - datetime.now()).total_seconds(), 0)
+                        session.refresh(game)
 
-            seconds_left = max((wake_up - datetime.now()).total_seconds(), 0)
-            session.refresh(game)
+                        if seconds_left <= 0 or game.timestamp != last_timestamp:
+                            break
 
-            if seconds_left <= 0 or game.timestamp != last_timestamp:
-                break
+                        await notify_game_players(game.id, WebsocketMessage(model="timer", action="update_seconds",
+                                                                            data={"remaining_seconds": int(seconds_left)},
+                                                                            dest_game=game.id))
 
-            await notify_game_players(game.id, WebsocketMessage(model="timer", action="update_seconds",
-                                                                data={"remaining_seconds": int(seconds_left)},
-                                                                dest_game=game.id))
-            
 
-            await asyncio.sleep(1)
+                        await asyncio.sleep(1)
+    finally:
+        NOT_SO_FAST_WINDOWS.dec()
 
+    # Los cancel_action cambiaron filas que esta sesion tiene cargadas (cartas, eventos, la partida)
+    session.expire_all()
     session.refresh(canceled_times_event)
 
-    return canceled_times_event.target_card % 2 != 0
\ No newline at end of file
+    return canceled_times_event.counter % 2 != 0
\ No newline at end of file
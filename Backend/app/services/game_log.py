@@ -0,0 +1,207 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from pydantic_core import to_jsonable_python
+from sqlalchemy import event, func, inspect, insert
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.orm.util import identity_key
+from sqlmodel import Session, select
+
+from app.models.card import Card
+from app.models.detective_set import DetectiveSet
+from app.models.event_table import EventTable
+from app.models.game import Game
+from app.models.game_log import GameLogEntry, GameSnapshot, LogOperation
+from app.models.player import Player
+from app.models.secret import Secret
+from app.services.base import BaseService
+from app.settings import settings
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Tablas que forman el estado de una partida. El chat no cambia el estado y no se registra
+TRACKED_MODELS = {
+    Game: "game",
+    Player: "player",
+    Card: "card",
+    Secret: "secret",
+    DetectiveSet: "detective_set",
+    EventTable: "event_table",
+}
+HIDDEN_FIELDS = {Game: {"password"}, Player: {"token"}}
+
+
+def _game_id(obj) -> Optional[int]:
+    # Se lee del estado cargado para no disparar un SELECT en medio del flush (la fila puede estar borrada)
+    values = inspect(obj).dict
+    return values.get("id") if isinstance(obj, Game) else values.get("game_id")
+
+
+def _row(obj) -> dict:
+    # Las columnas que no se asignaron se insertaron como NULL y no estan en el dict del objeto
+    values = inspect(obj).dict
+    hidden = HIDDEN_FIELDS.get(type(obj), set())
+    return {attr.key: to_jsonable_python(values.get(attr.key)) for attr in inspect(obj).mapper.column_attrs
+            if attr.key not in hidden}
+
+
+def _changes(obj) -> dict:
+    state = inspect(obj)
+    hidden = HIDDEN_FIELDS.get(type(obj), set())
+    changes = {}
+    for attr in state.mapper.column_attrs:
+        history = state.attrs[attr.key].history
+        if attr.key not in hidden and history.added:
+            changes[attr.key] = to_jsonable_python(history.added[0])
+    if changes and isinstance(obj, Game):
+        # La version la incrementa SQLAlchemy en el UPDATE, no queda en el historial del atributo
+        changes["version"] = state.dict.get("version")
+    return changes
+
+
+def _collect(session: OrmSession) -> List[tuple]:
+    """ Arma (partida, objeto, operacion, datos) para cada fila de una partida que cambia en este flush """
+    entries = []
+    for obj in session.new:
+        if type(obj) in TRACKED_MODELS and _game_id(obj) is not None:
+            entries.append((_game_id(obj), obj, LogOperation.INSERT, _row(obj)))
+    for obj in session.dirty:
+        if type(obj) not in TRACKED_MODELS:
+            continue
+        changes = _changes(obj)
+        if not changes:
+            continue
+        if "game_id" in changes and not isinstance(obj, Game):
+            # Un jugador que entra o sale de una partida aparece o desaparece entero en el log de esa partida
+            previous = inspect(obj).attrs.game_id.history.deleted
+            if previous and previous[0] is not None:
+                entries.append((previous[0], obj, LogOperation.DELETE, {}))
+            if obj.game_id is not None:
+                entries.append((obj.game_id, obj, LogOperation.INSERT, _row(obj)))
+        elif _game_id(obj) is not None:
+            entries.append((_game_id(obj), obj, LogOperation.UPDATE, changes))
+    for obj in session.deleted:
+        if type(obj) in TRACKED_MODELS and _game_id(obj) is not None:
+            entries.append((_game_id(obj), obj, LogOperation.DELETE, {}))
+    return entries
+
+
+def _current_turns(session: OrmSession, game_ids: Set[int]) -> Dict[int, int]:
+    turns = {}
+    # Las partidas nuevas todavia no estan en el identity map durante el flush
+    candidates = [*session.new, *session.dirty, *session.deleted,
+                  *(session.identity_map.get(identity_key(Game, gid)) for gid in game_ids)]
+    for obj in candidates:
+        if isinstance(obj, Game) and "current_turn" in inspect(obj).dict:
+            turns[inspect(obj).dict["id"]] = obj.current_turn
+    missing = game_ids - turns.keys()
+    if missing:
+        rows = session.connection().execute(select(Game.id, Game.current_turn).where(Game.id.in_(missing)))
+        turns.update({gid: turn for gid, turn in rows})
+    return turns
+
+
+def _turn_changes(session: OrmSession) -> Dict[int, int]:
+    """ Partidas que en este flush pasaron a un turno multiplo de GAME_LOG_SNAPSHOT_EVERY_TURNS """
+    every = settings.GAME_LOG_SNAPSHOT_EVERY_TURNS
+    changed = {}
+    for obj in session.dirty:
+        if isinstance(obj, Game) and every and inspect(obj).attrs.current_turn.history.added:
+            if obj.current_turn and obj.current_turn % every == 0:
+                changed[obj.id] = obj.current_turn
+    return changed
+
+
+def game_state(connection, game_id: int) -> dict:
+    """ Estado actual de la partida leido de las tablas, con la misma forma que arma el replay """
+    state = {}
+    for model, table_name in TRACKED_MODELS.items():
+        column = model.id if model is Game else model.game_id
+        hidden = HIDDEN_FIELDS.get(model, set())
+        # Con el nombre del atributo, que no siempre es el de la columna (card.name se guarda en card_def_id)
+        columns = [attr.columns[0].label(attr.key) for attr in inspect(model).column_attrs if attr.key not in hidden]
+        rows = connection.execute(select(*columns).where(column == game_id)).mappings()
+        state[table_name] = {str(row["id"]): to_jsonable_python(dict(row)) for row in rows}
+    return state
+
+
+def _write(session: OrmSession, entries: List[tuple]):
+    connection = session.connection()
+    turns = _current_turns(session, {gid for gid, _, _, _ in entries})
+    now = datetime.now()
+    connection.execute(insert(GameLogEntry), [
+        {"game_id": gid, "turn": turns.get(gid, 0), "table_name": TRACKED_MODELS[type(obj)],
+         "row_id": inspect(obj).dict.get("id"), "operation": operation, "data": data, "created_at": now}
+        for gid, obj, operation, data in entries
+    ])
+
+
+def _after_flush(session: OrmSession, flush_context):
+    if not settings.GAME_LOG_ENABLED:
+        return
+    entries = _collect(session)
+    if not entries:
+        return
+    _write(session, entries)
+    connection = session.connection()
+    for gid, turn in _turn_changes(session).items():
+        last_entry_id = connection.execute(select(func.max(GameLogEntry.id)).where(GameLogEntry.game_id == gid)).scalar()
+        connection.execute(insert(GameSnapshot), [{"game_id": gid, "turn": turn, "last_entry_id": last_entry_id,
+                                                   "data": game_state(connection, gid)}])
+
+
+event.listen(OrmSession, "after_flush", _after_flush)
+
+
+def log_inserts(session: OrmSession, objs: List):
+    """ Registra filas creadas con un INSERT en bloque, que no pasan por el flush de la sesion """
+    if not settings.GAME_LOG_ENABLED:
+        return
+    entries = [(_game_id(obj), obj, LogOperation.INSERT, _row(obj)) for obj in objs
+               if type(obj) in TRACKED_MODELS and _game_id(obj) is not None]
+    if entries:
+        _write(session, entries)
+
+
+def apply_entry(state: dict, entry: GameLogEntry):
+    rows = state.setdefault(entry.table_name, {})
+    key = str(entry.row_id)
+    if entry.operation == LogOperation.INSERT:
+        rows[key] = dict(entry.data)
+    elif entry.operation == LogOperation.UPDATE:
+        rows.setdefault(key, {}).update(entry.data)
+    else:
+        rows.pop(key, None)
+
+
+class GameLogService(BaseService[GameLogEntry]):
+    _metaclass = GameLogEntry
+
+    def entries(self, session: Session, game_id: int, since: int = 0, limit: Optional[int] = None) -> List[GameLogEntry]:
+        """ Entradas del log posteriores a `since`, en el orden en que se escribieron """
+        query = select(GameLogEntry).where(GameLogEntry.game_id == game_id, GameLogEntry.id > since).order_by(GameLogEntry.id)
+        if limit:
+            query = query.limit(limit)
+        return session.exec(query).all()
+
+    def replay(self, session: Session, game_id: int, turn: Optional[int] = None) -> dict:
+        """ Reconstruye la partida al final de `turn` (o al dia) desde el snapshot anterior mas cercano """
+        query = select(GameSnapshot).where(GameSnapshot.game_id == game_id)
+        if turn is not None:
+            query = query.where(GameSnapshot.turn <= turn)
+        snapshot = session.exec(query.order_by(GameSnapshot.turn.desc(), GameSnapshot.id.desc()).limit(1)).first()
+
+        state = {table_name: {} for table_name in TRACKED_MODELS.values()}
+        since = 0
+        if snapshot:
+            state.update({table_name: {key: dict(row) for key, row in rows.items()} for table_name, rows in snapshot.data.items()})
+            since = snapshot.last_entry_id
+        query = select(GameLogEntry).where(GameLogEntry.game_id == game_id, GameLogEntry.id > since)
+        if turn is not None:
+            query = query.where(GameLogEntry.turn <= turn)
+        for entry in session.exec(query.order_by(GameLogEntry.id)):
+            apply_entry(state, entry)
+            since = entry.id
+        return {"game_id": game_id, "turn": turn, "last_entry_id": since, "state": state}
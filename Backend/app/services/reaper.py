@@ -0,0 +1,114 @@
+import asyncio
+import time
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy.sql.expression import delete, update
+from sqlmodel import Session, select
+
+from app.database.engine import db_engine
+from app.metrics import REGISTRY, Counter
+from app.models.game import Game, GameStatus
+from app.models.player import Player
+from app.models.websocket import GAME_CONNECTIONS, WebsocketMessage, notify_game_players, notify_lobby
+from app.services.game import delete_game_rows
+from app.settings import settings
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+REAPED_GAMES = REGISTRY.register(Counter(
+    "reaped_games_total", "Partidas abandonadas borradas por el reaper", ("status",)))
+REAPED_PLAYERS = REGISTRY.register(Counter(
+    "reaped_players_total", "Jugadores sin partida borrados por el reaper"))
+
+
+class Reaper:
+    """
+    Borra partidas abandonadas y jugadores que nunca quedaron asociados a una partida.
+
+    Una partida en WAITING esta abandonada si su dueño no tiene el websocket abierto; una en juego, si no queda
+    ningun jugador conectado. Las conexiones viven en memoria, asi que el reaper recuerda desde cuando ve a cada
+    partida (o jugador sin partida) en ese estado y la borra cuando supera el TTL de su estado. Las FINALIZED
+    no se tocan, de esas se encarga el archivado.
+    """
+
+    def __init__(self):
+        self.idle_since: Dict[int, float] = {}
+        self.orphan_since: Dict[int, float] = {}
+
+    def ttl(self, status: GameStatus) -> int:
+        return settings.REAPER_TTL_SECONDS.get(status.value, settings.REAPER_DEFAULT_TTL_SECONDS)
+
+    def sweep(self, session: Session, connected: Dict[int, Set[int]], now: float) -> Tuple[List[Tuple[int, GameStatus]], int]:
+        """ Borra lo vencido en una sola transaccion; devuelve (partidas borradas con su estado, jugadores borrados) """
+        expired: List[Tuple[int, GameStatus]] = []
+        idle_ids = set()
+        rows = session.exec(select(Game.id, Game.status, Game.owner).where(Game.status != GameStatus.FINALIZED)).all()
+        for game_id, status, owner in rows:
+            players_connected = connected.get(game_id, set())
+            idle = owner not in players_connected if status == GameStatus.WAITING else not players_connected
+            if not idle:
+                continue
+            idle_ids.add(game_id)
+            since = self.idle_since.setdefault(game_id, now)
+            if now - since >= self.ttl(GameStatus(status)):
+                expired.append((game_id, GameStatus(status)))
+        self.idle_since = {gid: since for gid, since in self.idle_since.items() if gid in idle_ids}
+
+        orphans = set(session.exec(select(Player.id).where(Player.game_id.is_(None))).all())
+        self.orphan_since = {pid: self.orphan_since.get(pid, now) for pid in orphans}
+        expired_orphans = [pid for pid, since in self.orphan_since.items()
+                           if now - since >= settings.REAPER_ORPHAN_PLAYER_TTL_SECONDS]
+
+        if not expired and not expired_orphans:
+            return [], 0
+
+        if expired:
+            delete_game_rows(session, [gid for gid, _ in expired])
+        if expired_orphans:
+            # Un create_game cortado a la mitad deja la partida apuntando al jugador sin partida
+            session.exec(update(Game).where(Game.owner.in_(expired_orphans)).values(owner=None, version=Game.version + 1))
+            session.exec(update(Game).where(Game.player_in_action.in_(expired_orphans))
+                         .values(player_in_action=None, version=Game.version + 1))
+            session.exec(delete(Player).where(Player.id.in_(expired_orphans), Player.game_id.is_(None)))
+        session.commit()
+
+        for gid, _ in expired:
+            self.idle_since.pop(gid, None)
+        for pid in expired_orphans:
+            self.orphan_since.pop(pid, None)
+        return expired, len(expired_orphans)
+
+    def _sweep_in_thread(self, connected: Dict[int, Set[int]]):
+        with Session(db_engine) as session:
+            return self.sweep(session, connected, time.monotonic())
+
+    async def run_once(self):
+        # Las conexiones se copian desde el event loop, el thread no toca GAME_CONNECTIONS
+        connected = {gid: set(players) for gid, players in GAME_CONNECTIONS.items()}
+        expired, orphans = await asyncio.to_thread(self._sweep_in_thread, connected)
+
+        for gid, status in expired:
+            REAPED_GAMES.inc(status.value)
+            if GAME_CONNECTIONS.get(gid):
+                await notify_game_players(gid, WebsocketMessage(model="game", action="delete", data={"id": gid},
+                                                                dest_game=gid, dest_user=None))
+        if orphans:
+            REAPED_PLAYERS.inc(amount=orphans)
+        if expired:
+            # Un solo mensaje para el lobby con todas las partidas borradas
+            await notify_lobby(WebsocketMessage(model="game", action="delete_many",
+                                                data={"ids": [gid for gid, _ in expired]}, dest_game=None, dest_user=None))
+            _logger.info(f"Reaper: partidas borradas {[gid for gid, _ in expired]}, jugadores sin partida {orphans}")
+
+    async def run_periodically(self):
+        while True:
+            await asyncio.sleep(settings.REAPER_INTERVAL_SECONDS)
+            try:
+                await self.run_once()
+            except Exception as e:
+                _logger.exception(f"Error en el reaper: {e}")
+
+
+REAPER = Reaper()
@@ -0,0 +1,45 @@
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from sqlmodel import Session
+
+from app.models.game import Game
+from app.models.player import Player
+from app.services.player import PlayerService
+
+
+class Seating:
+    """ Ronda de una partida: jugador en cada posicion, posicion de cada jugador y sus vecinos a cada lado """
+
+    def __init__(self, seats: Tuple[Tuple[int, int], ...]):
+        amount = len(seats)
+        self.by_position: Dict[int, int] = dict(seats)
+        self.positions: Dict[int, int] = {pid: position for position, pid in seats}
+        self.clockwise: Dict[int, Optional[int]] = {pid: self.by_position.get((position + 1) % amount) for position, pid in seats}
+        self.counter_clockwise: Dict[int, Optional[int]] = {pid: self.by_position.get((position - 1) % amount) for position, pid in seats}
+
+    def __len__(self) -> int:
+        return len(self.by_position)
+
+    def turn_owner(self, current_turn: int) -> Optional[int]:
+        return self.by_position.get(current_turn % len(self))
+
+    def neighbour(self, pid: int, clockwise: bool) -> Optional[int]:
+        return self.clockwise.get(pid) if clockwise else self.counter_clockwise.get(pid)
+
+
+@lru_cache(maxsize=1024)
+def _seating(seats: Tuple[Tuple[int, int], ...]) -> Seating:
+    return Seating(seats)
+
+
+def game_seating(session: Session, game: Game, players: Optional[List[Player]] = None) -> Seating:
+    """
+    Ronda fijada al empezar la partida (`game.seating`), sin consultas. Las partidas empezadas antes de guardarla la
+    arman con las posiciones de sus jugadores (los de `players` si ya estan cargados).
+    """
+    if game.seating:
+        return _seating(tuple(enumerate(game.seating)))
+    if players is None:
+        players = PlayerService().search(session=session, filterby={"game_id__eq": game.id})
+    return _seating(tuple(sorted((p.position, p.id) for p in players if p.position is not None)))
@@ -1,7 +1,9 @@
 from pydantic import BaseModel
+from app.models.game import Game
 from app.models.secret import SecretType, Secret
 from app.models.websocket import WebsocketMessage, notify_game_players
 from app.services.base import BaseService
+from app.services.secret_tally import SecretKey, move_secret
 from typing import Optional, List
 
 class CreateSecret(BaseModel):
@@ -20,10 +22,26 @@ class SecretFilter(BaseModel):
     type__in: Optional[List[SecretType]] = None
 
 
+def _key(data: dict, secret: Optional[Secret] = None) -> SecretKey:
+    owner, revealed, secret_type = (secret.owner, secret.revealed, secret.type) if secret else (None, False, None)
+    return data.get("owner", owner), data.get("revealed", revealed), SecretType(data.get("type", secret_type))
+
+
 class SecretService(BaseService[Secret]):
     _metaclass = Secret
 
+    def _track(self, session, game_id: int, before: Optional[SecretKey], after: Optional[SecretKey]):
+        """ Lleva el cambio al conteo de la partida, que se guarda en el mismo commit que el secreto """
+        if before == after:
+            return
+        game = session.get(Game, game_id)
+        # Las partidas empezadas antes de guardar el conteo no lo tienen y se siguen resolviendo con consultas
+        if game is None or game.secret_tally is None:
+            return
+        game.secret_tally = move_secret(game.secret_tally, before, after)
+
     async def create(self, session, data: dict) -> Optional[Secret]:
+        self._track(session, data["game_id"], None, _key(data))
         result = await super().create(session, data)
         if result:
             session.refresh(result)
@@ -32,6 +50,8 @@ class SecretService(BaseService[Secret]):
 
     async def create_bulk(self, session, data: List[dict]) -> List[Secret]:
         objs = [self._metaclass(**item) for item in data]
+        for item in data:
+            self._track(session, item["game_id"], None, _key(item))
         session.add_all(objs)
         session.commit()
         for obj in objs:
@@ -41,6 +61,9 @@ class SecretService(BaseService[Secret]):
 
 
     async def update(self, session, oid: int, data: dict) -> Optional[Secret]:
+        secret = session.get(Secret, oid)
+        if secret:
+            self._track(session, secret.game_id, _key({}, secret), _key(data, secret))
         result = await super().update(session, oid, data)
         if result:
             session.refresh(result)
@@ -48,7 +71,9 @@ class SecretService(BaseService[Secret]):
         return result
 
     async def delete(self, session, oid: int) -> Optional[int]:
-        model_data = session.get(Secret, oid).model_dump()
+        secret = session.get(Secret, oid)
+        model_data = secret.model_dump()
+        self._track(session, secret.game_id, _key({}, secret), None)
         result = await super().delete(session, oid)
         if model_data and result:
             await notify_game_players(model_data['game_id'], WebsocketMessage(model="secret", action="delete", data=model_data, dest_game=model_data['game_id'], dest_user=None))
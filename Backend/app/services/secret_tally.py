@@ -0,0 +1,56 @@
+import copy
+from typing import Iterable, Optional, Tuple
+
+from app.models.secret import SecretType
+
+# (owner, revealed, type) de un secreto, lo unico que mira el conteo
+SecretKey = Tuple[Optional[int], bool, SecretType]
+
+CULPRIT_TYPES = {SecretType.MURDERER, SecretType.ACCOMPLICE}
+
+
+def _secret_key(secret) -> SecretKey:
+    return secret.owner, secret.revealed, secret.type
+
+
+def _count(tally: dict, key: Optional[SecretKey], sign: int):
+    if key is None:
+        return
+    owner, revealed, secret_type = key
+    if revealed or owner is None:
+        return
+    hidden, culprit = tally["players"].get(str(owner), (0, 0))
+    # Los ocultos de un jugador sin secreto de asesino o complice son los que impiden terminar la partida
+    tally["innocent"] -= 0 if culprit else hidden
+    hidden += sign
+    culprit += sign if secret_type in CULPRIT_TYPES else 0
+    tally["innocent"] += 0 if culprit else hidden
+    tally["players"][str(owner)] = [hidden, culprit]
+
+
+def tally_secrets(secrets: Iterable) -> dict:
+    """
+    Conteo de secretos ocultos de una partida: {"players": {id: [ocultos, ocultos de asesino o complice]},
+    "innocent": ocultos de jugadores sin secreto culpable}. Se guarda en `game.secret_tally`
+    """
+    tally = {"players": {}, "innocent": 0}
+    for secret in secrets:
+        _count(tally, _secret_key(secret), 1)
+    return tally
+
+
+def move_secret(tally: dict, before: Optional[SecretKey], after: Optional[SecretKey]) -> dict:
+    """ Conteo nuevo despues de que un secreto cambia de dueño o de estado (None si se crea o se borra) """
+    tally = copy.deepcopy(tally)
+    _count(tally, before, -1)
+    _count(tally, after, 1)
+    return tally
+
+
+def hidden_secrets(tally: dict, pid: int) -> int:
+    return tally["players"].get(str(pid), (0, 0))[0]
+
+
+def culprits_cornered(tally: dict) -> bool:
+    """ Todos los secretos ocultos son de jugadores con secreto de asesino o complice: los inocentes cayeron en desgracia y gana el asesino """
+    return tally["innocent"] == 0
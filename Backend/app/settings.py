@@ -1,18 +1,69 @@
+from typing import Dict, Literal, Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     # Aplicacion
     DEBUG: bool = True
+    # Archivo donde se agregan las trazas de los efectos de cartas (JSON de OTLP, una por linea)
+    TRACES_FILE: Optional[str] = None
+    # Token para los endpoints de /api/admin, sin token quedan deshabilitados
+    ADMIN_TOKEN: Optional[str] = None
+    # Bloqueos del event loop a partir de los cuales se registra el stack, None deshabilita el watchdog
+    STALL_THRESHOLD_MS: Optional[float] = 100
 
     # Base de datos
+    # "sqlite" no necesita un proceso aparte: SQLITE_PATH es el archivo (en modo WAL) o ":memory:"
+    DB_BACKEND: Literal["postgresql", "sqlite"] = "postgresql"
+    SQLITE_PATH: str = "acdoc.db"
     DB_HOST: str = 'localhost'
     DB_USER: str = 'postgres'
     DB_PORT: int = 5432
     DB_NAME: str = 'takehome'
     DB_PASSWORD: str = "CHANGEME"
 
+    # Replica de solo lectura (misma base, usuario y contraseña). Sin host las lecturas van a la base principal
+    DB_REPLICA_HOST: Optional[str] = None
+    DB_REPLICA_PORT: int = 5432
+
+    # Pool de conexiones. Si un request espera mas de DB_POOL_TIMEOUT segundos por una conexion se corta con un 503
+    # (y Retry-After) en vez de seguir acumulando latencia
+    DB_POOL_SIZE: int = 30
+    DB_MAX_OVERFLOW: int = 0
+    DB_POOL_TIMEOUT: float = 5
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+    DB_POOL_RETRY_AFTER: int = 2
+    # Las partidas finalizadas hace mas de ARCHIVE_AFTER_MINUTES se mueven a archivedgame, None deshabilita el archivado
+    ARCHIVE_AFTER_MINUTES: Optional[int] = 30
+    ARCHIVE_INTERVAL_SECONDS: int = 300
+    ARCHIVE_BATCH_SIZE: int = 50
+
+    # Reaper: cada REAPER_INTERVAL_SECONDS borra las partidas abandonadas (WAITING sin el dueño conectado, en juego sin
+    # nadie conectado) que superaron el TTL de su estado, y los jugadores que quedaron sin partida. None lo deshabilita
+    REAPER_INTERVAL_SECONDS: Optional[int] = 60
+    REAPER_TTL_SECONDS: Dict[str, int] = {"waiting": 600}
+    REAPER_DEFAULT_TTL_SECONDS: int = 1800
+    REAPER_ORPHAN_PLAYER_TTL_SECONDS: int = 600
+
+    # Log de eventos de cada partida: todo cambio de sus filas queda registrado y cada
+    # GAME_LOG_SNAPSHOT_EVERY_TURNS turnos se guarda un snapshot completo desde donde reconstruirla
+    GAME_LOG_ENABLED: bool = True
+    GAME_LOG_SNAPSHOT_EVERY_TURNS: int = 5
+
+    # Sentencias SQL compiladas que SQLAlchemy guarda para no volver a compilarlas
+    DB_QUERY_CACHE_SIZE: int = 500
+
     @property
     def db_url(self):
+        if self.DB_BACKEND == "sqlite":
+            return "sqlite://" if self.SQLITE_PATH == ":memory:" else f"sqlite:///{self.SQLITE_PATH}"
         return f'postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}'
 
+    @property
+    def db_replica_url(self) -> Optional[str]:
+        if self.DB_BACKEND != "postgresql" or not self.DB_REPLICA_HOST:
+            return None
+        return f'postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_REPLICA_HOST}:{self.DB_REPLICA_PORT}/{self.DB_NAME}'
+
 settings = Settings(_env_file='.env')
\ No newline at end of file
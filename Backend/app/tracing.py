@@ -0,0 +1,194 @@
+"""
+Trazas de los efectos de cartas.
+
+Cada ejecucion de un efecto abre un span raiz; adentro se abren spans de `broadcast` (notify_*) y `wait`
+(ventana de NOT SO FAST), y el tiempo de las sentencias SQL se suma al span que este activo. Al cerrar la
+raiz el tiempo se reparte en db / broadcast / wait / logic (lo que queda) y se acumula en /metrics por carta y
+estado de la partida. Si `settings.TRACES_FILE` esta definido ademas se agrega la traza completa como una linea
+de JSON con el formato de OTLP (resourceSpans), que se puede leer con `python -m app.tracing <archivo>`.
+"""
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from app.metrics import CARD_EFFECT_DURATION, CARD_EFFECT_PHASE_SECONDS
+from app.settings import settings
+
+PHASES = ("db", "broadcast", "wait", "logic")
+
+
+class Span:
+    __slots__ = ("name", "kind", "trace", "span_id", "parent", "start", "end", "attributes", "db_time", "db_queries",
+                 "children_time")
+
+    def __init__(self, name: str, kind: str, trace: "Trace", parent: Optional["Span"], attributes: dict):
+        self.name = name
+        self.kind = kind
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent = parent
+        self.start = time.time_ns()
+        self.end: Optional[int] = None
+        self.attributes = attributes
+        self.db_time = 0.0
+        self.db_queries = 0
+        self.children_time = 0.0
+
+    @property
+    def duration(self) -> float:
+        return ((self.end or time.time_ns()) - self.start) / 1e9
+
+    def self_time(self) -> float:
+        return max(self.duration - self.children_time - self.db_time, 0.0)
+
+
+class Trace:
+    __slots__ = ("trace_id", "spans")
+
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans: List[Span] = []
+
+    def phases(self) -> Dict[str, float]:
+        totals = dict.fromkeys(PHASES, 0.0)
+        for s in self.spans:
+            totals["db"] += s.db_time
+            totals[s.kind if s.kind in ("broadcast", "wait") else "logic"] += s.self_time()
+        return totals
+
+
+CURRENT_SPAN: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes):
+    """ Span hijo del span activo; fuera de una traza no hace nada """
+    parent = CURRENT_SPAN.get()
+    if parent is None:
+        yield None
+        return
+    current = Span(name, kind, parent.trace, parent, attributes)
+    parent.trace.spans.append(current)
+    reset_token = CURRENT_SPAN.set(current)
+    try:
+        yield current
+    finally:
+        CURRENT_SPAN.reset(reset_token)
+        current.end = time.time_ns()
+        parent.children_time += current.duration
+
+
+@contextmanager
+def trace_card_effect(card_name: str, status: str, **attributes):
+    """ Span raiz de una fase de un efecto de carta """
+    trace = Trace()
+    root = Span("card_effect", "internal", trace, None, {"card": card_name, "status": status, **attributes})
+    trace.spans.append(root)
+    reset_token = CURRENT_SPAN.set(root)
+    try:
+        yield root
+    finally:
+        CURRENT_SPAN.reset(reset_token)
+        root.end = time.time_ns()
+        CARD_EFFECT_DURATION.observe(root.duration, card_name, status)
+        for phase, seconds in trace.phases().items():
+            CARD_EFFECT_PHASE_SECONDS.inc(card_name, status, phase, amount=seconds)
+        if settings.TRACES_FILE:
+            export(trace, settings.TRACES_FILE)
+
+
+def record_query(elapsed: float):
+    current = CURRENT_SPAN.get()
+    if current is not None:
+        current.db_time += elapsed
+        current.db_queries += 1
+
+
+def _attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def to_otlp(trace: Trace) -> dict:
+    spans = []
+    for s in trace.spans:
+        attributes = {**s.attributes, "span.kind": s.kind, "db.time_ms": round(s.db_time * 1000, 3),
+                      "db.queries": s.db_queries}
+        spans.append({
+            "traceId": trace.trace_id,
+            "spanId": s.span_id,
+            "parentSpanId": s.parent.span_id if s.parent else "",
+            "name": s.name,
+            "kind": 1,
+            "startTimeUnixNano": str(s.start),
+            "endTimeUnixNano": str(s.end or s.start),
+            "attributes": [_attribute(k, v) for k, v in attributes.items()],
+        })
+    return {"resourceSpans": [{
+        "resource": {"attributes": [_attribute("service.name", "acdoc-backend")]},
+        "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}],
+    }]}
+
+
+def export(trace: Trace, path: str):
+    with open(path, "a") as traces_file:
+        traces_file.write(json.dumps(to_otlp(trace), separators=(",", ":")) + "\n")
+
+
+def summarize(path: str) -> Dict[tuple, Dict[str, float]]:
+    """ Suma por (carta, estado) del tiempo en cada fase de las trazas exportadas """
+    totals: Dict[tuple, Dict[str, float]] = {}
+    with open(path) as traces_file:
+        for line in traces_file:
+            spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+            by_id = {s["spanId"]: s for s in spans}
+            children_time: Dict[str, float] = {}
+            for s in spans:
+                if s["parentSpanId"]:
+                    children_time[s["parentSpanId"]] = children_time.get(s["parentSpanId"], 0.0) + _duration(s)
+            root = next(s for s in spans if not s["parentSpanId"])
+            root_attributes = _attributes(root)
+            entry = totals.setdefault((root_attributes["card"], root_attributes["status"]),
+                                      {"count": 0, **dict.fromkeys(PHASES, 0.0)})
+            entry["count"] += 1
+            for span_id, s in by_id.items():
+                attributes = _attributes(s)
+                db_time = attributes["db.time_ms"] / 1000
+                self_time = max(_duration(s) - children_time.get(span_id, 0.0) - db_time, 0.0)
+                entry["db"] += db_time
+                entry[attributes["span.kind"] if attributes["span.kind"] in ("broadcast", "wait") else "logic"] += self_time
+    return totals
+
+
+def _duration(otlp_span: dict) -> float:
+    return (int(otlp_span["endTimeUnixNano"]) - int(otlp_span["startTimeUnixNano"])) / 1e9
+
+
+def _attributes(otlp_span: dict) -> dict:
+    result = {}
+    for a in otlp_span["attributes"]:
+        value = next(iter(a["value"].values()))
+        result[a["key"]] = int(value) if "intValue" in a["value"] else value
+    return result
+
+
+def main():
+    totals = summarize(sys.argv[1])
+    print(f"{'carta':<30}{'estado':<40}{'n':>6}" + "".join(f"{p + ' ms':>12}" for p in PHASES) + f"{'domina':>12}")
+    for (card, status), entry in sorted(totals.items()):
+        dominant = max(PHASES, key=lambda p: entry[p])
+        print(f"{card:<30}{status:<40}{entry['count']:>6}"
+              + "".join(f"{entry[p] / entry['count'] * 1000:>12.1f}" for p in PHASES) + f"{dominant:>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Watchdog de bloqueos del event loop.
+
+El latido del loop es `app.profiler.HEARTBEAT`, el mismo del profiler, que ademas mide cuanto se atraso (lag). Un
+thread aparte revisa esos latidos: cuando pasa mas de `threshold` sin uno, el loop esta bloqueado por codigo
+sincronico (las consultas de `BaseService`, `session.refresh`, `session.commit`...) y se toma el stack del thread del
+loop para ver donde. Los bloqueos se agrupan con `app.profiler.call_site`: el frame mas profundo de la app y la
+funcion externa que estaba corriendo.
+"""
+import asyncio
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+from app.metrics import REGISTRY, Counter
+from app.profiler import HEARTBEAT, call_site, capture_stack
+from app.settings import settings
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+EVENT_LOOP_STALLS = REGISTRY.register(Counter(
+    "event_loop_stalls_total", "Bloqueos del event loop por punto de llamada", ("call_site",)))
+EVENT_LOOP_STALL_SECONDS = REGISTRY.register(Counter(
+    "event_loop_stall_seconds_total", "Tiempo bloqueado del event loop por punto de llamada", ("call_site",)))
+
+
+class StallWatchdog:
+    def __init__(self, threshold_ms: float = 100):
+        self.threshold = threshold_ms / 1000
+        self.interval = max(self.threshold / 4, 0.001)
+        self.report: Dict[str, dict] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _watch(self):
+        stalled_since: Optional[float] = None
+        sites: Dict[str, int] = {}
+        stack = ()
+        while not self._stop.wait(self.interval):
+            last_beat = HEARTBEAT.last_beat
+            if stalled_since is not None and last_beat > stalled_since:
+                site = max(sites, key=sites.get)
+                self._loop.call_soon_threadsafe(self._record, site, last_beat - stalled_since, stack)
+                stalled_since, sites = None, {}
+            if time.perf_counter() - last_beat > self.threshold:
+                frame = sys._current_frames().get(self._loop_thread)
+                if frame is None:
+                    continue
+                sample = capture_stack(frame)
+                site = call_site(sample)
+                sites[site] = sites.get(site, 0) + 1
+                if stalled_since is None:
+                    stack = sample
+                stalled_since = last_beat
+                del frame
+
+    def _record(self, site: str, duration: float, stack):
+        EVENT_LOOP_STALLS.inc(site)
+        EVENT_LOOP_STALL_SECONDS.inc(site, amount=duration)
+        entry = self.report.setdefault(site, {"call_site": site, "count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        entry["count"] += 1
+        entry["total_ms"] += duration * 1000
+        entry["max_ms"] = max(entry["max_ms"], duration * 1000)
+        entry["stack"] = ";".join(f"{name} ({filename}:{line})" for name, filename, line in stack)
+        _logger.warning(f"Event loop bloqueado {duration * 1000:.0f}ms en {site}")
+
+    def summary(self) -> list:
+        return sorted(self.report.values(), key=lambda e: e["total_ms"], reverse=True)
+
+    def start(self):
+        """ Se llama desde el event loop que se quiere vigilar """
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._stop.clear()
+        HEARTBEAT.acquire(self.interval)
+        self._thread = threading.Thread(target=self._watch, name="stall-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._thread:
+            await asyncio.to_thread(self._thread.join)
+            HEARTBEAT.release(self.interval)
+            self._thread = None
+
+
+WATCHDOG = StallWatchdog(settings.STALL_THRESHOLD_MS or 100)
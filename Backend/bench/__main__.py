@@ -0,0 +1,126 @@
+import argparse
+import asyncio
+import random
+import threading
+import time
+
+import httpx
+
+from bench.bot import GameRun
+from bench.stats import LatencyRecorder, PoolSampler, format_report, parse_gauges
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Simula partidas concurrentes jugadas por bots")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="URL del servidor a medir")
+    parser.add_argument("--games", type=int, default=20, help="Cantidad total de partidas a jugar")
+    parser.add_argument("--concurrency", type=int, default=None, help="Partidas en simultaneo (por defecto todas)")
+    parser.add_argument("--players", type=int, default=4, help="Jugadores por partida (2 a 6)")
+    parser.add_argument("--max-turns", type=int, default=60, help="Turnos maximos antes de cortar una partida")
+    parser.add_argument("--nsf-probability", type=float, default=0.3, help="Probabilidad de intentar un NOT SO FAST")
+    parser.add_argument("--play-probability", type=float, default=0.5, help="Probabilidad de jugar un set o evento por turno")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--serve", action="store_true",
+                        help="Levanta el servidor en este proceso (el pool se mide directo en vez de leer /metrics)")
+    parser.add_argument("--port", type=int, default=8765, help="Puerto del servidor levantado con --serve")
+    return parser.parse_args()
+
+
+def start_server(port: int):
+    import uvicorn
+    from app.main import base_app
+
+    server = uvicorn.Server(uvicorn.Config(app=base_app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+async def sample_pool(sampler: PoolSampler, stop: asyncio.Event):
+    from app.database.engine import db_engine
+
+    while not stop.is_set():
+        sampler.record(db_engine.pool.checkedout())
+        await asyncio.sleep(0.1)
+
+
+async def scrape_pool(client: httpx.AsyncClient, sampler: PoolSampler, stop: asyncio.Event):
+    """ Con el servidor en otro proceso el uso del pool se lee de /metrics """
+    while not stop.is_set():
+        try:
+            response = await client.get("/metrics")
+            gauges = parse_gauges(response.text)
+            sampler.capacity = int(gauges["db_pool_size"] + gauges.get("db_pool_max_overflow", 0))
+            sampler.record(int(gauges["db_pool_checked_out"]))
+        except (httpx.HTTPError, KeyError, ValueError):
+            return
+        await asyncio.sleep(0.5)
+
+
+async def run(args) -> str:
+    rng = random.Random(args.seed)
+    recorder = LatencyRecorder()
+    base_url = f"http://127.0.0.1:{args.port}" if args.serve else args.base_url.rstrip("/")
+    ws_url = base_url.replace("http", "ws", 1)
+
+    semaphore = asyncio.Semaphore(args.concurrency or args.games)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    stop = asyncio.Event()
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        pool = None
+        if args.serve:
+            from app.database.engine import db_engine
+            pool = db_engine.pool
+        # Con SQLite en memoria (StaticPool) no hay pool que medir y /metrics tampoco lo expone
+        if pool is not None and hasattr(pool, "checkedout"):
+            from app.settings import settings
+            sampler = PoolSampler(capacity=pool.size() + settings.DB_MAX_OVERFLOW)
+            sampler_task = asyncio.create_task(sample_pool(sampler, stop))
+        else:
+            sampler = PoolSampler(capacity=0)
+            sampler_task = asyncio.create_task(scrape_pool(client, sampler, stop))
+
+        async def one_game():
+            async with semaphore:
+                game_run = GameRun(client, ws_url, recorder, args.players, random.Random(rng.random()),
+                                   nsf_probability=args.nsf_probability, play_probability=args.play_probability,
+                                   max_turns=args.max_turns)
+                result = await game_run.play()
+                return result, (game_run.game or {}).get("current_turn", 0)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(one_game() for _ in range(args.games)))
+        elapsed = time.perf_counter() - start
+
+        stop.set()
+        await sampler_task
+
+    games = {
+        "finished": sum(1 for r, _ in results if r == "finished"),
+        "truncated": sum(1 for r, _ in results if r == "truncated"),
+        "stuck": sum(1 for r, _ in results if r == "stuck"),
+        "turns": sum(t for _, t in results),
+        "elapsed": elapsed,
+    }
+    return format_report(recorder.summary(), sampler.summary(), games)
+
+
+def main():
+    logging.basicConfig(level=logging.WARNING)
+    args = parse_args()
+    if not 2 <= args.players <= 6:
+        raise SystemExit("La cantidad de jugadores debe estar entre 2 y 6")
+    if args.serve:
+        start_server(args.port)
+    print(asyncio.run(run(args)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,327 @@
+import asyncio
+import json
+import random
+import time
+from typing import Dict, List, Optional, Set
+
+import httpx
+from websockets.asyncio.client import connect
+
+from app.models.game import GameStatus
+from app.services.detective_set import DETECTIVES_CHOOSE_PLAYERS
+from bench.stats import LatencyRecorder
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+BIRTHDAY = "1990-05-17T00:00:00+00:00"
+# Si no llega ningun frame de partida en este tiempo se vuelve a consultar el estado
+STATE_TIMEOUT = 20
+MAX_IDLE_TIMEOUTS = 3
+# Eventos que los bots saben resolver de punta a punta
+PLAYABLE_EVENTS = {"look-into-the-ashes", "cards-off-the-table", "delay-the-murderers-escape", "early-train-to-paddington"}
+# Sets que solo necesitan elegir jugador y/o secreto oculto
+SET_DETECTIVES = {"miss-marple", "hercule-poirot", "tommy-beresford", "tuppence-beresford",
+                  "lady-eileen-bundle-brent", "mr-satterthwaite"}
+
+
+class Bot:
+    """ Jugador simulado: mantiene su websocket abierto y ejecuta las acciones que le pide la partida """
+
+    def __init__(self, run: "GameRun", player: dict):
+        self.run = run
+        self.id: int = player["id"]
+        self.token: str = player["token"]
+        self.position: Optional[int] = None
+        self.connected = asyncio.Event()
+        self.listener: Optional[asyncio.Task] = None
+
+    async def listen(self):
+        try:
+            async with connect(f"{self.run.ws_url}/ws/monolithic?token={self.token}") as ws:
+                self.connected.set()
+                async for raw in ws:
+                    self.run.on_frame(self, json.loads(raw), time.perf_counter())
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            _logger.warning(f"Websocket del bot {self.id} cerrado: {e}")
+        finally:
+            self.connected.set()
+
+    async def hand(self) -> List[dict]:
+        cards = await self.run.call("POST", "/api/card/search", "/api/card/search",
+                                    json={"game_id__eq": self.run.game_id, "owner__eq": self.id, "set_id__is_null": True})
+        return cards or []
+
+    async def play_card(self, cid: int, **targets) -> bool:
+        result = await self.run.call("POST", "/api/card/play_card/{cid}", f"/api/card/play_card/{cid}",
+                                     params={"token": self.token}, json=targets, actor=self)
+        return result is not None
+
+    async def discard(self, cards: List[dict]) -> bool:
+        dto = {"turn_discarded": self.run.game["current_turn"], "token": self.token}
+        result = await self.run.call("PATCH", "/api/card", "/api/card",
+                                     json={"cids": [c["id"] for c in cards], "dto": dto}, actor=self)
+        return result is not None
+
+    async def end_turn(self) -> bool:
+        result = await self.run.call("PATCH", "/api/game/{gid}", f"/api/game/{self.run.game_id}",
+                                     json={"current_turn": self.run.game["current_turn"] + 1, "token": self.token}, actor=self)
+        return result is not None
+
+
+class GameRun:
+    """ Una partida completa jugada por bots, de la creacion hasta FINALIZED o el limite de turnos """
+
+    def __init__(self, client: httpx.AsyncClient, ws_url: str, recorder: LatencyRecorder, players: int,
+                 rng: random.Random, nsf_probability: float = 0.3, play_probability: float = 0.5, max_turns: int = 60):
+        self.client = client
+        self.ws_url = ws_url
+        self.recorder = recorder
+        self.players = players
+        self.rng = rng
+        self.nsf_probability = nsf_probability
+        self.play_probability = play_probability
+        self.max_turns = max_turns
+
+        self.game_id: Optional[int] = None
+        self.game: Optional[dict] = None
+        self.bots: Dict[int, Bot] = {}
+        self.owner: Optional[Bot] = None
+        self.state_changed = asyncio.Event()
+        self.result: str = "stuck"
+
+        # Accion en curso del jugador de turno y lo que se jugo para resolver las fases siguientes
+        self.busy: Optional[asyncio.Task] = None
+        self.pending: Optional[dict] = None
+        self.cancel_windows: Set[tuple] = set()
+        self.tasks: Set[asyncio.Task] = set()
+
+        # Demora de broadcast: desde que se envia una accion hasta el primer frame de cada jugador
+        self.action_sent_at: Optional[float] = None
+        self.waiting_frame: Set[int] = set()
+
+    async def call(self, method: str, template: str, url: str, actor: Optional[Bot] = None, **kwargs):
+        if actor:
+            self.action_sent_at = time.perf_counter()
+            self.waiting_frame = set(self.bots)
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            ok = response.status_code < 400
+        except httpx.HTTPError as e:
+            _logger.warning(f"{method} {url} fallo: {e}")
+            response, ok = None, False
+        self.recorder.record(f"{method} {template}", time.perf_counter() - start, ok)
+        if not ok:
+            if response is not None:
+                _logger.debug(f"{method} {url} -> {response.status_code} {response.text}")
+            return None
+        return response.json()
+
+    def on_frame(self, bot: Bot, message: dict, received_at: float):
+        if self.action_sent_at is not None and bot.id in self.waiting_frame:
+            self.waiting_frame.discard(bot.id)
+            self.recorder.record("WS broadcast", received_at - self.action_sent_at)
+        if bot is self.owner and message.get("model") == "game" and message.get("action") == "update":
+            self.game = message["data"]
+            self.state_changed.set()
+
+    def spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self.tasks.add(task)
+
+        def done(t: asyncio.Task):
+            self.tasks.discard(t)
+            # Al terminar una accion se vuelve a evaluar el estado aunque no haya llegado un frame nuevo
+            self.state_changed.set()
+        task.add_done_callback(done)
+        return task
+
+    async def setup(self):
+        created = await self.call("POST", "/api/game", "/api/game/", json={
+            "game_name": f"bench-{self.rng.randint(0, 9999)}", "min_players": 2, "max_players": self.players,
+            "player_name": "bot-0", "avatar": "bench", "birthday": BIRTHDAY})
+        if not created:
+            raise RuntimeError("No se pudo crear la partida")
+        self.game_id = created["game"]["id"]
+        self.owner = Bot(self, created["player"])
+        self.bots[self.owner.id] = self.owner
+
+        for i in range(1, self.players):
+            player = await self.call("POST", "/api/player/{gid}", f"/api/player/{self.game_id}", json={
+                "player_name": f"bot-{i}", "player_date_of_birth": BIRTHDAY, "avatar": "bench"})
+            if not player:
+                raise RuntimeError(f"No se pudo unir el bot {i} a la partida {self.game_id}")
+            self.bots[player["id"]] = Bot(self, player)
+
+        for bot in self.bots.values():
+            bot.listener = asyncio.create_task(bot.listen())
+        await asyncio.gather(*(b.connected.wait() for b in self.bots.values()))
+
+        started = await self.call("PATCH", "/api/game/{gid}", f"/api/game/{self.game_id}",
+                                  json={"status": GameStatus.STARTED.value, "token": self.owner.token}, actor=self.owner)
+        if not started:
+            raise RuntimeError(f"No se pudo empezar la partida {self.game_id}")
+
+        players = await self.call("POST", "/api/player/search", "/api/player/search", json={"game_id__eq": self.game_id})
+        for p in players or []:
+            self.bots[p["id"]].position = p["position"]
+        self.game = started
+        self.state_changed.set()
+
+    async def play(self) -> str:
+        try:
+            await self.setup()
+            idle = 0
+            while True:
+                try:
+                    await asyncio.wait_for(self.state_changed.wait(), timeout=STATE_TIMEOUT)
+                    idle = 0
+                except asyncio.TimeoutError:
+                    idle += 1
+                    if idle > MAX_IDLE_TIMEOUTS:
+                        _logger.warning(f"Partida {self.game_id} trabada en {self.game['status']}")
+                        self.result = "stuck"
+                        break
+                    game = await self.call("GET", "/api/game/{gid}", f"/api/game/{self.game_id}")
+                    if game:
+                        self.game = game
+                self.state_changed.clear()
+
+                if self.game["status"] == GameStatus.FINALIZED.value:
+                    self.result = "finished"
+                    break
+                if self.game["current_turn"] >= self.max_turns:
+                    self.result = "truncated"
+                    break
+                self.decide()
+        except Exception as e:
+            _logger.warning(f"Partida {self.game_id} abortada: {e}")
+            self.result = "stuck"
+        finally:
+            for task in [*self.tasks, *(b.listener for b in self.bots.values() if b.listener)]:
+                task.cancel()
+            await asyncio.gather(*self.tasks, *(b.listener for b in self.bots.values() if b.listener),
+                                 return_exceptions=True)
+        return self.result
+
+    def current_bot(self) -> Bot:
+        position = self.game["current_turn"] % len(self.bots)
+        return next(b for b in self.bots.values() if b.position == position)
+
+    def decide(self):
+        status = self.game["status"]
+
+        if status == GameStatus.WAITING_FOR_CANCEL_ACTION.value:
+            self.maybe_cancel()
+            return
+
+        if self.busy and not self.busy.done():
+            return
+
+        in_action = self.bots.get(self.game["player_in_action"])
+        if status == GameStatus.TURN_START.value:
+            self.busy = self.spawn(self.start_turn(self.current_bot()))
+        elif status in {GameStatus.FINALIZE_TURN.value, GameStatus.FINALIZE_TURN_DRAFT.value}:
+            self.busy = self.spawn(self.finish_turn(self.current_bot()))
+        elif in_action and self.pending:
+            self.busy = self.spawn(self.resolve(in_action, status))
+
+    def maybe_cancel(self):
+        window = (self.game["current_turn"], self.game["timestamp"])
+        if window in self.cancel_windows:
+            return
+        self.cancel_windows.add(window)
+        actor = self.current_bot()
+        for bot in self.bots.values():
+            if bot is not actor and self.rng.random() < self.nsf_probability:
+                self.spawn(self.cancel(bot, self.rng.uniform(0.3, 2.0)))
+                break
+
+    async def cancel(self, bot: Bot, delay: float):
+        await asyncio.sleep(delay)
+        nsf = [c for c in await bot.hand() if c["name"] == "not-so-fast"]
+        if not nsf:
+            return
+        events = await self.call("POST", "/api/event_table/search", "/api/event_table/search", json={
+            "game_id__eq": self.game_id, "turn_played__eq": self.game["current_turn"],
+            "action__eq": "to_cancel", "completed_action__eq": False})
+        if not events:
+            return
+        last_event = max(events, key=lambda e: e["id"])
+        await self.call("POST", "/api/card/cancel_action/{oid}", f"/api/card/cancel_action/{last_event['id']}",
+                        json={"not_so_fast": nsf[0]["id"], "token": bot.token}, actor=bot)
+
+    async def start_turn(self, bot: Bot):
+        self.pending = None
+        hand = await bot.hand()
+        if self.rng.random() < self.play_probability:
+            by_name: Dict[str, List[dict]] = {}
+            for c in hand:
+                by_name.setdefault(c["name"], []).append(c)
+            pairs = [cards[:2] for name, cards in by_name.items() if name in SET_DETECTIVES and len(cards) >= 2]
+            events = [c for c in hand if c["name"] in PLAYABLE_EVENTS]
+
+            if pairs and (not events or self.rng.random() < 0.5):
+                cards = self.rng.choice(pairs)
+                self.pending = {"kind": "set", "names": {c["name"] for c in cards}, "owner": bot.id}
+                detective_set = await self.call("POST", "/api/detective_set", "/api/detective_set/",
+                                                params={"token": bot.token},
+                                                json={"detectives": [c["id"] for c in cards]}, actor=bot)
+                if detective_set:
+                    self.pending["id"] = detective_set["id"]
+                    return
+            elif events:
+                card = self.rng.choice(events)
+                self.pending = {"kind": "card", "id": card["id"], "name": card["name"], "owner": bot.id}
+                if await bot.play_card(card["id"]):
+                    return
+            self.pending = None
+        await self.finish_turn(bot)
+
+    async def finish_turn(self, bot: Bot):
+        if self.game["status"] in {GameStatus.TURN_START.value, GameStatus.FINALIZE_TURN.value}:
+            hand = [c for c in await bot.hand() if c["name"] != "not-so-fast"] or await bot.hand()
+            if hand:
+                await bot.discard([self.rng.choice(hand)])
+
+        if len(await bot.hand()) <= 5:
+            draft = await self.call("POST", "/api/card/search", "/api/card/search", json={
+                "game_id__eq": self.game_id, "turn_discarded__is_null": True, "owner__is_null": True, "state__eq": "available"})
+            if draft:
+                card = self.rng.choice(draft[:3])
+                await self.call("PATCH", "/api/card/{cid}", f"/api/card/{card['id']}",
+                                json={"owner": bot.id, "token": bot.token}, actor=bot)
+        await bot.end_turn()
+
+    async def resolve(self, bot: Bot, status: str):
+        pending = self.pending
+        others = [b for b in self.bots.values() if b is not bot]
+
+        if pending["kind"] == "set" and "id" in pending:
+            if status == GameStatus.WAITING_FOR_CHOOSE_PLAYER.value:
+                target = self.rng.choice(others)
+                await self.call("POST", "/api/detective_set/{sid}", f"/api/detective_set/{pending['id']}",
+                                json={"target_player": target.id, "token": bot.token}, actor=bot)
+            elif status == GameStatus.WAITING_FOR_CHOOSE_SECRET.value:
+                own_secret = bool(pending["names"] & set(DETECTIVES_CHOOSE_PLAYERS))
+                secrets = await self.call("POST", "/api/secret/search", "/api/secret/search",
+                                          json={"game_id__eq": self.game_id, "revealed__eq": False})
+                candidates = [s for s in secrets or [] if (s["owner"] == bot.id) == own_secret]
+                if candidates:
+                    await self.call("POST", "/api/detective_set/{sid}", f"/api/detective_set/{pending['id']}",
+                                    json={"target_secret": self.rng.choice(candidates)["id"], "token": bot.token}, actor=bot)
+
+        elif pending["kind"] == "card":
+            if status == GameStatus.WAITING_FOR_CHOOSE_PLAYER.value:
+                await bot.play_card(pending["id"], target_players=[self.rng.choice(others).id])
+            elif status in {GameStatus.WAITING_FOR_CHOOSE_DISCARDED.value, GameStatus.WAITING_FOR_ORDER_DISCARD.value}:
+                discarded = await self.call("POST", "/api/card/search", "/api/card/search",
+                                            json={"game_id__eq": self.game_id, "discarded_order__is_null": False})
+                last_five = sorted(discarded or [], key=lambda c: c["discarded_order"], reverse=True)[:5]
+                if last_five:
+                    targets = last_five[:1] if status == GameStatus.WAITING_FOR_CHOOSE_DISCARDED.value else last_five
+                    await bot.play_card(pending["id"], target_cards=[c["id"] for c in targets])
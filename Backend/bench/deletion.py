@@ -0,0 +1,108 @@
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime
+from typing import List
+
+from sqlmodel import Session, SQLModel
+
+from app.database.engine import db_engine
+from app.database.instrumentation import instrument_engine, track_queries
+from app.models.card import Card
+from app.models.chat import Chat
+from app.models.detective_set import DetectiveSet
+from app.models.event_table import EventTable, EventAction
+from app.models.game import Game, GameStatus
+from app.models.player import Player
+from app.models.secret import Secret, SecretType
+from app.services.game import GameService
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Tamaño de una partida avanzada: mazo completo, 3 secretos por jugador y un historial largo
+PLAYERS = 6
+CARDS = 70
+EVENTS = 300
+CHATS = 50
+SETS = 4
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="python -m bench.deletion",
+                                     description="Compara borrar partidas de a una contra borrarlas en lote")
+    parser.add_argument("--games", type=int, default=100, help="Partidas a borrar en cada modo")
+    parser.add_argument("--batch", type=int, default=50, help="Partidas por llamada a delete_many")
+    return parser.parse_args()
+
+
+def seed_games(session: Session, amount: int) -> List[int]:
+    """ Inserta partidas con todas sus filas dependientes y devuelve sus ids """
+    game_ids = []
+    for n in range(amount):
+        game = Game(name=f"bench-delete-{n}", status=GameStatus.TURN_START, owner=None, player_in_action=None)
+        session.add(game)
+        session.flush()
+        players = [Player(game_id=game.id, name=f"p{i}", date_of_birth=datetime(2000, 1, 1), avatar="a",
+                          token=uuid.uuid4().hex, position=i) for i in range(PLAYERS)]
+        session.add_all(players)
+        session.flush()
+        game.owner = players[0].id
+        sets = [DetectiveSet(owner=players[i % PLAYERS].id, game_id=game.id, turn_played=i) for i in range(SETS)]
+        session.add_all(sets)
+        session.flush()
+        session.add_all([Card(game_id=game.id, owner=players[i % PLAYERS].id if i < 36 else None, name="miss-marple",
+                              pile_order=i, set_id=sets[i % SETS].id if i < 2 * SETS else None) for i in range(CARDS)])
+        session.add_all([Secret(game_id=game.id, owner=players[i % PLAYERS].id, name="secret", content="",
+                                type=SecretType.OTHER if i else SecretType.MURDERER) for i in range(3 * PLAYERS)])
+        session.add_all([EventTable(game_id=game.id, action=EventAction.CARD_TRADE, turn_played=i // PLAYERS,
+                                    player_id=players[i % PLAYERS].id) for i in range(EVENTS)])
+        session.add_all([Chat(game_id=game.id, owner_name=f"p{i % PLAYERS}", content="gg",
+                              timestamp=datetime.now().isoformat()) for i in range(CHATS)])
+        session.commit()
+        game_ids.append(game.id)
+    return game_ids
+
+
+async def delete_one_by_one(session: Session, game_ids: List[int]):
+    service = GameService()
+    for gid in game_ids:
+        await service.delete(session, gid)
+
+
+async def delete_in_batches(session: Session, game_ids: List[int], batch: int):
+    service = GameService()
+    for i in range(0, len(game_ids), batch):
+        await service.delete_many(session, game_ids[i:i + batch])
+
+
+async def run(args) -> str:
+    SQLModel.metadata.create_all(db_engine)
+    instrument_engine(db_engine)
+    modes = {
+        "delete": lambda session, ids: delete_one_by_one(session, ids),
+        "delete_many": lambda session, ids: delete_in_batches(session, ids, args.batch),
+    }
+    lines = [f"{'modo':<12} {'partidas':>8} {'seg':>8} {'partidas/s':>11} {'sentencias':>11} {'commits':>8}"]
+    for name, delete_games in modes.items():
+        with Session(db_engine) as session:
+            game_ids = seed_games(session, args.games)
+            with track_queries() as stats:
+                start = time.perf_counter()
+                await delete_games(session, game_ids)
+                elapsed = time.perf_counter() - start
+        lines.append(f"{name:<12} {len(game_ids):>8} {elapsed:>8.3f} {len(game_ids) / elapsed:>11.1f} "
+                     f"{stats.queries:>11} {stats.commits:>8}")
+    return "\n".join(lines)
+
+
+def main():
+    logging.basicConfig(level=logging.WARNING)
+    args = parse_args()
+    print(asyncio.run(run(args)))
+
+
+if __name__ == '__main__':
+    main()
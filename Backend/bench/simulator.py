@@ -0,0 +1,479 @@
+import argparse
+import multiprocessing
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence
+
+from app.engine import (GameState, cancel_action, close_window, create_set, discard, end_turn, new_game,
+                        play_card, set_action, take_draft)
+from app.engine.effects import BLACKMAILED, CARD_TRADE, DEAD_CARD_FOLLY, NOT_SO_FAST, SOCIAL_FAUX_PAS
+from app.engine.rules import HAND_SIZE
+from app.engine.state import DETECTIVES_CHOOSE_PLAYERS
+from app.models.game import GameStatus
+from bench.bot import PLAYABLE_EVENTS, SET_DETECTIVES
+from bench.stats import percentile
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Ademas de los del bot HTTP, el motor resuelve estos eventos sin websockets de por medio. Las devious no se juegan
+# de la mano: entran en juego cuando llegan por CARD TRADE o DEAD CARD FOLLY
+SIM_EVENTS = PLAYABLE_EVENTS | {"point-your-suspicions", "another-victim", "and-then-there-was-one-more",
+                                "ariadne-oliver", CARD_TRADE, DEAD_CARD_FOLLY}
+SIM_SET_DETECTIVES = SET_DETECTIVES | {"parker-pyne"}
+WILDCARD = "harley-quin-wildcard"
+DEVIOUS = {BLACKMAILED, SOCIAL_FAUX_PAS}
+# Quien gana segun como termino la partida
+CULPRITS_WIN = {"culprits_cornered", "deck_exhausted", "early_train_exhausted"}
+
+
+class StuckGame(Exception):
+    """ La partida quedo esperando una eleccion que nadie puede hacer (ej: revelar sin secretos ocultos) """
+
+
+class RandomPolicy:
+    """ Decide todo al azar: si juega, que set o evento, a quien apunta y si cancela """
+
+    def __init__(self, rng: random.Random, play_probability: float = 0.5, nsf_probability: float = 0.3):
+        self.rng = rng
+        self.play_probability = play_probability
+        self.nsf_probability = nsf_probability
+
+    def wants_to_play(self) -> bool:
+        return self.rng.random() < self.play_probability
+
+    def wants_to_cancel(self) -> bool:
+        return self.rng.random() < self.nsf_probability
+
+    def pick(self, options: Sequence, state: GameState):
+        return self.rng.choice(options)
+
+    def pick_player(self, options: Sequence[int], state: GameState) -> int:
+        return self.rng.choice(options)
+
+
+class ScriptedPolicy(RandomPolicy):
+    """ Siempre juega si puede, apunta al jugador con mas secretos ocultos y cancela todo lo que puede """
+
+    def wants_to_play(self) -> bool:
+        return True
+
+    def wants_to_cancel(self) -> bool:
+        return True
+
+    def pick(self, options: Sequence, state: GameState):
+        return options[0]
+
+    def pick_player(self, options: Sequence[int], state: GameState) -> int:
+        return max(options, key=lambda pid: (len(state.hidden_secrets(pid)), -pid))
+
+
+POLICIES = {"random": RandomPolicy, "scripted": ScriptedPolicy}
+
+
+@dataclass
+class GameResult:
+    players: int
+    # finished, truncated (llego a --max-turns) o stuck
+    result: str
+    outcome: Optional[str]
+    turns: int
+    plays: Counter = field(default_factory=Counter)
+    stuck_reason: Optional[str] = None
+
+
+class SimulatedGame:
+    """ Una partida entera jugada contra el motor, con una politica por jugador """
+
+    def __init__(self, players_amount: int, rng: random.Random, policy: str = "random", max_turns: int = 200,
+                 **policy_args):
+        self.rng = rng
+        birthdays = {pid: date(2000, 1, 1) + timedelta(days=rng.randrange(366)) for pid in range(1, players_amount + 1)}
+        self.state = new_game(birthdays, rng)
+        self.policies = {pid: POLICIES[policy](rng, **policy_args) for pid in birthdays}
+        self.max_turns = max_turns
+        self.plays: Counter = Counter()
+        # Lo que se jugo este turno y espera objetivos: ("set", sid) o ("card", cid)
+        self.pending: Optional[tuple] = None
+
+    def play(self) -> GameResult:
+        state = self.state
+        try:
+            while state.status != GameStatus.FINALIZED and state.current_turn < self.max_turns:
+                self.turn(state.turn_owner())
+        except StuckGame as e:
+            _logger.debug("Partida trabada en %s: %s", state.status, e)
+            return self.result("stuck", str(e))
+        return self.result("finished" if state.status == GameStatus.FINALIZED else "truncated")
+
+    def result(self, result: str, stuck_reason: Optional[str] = None) -> GameResult:
+        return GameResult(players=len(self.state.players), result=result, outcome=self.state.outcome,
+                          turns=self.state.current_turn, plays=self.plays, stuck_reason=stuck_reason)
+
+    def others(self, pid: int) -> List[int]:
+        return [p for p in self.state.seating if p != pid]
+
+    def tradeable(self, pid: int, cid: int) -> List[int]:
+        """ Cartas que `pid` puede dar en un intercambio, sin la carta que lo inicio """
+        return [c.id for c in self.state.hand(pid) if c.id != cid]
+
+    def can_play(self, pid: int, cid: int) -> bool:
+        """ Si el evento tiene con que resolverse; el motor rechazaria (o trabaria) la jugada si no """
+        state = self.state
+        name = state.cards[cid].name
+        if name == "look-into-the-ashes":
+            return bool(state.discard_pile())
+        if name == "ariadne-oliver":
+            return any(s.owner != pid for s in state.sets.values())
+        if name == CARD_TRADE:
+            return bool(self.tradeable(pid, cid)) and any(state.hand(p) for p in self.others(pid))
+        if name == DEAD_CARD_FOLLY:
+            return bool(self.tradeable(pid, cid)) and all(state.hand(p) for p in self.others(pid))
+        return True
+
+    def devious_in_play(self):
+        """ Devious recibida en un intercambio de este turno que todavia no se resolvio """
+        state = self.state
+        return next((c for c in state.cards.values() if c.name in DEVIOUS and c.turn_played == state.current_turn
+                     and c.discarded_order is None), None)
+
+    def turn(self, pid: int):
+        state = self.state
+        policy = self.policies[pid]
+        self.pending = None
+
+        if not state.players[pid].social_disgrace and policy.wants_to_play():
+            self.start_play(pid, policy)
+            self.resolve()
+        if state.status == GameStatus.FINALIZED:
+            return
+
+        if state.status in {GameStatus.TURN_START, GameStatus.FINALIZE_TURN}:
+            hand = [c for c in state.hand(pid) if c.name != NOT_SO_FAST] or state.hand(pid)
+            if not hand:
+                # Con el mazo reducido al draft `end_turn` ya no reparte ni termina la partida
+                raise StuckGame("Sin cartas para descartar")
+            discard(state, pid, [policy.pick(hand, state).id])
+            self.resolve()
+            if state.status == GameStatus.FINALIZED:
+                return
+
+        draft = state.draft()
+        if len(state.hand(pid)) < HAND_SIZE and draft:
+            take_draft(state, pid, policy.pick(draft, state).id)
+        end_turn(state, pid)
+
+    def start_play(self, pid: int, policy: RandomPolicy):
+        state = self.state
+        by_name: Dict[str, List[int]] = {}
+        for c in state.hand(pid):
+            by_name.setdefault(c.name, []).append(c.id)
+        pairs = [cids[:2] for name, cids in by_name.items() if name in SIM_SET_DETECTIVES and len(cids) >= 2]
+        # Harley Quin completa el par de cualquier detective
+        pairs += [[cids[0], by_name[WILDCARD][0]] for name, cids in by_name.items()
+                  if name in SIM_SET_DETECTIVES and WILDCARD in by_name]
+        events = [c for c in state.hand(pid) if c.name in SIM_EVENTS and self.can_play(pid, c.id)]
+
+        if pairs and (not events or self.rng.random() < 0.5):
+            cids = policy.pick(pairs, state)
+            detective_set = create_set(state, pid, cids)
+            self.pending = ("set", detective_set.id)
+            self.plays[f"set:{state.cards[cids[0]].name}"] += 1
+        elif events:
+            card = policy.pick(events, state)
+            play_card(state, pid, card.id)
+            self.pending = ("card", card.id)
+            self.plays[card.name] += 1
+
+    def resolve(self):
+        """ Contesta lo que la partida espera hasta que vuelve a depender del jugador del turno """
+        state = self.state
+        while state.status not in {GameStatus.TURN_START, GameStatus.FINALIZE_TURN, GameStatus.FINALIZE_TURN_DRAFT,
+                                   GameStatus.FINALIZED}:
+            if state.status == GameStatus.WAITING_FOR_CANCEL_ACTION:
+                self.not_so_fast_window()
+                continue
+
+            devious = self.devious_in_play()
+            if devious is not None and self.pending != ("card", devious.id):
+                # La devious recibida se resuelve antes que la jugada que la trajo
+                self.pending = ("card", devious.id)
+                self.plays[devious.name] += 1
+            if self.pending is None:
+                raise StuckGame(f"Estado {state.status} sin jugada pendiente")
+            elif self.pending[0] == "set":
+                self.resolve_set(self.pending[1])
+            else:
+                self.resolve_card(self.pending[1])
+
+    def not_so_fast_window(self):
+        """ Los jugadores con NOT SO FAST cancelan (o cancelan la cancelacion) hasta que nadie quiere jugar otro """
+        state = self.state
+        last = None
+        while True:
+            candidates = [(pid, c.id) for pid in state.seating if pid != last for c in state.hand(pid)
+                          if c.name == NOT_SO_FAST and self.policies[pid].wants_to_cancel()]
+            if not candidates:
+                break
+            last, cid = self.rng.choice(candidates)
+            cancel_action(state, last, cid)
+            self.plays[NOT_SO_FAST] += 1
+        close_window(state)
+
+    def resolve_set(self, sid: int):
+        state = self.state
+        detective_set = state.sets.get(sid)
+        if detective_set is None:
+            raise StuckGame("Set borrado con la partida esperando")
+        pid = state.player_in_action
+        policy = self.policies[pid]
+
+        if state.status == GameStatus.WAITING_FOR_CHOOSE_PLAYER:
+            set_action(state, pid, sid, target_player=policy.pick_player(self.others(pid), state))
+        elif state.status == GameStatus.WAITING_FOR_CHOOSE_SECRET:
+            names = state.set_names(detective_set)
+            ariadne = any(state.cards[cid].name == "ariadne-oliver" and state.cards[cid].turn_played == state.current_turn
+                          for cid in detective_set.detectives)
+            if ariadne:
+                # Con ARIADNE OLIVER el dueño del set revela un secreto propio
+                candidates = state.hidden_secrets(pid)
+            elif "parker-pyne" in names:
+                candidates = [s for s in state.secrets.values() if s.revealed]
+            elif set(names) & set(DETECTIVES_CHOOSE_PLAYERS):
+                candidates = state.hidden_secrets(pid)
+            else:
+                candidates = [s for s in state.secrets.values() if not s.revealed and s.owner != pid]
+            if not candidates:
+                raise StuckGame("Sin secretos para elegir")
+            set_action(state, pid, sid, target_secret=policy.pick(candidates, state).id)
+        else:
+            raise StuckGame(f"Estado {state.status} con un set pendiente")
+
+    def resolve_card(self, cid: int):
+        state = self.state
+        card = state.cards.get(cid)
+        if card is None:
+            raise StuckGame("Carta borrada con la partida esperando")
+        status = state.status
+        owner = card.owner
+        policy = self.policies[owner]
+
+        if status == GameStatus.WAITING_FOR_CHOOSE_PLAYER and card.name == "point-your-suspicions":
+            voted = {voter for voter, _ in state.votes}
+            voters = [pid for pid in state.seating if pid not in voted] or [state.player_in_action]
+            for voter in voters:
+                play_card(state, voter, cid, target_players=[self.policies[voter].pick_player(self.others(voter), state)])
+                if state.status != GameStatus.WAITING_FOR_CHOOSE_PLAYER:
+                    break
+        elif status == GameStatus.WAITING_FOR_CHOOSE_PLAYER and card.name == CARD_TRADE:
+            partners = [pid for pid in self.others(owner) if state.hand(pid)]
+            if not partners:
+                raise StuckGame("Nadie tiene cartas para intercambiar")
+            play_card(state, owner, cid, target_players=[policy.pick_player(partners, state)])
+        elif status == GameStatus.WAITING_FOR_CHOOSE_PLAYER:
+            play_card(state, owner, cid, target_players=[policy.pick_player(self.others(owner), state)])
+        elif status == GameStatus.WAITING_TO_CHOOSE_DIRECTION:
+            play_card(state, owner, cid, clockwise=policy.pick([True, False], state))
+        elif status == GameStatus.SELECT_CARD_TO_TRADE:
+            self.select_cards_to_trade(card)
+        elif status == GameStatus.WAITING_FOR_CHOOSE_SECRET and card.name == BLACKMAILED:
+            # Quien la recibio le muestra un secreto a quien se la dio, que es el que lo elige
+            chooser = state.player_in_action
+            candidates = [s for s in state.secrets.values() if s.owner == owner]
+            if not candidates:
+                raise StuckGame("Sin secretos para mostrar")
+            play_card(state, chooser, cid, target_secrets=[self.policies[chooser].pick(candidates, state).id])
+        elif status == GameStatus.WAITING_FOR_CHOOSE_SECRET:
+            chooser = state.player_in_action
+            candidates = state.hidden_secrets(chooser)
+            if not candidates:
+                raise StuckGame("El sospechoso no tiene secretos ocultos")
+            play_card(state, chooser, cid, target_secrets=[self.policies[chooser].pick(candidates, state).id])
+        elif status == GameStatus.WAITING_FOR_CHOOSE_DISCARDED:
+            play_card(state, owner, cid, target_cards=[policy.pick(state.discard_pile()[:5], state).id])
+        elif status == GameStatus.WAITING_FOR_ORDER_DISCARD:
+            last_five = [c.id for c in state.discard_pile()[:5]]
+            self.rng.shuffle(last_five)
+            play_card(state, owner, cid, target_cards=last_five)
+        elif status == GameStatus.WAITING_FOR_CHOOSE_SET:
+            target = policy.pick([s.id for s in state.sets.values() if s.owner != owner], state)
+            play_card(state, owner, cid, target_sets=[target])
+            # ANOTHER VICTIM y ARIADNE OLIVER siguen con la accion del set elegido
+            self.pending = ("set", target)
+        elif status == GameStatus.WAITING_FOR_CHOOSE_PLAYER_AND_SECRET:
+            revealed = [s.id for s in state.secrets.values() if s.revealed]
+            play_card(state, owner, cid, target_players=[policy.pick_player(self.others(owner), state)],
+                      target_secrets=[policy.pick(revealed, state)])
+        else:
+            raise StuckGame(f"Estado {status} con {card.name} pendiente")
+
+    def select_cards_to_trade(self, card):
+        """ Cada jugador del intercambio elige que carta da: los dos de CARD TRADE o todos en DEAD CARD FOLLY """
+        state = self.state
+        if card.name == CARD_TRADE:
+            chosen = next(t for t in state.trades if t.kind == CARD_TRADE and t.card is None)
+            traders = [chosen.player, chosen.target_player]
+        else:
+            traders = list(state.seating)
+        selected = {t.player for t in state.trades if t.kind == card.name and t.card is not None}
+
+        for pid in traders:
+            if pid in selected:
+                continue
+            options = self.tradeable(pid, card.id)
+            if not options:
+                raise StuckGame("Sin cartas para intercambiar")
+            play_card(state, pid, card.id, target_cards=[self.policies[pid].pick(options, state)])
+
+
+class SimulationStats:
+    """ Resultados de muchas partidas; se suman entre procesos con `merge` """
+
+    def __init__(self):
+        self.results: Counter = Counter()
+        self.outcomes: Counter = Counter()
+        self.plays: Counter = Counter()
+        self.stuck: Counter = Counter()
+        self.turns: List[int] = []
+        # Segundos de CPU de cada proceso, para sacar partidas por segundo por nucleo
+        self.busy_seconds = 0.0
+
+    def record(self, game: GameResult):
+        self.results[game.result] += 1
+        if game.outcome:
+            self.outcomes[game.outcome] += 1
+        self.plays.update(game.plays)
+        if game.stuck_reason:
+            self.stuck[game.stuck_reason] += 1
+        self.turns.append(game.turns)
+
+    def merge(self, other: "SimulationStats"):
+        self.results.update(other.results)
+        self.outcomes.update(other.outcomes)
+        self.plays.update(other.plays)
+        self.stuck.update(other.stuck)
+        self.turns.extend(other.turns)
+        self.busy_seconds += other.busy_seconds
+
+    @property
+    def games(self) -> int:
+        return sum(self.results.values())
+
+    def rate(self, count: int) -> Optional[float]:
+        """ Sobre todas las partidas: las trabadas y cortadas cuentan, asi las tasas suman 1 con `unfinished_rate` """
+        return count / self.games if self.games else None
+
+    def summary(self, elapsed: float) -> dict:
+        culprits = sum(self.outcomes[o] for o in CULPRITS_WIN)
+        return {
+            "games": self.games,
+            "results": dict(self.results),
+            "outcomes": dict(self.outcomes),
+            "stuck": dict(self.stuck.most_common()),
+            "culprits_win_rate": self.rate(culprits),
+            "detectives_win_rate": self.rate(self.outcomes["murderer_revealed"]),
+            "unfinished_rate": self.rate(self.games - self.results["finished"]),
+            "deck_exhaustion_rate": self.rate(self.outcomes["deck_exhausted"]),
+            "turns": {"mean": sum(self.turns) / len(self.turns) if self.turns else None,
+                      "p50": percentile(self.turns, 50), "p95": percentile(self.turns, 95),
+                      "max": max(self.turns, default=None)},
+            "plays_per_game": {name: count / self.games for name, count in self.plays.most_common()},
+            "games_per_second": self.games / elapsed if elapsed else None,
+            "games_per_second_per_core": self.games / self.busy_seconds if self.busy_seconds else None,
+        }
+
+
+def run_batch(task: tuple) -> SimulationStats:
+    """ Juega un lote de partidas en un proceso del pool """
+    seed, games, players, policy, max_turns, policy_args = task
+    rng = random.Random(seed)
+    stats = SimulationStats()
+    start = time.process_time()
+    for _ in range(games):
+        game = SimulatedGame(rng.choice(players), random.Random(rng.random()), policy, max_turns, **policy_args)
+        stats.record(game.play())
+    stats.busy_seconds = time.process_time() - start
+    return stats
+
+
+def simulate(games: int, players: Sequence[int], workers: int = 1, batch: int = 500, policy: str = "random",
+             max_turns: int = 200, seed: Optional[int] = None, **policy_args) -> dict:
+    rng = random.Random(seed)
+    tasks = []
+    for start in range(0, games, batch):
+        tasks.append((rng.random(), min(batch, games - start), list(players), policy, max_turns, policy_args))
+
+    stats = SimulationStats()
+    start = time.perf_counter()
+    if workers > 1:
+        with multiprocessing.Pool(workers) as pool:
+            for partial in pool.imap_unordered(run_batch, tasks):
+                stats.merge(partial)
+    else:
+        for task in tasks:
+            stats.merge(run_batch(task))
+    return stats.summary(time.perf_counter() - start)
+
+
+def _rate(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1%}"
+
+
+def format_simulation(summary: dict) -> str:
+    results = summary["results"]
+    turns = summary["turns"]
+    lines = [
+        f"partidas: {summary['games']} ({results.get('finished', 0)} finalizadas, {results.get('truncated', 0)} "
+        f"cortadas por turnos, {results.get('stuck', 0)} trabadas)",
+        f"turnos: media {turns['mean'] or 0:.1f}, p50 {turns['p50']}, p95 {turns['p95']}, max {turns['max']}",
+        f"ganan asesino y complice: {_rate(summary['culprits_win_rate'])}, "
+        f"ganan detectives: {_rate(summary['detectives_win_rate'])}, "
+        f"sin terminar: {_rate(summary['unfinished_rate'])}",
+        f"mazo agotado al terminar turno: {_rate(summary['deck_exhaustion_rate'])}",
+        "finales: " + ", ".join(f"{outcome} {count}" for outcome, count in sorted(summary["outcomes"].items())),
+    ]
+    lines.extend(f"trabada: {reason} ({count})" for reason, count in summary["stuck"].items())
+    lines += [
+        "",
+        f"{'jugada':<40}{'por partida':>12}",
+    ]
+    lines.extend(f"{name:<40}{per_game:>12.2f}" for name, per_game in summary["plays_per_game"].items())
+    lines.append("")
+    lines.append(f"{summary['games_per_second'] or 0:.0f} partidas/s, "
+                 f"{summary['games_per_second_per_core'] or 0:.0f} partidas/s por nucleo")
+    return "\n".join(lines)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="python -m bench.simulator",
+                                     description="Juega partidas completas contra el motor de reglas, sin servidor")
+    parser.add_argument("--games", type=int, default=10000, help="Cantidad total de partidas")
+    parser.add_argument("--players", type=int, nargs="+", default=[4],
+                        help="Jugadores por partida (2 a 6); con varios valores se elige uno al azar por partida")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count(), help="Procesos del pool")
+    parser.add_argument("--batch", type=int, default=500, help="Partidas por tarea del pool")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--max-turns", type=int, default=200, help="Turnos maximos antes de cortar una partida")
+    parser.add_argument("--nsf-probability", type=float, default=0.3, help="Probabilidad de jugar un NOT SO FAST")
+    parser.add_argument("--play-probability", type=float, default=0.5, help="Probabilidad de jugar un set o evento por turno")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args()
+
+
+def main():
+    logging.basicConfig(level=logging.WARNING)
+    args = parse_args()
+    if not all(2 <= p <= 6 for p in args.players):
+        raise SystemExit("La cantidad de jugadores debe estar entre 2 y 6")
+    summary = simulate(args.games, args.players, workers=args.workers, batch=args.batch, policy=args.policy,
+                       max_turns=args.max_turns, seed=args.seed, nsf_probability=args.nsf_probability,
+                       play_probability=args.play_probability)
+    print(format_simulation(summary))
+
+
+if __name__ == '__main__':
+    main()
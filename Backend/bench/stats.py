@@ -0,0 +1,86 @@
+import math
+from typing import Dict, List, Optional
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """ Percentil por rango mas cercano, None si no hay muestras """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class LatencyRecorder:
+    """ Acumula muestras (en segundos) agrupadas por nombre y cuenta errores """
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, name: str, seconds: float, ok: bool = True):
+        self.samples.setdefault(name, []).append(seconds)
+        if not ok:
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+    def summary(self) -> Dict[str, dict]:
+        result = {}
+        for name, values in sorted(self.samples.items()):
+            result[name] = {
+                "count": len(values),
+                "errors": self.errors.get(name, 0),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "max": max(values),
+            }
+        return result
+
+
+class PoolSampler:
+    """ Muestras periodicas de conexiones en uso del pool de la base de datos """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.checked_out: List[int] = []
+
+    def record(self, checked_out: int):
+        self.checked_out.append(checked_out)
+
+    def summary(self) -> Optional[dict]:
+        if not self.checked_out:
+            return None
+        saturated = sum(1 for c in self.checked_out if c >= self.capacity)
+        return {
+            "capacity": self.capacity,
+            "max_checked_out": max(self.checked_out),
+            "p95_checked_out": percentile(self.checked_out, 95),
+            "saturated_ratio": saturated / len(self.checked_out),
+        }
+
+
+def parse_gauges(text: str) -> Dict[str, float]:
+    """ Valores sin labels de un texto en formato Prometheus """
+    gauges = {}
+    for line in text.splitlines():
+        if line.startswith("#") or "{" in line or " " not in line:
+            continue
+        name, value = line.rsplit(" ", 1)
+        gauges[name] = float(value)
+    return gauges
+
+
+def format_report(latencies: Dict[str, dict], pool: Optional[dict], games: dict) -> str:
+    lines = [f"{'endpoint':<48}{'count':>8}{'err':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+    for name, s in latencies.items():
+        lines.append(f"{name:<48}{s['count']:>8}{s['errors']:>6}"
+                     f"{s['p50'] * 1000:>10.1f}{s['p95'] * 1000:>10.1f}{s['p99'] * 1000:>10.1f}{s['max'] * 1000:>10.1f}")
+    lines.append("")
+    lines.append(f"partidas: {games['finished']} finalizadas, {games['truncated']} cortadas por turnos, "
+                 f"{games['stuck']} trabadas, {games['turns']} turnos en {games['elapsed']:.1f}s")
+    if pool:
+        lines.append(f"pool db: capacidad {pool['capacity']}, max en uso {pool['max_checked_out']}, "
+                     f"p95 en uso {pool['p95_checked_out']}, saturado {pool['saturated_ratio'] * 100:.1f}% del tiempo")
+    else:
+        lines.append("pool db: sin datos (el servidor no expone /metrics, usar --serve)")
+    return "\n".join(lines)
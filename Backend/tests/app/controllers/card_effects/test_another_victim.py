@@ -7,7 +7,7 @@ from requests import session
 from fastapi import HTTPException
 
 from app.controllers.card_effects.another_victim import another_victim
-from app.models.card import PublicCard, CardType
+from app.models.card import PublicCard
 from app.models.detective_set import DetectiveSet
 from app.models.game import GameStatus
 from app.models.secret import Secret, SecretType
@@ -30,7 +30,7 @@ def test_another_victim_initial_play_sets_waiting_state(mocker):
     mock_card_update = mocker.patch('app.controllers.card_effects.another_victim.CardService.update', new_callable=AsyncMock)
     mock_game_update = mocker.patch('app.controllers.card_effects.another_victim.GameService.update', new_callable=AsyncMock)
     mocker.patch('app.controllers.card_effects.another_victim.not_so_fast_status', return_value=False)
-    mocker.patch('app.controllers.card_effects.another_victim.PlayerService.read', return_value=fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=fake_player)
     mocker.patch('app.controllers.card_effects.another_victim.ChatService.create')
 
     asyncio.run(another_victim(fake_card, None, [], [], [], []))
@@ -60,7 +60,7 @@ def test_another_victim_initial_play_without_targets_finishes_turn(mocker):
     mock_get_order = mocker.patch('app.controllers.card_effects.another_victim.get_new_discarded_order', return_value=22)
     mock_card_update = mocker.patch('app.controllers.card_effects.another_victim.CardService.update', new_callable=AsyncMock)
     mock_game_update = mocker.patch('app.controllers.card_effects.another_victim.GameService.update', new_callable=AsyncMock)
-    mocker.patch('app.controllers.card_effects.another_victim.PlayerService.read', return_value=fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=fake_player)
     mocker.patch('app.controllers.card_effects.another_victim.ChatService.create')
 
     asyncio.run(another_victim(fake_card, None, [], [], [], []))
@@ -96,7 +96,7 @@ def test_another_victim_canceled_by_not_so_fast(mocker):
     mock_game_update = mocker.patch('app.controllers.card_effects.another_victim.GameService.update', new_callable=AsyncMock)
     mock_get_order = mocker.patch('app.controllers.card_effects.another_victim.get_new_discarded_order', return_value=31)
     mocker.patch('app.controllers.card_effects.another_victim.not_so_fast_status', return_value=True)
-    mocker.patch('app.controllers.card_effects.another_victim.PlayerService.read', return_value=fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=fake_player)
     mocker.patch('app.controllers.card_effects.another_victim.ChatService.create')
 
 
@@ -114,7 +114,7 @@ def test_another_victim_requires_target_set(mocker):
 
 
     mocker.patch('app.controllers.card_effects.another_victim.GameService.read', return_value=fake_game)
-    mocker.patch('app.controllers.card_effects.another_victim.PlayerService.read', return_value=fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=fake_player)
 
     with pytest.raises(HTTPException) as exc_info:
         asyncio.run(another_victim(fake_card, None, [], [], [], []))
@@ -130,7 +130,7 @@ def test_another_victim_set_not_found(mocker):
 
     mocker.patch('app.controllers.card_effects.another_victim.GameService.read', return_value=fake_game)
     mocker.patch('app.controllers.card_effects.another_victim.DetectiveSetService.read', new_callable=AsyncMock, return_value=None)
-    mocker.patch('app.controllers.card_effects.another_victim.PlayerService.read', return_value=fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=fake_player)
 
     with pytest.raises(HTTPException) as exc_info:
         asyncio.run(another_victim(fake_card, None, [], [], [], [11]))
@@ -147,7 +147,7 @@ def test_another_victim_set_from_other_game(mocker):
 
     mocker.patch('app.controllers.card_effects.another_victim.GameService.read', return_value=fake_game)
     mocker.patch('app.controllers.card_effects.another_victim.DetectiveSetService.read', new_callable=AsyncMock, return_value=stolen_set)
-    mocker.patch('app.controllers.card_effects.another_victim.PlayerService.read', return_value=fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=fake_player)
 
     with pytest.raises(HTTPException) as exc_info:
         asyncio.run(another_victim(fake_card, None, [], [], [], [stolen_set.id]))
@@ -164,7 +164,7 @@ def test_another_victim_set_of_your_own(mocker):
 
     mocker.patch('app.controllers.card_effects.another_victim.GameService.read', return_value=fake_game)
     mocker.patch('app.controllers.card_effects.another_victim.DetectiveSetService.read', new_callable=AsyncMock, return_value=stolen_set)
-    mocker.patch('app.controllers.card_effects.another_victim.PlayerService.read', return_value=fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=fake_player)
 
     with pytest.raises(HTTPException) as exc_info:
         asyncio.run(another_victim(fake_card, None, [], [], [], [stolen_set.id]))
@@ -176,7 +176,7 @@ def test_another_victim_set_of_your_own(mocker):
 def test_another_victim_ok(mocker):
     fake_game = GameFactory(status=GameStatus.WAITING_FOR_CHOOSE_SET, current_turn=9)
     fake_card = CardFactory(game_id=fake_game.id, owner=29, turn_played=fake_game.current_turn)
-    fake_detective = CardFactory(game_id = fake_game.id, owner = 29, card_type=CardType.DETECTIVE)
+    fake_detective = CardFactory(game_id = fake_game.id, owner = 29, name="miss-marple")
     stolen_set = DetectiveSet(id=fake_game.id, owner=31, game_id=fake_game.id, turn_played=3, detectives=[fake_detective])
     fake_player = PlayerFactory(game_id = fake_game.id, id = fake_card.owner)
 
@@ -184,7 +184,7 @@ def test_another_victim_ok(mocker):
     mocker.patch('app.controllers.card_effects.another_victim.CardService.update', return_value=fake_card)
     mocker.patch('app.controllers.card_effects.another_victim.get_new_discarded_order', return_value=10)
     mocker.patch('app.controllers.card_effects.another_victim.DetectiveSetService.read', new_callable=AsyncMock, return_value=stolen_set)
-    mocker.patch('app.controllers.card_effects.another_victim.PlayerService.read', return_value=fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=fake_player)
     mocker.patch('app.controllers.card_effects.another_victim.ChatService.create')
     mock_set_update = mocker.patch('app.controllers.card_effects.another_victim.DetectiveSetService.update', new_callable=AsyncMock)
     mock_status = mocker.patch('app.controllers.card_effects.another_victim.set_next_game_status', return_value=GameStatus.WAITING_FOR_CHOOSE_SECRET)
@@ -203,7 +203,7 @@ def test_another_victim_disallowed_status(mocker):
     fake_player = PlayerFactory(game_id = fake_game.id, id = fake_card.owner)
 
     mocker.patch('app.controllers.card_effects.another_victim.GameService.read', return_value=fake_game)
-    mocker.patch('app.controllers.card_effects.another_victim.PlayerService.read', return_value=fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=fake_player)
 
     with pytest.raises(HTTPException) as exc_info:
         asyncio.run(another_victim(fake_card, None, [], [], [], []))
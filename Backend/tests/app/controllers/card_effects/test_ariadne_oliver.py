@@ -20,7 +20,7 @@ def test_ariadne_oliver_requires_other_sets(mocker):
         'app.controllers.card_effects.ariadne_oliver.DetectiveSetService.search',
         return_value=[DetectiveSet(id=1, owner=fake_card.owner, game_id=fake_game.id, turn_played=1, detectives=[])],
     )
-    mocker.patch('app.controllers.card_effects.ariadne_oliver.PlayerService.read', return_value = fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value = fake_player)
 
     with pytest.raises(HTTPException) as exc_info:
         asyncio.run(ariadne_oliver(fake_card, None, [], [], [], []))
@@ -42,7 +42,7 @@ def test_ariadne_oliver_initial_play_updates_state(mocker):
     )
     mock_card_update = mocker.patch('app.controllers.card_effects.ariadne_oliver.CardService.update', new_callable=AsyncMock)
     mock_game_update = mocker.patch('app.controllers.card_effects.ariadne_oliver.GameService.update', new_callable=AsyncMock)
-    mocker.patch('app.controllers.card_effects.ariadne_oliver.PlayerService.read', return_value = fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value = fake_player)
     mocker.patch('app.controllers.card_effects.ariadne_oliver.ChatService.create')
     mocker.patch('app.controllers.card_effects.ariadne_oliver.not_so_fast_status', return_value = False)
 
@@ -72,7 +72,7 @@ def test_ariadne_oliver_canceled(mocker):
     )
     mock_card_update = mocker.patch('app.controllers.card_effects.ariadne_oliver.CardService.update', new_callable=AsyncMock)
     mock_game_update = mocker.patch('app.controllers.card_effects.ariadne_oliver.GameService.update', new_callable=AsyncMock)
-    mocker.patch('app.controllers.card_effects.ariadne_oliver.PlayerService.read', return_value = fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value = fake_player)
     mocker.patch('app.controllers.card_effects.ariadne_oliver.ChatService.create')
     mocker.patch('app.controllers.card_effects.ariadne_oliver.not_so_fast_status', return_value = True)
     mock_get_new_discarded_order = mocker.patch(
@@ -111,7 +111,7 @@ def test_ariadne_oliver_second_phase_requires_target_set(mocker):
     fake_player = PlayerFactory(id = fake_card.owner, game_id = fake_game.id)
 
     mocker.patch('app.controllers.card_effects.ariadne_oliver.GameService.read', return_value=fake_game)
-    mocker.patch('app.controllers.card_effects.ariadne_oliver.PlayerService.read', return_value = fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value = fake_player)
 
     with pytest.raises(HTTPException) as exc_info:
         asyncio.run(ariadne_oliver(fake_card, None, [], [], [], []))
@@ -126,7 +126,7 @@ def test_ariadne_oliver_second_phase_set_not_found(mocker):
     fake_player = PlayerFactory(id = fake_card.owner, game_id = fake_game.id)
 
     mocker.patch('app.controllers.card_effects.ariadne_oliver.GameService.read', return_value=fake_game)
-    mocker.patch('app.controllers.card_effects.ariadne_oliver.PlayerService.read', return_value = fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value = fake_player)
     mocker.patch(
         'app.controllers.card_effects.ariadne_oliver.DetectiveSetService.read',
         new_callable=AsyncMock,
@@ -147,7 +147,7 @@ def test_ariadne_oliver_second_phase_other_game(mocker):
     fake_player = PlayerFactory(id = fake_card.owner, game_id = fake_game.id)
 
     mocker.patch('app.controllers.card_effects.ariadne_oliver.GameService.read', return_value=fake_game)
-    mocker.patch('app.controllers.card_effects.ariadne_oliver.PlayerService.read', return_value = fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value = fake_player)
     mocker.patch(
         'app.controllers.card_effects.ariadne_oliver.DetectiveSetService.read',
         new_callable=AsyncMock,
@@ -164,7 +164,7 @@ def test_ariadne_oliver_second_phase_other_game(mocker):
 def test_ariadne_oliver_second_phase_ok(mocker):
     fake_game = GameFactory(status=GameStatus.WAITING_FOR_CHOOSE_SET, current_turn=9)
     fake_card = CardFactory(game_id=fake_game.id, owner=90, turn_played=fake_game.current_turn)
-    fake_detective = CardFactory(game_id = fake_game.id, card_type = "detective")
+    fake_detective = CardFactory(game_id = fake_game.id, name="miss-marple")
     stolen_set = DetectiveSet(id=5, owner=33, game_id=fake_game.id, turn_played=0, detectives=[fake_detective])
     fake_player = PlayerFactory(id = fake_card.owner, game_id = fake_game.id)
 
@@ -180,7 +180,7 @@ def test_ariadne_oliver_second_phase_ok(mocker):
         return_value=stolen_set,
     )
     mock_game_update = mocker.patch('app.controllers.card_effects.ariadne_oliver.GameService.update', new_callable=AsyncMock)
-    mocker.patch('app.controllers.card_effects.ariadne_oliver.PlayerService.read', return_value = fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value = fake_player)
     mocker.patch('app.controllers.card_effects.ariadne_oliver.ChatService.create')
 
     asyncio.run(ariadne_oliver(fake_card, None, [], [], [], [stolen_set.id]))
@@ -203,7 +203,7 @@ def test_ariadne_oliver_invalid_state(mocker):
     fake_player = PlayerFactory(id = fake_card.owner, game_id = fake_game.id)
 
     mocker.patch('app.controllers.card_effects.ariadne_oliver.GameService.read', return_value=fake_game)
-    mocker.patch('app.controllers.card_effects.ariadne_oliver.PlayerService.read', return_value = fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value = fake_player)
 
     with pytest.raises(HTTPException) as exc_info:
         asyncio.run(ariadne_oliver(fake_card, None, [], [], [], []))
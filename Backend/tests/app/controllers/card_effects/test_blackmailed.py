@@ -6,7 +6,6 @@ from sqlalchemy import create_engine
 from sqlmodel import SQLModel, Session
 
 from app.controllers.card_effects.blackmailed import blackmailed
-from app.models.card import CardType
 from app.models.event_table import EventTable
 from app.models.game import GameStatus
 from tests.conftest import CardFactory, GameFactory, PlayerFactory
@@ -33,7 +32,6 @@ async def test_blackmailed_card_not_in_play(session):
         game_id=game.id,
         name="blackmailed",
         turn_played=1,
-        card_type=CardType.DEVIOUS,
     )
 
     session.add(game)
@@ -55,7 +53,6 @@ async def test_blackmailed_requires_secret_selection(session):
         game_id=game.id,
         name="blackmailed",
         turn_played=game.current_turn,
-        card_type=CardType.DEVIOUS,
     )
 
     session.add(game)
@@ -83,7 +80,6 @@ async def test_blackmailed_event_player_mismatch(session):
         name="blackmailed",
         owner=player.id,
         turn_played=game.current_turn,
-        card_type=CardType.DEVIOUS,
     )
     event = EventTable(
         id=30,
@@ -127,7 +123,6 @@ async def test_blackmailed_reveals_secret_and_chains_devious_detect(session, moc
         turn_played=game.current_turn,
         discarded_order=None,
         turn_discarded=None,
-        card_type=CardType.DEVIOUS,
     )
     event = EventTable(
         id=31,
@@ -22,7 +22,7 @@ def test_cards_off_the_table_initial_play(mocker):
     mock_game_read = mocker.patch('app.controllers.card_effects.cards_off_the_table.GameService.read', return_value=fake_game)
     mock_card_update = mocker.patch('app.controllers.card_effects.cards_off_the_table.CardService.update', new_callable=AsyncMock)
     mock_game_update = mocker.patch('app.controllers.card_effects.cards_off_the_table.GameService.update', new_callable=AsyncMock)
-    mock_player_read = mocker.patch('app.controllers.card_effects.cards_off_the_table.PlayerService.read', return_value = fake_player)
+    mock_player_read = mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value = fake_player)
     mocker.patch('app.controllers.card_effects.cards_off_the_table.ChatService.create')
 
     asyncio.run(cards_off_the_table(card=fake_card, session=None, target_players=[]))
@@ -63,7 +63,7 @@ def test_cards_off_the_table_target_player_not_found(mocker):
     fake_card = CardFactory(game_id=fake_game.id, turn_played=2)
 
     mocker.patch('app.controllers.card_effects.cards_off_the_table.GameService.read', return_value=fake_game)
-    mocker.patch('app.controllers.card_effects.cards_off_the_table.PlayerService.read', return_value=None)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=None)
 
     with pytest.raises(HTTPException) as exc_info:
         asyncio.run(cards_off_the_table(card=fake_card, session=None, target_players=[123]))
@@ -79,7 +79,7 @@ def test_cards_off_the_table_target_player_wrong_game(mocker):
     target_player = PlayerFactory(id=42, game_id=other_game_id)
 
     mocker.patch('app.controllers.card_effects.cards_off_the_table.GameService.read', return_value=fake_game)
-    mocker.patch('app.controllers.card_effects.cards_off_the_table.PlayerService.read', return_value=target_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=target_player)
 
     with pytest.raises(HTTPException) as exc_info:
         asyncio.run(cards_off_the_table(card=fake_card, session=None, target_players=[target_player.id]))
@@ -111,7 +111,7 @@ def test_cards_off_the_table_discards_not_so_fast_cards(mocker):
     ]
 
     mocker.patch('app.controllers.card_effects.cards_off_the_table.GameService.read', return_value=fake_game)
-    mocker.patch('app.controllers.card_effects.cards_off_the_table.PlayerService.read', return_value=target_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=target_player)
     mock_card_search = mocker.patch('app.controllers.card_effects.cards_off_the_table.CardService.search', return_value=not_so_fast_cards)
     mock_get_last = mocker.patch('app.controllers.card_effects.cards_off_the_table.get_new_discarded_order', side_effect=[20, 30])
     mock_card_update = mocker.patch('app.controllers.card_effects.cards_off_the_table.CardService.update', new_callable=AsyncMock)
@@ -120,7 +120,8 @@ def test_cards_off_the_table_discards_not_so_fast_cards(mocker):
 
     asyncio.run(cards_off_the_table(card=fake_card, session=None, target_players=[target_player.id]))
 
-    mock_card_search.assert_called_once_with(session=None, filterby={'owner__eq': target_player.id, 'name__eq': 'not-so-fast'})
+    mock_card_search.assert_called_once_with(session=None, filterby={'owner__eq': target_player.id, 'name__eq': 'not-so-fast'},
+                                             sortby="id__asc")
     assert mock_get_last.call_count == 2
 
     awaited_calls = mock_card_update.await_args_list
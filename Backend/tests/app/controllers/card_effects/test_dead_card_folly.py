@@ -50,7 +50,7 @@ async def test_cancel_dead_card_folly(session, mocker):
     await dead_card_folly(card=playing_card, session=session, issuer_player=players[0])
 
     # then
-    events = EventTableService().search(session=session, filterby={"game_id__eq": game.id, "turn_played__eq": game.current_turn, "action__eq": "dead_card_folly", "target_player__is_null": False})
+    events = EventTableService().search(session=session, filterby={"game_id__eq": game.id, "turn_played__eq": game.current_turn, "action__in": ["dead_card_folly_clockwise", "dead_card_folly_counter-clockwise", "dead_card_folly_trade"], "target_player__is_null": False})
     assert len(events) == 0
     session.refresh(game)
     assert game.status == GameStatus.FINALIZE_TURN
@@ -199,7 +199,7 @@ async def test_dead_card_folly_select_card_not_mine(session, mocker):
     game = GameFactory(id=1, status=GameStatus.SELECT_CARD_TO_TRADE, current_turn=1, player_in_action=None)
     players = [PlayerFactory(id=i, game_id=game.id, position=i, token=f"token_{i}") for i in range(1, 4)]
     playing_card = CardFactory(id=0, game_id=game.id, turn_discarded=None, owner=1, name="dead-card-folly", turn_played=1)
-    target_card = CardFactory(id=99, game_id=game.id, turn_discarded=None, owner=2, name="asdf")
+    target_card = CardFactory(id=99, game_id=game.id, turn_discarded=None, owner=2, name="card-trade")
     event_order_selected = EventTableFactory(id=1, game_id=game.id, player_id=players[0].id, action="dead_card_folly_clockwise", turn_played=game.current_turn)
 
     mocker.patch('app.controllers.card_effects.dead_card_folly.not_so_fast_status', return_value=False)
@@ -236,7 +236,7 @@ async def test_dead_card_folly_select_card(session, mocker):
     game = GameFactory(id=1, status=GameStatus.SELECT_CARD_TO_TRADE, current_turn=1, player_in_action=None)
     players = [PlayerFactory(id=i, game_id=game.id, token=f"token_{i}", position=i-1) for i in range(1, 4)]
     playing_card = CardFactory(id=0, game_id=game.id, turn_discarded=None, owner=1, name="dead-card-folly", turn_played=1)
-    target_card = CardFactory(id=99, game_id=game.id, turn_discarded=None, owner=1, name="asdf")
+    target_card = CardFactory(id=99, game_id=game.id, turn_discarded=None, owner=1, name="card-trade")
     event_order_selected = EventTableFactory(id=1, game_id=game.id, player_id=players[0].id, action="dead_card_folly_clockwise", turn_played=game.current_turn)
 
     mocker.patch('app.controllers.card_effects.dead_card_folly.not_so_fast_status', return_value=False)
@@ -272,9 +272,9 @@ async def test_dead_card_folly_select_card_last(session, mocker):
     game = GameFactory(id=1, status=GameStatus.SELECT_CARD_TO_TRADE, current_turn=1, player_in_action=None)
     players = [PlayerFactory(id=i, game_id=game.id, token=f"token_{i}", position=i-1) for i in range(1, 4)]
     playing_card = CardFactory(id=0, game_id=game.id, turn_discarded=None, owner=1, name="dead-card-folly", turn_played=1)
-    target_card = CardFactory(id=99, game_id=game.id, turn_discarded=None, owner=1, name="asdf")
+    target_card = CardFactory(id=99, game_id=game.id, turn_discarded=None, owner=1, name="card-trade")
     event_order_selected = EventTableFactory(id=1, game_id=game.id, player_id=players[0].id, action="dead_card_folly_clockwise", turn_played=game.current_turn)
-    other_players_target_cards = [CardFactory(id=100+i, game_id=game.id, turn_discarded=None, owner=players[i+1].id, name=f"card_{i+1}") for i in range(len(players)-1)]
+    other_players_target_cards = [CardFactory(id=100+i, game_id=game.id, turn_discarded=None, owner=players[i+1].id, name="miss-marple") for i in range(len(players)-1)]
     session.add_all(other_players_target_cards)
     events_card_trades = [EventTableFactory(id=i+2, game_id=game.id, player_id=players[i-1].id, action="dead_card_folly_trade",target_card=other_players_target_cards[i-1].id, target_player=players[i-1 % len(players)].id, turn_played=game.current_turn, completed_action=False) for i in range(1, len(players))]
     session.add_all(events_card_trades)
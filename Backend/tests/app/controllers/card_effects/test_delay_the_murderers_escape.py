@@ -30,7 +30,7 @@ def session(engine):
 @pytest.mark.asyncio
 async def test_delay_the_murderers_escape_canceled_by_not_so_fast(mocker):
     mocked_game = GameFactory(status=GameStatus.TURN_START)
-    playing_card = CardFactory(game_id=mocked_game.id)
+    playing_card = CardFactory(game_id=mocked_game.id, owner=7)
     mocked_player = PlayerFactory(id = playing_card.owner, game_id = mocked_game.id)
 
     mocker.patch('app.controllers.card_effects.delay_the_murderers_escape.GameService.read', return_value=mocked_game)
@@ -38,7 +38,7 @@ async def test_delay_the_murderers_escape_canceled_by_not_so_fast(mocker):
     mock_card_delete = mocker.patch('app.controllers.card_effects.delay_the_murderers_escape.CardService.delete', new_callable=AsyncMock)
     mock_game_update = mocker.patch('app.controllers.card_effects.delay_the_murderers_escape.GameService.update', new_callable=AsyncMock)
     mock_card_search = mocker.patch('app.controllers.card_effects.delay_the_murderers_escape.CardService.search')
-    mock_player_read = mocker.patch('app.controllers.card_effects.delay_the_murderers_escape.PlayerService.read', return_vale=mocked_player)
+    mock_player_read = mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=mocked_player)
     mock_log_create = mocker.patch('app.controllers.card_effects.delay_the_murderers_escape.ChatService.create')
     mocker.patch('app.controllers.card_effects.delay_the_murderers_escape.CardService.update',return_value=playing_card)
     await delay_the_murderers_escape(card=playing_card, session=None)
@@ -65,7 +65,7 @@ async def test_delay_the_murderers_escape_play_card(session, mocker):
 
     mock_notify_game_players = mocker.patch("app.controllers.card_effects.delay_the_murderers_escape.notify_game_players")
     mock_not_so_fast = mocker.patch("app.controllers.card_effects.delay_the_murderers_escape.not_so_fast_status", return_value=False)
-    mock_player_read = mocker.patch('app.controllers.card_effects.delay_the_murderers_escape.PlayerService.read', return_vale=mocked_player)
+    mock_player_read = mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=mocked_player)
     mock_log_create = mocker.patch('app.controllers.card_effects.delay_the_murderers_escape.ChatService.create')
 
     session.add(mocked_game)
@@ -5,7 +5,6 @@ from sqlalchemy import create_engine
 from sqlmodel import SQLModel, Session
 
 from app.controllers.card_effects.devious_detect import devious_detect
-from app.models.card import CardType
 from app.models.event_table import EventTable
 from app.models.game import GameStatus
 from tests.conftest import CardFactory, GameFactory, PlayerFactory
@@ -32,7 +31,6 @@ async def test_devious_detect_social_faux_pas_branch(session):
         game_id=game.id,
         name="social-faux-pas",
         turn_played=None,
-        card_type=CardType.DEVIOUS,
     )
     trade_event = EventTable(
         id=10,
@@ -75,7 +73,6 @@ async def test_devious_detect_social_faux_pas_canceled_flow(session, mocker):
         turn_played=None,
         turn_discarded=None,
         discarded_order=None,
-        card_type=CardType.DEVIOUS,
     )
     trade_event = EventTable(
         id=60,
@@ -127,7 +124,6 @@ async def test_devious_detect_blackmailed_branch(session):
         game_id=game.id,
         name="blackmailed",
         turn_played=None,
-        card_type=CardType.DEVIOUS,
     )
     trade_event = EventTable(
         id=11,
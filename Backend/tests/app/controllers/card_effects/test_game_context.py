@@ -0,0 +1,50 @@
+import pytest
+from sqlmodel import Session
+
+from app.controllers.card_effects.context import GameContext
+from app.database.instrumentation import query_budget
+from app.models.game import Game, GameStatus
+from app.models.player import Player
+from tests.conftest import CardFactory, GameFactory, PlayerFactory
+
+
+@pytest.fixture
+def game_session(sqlite_engine):
+    with Session(sqlite_engine) as session:
+        session.add(GameFactory(id=1, status=GameStatus.TURN_START, owner=None, password=None))
+        session.flush()
+        session.add_all([PlayerFactory(id=pid, game_id=1, position=pid - 1) for pid in (1, 2, 3)])
+        session.flush()
+        session.add(CardFactory(id=1, game_id=1, owner=1))
+        session.add_all([CardFactory(id=cid, game_id=1, owner=None, turn_discarded=1, discarded_order=cid) for cid in (2, 3)])
+        session.commit()
+    with Session(sqlite_engine) as session:
+        yield session
+
+
+def test_preloaded_rows_need_no_queries(game_session, sqlite_engine):
+    game = game_session.get(Game, 1)
+    owner = game_session.get(Player, 1)
+    issuer = game_session.get(Player, 2)
+    card = CardFactory(id=1, game_id=1, owner=1)
+
+    ctx = GameContext(game_session, card, game, owner=owner, issuer=issuer)
+    with query_budget(0, engine=sqlite_engine):
+        assert GameContext.load(game_session, card, ctx) is ctx
+        assert ctx.owner is owner
+        assert ctx.player(2) is issuer
+
+
+def test_players_and_piles_are_read_once(game_session, sqlite_engine):
+    card = CardFactory(id=1, game_id=1, owner=1)
+    ctx = GameContext.load(game_session, card)
+
+    # Jugadores, descarte y sets: una consulta cada uno, despues salen del contexto
+    with query_budget(3, engine=sqlite_engine):
+        assert sorted(ctx.players_by_id) == [1, 2, 3]
+        assert ctx.player(2).id == 2
+        assert ctx.owner.id == 1
+        assert [c.id for c in ctx.discard] == [3, 2]
+        assert ctx.discard is ctx.discard
+        assert ctx.sets == []
+        assert ctx.sets == []
@@ -7,7 +7,7 @@ from requests import session
 from fastapi import HTTPException
 
 from app.controllers.card_effects.look_into_the_ashes import look_into_the_ashes
-from app.models.card import PublicCard, CardType
+from app.models.card import PublicCard, CardType, CardState
 from app.models.detective_set import DetectiveSet
 from app.models.game import GameStatus
 from app.models.secret import Secret, SecretType
@@ -21,7 +21,7 @@ def test_look_into_the_ashes_requires_discarded_cards(mocker):
 
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.GameService.read', return_value=fake_game)
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.CardService.search', return_value=[])
-    mocker.patch('app.controllers.card_effects.look_into_the_ashes.PlayerService.read', return_value=fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=fake_player)
 
     with pytest.raises(HTTPException) as exc_info:
         asyncio.run(look_into_the_ashes(fake_card, None))
@@ -38,7 +38,7 @@ def test_look_into_the_ashes_initial_play_sets_waiting_state(mocker):
 
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.GameService.read', return_value=fake_game)
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.CardService.search', return_value=last_discards)
-    mocker.patch('app.controllers.card_effects.look_into_the_ashes.PlayerService.read', return_value=fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=fake_player)
     mock_card_update = mocker.patch('app.controllers.card_effects.look_into_the_ashes.CardService.update', new_callable=AsyncMock)
     mock_game_update = mocker.patch('app.controllers.card_effects.look_into_the_ashes.GameService.update', new_callable=AsyncMock)
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.not_so_fast_status', return_value=False)
@@ -57,7 +57,7 @@ def test_look_into_the_ashes_canceled_by_not_so_fast(mocker):
     last_discards = CardFactory.create_batch(size=2, game_id=fake_game.id)
 
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.GameService.read', return_value=fake_game)
-    mocker.patch('app.controllers.card_effects.look_into_the_ashes.PlayerService.read', return_value=fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=fake_player)
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.CardService.search', return_value=last_discards)
     mock_card_update = mocker.patch('app.controllers.card_effects.look_into_the_ashes.CardService.update', new_callable=AsyncMock)
     mock_game_update = mocker.patch('app.controllers.card_effects.look_into_the_ashes.GameService.update', new_callable=AsyncMock)
@@ -85,7 +85,7 @@ def test_look_into_the_ashes_requires_last_five_card(mocker):
 
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.GameService.read', return_value=fake_game)
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.CardService.search', return_value=last_discards)
-    mocker.patch('app.controllers.card_effects.look_into_the_ashes.PlayerService.read', return_value=fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=fake_player)
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.CardService.read', return_value=target_card)
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.not_so_fast_status', return_value=False)
 
@@ -104,7 +104,7 @@ def test_look_into_the_ashes_requires_single_target(mocker):
 
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.GameService.read', return_value=fake_game)
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.CardService.search', return_value=last_discards)
-    mocker.patch('app.controllers.card_effects.look_into_the_ashes.PlayerService.read', return_value=fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=fake_player)
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.not_so_fast_status', return_value=False)
 
     with pytest.raises(HTTPException) as exc_info:
@@ -123,7 +123,7 @@ def test_look_into_the_ashes_requires_same_turn(mocker):
 
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.GameService.read', return_value=fake_game)
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.CardService.search', return_value=last_discards)
-    mocker.patch('app.controllers.card_effects.look_into_the_ashes.PlayerService.read', return_value=fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=fake_player)
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.CardService.read', return_value=target_card)
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.not_so_fast_status', return_value=False)
 
@@ -142,7 +142,7 @@ def test_look_into_the_ashes_target_card_not_found(mocker):
 
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.GameService.read', return_value=fake_game)
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.CardService.search', return_value=last_discards)
-    mocker.patch('app.controllers.card_effects.look_into_the_ashes.PlayerService.read', return_value=fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=fake_player)
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.CardService.read', return_value=None)
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.not_so_fast_status', return_value=False)
 
@@ -162,7 +162,7 @@ def test_look_into_the_ashes_target_card_wrong_game(mocker):
 
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.GameService.read', return_value=fake_game)
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.CardService.search', return_value=last_discards)
-    mocker.patch('app.controllers.card_effects.look_into_the_ashes.PlayerService.read', return_value=fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=fake_player)
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.CardService.read', return_value=other_game_card)
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.not_so_fast_status', return_value=False)
 
@@ -182,7 +182,7 @@ def test_look_into_the_ashes_successful_recovery(mocker):
 
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.GameService.read', return_value=fake_game)
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.CardService.search', return_value=last_discards)
-    mocker.patch('app.controllers.card_effects.look_into_the_ashes.PlayerService.read', return_value=fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=fake_player)
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.CardService.read', return_value=target_card)
     mock_get_last = mocker.patch('app.controllers.card_effects.look_into_the_ashes.get_new_discarded_order', return_value=30)
     mock_card_update = mocker.patch('app.controllers.card_effects.look_into_the_ashes.CardService.update', new_callable=AsyncMock)
@@ -193,7 +193,7 @@ def test_look_into_the_ashes_successful_recovery(mocker):
     asyncio.run(look_into_the_ashes(fake_card, None, [], [], [target_card.id], []))
 
     expected_calls = [
-        call(session=None, oid=target_card.id, data={'turn_discarded': None, 'discarded_order': None,"content":"",'owner': fake_player.id, "turn_played":None}),
+        call(session=None, oid=target_card.id, data={'turn_discarded': None, 'discarded_order': None,"state": CardState.AVAILABLE,'owner': fake_player.id, "turn_played":None}),
         call(session=None, oid=fake_card.id, data={'turn_discarded': fake_game.current_turn, 'discarded_order': mock_get_last.return_value, 'owner': None}),
     ]
     assert mock_card_update.await_args_list == expected_calls
@@ -208,7 +208,7 @@ def test_look_into_the_ashes_disallowed_status(mocker):
 
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.GameService.read', return_value=fake_game)
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.CardService.search', return_value=last_discards)
-    mocker.patch('app.controllers.card_effects.look_into_the_ashes.PlayerService.read', return_value=fake_player)
+    mocker.patch('app.controllers.card_effects.context.PlayerService.read', return_value=fake_player)
     mocker.patch('app.controllers.card_effects.look_into_the_ashes.not_so_fast_status', return_value=False)
 
     with pytest.raises(HTTPException) as exc_info:
@@ -6,7 +6,6 @@ from sqlalchemy import create_engine
 from sqlmodel import SQLModel, Session
 
 from app.controllers.card_effects.social_faux_pas import social_faux_pas
-from app.models.card import CardType
 from app.models.event_table import EventTable
 from app.models.game import GameStatus
 from app.models.secret import Secret, SecretType
@@ -34,7 +33,6 @@ async def test_social_faux_pas_card_not_in_play(session):
         game_id=game.id,
         name="social-faux-pas",
         turn_played=1,
-        card_type=CardType.DEVIOUS,
     )
 
     session.add(game)
@@ -56,7 +54,6 @@ async def test_social_faux_pas_requires_secret_selection(session):
         game_id=game.id,
         name="social-faux-pas",
         turn_played=game.current_turn,
-        card_type=CardType.DEVIOUS,
     )
 
     session.add(game)
@@ -84,7 +81,6 @@ async def test_social_faux_pas_event_player_mismatch(session):
         name="social-faux-pas",
         owner=player.id,
         turn_played=game.current_turn,
-        card_type=CardType.DEVIOUS,
     )
     event = EventTable(
         id=30,
@@ -134,7 +130,6 @@ async def test_social_faux_pas_reveals_secret_and_finalizes_game(session, mocker
         turn_played=game.current_turn,
         discarded_order=None,
         turn_discarded=None,
-        card_type=CardType.DEVIOUS,
     )
     event = EventTable(
         id=32,
@@ -203,7 +198,6 @@ async def test_social_faux_pas_reveals_secret_and_triggers_devious_detect(sessio
         turn_played=game.current_turn,
         discarded_order=None,
         turn_discarded=None,
-        card_type=CardType.DEVIOUS,
     )
     event = EventTable(
         id=33,
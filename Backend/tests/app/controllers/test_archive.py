@@ -0,0 +1,24 @@
+from sqlmodel import Session
+
+from app.services.archive import ArchiveService
+from tests.conftest import insert_full_game
+
+
+def test_get_archived_game(db_test_client, sqlite_engine):
+    # Given
+    with Session(sqlite_engine) as session:
+        ArchiveService().archive(session, insert_full_game(session, 1))
+
+    # When
+    response = db_test_client.get('/api/archive/1')
+
+    # Then
+    assert response.status_code == 200
+    assert response.json()["game"]["id"] == 1
+    assert len(response.json()["secrets"]) == 1
+
+
+def test_get_archived_game_not_found(db_test_client):
+    response = db_test_client.get('/api/archive/1')
+
+    assert response.status_code == 404
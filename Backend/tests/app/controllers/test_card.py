@@ -10,7 +10,7 @@ from fastapi import HTTPException
 
 from app.controllers.card import early_train_to_paddington, cards_off_the_table, look_into_the_ashes, \
     and_then_there_was_one_more, UpdateCardsDTO, another_victim, NOT_SO_FAST_TIME
-from app.models.card import PublicCard, CardType
+from app.models.card import PublicCard, CardState
 from app.models.detective_set import DetectiveSet
 from app.models.game import GameStatus
 from app.models.secret import Secret, SecretType
@@ -20,7 +20,7 @@ from tests.conftest import GameFactory
 
 def fake_set():
     fake_player = PlayerFactory()
-    fake_card_detective = CardFactory(id=1, owner=fake_player.id, card_type=CardType.DETECTIVE)
+    fake_card_detective = CardFactory(id=1, owner=fake_player.id)
     return DetectiveSet(id=1, owner=fake_player.id, detectives=[fake_card_detective], turn_played=2,game_id=1)
 
 def test_card_not_found(mocker, test_client):
@@ -188,7 +188,7 @@ def test_update_cards_social_disgrace(mocker, test_client):
     cids = [card.id,other_card.id]
     dto = UpdateCardsDTO(turn_discarded=game.current_turn,token=player.token)
 
-    mocker.patch('app.controllers.card.CardService.read', side_effect=[card, other_card])
+    mocker.patch('app.controllers.card.CardService.read', side_effect=[card, card, other_card])
     mocker.patch('app.controllers.card.PlayerService.read', return_value=player)
     mocker.patch('app.controllers.card.GameService.read', return_value=game)
     mocker.patch('app.controllers.card.PlayerService.search', return_value=[player, other_player])
@@ -226,7 +226,7 @@ def test_update_cards_early_train_to_paddington(mocker, test_client):
     card_two = CardFactory(owner=player.id, turn_discarded=None, game_id=game.id)
     dto = UpdateCardsDTO(turn_discarded=game.current_turn,token=player.token)
 
-    mocker.patch('app.controllers.card.CardService.read', side_effect=[card_one, card_two])
+    mocker.patch('app.controllers.card.CardService.read', side_effect=[card_one, card_one, card_two])
     mocker.patch('app.controllers.card.PlayerService.read', side_effect=[player, player, player])
     mocker.patch('app.controllers.card.GameService.read', return_value=game)
     mocker.patch('app.controllers.card.PlayerService.search', return_value=[player, other_player])
@@ -254,7 +254,7 @@ def test_update_cards_ok(mocker, test_client):
     card_two = CardFactory(owner=player.id, turn_discarded=None, game_id=game.id)
     dto = UpdateCardsDTO(turn_discarded=game.current_turn,token=player.token)
 
-    mocker.patch('app.controllers.card.CardService.read', side_effect=[card_one, card_two])
+    mocker.patch('app.controllers.card.CardService.read', side_effect=[card_one, card_one, card_two])
     mocker.patch('app.controllers.card.PlayerService.read', side_effect=[player, player, player])
     mocker.patch('app.controllers.card.GameService.read', return_value=game)
     mocker.patch('app.controllers.card.PlayerService.search', return_value=[player, other_player])
@@ -280,7 +280,7 @@ def test_update_card_not_found(mocker, test_client):
     response = test_client.patch('/api/card/999', json=fake_update_dto.model_dump(mode='json'))
 
     assert response.status_code == 404
-    mock_service.assert_called_once()
+    mock_service.assert_called_with(session=mocker.ANY, oid=999)
 
 
 def test_update_card_not_owner(mocker, test_client):
@@ -408,7 +408,7 @@ def test_update_card_too_many_cards(mocker, test_client):
 def test_update_card_not_in_draft(mocker, test_client):
     fake_game = GameFactory(current_turn=3,status=GameStatus.FINALIZE_TURN_DRAFT)
     fake_player = PlayerFactory(game_id=fake_game.id, token='token-1', position=fake_game.current_turn % 2)
-    other_player = PlayerFactory(game_id=fake_game.id, position=1)
+    other_player = PlayerFactory(game_id=fake_game.id, position=(fake_game.current_turn + 1) % 2)
     players_in_game = [fake_player, other_player]
     fake_card = CardFactory(owner=None, turn_discarded=None, game_id=fake_game.id)
     fake_update_dto = UpdateCardDTOFactory(owner=fake_player.id, turn_discarded=None, token=fake_player.token)
@@ -614,7 +614,7 @@ def test_cancel_action_success(mocker, test_client):
         game_id=game.id,
         turn_played=game.current_turn,
         action="canceled_times",
-        target_card=0,
+        counter=0,
         completed_action=False,
     )
     mock_event_search = mocker.patch(
@@ -636,6 +636,7 @@ def test_cancel_action_success(mocker, test_client):
     dummy_session.commit.assert_called_once()
     dummy_session.refresh.assert_not_called()
     assert cancel_event.completed_action is True
+    assert canceled_times_event.counter == 1
     assert mock_event_search.call_count == 2
     first_call_kwargs = mock_event_search.call_args_list[0].kwargs
     assert first_call_kwargs["filterby"] == {
@@ -665,7 +666,7 @@ def test_cancel_action_success(mocker, test_client):
     assert card_update_kwargs["oid"] == not_so_fast.id
     assert card_update_kwargs["data"] == {
         "owner": None,
-        "content": "nsf",
+        "state": CardState.CANCELING,
     }
 
     test_client.app.dependency_overrides.pop(db_session, None)
@@ -692,7 +693,7 @@ def test_cancel_action_success_uses_event_filters(mocker, test_client):
         game_id=game.id,
         turn_played=game.current_turn,
         action="canceled_times",
-        target_card=0,
+        counter=0,
         completed_action=False,
     )
     mock_event_search = mocker.patch(
@@ -876,3 +877,70 @@ def test_play_card_not_implemented(mocker, test_client):
 
     # Then
     assert response.status_code == 404
+
+
+def test_play_card_cards_off_the_table_query_budget(db_test_client, sqlite_engine):
+    # Given
+    from sqlmodel import Session
+
+    with Session(sqlite_engine) as session:
+        game = GameFactory(id=1, status=GameStatus.WAITING_FOR_CHOOSE_PLAYER, current_turn=1, owner=None, password=None)
+        session.add(game)
+        session.flush()
+        session.add_all([PlayerFactory(id=i, game_id=1, position=i - 1, token=f"token_{i}") for i in (1, 2)])
+        session.flush()
+        game.owner, game.player_in_action = 1, 1
+        session.add(CardFactory(id=1, game_id=1, owner=1, name="cards-off-the-table", turn_played=1))
+        session.add(CardFactory(id=2, game_id=1, owner=2, name="not-so-fast"))
+        session.add(CardFactory(id=3, game_id=1, owner=None, turn_discarded=0, discarded_order=0))
+        session.commit()
+
+    # When
+    response = db_test_client.post('/api/card/play_card/1', params={"token": "token_1"}, json={"target_players": [2]})
+
+    # Then
+    assert response.status_code == 200
+    # 25 + un INSERT al log de la partida por cada flush con cambios
+    assert int(response.headers["X-DB-Queries"]) <= 28
+    assert int(response.headers["X-DB-Commits"]) <= 4
+
+
+def test_concurrent_cancel_action_gets_conflict(db_test_client, sqlite_engine, mocker):
+    # Given
+    from sqlmodel import Session
+    from app.models.event_table import EventTable, EventAction
+    from app.models.game import Game
+    from app.services.player import PlayerService
+
+    with Session(sqlite_engine) as session:
+        game = GameFactory(id=1, status=GameStatus.WAITING_FOR_CANCEL_ACTION, current_turn=1, owner=None, password=None)
+        session.add(game)
+        session.flush()
+        session.add_all([PlayerFactory(id=i, game_id=1, position=i - 1, token=f"token_{i}") for i in (1, 2)])
+        session.flush()
+        game.owner = 1
+        session.add(CardFactory(id=5, game_id=1, owner=2, name="not-so-fast"))
+        session.add(EventTable(id=1, game_id=1, action=EventAction.CANCELED_TIMES, turn_played=1, player_id=None))
+        session.add(EventTable(id=2, game_id=1, action=EventAction.TO_CANCEL, turn_played=1, player_id=None))
+        session.commit()
+
+    read_player = PlayerService.read
+
+    def read_player_while_other_request_commits(self, session, oid):
+        # Otro NOT SO FAST se confirma entre la lectura de la partida y el commit de este request
+        with Session(sqlite_engine) as other:
+            other.get(Game, 1).timestamp = datetime.now()
+            other.commit()
+        return read_player(self, session, oid)
+
+    mocker.patch("app.controllers.card.PlayerService.read", new=read_player_while_other_request_commits)
+
+    # When
+    response = db_test_client.post('/api/card/cancel_action/2', json={"not_so_fast": 5, "token": "token_2"})
+
+    # Then
+    assert response.status_code == 409
+    with Session(sqlite_engine) as session:
+        assert session.get(EventTable, 1).counter == 0
+        assert session.get(EventTable, 2).completed_action is False
+        assert session.get(Game, 1).version == 3
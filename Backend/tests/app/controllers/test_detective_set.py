@@ -1,7 +1,7 @@
 from unittest.mock import AsyncMock, ANY
 
 import pytest
-from app.models.card import Card, CardType
+from app.models.card import Card
 from app.models.detective_set import DetectiveSet
 from app.models.game import GameStatus
 from app.models.secret import Secret, SecretType
@@ -11,7 +11,7 @@ from tests.conftest import PlayerFactory, CardFactory, GameFactory
 @pytest.fixture
 def fake_set():
     fake_player = PlayerFactory()
-    fake_card_detective = CardFactory(id=1, owner=fake_player.id, card_type=CardType.DETECTIVE)
+    fake_card_detective = CardFactory(id=1, owner=fake_player.id, name="miss-marple")
     return DetectiveSet(id=1, owner=fake_player.id, detectives=[fake_card_detective], turn_played=2,game_id=1)
 
 
@@ -31,7 +31,7 @@ async def test_create_detective_set_card_not_found(mocker, test_client):
     fake_game = GameFactory(status=GameStatus.TURN_START)
     fake_player = PlayerFactory(token="abc", game_id=fake_game.id)
     mocker.patch('app.controllers.detective_set.PlayerService.read_by_token', return_value=fake_player)
-    mocker.patch('app.controllers.detective_set.CardService.read', return_value=None)
+    mocker.patch('app.controllers.detective_set.CardService.read_many', return_value={})
     mocker.patch('app.controllers.detective_set.GameService.read', return_value=fake_game)
 
     dto = {"detectives": [1]}
@@ -71,11 +71,11 @@ async def test_create_detective_set_invalid_game_status(mocker, test_client):
 async def test_create_detective_set_wrong_type(mocker, test_client):
     fake_game = GameFactory(status=GameStatus.TURN_START)
     fake_player = PlayerFactory(token="abc", game_id=fake_game.id)
-    fake_card_other = Card(id=2, owner=fake_player.id, card_type=CardType.EVENT)
+    fake_card_other = Card(id=2, owner=fake_player.id, name="card-trade")
     fake_card_other.game_id = fake_game.id
 
     mocker.patch('app.controllers.detective_set.PlayerService.read_by_token', return_value=fake_player)
-    mocker.patch('app.controllers.detective_set.CardService.read', return_value=fake_card_other)
+    mocker.patch('app.controllers.detective_set.CardService.read_many', return_value={2: fake_card_other})
     mocker.patch('app.controllers.detective_set.GameService.read', return_value=fake_game)
 
     dto = {"detectives": [2]}
@@ -89,10 +89,10 @@ async def test_create_detective_set_wrong_type(mocker, test_client):
 async def test_create_detective_set_card_already_in_set(mocker, test_client):
     fake_game = GameFactory(status=GameStatus.TURN_START)
     fake_player = PlayerFactory(token="abc", game_id=fake_game.id)
-    card_in_set = CardFactory(owner=fake_player.id,card_type=CardType.DETECTIVE,set_id=99,game_id=fake_game.id)
+    card_in_set = CardFactory(owner=fake_player.id,name="miss-marple",set_id=99,game_id=fake_game.id)
 
     mocker.patch('app.controllers.detective_set.PlayerService.read_by_token', return_value=fake_player)
-    mocker.patch('app.controllers.detective_set.CardService.read', return_value=card_in_set)
+    mocker.patch('app.controllers.detective_set.CardService.read_many', return_value={card_in_set.id: card_in_set})
     mocker.patch('app.controllers.detective_set.GameService.read', return_value=fake_game)
 
     response = test_client.post("/api/detective_set?token=abc", json={"detectives": [card_in_set.id]})
@@ -104,10 +104,10 @@ async def test_create_detective_set_card_already_in_set(mocker, test_client):
 async def test_create_detective_set_not_owner(mocker, test_client):
     fake_game = GameFactory(status=GameStatus.TURN_START)
     fake_player = PlayerFactory(token="abc", game_id=fake_game.id)
-    fake_card_detective = CardFactory(id=1, owner=fake_player.id, card_type=CardType.DETECTIVE, game_id=fake_game.id)
+    fake_card_detective = CardFactory(id=1, owner=fake_player.id, name="miss-marple", game_id=fake_game.id)
     fake_card_detective.owner = fake_player.id + 1  # distinto jugador
     mocker.patch('app.controllers.detective_set.PlayerService.read_by_token', return_value=fake_player)
-    mocker.patch('app.controllers.detective_set.CardService.read', return_value=fake_card_detective)
+    mocker.patch('app.controllers.detective_set.CardService.read_many', return_value={1: fake_card_detective})
     mocker.patch('app.controllers.detective_set.GameService.read', return_value=fake_game)
 
     dto = {"detectives": [1]}
@@ -121,10 +121,10 @@ async def test_create_detective_set_not_owner(mocker, test_client):
 async def test_create_detective_set_ok(mocker, test_client, fake_set):
     fake_game = GameFactory(status=GameStatus.TURN_START)
     fake_player = PlayerFactory(token="abc", game_id=fake_game.id)
-    fake_card_detective = CardFactory(id=1, owner=fake_player.id, card_type=CardType.DETECTIVE, game_id=fake_game.id)
+    fake_card_detective = CardFactory(id=1, owner=fake_player.id, name="miss-marple", game_id=fake_game.id)
 
     mocker.patch('app.controllers.detective_set.PlayerService.read_by_token', return_value=fake_player)
-    mocker.patch('app.controllers.detective_set.CardService.read', return_value=fake_card_detective)
+    mocker.patch('app.controllers.detective_set.CardService.read_many', return_value={1: fake_card_detective})
     mock_create = mocker.patch('app.controllers.detective_set.DetectiveSetService.create', return_value=fake_set)
     mocker.patch('app.controllers.detective_set.GameService.read', return_value=fake_game)
     mocker.patch('app.controllers.detective_set.GameService.update')
@@ -144,11 +144,11 @@ async def test_create_detective_set_ok(mocker, test_client, fake_set):
 async def test_create_detective_set_choose_player(mocker, test_client):
     fake_game = GameFactory(status=GameStatus.TURN_START)
     fake_player = PlayerFactory(token="abc", game_id=fake_game.id)
-    detective_card = CardFactory(owner=fake_player.id,card_type=CardType.DETECTIVE,name="mr-satterthwaite",game_id=fake_game.id,)
+    detective_card = CardFactory(owner=fake_player.id,name="mr-satterthwaite",game_id=fake_game.id,)
     created_set = DetectiveSet(id=3, owner=fake_player.id, detectives=[detective_card],turn_played=2,game_id=fake_game.id)
 
     mocker.patch('app.controllers.detective_set.PlayerService.read_by_token', return_value=fake_player)
-    mocker.patch('app.controllers.detective_set.CardService.read', return_value=detective_card)
+    mocker.patch('app.controllers.detective_set.CardService.read_many', return_value={detective_card.id: detective_card})
     mocker.patch('app.controllers.detective_set.DetectiveSetService.create', return_value=created_set)
     mocker.patch('app.controllers.detective_set.GameService.read', return_value=fake_game)
     mocker.patch('app.controllers.detective_set.GameService.update', new_callable=AsyncMock)
@@ -165,11 +165,11 @@ async def test_create_detective_set_choose_player(mocker, test_client):
 async def test_create_detective_set_canceled_finalize_turn(mocker, test_client):
     fake_game = GameFactory(status=GameStatus.TURN_START)
     fake_player = PlayerFactory(token="abc", game_id=fake_game.id)
-    detective_card = CardFactory(owner=fake_player.id, card_type=CardType.DETECTIVE, name="hercule-poirot", game_id=fake_game.id, set_id=None,)
+    detective_card = CardFactory(owner=fake_player.id, name="hercule-poirot", game_id=fake_game.id, set_id=None,)
     created_set = DetectiveSet(id=4, owner=fake_player.id, detectives=[detective_card], turn_played=fake_game.current_turn, game_id=fake_game.id,)
 
     mocker.patch('app.controllers.detective_set.PlayerService.read_by_token', return_value=fake_player)
-    mocker.patch('app.controllers.detective_set.CardService.read', return_value=detective_card)
+    mocker.patch('app.controllers.detective_set.CardService.read_many', return_value={detective_card.id: detective_card})
     mocker.patch('app.controllers.detective_set.DetectiveSetService.create', new_callable=AsyncMock, return_value=created_set)
     mocker.patch('app.controllers.detective_set.GameService.read', return_value=fake_game)
     mocker.patch('app.controllers.detective_set.ChatService.create')
@@ -189,13 +189,13 @@ async def test_create_detective_set_canceled_finalize_turn(mocker, test_client):
 async def test_create_detective_set_canceled_returns_cards_when_lady_eileen(mocker, test_client):
     fake_game = GameFactory(status=GameStatus.TURN_START)
     fake_player = PlayerFactory(token="abc", game_id=fake_game.id)
-    lady_card = CardFactory(owner=fake_player.id, card_type=CardType.DETECTIVE, name="lady-eileen-bundle-brent", game_id=fake_game.id, set_id=None,)
-    other_card = CardFactory(owner=fake_player.id, card_type=CardType.DETECTIVE, name="harley-quin-wildcard", game_id=fake_game.id, set_id=None,)
+    lady_card = CardFactory(owner=fake_player.id, name="lady-eileen-bundle-brent", game_id=fake_game.id, set_id=None,)
+    other_card = CardFactory(owner=fake_player.id, name="harley-quin-wildcard", game_id=fake_game.id, set_id=None,)
     detective_ids = [lady_card.id, other_card.id]
     created_set = DetectiveSet(id=5, owner=fake_player.id, detectives=[lady_card, other_card], turn_played=fake_game.current_turn, game_id=fake_game.id,)
 
     mocker.patch('app.controllers.detective_set.PlayerService.read_by_token', return_value=fake_player)
-    mocker.patch('app.controllers.detective_set.CardService.read', side_effect=[lady_card, other_card])
+    mocker.patch('app.controllers.detective_set.CardService.read_many', return_value={lady_card.id: lady_card, other_card.id: other_card})
     mocker.patch('app.controllers.detective_set.DetectiveSetService.create', new_callable=AsyncMock, return_value=created_set)
     mocker.patch('app.controllers.detective_set.GameService.read', return_value=fake_game)
     mocker.patch('app.controllers.detective_set.DetectiveSetService.delete', return_value=1)
@@ -267,7 +267,7 @@ async def test_update_detective_set_missing_card(mocker, test_client, fake_set):
 async def test_update_detective_set_card_already_in_set(mocker, test_client, fake_set):
     fake_game = GameFactory(status=GameStatus.TURN_START)
     owner_player = PlayerFactory(id=fake_set.owner, token="valid_token")
-    used_card = CardFactory(owner=owner_player.id, set_id=123, card_type=CardType.DETECTIVE)
+    used_card = CardFactory(owner=owner_player.id, name="miss-marple", set_id=123)
 
     mocker.patch('app.controllers.detective_set.DetectiveSetService.read', return_value=fake_set)
     mocker.patch('app.controllers.detective_set.GameService.read', return_value=fake_game)
@@ -288,7 +288,7 @@ async def test_update_detective_set_card_wrong_owner(mocker, test_client, fake_s
     fake_game = GameFactory(status=GameStatus.TURN_START)
     owner_player = PlayerFactory(id=fake_set.owner, token="valid_token")
     other_player = PlayerFactory()
-    foreign_card = CardFactory(owner=other_player.id, set_id=None, card_type=CardType.DETECTIVE)
+    foreign_card = CardFactory(owner=other_player.id, name="miss-marple", set_id=None)
 
     mocker.patch('app.controllers.detective_set.DetectiveSetService.read', return_value=fake_set)
     mocker.patch('app.controllers.detective_set.GameService.read', return_value=fake_game)
@@ -309,7 +309,7 @@ async def test_update_detective_set_invalid_detective_for_set(mocker, test_clien
     fake_set.detectives[0].name = "existing_detective"
     fake_game = GameFactory(status=GameStatus.TURN_START)
     owner_player = PlayerFactory(id=fake_set.owner, token="valid_token")
-    wrong_card = CardFactory(owner=owner_player.id, name="other_detective", card_type=CardType.DETECTIVE)
+    wrong_card = CardFactory(owner=owner_player.id, name="other_detective")
 
     mocker.patch('app.controllers.detective_set.DetectiveSetService.read', return_value=fake_set)
     mocker.patch('app.controllers.detective_set.GameService.read', return_value=fake_game)
@@ -328,10 +328,9 @@ async def test_update_detective_set_invalid_detective_for_set(mocker, test_clien
 @pytest.mark.asyncio
 async def test_update_detective_set_tuppence_pair(mocker, test_client, fake_set):
     fake_set.detectives[0].name = "tuppence-beresford"
-    fake_set.detectives[0].card_type = CardType.DETECTIVE
     fake_game = GameFactory(id=fake_set.game_id, status=GameStatus.TURN_START)
     owner_player = PlayerFactory(id=fake_set.owner, token="valid_token", game_id=fake_game.id)
-    new_card = CardFactory(owner=owner_player.id, name="tommy-beresford", card_type=CardType.DETECTIVE, game_id=fake_game.id)
+    new_card = CardFactory(owner=owner_player.id, name="tommy-beresford", game_id=fake_game.id)
     updated_set = DetectiveSet(id=fake_set.id, owner=fake_set.owner, detectives=[*fake_set.detectives, new_card], turn_played=fake_set.turn_played, game_id=fake_set.game_id,)
 
     mocker.patch('app.controllers.detective_set.DetectiveSetService.read', return_value=fake_set)
@@ -353,10 +352,10 @@ async def test_update_detective_set_tuppence_pair(mocker, test_client, fake_set)
 
 @pytest.mark.asyncio
 async def test_update_detective_set_ok(mocker, test_client, fake_set):
-    fake_set.detectives[0].name = "matching_detective"
+    fake_set.detectives[0].name = "miss-marple"
     fake_game = GameFactory(id=fake_set.game_id, status=GameStatus.TURN_START)
     owner_player = PlayerFactory(id=fake_set.owner, token="valid_token")
-    new_card = CardFactory(owner=owner_player.id, name="matching_detective", card_type=CardType.DETECTIVE)
+    new_card = CardFactory(owner=owner_player.id, name="miss-marple")
     updated_set = DetectiveSet(
         id=fake_set.id,
         owner=fake_set.owner,
@@ -389,11 +388,11 @@ async def test_update_detective_set_ok(mocker, test_client, fake_set):
 
 @pytest.mark.asyncio
 async def test_update_detective_set_canceled_returns_cards_when_lady_eileen(mocker, test_client, fake_set):
-    lady_card = CardFactory(owner=fake_set.owner, name="lady-eileen-bundle-brent", card_type=CardType.DETECTIVE, game_id=fake_set.game_id)
+    lady_card = CardFactory(owner=fake_set.owner, name="lady-eileen-bundle-brent", game_id=fake_set.game_id)
     fake_set.detectives = [lady_card]
     fake_game = GameFactory(id=fake_set.game_id, status=GameStatus.TURN_START)
     owner_player = PlayerFactory(id=fake_set.owner, token="valid_token", game_id=fake_game.id)
-    new_card = CardFactory(owner=owner_player.id, name="lady-eileen-bundle-brent", card_type=CardType.DETECTIVE, game_id=fake_game.id)
+    new_card = CardFactory(owner=owner_player.id, name="lady-eileen-bundle-brent", game_id=fake_game.id)
     updated_set = DetectiveSet(id=fake_set.id, owner=fake_set.owner, detectives=[*fake_set.detectives, new_card], turn_played=fake_set.turn_played, game_id=fake_set.game_id,)
 
     mocker.patch('app.controllers.detective_set.DetectiveSetService.read', return_value=fake_set)
@@ -668,7 +667,7 @@ async def test_post_detective_set_action_secret_other_game(mocker, test_client):
 @pytest.mark.asyncio
 async def test_post_detective_set_action_secret_requires_own_secret(mocker, test_client):
     player_in_action = PlayerFactory(token="valid", game_id=45)
-    detective_card = CardFactory(owner=player_in_action.id, card_type=CardType.DETECTIVE, name="mr-satterthwaite", game_id=player_in_action.game_id)
+    detective_card = CardFactory(owner=player_in_action.id, name="mr-satterthwaite", game_id=player_in_action.game_id)
     played_set = DetectiveSet(id=12,owner=player_in_action.id, game_id=player_in_action.game_id, turn_played=5, detectives=[detective_card])
     fake_game = GameFactory(id=played_set.game_id, status=GameStatus.WAITING_FOR_CHOOSE_SECRET, current_turn=played_set.turn_played, player_in_action=player_in_action.id,)
     secret = Secret(id=99, game_id=played_set.game_id, owner=player_in_action.id + 1, name="secret", content="content", revealed=False, type=SecretType.OTHER,)
@@ -688,7 +687,7 @@ async def test_post_detective_set_action_secret_requires_own_secret(mocker, test
 @pytest.mark.asyncio
 async def test_post_detective_set_action_secret_update_parker(mocker, test_client):
     player_in_action = PlayerFactory(token="valid", game_id=50)
-    parker_card = CardFactory(name="parker-pyne", owner=player_in_action.id, card_type=CardType.DETECTIVE, game_id=player_in_action.game_id)
+    parker_card = CardFactory(name="parker-pyne", owner=player_in_action.id, game_id=player_in_action.game_id)
     played_set = DetectiveSet(id=12, owner=player_in_action.id, game_id=player_in_action.game_id, turn_played=6, detectives=[parker_card])
     fake_game = GameFactory(id=played_set.game_id, status=GameStatus.WAITING_FOR_CHOOSE_SECRET, current_turn=played_set.turn_played, player_in_action=player_in_action.id)
     secret = Secret(id=7, game_id=played_set.game_id, owner=player_in_action.id, name="secret", content="content", revealed=True, type=SecretType.OTHER)
@@ -712,8 +711,8 @@ async def test_post_detective_set_action_secret_update_parker(mocker, test_clien
 @pytest.mark.asyncio
 async def test_post_detective_set_action_secret_update_wildcard_transfer(mocker, test_client):
     player_in_action = PlayerFactory(token="valid", game_id=60)
-    card_a = Card(owner=player_in_action.id, card_type=CardType.DETECTIVE, name="mr-satterthwaite", id=1, game_id=player_in_action.game_id, content="a")
-    card_b = Card(owner=player_in_action.id, card_type=CardType.DETECTIVE, name="harley-quin-wildcard", id=2, game_id=player_in_action.game_id, content="b")
+    card_a = Card(owner=player_in_action.id, name="mr-satterthwaite", id=1, game_id=player_in_action.game_id)
+    card_b = Card(owner=player_in_action.id, name="harley-quin-wildcard", id=2, game_id=player_in_action.game_id)
     played_set = DetectiveSet(id=13, owner=player_in_action.id, game_id=player_in_action.game_id, turn_played=7, detectives=[card_a, card_b])
     fake_game = GameFactory(id=played_set.game_id, status=GameStatus.WAITING_FOR_CHOOSE_SECRET, current_turn=played_set.turn_played, player_in_action=player_in_action.id)
     secret = Secret(id=9, game_id=played_set.game_id, owner=player_in_action.id, name="secret", content="content", revealed=False, type=SecretType.OTHER)
@@ -760,7 +759,7 @@ async def test_post_detective_set_action_secret_update_wildcard_transfer(mocker,
 @pytest.mark.asyncio
 async def test_post_detective_set_action_secret_murderer_revealed(mocker, test_client):
     player_in_action = PlayerFactory(token="valid", game_id=75)
-    detective_card = CardFactory(owner=player_in_action.id, card_type=CardType.DETECTIVE, name="generic-detective", game_id=player_in_action.game_id)
+    detective_card = CardFactory(owner=player_in_action.id, name="generic-detective", game_id=player_in_action.game_id)
     played_set = DetectiveSet(id=16, owner=player_in_action.id, game_id=player_in_action.game_id, turn_played=4, detectives=[detective_card])
     fake_game = GameFactory(id=played_set.game_id, status=GameStatus.WAITING_FOR_CHOOSE_SECRET, current_turn=played_set.turn_played, player_in_action=player_in_action.id)
     secret = Secret(id=21, game_id=played_set.game_id, owner=player_in_action.id, name="youre-the-murderer", content="content", revealed=False, type=SecretType.MURDERER)
@@ -786,7 +785,7 @@ async def test_post_detective_set_action_secret_murderer_revealed(mocker, test_c
 @pytest.mark.asyncio
 async def test_post_detective_set_action_secret_parker_pyne(mocker, test_client):
     player_in_action = PlayerFactory(token="valid", game_id=70,social_disgrace=True)
-    parker_card = CardFactory(owner=player_in_action.id, card_type=CardType.DETECTIVE, name="parker-pyne", game_id=player_in_action.game_id)
+    parker_card = CardFactory(owner=player_in_action.id, name="parker-pyne", game_id=player_in_action.game_id)
     played_set = DetectiveSet(id=14, owner=player_in_action.id, game_id=player_in_action.game_id, turn_played=8, detectives=[parker_card])
     fake_game = GameFactory(id=played_set.game_id, status=GameStatus.WAITING_FOR_CHOOSE_SECRET, current_turn=played_set.turn_played, player_in_action=player_in_action.id)
     secret = Secret(id=10, game_id=played_set.game_id, owner=player_in_action.id, name="secret", content="content", revealed=False, type=SecretType.OTHER)
@@ -811,7 +810,7 @@ async def test_post_detective_set_action_secret_parker_pyne(mocker, test_client)
 @pytest.mark.asyncio
 async def test_post_detective_set_action_secret_social_disgrace(mocker, test_client):
     player_in_action = PlayerFactory(token="valid", game_id=80)
-    detective_card = CardFactory(owner=player_in_action.id, card_type=CardType.DETECTIVE, name="another-detective", game_id=player_in_action.game_id)
+    detective_card = CardFactory(owner=player_in_action.id, name="another-detective", game_id=player_in_action.game_id)
     played_set = DetectiveSet(id=15, owner=player_in_action.id, game_id=player_in_action.game_id, turn_played=9, detectives=[detective_card])
     fake_game = GameFactory(id=played_set.game_id, status=GameStatus.WAITING_FOR_CHOOSE_SECRET, current_turn=played_set.turn_played, player_in_action=player_in_action.id)
     secret = Secret(id=11, game_id=played_set.game_id, owner=player_in_action.id, name="secret", content="content", revealed=True, type=SecretType.OTHER)
@@ -836,7 +835,7 @@ async def test_post_detective_set_action_secret_social_disgrace(mocker, test_cli
 @pytest.mark.asyncio
 async def test_post_detective_set_action_secret_revealed_without_parker(mocker, test_client):
     player_in_action = PlayerFactory(token="valid", game_id=80)
-    detective_card = CardFactory(owner=player_in_action.id, card_type=CardType.DETECTIVE, name="another-detective", game_id=player_in_action.game_id)
+    detective_card = CardFactory(owner=player_in_action.id, name="another-detective", game_id=player_in_action.game_id)
     played_set = DetectiveSet(id=15, owner=player_in_action.id, game_id=player_in_action.game_id, turn_played=9, detectives=[detective_card])
     fake_game = GameFactory(id=played_set.game_id, status=GameStatus.WAITING_FOR_CHOOSE_SECRET, current_turn=played_set.turn_played, player_in_action=player_in_action.id)
     secret = Secret(id=11, game_id=played_set.game_id, owner=player_in_action.id, name="secret", content="content", revealed=True, type=SecretType.OTHER)
@@ -10,4 +10,9 @@ def test_event_table_search(mocker, test_client):
     response = test_client.post('/api/event_table/search', json=event_table_filter.model_dump(mode='json'))
     # Then
     assert response.status_code == 200
-    mocker_service.assert_called_once()
\ No newline at end of file
+    mocker_service.assert_called_once()
+
+def test_event_table_search_rejects_unknown_action(test_client):
+    response = test_client.post('/api/event_table/search', json={"game_id__eq": 1, "action__eq": "dead_card_folly"})
+
+    assert response.status_code == 422
@@ -32,7 +32,7 @@ def test_game_ok(mocker, test_client):
     # Then
     assert response.status_code == 200
     mock_service.assert_called_once()
-    assert response.json() == fake_game.model_dump(mode="json", exclude={'password'})
+    assert response.json() == fake_game.model_dump(mode="json", exclude={'password', 'version', 'seating', 'secret_tally'})
 
 
 @pytest.mark.parametrize('min_players_cases', [1,7])
@@ -206,7 +206,7 @@ def test_update_game_turn_ok(mocker, test_client):
     not_so_fast_event = EventTableFactory(target_card=not_so_fast_card.id)
 
     mock_service_game = mocker.patch('app.controllers.game.GameService.read', return_value=fake_game)
-    mock_service_players = mocker.patch('app.controllers.game.PlayerService.search', side_effect=[[fake_player], [fake_player]])
+    mock_service_players = mocker.patch('app.controllers.game.PlayerService.search', return_value=[fake_player])
     mock_service_cards = mocker.patch('app.controllers.game.CardService.search', side_effect=[[fake_player_card], [fake_card_to_pick], []])
     mock_service_update_card = mocker.patch('app.controllers.game.CardService.update', new_callable=AsyncMock, return_value=fake_card_updated)
     mock_get_discard_order = mocker.patch('app.controllers.game.get_new_discarded_order', return_value=10)
@@ -221,7 +221,8 @@ def test_update_game_turn_ok(mocker, test_client):
     assert response.status_code == 200
     mock_service.assert_called_once()
     mock_service_game.assert_called_once()
-    assert len(mock_service_players.mock_calls) == 2
+    # El jugador del turno sale de la ronda, sin otra busqueda
+    mock_service_players.assert_called_once()
     assert len(mock_service_cards.mock_calls) == 3
     mock_service_update_card.assert_awaited_once()
     mock_event_search.assert_called_once()
@@ -232,6 +233,7 @@ def test_update_game_turn_ok(mocker, test_client):
     assert bulk_kwargs["data"][0]["discarded_order"] == mock_get_discard_order.return_value
     update_kwargs = mock_service.await_args.kwargs["data"]
     assert update_kwargs["status"] == GameStatus.FINALIZED
+    assert update_kwargs["player_in_action"] is None
     assert response.json()['current_turn'] == 1
 
 def test_update_game_status_invalid_token(mocker, test_client):
@@ -325,7 +327,7 @@ def test_update_game_bad_token(mocker, test_client):
         # Then
         assert response.status_code == 401
         mocker_service.assert_called_once()
-        assert len(mock_service_players.mock_calls) == 2
+        mock_service_players.assert_called_once()
 
 
 def test_search_game_bad_token(mocker, test_client):
@@ -354,3 +356,79 @@ def test_search_game_multi(mocker, test_client):
     assert response.status_code == 200
     mock_service.assert_called_once()
     assert len(response.json()) == 10
+
+
+def test_update_game_end_turn_query_budget(db_test_client, sqlite_engine):
+    # Given
+    from sqlmodel import Session
+
+    with Session(sqlite_engine) as session:
+        game = GameFactory(id=1, status=GameStatus.FINALIZE_TURN_DRAFT, current_turn=1, owner=None, password=None)
+        session.add(game)
+        session.flush()
+        session.add_all([PlayerFactory(id=i, game_id=1, position=i - 1, token=f"token_{i}") for i in (1, 2)])
+        session.flush()
+        game.owner = 1
+        # El jugador 2 (posicion 1) termina el turno con 5 cartas y roba una del mazo
+        session.add_all([CardFactory(id=i, game_id=1, owner=2, pile_order=i) for i in range(1, 6)])
+        session.add_all([CardFactory(id=i, game_id=1, owner=None, pile_order=i) for i in range(6, 16)])
+        session.commit()
+
+    # When
+    response = db_test_client.patch('/api/game/1', json={"current_turn": 2, "token": "token_2"})
+
+    # Then
+    assert response.status_code == 200
+    assert response.json()["status"] == GameStatus.TURN_START
+    # 14 + un INSERT al log de la partida por cada flush con cambios
+    assert int(response.headers["X-DB-Queries"]) <= 16
+    assert int(response.headers["X-DB-Commits"]) <= 2
+
+
+@pytest.mark.parametrize("players_amount", [2, 4, 6])
+def test_create_cards_for_game_deals_the_deck(players_amount):
+    from collections import Counter
+    from app.controllers.game import create_cards_for_game
+    from app.models.card import CARDS, INSTANT_CARDS
+
+    players = [PlayerFactory(id=i + 1) for i in range(players_amount)]
+
+    cards = create_cards_for_game(gid=7, players=players)
+
+    expected = {c["name"]: c["amount"] for c in CARDS}
+    expected[INSTANT_CARDS["name"]] = INSTANT_CARDS["amount"]
+    assert Counter(c["name"] for c in cards) == expected
+    assert [c["pile_order"] for c in cards] == list(range(len(cards)))
+    assert all(c["game_id"] == 7 for c in cards)
+    # 5 cartas del tope del mazo y un NOT SO FAST para cada jugador
+    hands = Counter(c["owner"] for c in cards if c["owner"] is not None)
+    assert hands == {p.id: 6 for p in players}
+    assert all(c["name"] == INSTANT_CARDS["name"] and c["owner"] for c in cards[-players_amount:])
+
+
+def test_update_game_start_stores_seating(db_test_client, sqlite_engine):
+    from datetime import datetime
+    from sqlmodel import Session, select
+    from app.models.game import Game
+    from app.models.player import Player
+
+    with Session(sqlite_engine) as session:
+        game = GameFactory(id=1, status=GameStatus.WAITING, current_turn=0, owner=None, password=None)
+        session.add(game)
+        session.flush()
+        session.add_all([PlayerFactory(id=i, game_id=1, position=None, token=f"token_{i}",
+                                       date_of_birth=datetime(2000, 1, i)) for i in (1, 2, 3)])
+        session.flush()
+        game.owner = 1
+        session.commit()
+
+    response = db_test_client.patch('/api/game/1', json={"status": GameStatus.STARTED, "token": "token_1"})
+
+    assert response.status_code == 200
+    with Session(sqlite_engine) as session:
+        seating = session.get(Game, 1).seating
+        secret_tally = session.get(Game, 1).secret_tally
+        players = {p.id: p.position for p in session.exec(select(Player)).all()}
+    assert sorted(seating) == [1, 2, 3]
+    assert sum(hidden for hidden, _ in secret_tally["players"].values()) == 9
+    assert [players[pid] for pid in seating] == [0, 1, 2]
@@ -0,0 +1,44 @@
+from sqlmodel import Session
+
+from app.settings import settings
+from tests.conftest import play_turn, start_game
+
+
+def test_get_game_log(db_test_client, sqlite_engine, mocker):
+    # Given
+    mocker.patch.object(settings, "ADMIN_TOKEN", "secreto")
+    with Session(sqlite_engine) as session:
+        play_turn(session, start_game(session), 1)
+
+    # When
+    response = db_test_client.get('/api/admin/game/1/log', params={"token": "secreto", "since": 0, "limit": 3})
+
+    # Then
+    assert response.status_code == 200
+    assert [entry["operation"] for entry in response.json()] == ["insert"] * 3
+
+
+def test_replay_game(db_test_client, sqlite_engine, mocker):
+    # Given
+    mocker.patch.object(settings, "ADMIN_TOKEN", "secreto")
+    with Session(sqlite_engine) as session:
+        game = start_game(session)
+        play_turn(session, game, 1)
+        play_turn(session, game, 2)
+
+    # When
+    response = db_test_client.get('/api/admin/game/1/replay', params={"token": "secreto", "turn": 1})
+
+    # Then
+    assert response.status_code == 200
+    state = response.json()["state"]
+    assert state["game"]["1"]["current_turn"] == 1
+    assert [card["owner"] for card in state["card"].values()].count(None) == 5
+
+
+def test_game_log_requires_admin_token(db_test_client, mocker):
+    mocker.patch.object(settings, "ADMIN_TOKEN", "secreto")
+
+    response = db_test_client.get('/api/admin/game/1/log', params={"token": "otro"})
+
+    assert response.status_code == 403
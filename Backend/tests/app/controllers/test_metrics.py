@@ -0,0 +1,27 @@
+from sqlmodel import Session
+
+from app.models.game import Game, GameStatus
+
+
+def test_metrics_endpoint(db_test_client, sqlite_engine):
+    # Given
+    with Session(sqlite_engine) as session:
+        session.add(Game(id=1, name="g1", status=GameStatus.WAITING, owner=None, player_in_action=None))
+        session.add(Game(id=2, name="g2", status=GameStatus.TURN_START, owner=None, player_in_action=None))
+        session.add(Game(id=3, name="g3", status=GameStatus.TURN_START, owner=None, player_in_action=None))
+        session.commit()
+    db_test_client.get('/api/game/1')
+
+    # When
+    response = db_test_client.get('/metrics')
+
+    # Then
+    assert response.status_code == 200
+    body = response.text
+    assert 'games{status="turn_start"} 2' in body
+    assert 'games{status="waiting"} 1' in body
+    assert 'games{status="finalized"} 0' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/game/{gid}",status="200"}' in body
+    assert 'ws_connections_open{kind="lobby"}' in body
+    assert "db_pool_checked_out" in body
+    assert "not_so_fast_windows_open" in body
@@ -0,0 +1,47 @@
+from app.settings import settings
+
+
+def test_profile_requires_admin_token(test_client, mocker):
+    mocker.patch.object(settings, "ADMIN_TOKEN", "secreto")
+
+    response = test_client.get('/api/admin/profile', params={"token": "otro", "seconds": 0.1})
+
+    assert response.status_code == 403
+
+
+def test_profile_disabled_without_admin_token(test_client, mocker):
+    mocker.patch.object(settings, "ADMIN_TOKEN", None)
+
+    response = test_client.get('/api/admin/profile', params={"token": "", "seconds": 0.1})
+
+    assert response.status_code == 403
+
+
+def test_profile_collapsed(test_client, mocker):
+    mocker.patch.object(settings, "ADMIN_TOKEN", "secreto")
+
+    response = test_client.get('/api/admin/profile', params={"token": "secreto", "seconds": 0.2, "rate": 200,
+                                                              "format": "collapsed"})
+
+    assert response.status_code == 200
+    assert "x-stalls" in response.headers
+    assert response.text.strip()
+
+
+def test_profile_speedscope(test_client, mocker):
+    mocker.patch.object(settings, "ADMIN_TOKEN", "secreto")
+
+    response = test_client.get('/api/admin/profile', params={"token": "secreto", "seconds": 0.1})
+
+    assert response.status_code == 200
+    assert response.json()["profiles"][0]["type"] == "sampled"
+    assert "stalls" in response.json()
+
+
+def test_stalls_report(test_client, mocker):
+    mocker.patch.object(settings, "ADMIN_TOKEN", "secreto")
+
+    response = test_client.get('/api/admin/stalls', params={"token": "secreto"})
+
+    assert response.status_code == 200
+    assert isinstance(response.json(), list)
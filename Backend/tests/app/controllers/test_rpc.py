@@ -0,0 +1,142 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.controllers.rpc import dispatch_rpc, RpcRequest
+from app.database.pool import PoolTimeoutError
+from app.models.game import GameStatus
+from app.models.websocket import GAME_CONNECTIONS
+from tests.conftest import PlayerFactory, CardFactory, GameFactory
+
+
+@pytest.fixture(autouse=True)
+def fake_db_session(mocker):
+    return mocker.patch("app.controllers.rpc.db_session", side_effect=lambda: (s for s in [MagicMock()]))
+
+
+@pytest.mark.asyncio
+async def test_rpc_unknown_method():
+    player = PlayerFactory(id=1, game_id=1, token="valid")
+
+    response = await dispatch_rpc(player, RpcRequest(rpc="no_existe", id=1))
+
+    assert response.status == 404
+    assert response.id == 1
+
+
+@pytest.mark.asyncio
+async def test_rpc_play_card_uses_connection_token(mocker):
+    player = PlayerFactory(id=1, game_id=1, token="valid")
+    mock_play_card = mocker.patch("app.controllers.rpc.play_card", new=AsyncMock(return_value=200))
+
+    response = await dispatch_rpc(player, RpcRequest(rpc="play_card", id="a", params={"cid": 5, "target_players": [2]}))
+
+    assert response.status == 200
+    assert response.data == 200
+    kwargs = mock_play_card.await_args.kwargs
+    assert kwargs["cid"] == 5
+    assert kwargs["token"] == "valid"
+    assert kwargs["dto"].target_players == [2]
+
+
+@pytest.mark.asyncio
+async def test_rpc_update_card_returns_public_card(mocker):
+    player = PlayerFactory(id=3, game_id=1, token="valid")
+    card = CardFactory(id=9, owner=3, game_id=1)
+    mock_update_card = mocker.patch("app.controllers.rpc.update_card", new=AsyncMock(return_value=card))
+
+    response = await dispatch_rpc(player, RpcRequest(rpc="update_card", params={"cid": 9}))
+
+    assert response.status == 200
+    assert response.data["id"] == 9
+    assert "pile_order" not in response.data
+    assert mock_update_card.await_args.kwargs["dto"].owner == 3
+
+
+@pytest.mark.asyncio
+async def test_rpc_update_game_hides_password(mocker):
+    player = PlayerFactory(id=3, game_id=4, token="valid")
+    game = GameFactory(id=4, status=GameStatus.TURN_START, password="secreta")
+    mock_update_game = mocker.patch("app.controllers.rpc.update_game", new=AsyncMock(return_value=game))
+
+    response = await dispatch_rpc(player, RpcRequest(rpc="update_game", params={"current_turn": 2}))
+
+    assert response.status == 200
+    assert "password" not in response.data
+    assert mock_update_game.await_args.kwargs["gid"] == 4
+    assert mock_update_game.await_args.kwargs["dto"].current_turn == 2
+
+
+@pytest.mark.asyncio
+async def test_rpc_http_exception(mocker):
+    player = PlayerFactory(id=1, game_id=1, token="valid")
+    mocker.patch("app.controllers.rpc.cancel_action", new=AsyncMock(side_effect=HTTPException(400, "Estado invalido")))
+
+    response = await dispatch_rpc(player, RpcRequest(rpc="cancel_action", id=7, params={"oid": 1, "not_so_fast": 2}))
+
+    assert response.status == 400
+    assert response.detail == "Estado invalido"
+
+
+@pytest.mark.asyncio
+async def test_rpc_pool_timeout(mocker):
+    player = PlayerFactory(id=1, game_id=1, token="valid")
+    mocker.patch("app.controllers.rpc.cancel_action", new=AsyncMock(side_effect=PoolTimeoutError("QueuePool limit")))
+
+    response = await dispatch_rpc(player, RpcRequest(rpc="cancel_action", id=7, params={"oid": 1, "not_so_fast": 2}))
+
+    assert response.status == 503
+
+
+@pytest.mark.asyncio
+async def test_rpc_missing_params():
+    player = PlayerFactory(id=1, game_id=1, token="valid")
+
+    response = await dispatch_rpc(player, RpcRequest(rpc="update_cards", params={}))
+
+    assert response.status == 422
+
+
+def test_rpc_over_websocket(mocker, test_client: TestClient):
+    fake_player = PlayerFactory(id=1, game_id=888, token="valid")
+    mocker.patch("app.controllers.websocket.PlayerService.read_by_token", return_value=fake_player)
+    mocker.patch("app.controllers.rpc.play_card", new=AsyncMock(return_value=200))
+
+    with test_client.websocket_connect("/ws/monolithic?token=valid") as ws:
+        ws.send_json({"rpc": "play_card", "id": 1, "params": {"cid": 5}})
+        response = ws.receive_json()
+
+    assert response["model"] == "rpc"
+    assert response["id"] == 1
+    assert response["status"] == 200
+    GAME_CONNECTIONS.pop(888, None)
+
+
+def test_malformed_rpc_over_websocket_keeps_the_connection(mocker, test_client: TestClient):
+    fake_player = PlayerFactory(id=1, game_id=888, token="valid")
+    mocker.patch("app.controllers.websocket.PlayerService.read_by_token", return_value=fake_player)
+    mocker.patch("app.controllers.rpc.play_card", new=AsyncMock(return_value=200))
+
+    with test_client.websocket_connect("/ws/monolithic?token=valid") as ws:
+        ws.send_json({"rpc": "play_card", "id": 1, "params": "cid=5"})
+        malformed = ws.receive_json()
+        ws.send_json({"rpc": "play_card", "id": 2, "params": {"cid": 5}})
+        response = ws.receive_json()
+
+    assert malformed["id"] == 1
+    assert malformed["status"] == 422
+    assert response["status"] == 200
+    GAME_CONNECTIONS.pop(888, None)
+
+
+@pytest.mark.asyncio
+async def test_rpc_version_conflict(mocker):
+    player = PlayerFactory(id=1, game_id=1, token="valid")
+    mocker.patch("app.controllers.rpc.cancel_action", new=AsyncMock(side_effect=StaleDataError("0 were matched")))
+
+    response = await dispatch_rpc(player, RpcRequest(rpc="cancel_action", id=8, params={"oid": 1, "not_so_fast": 2}))
+
+    assert response.status == 409
@@ -43,6 +43,11 @@ async def test_ws_broadcast_to_game_players(mocker, test_client: TestClient):
 
     with test_client.websocket_connect("/ws/monolithic?token=valid") as ws1:
         ws1.send_text(message.model_dump_json())
+        # La conexion se registra despues de buscar al jugador en el threadpool, antes del primer receive_text
+        for _ in range(100):
+            if mock_receive_text.called:
+                break
+            sleep(0.01)
         assert 1 in GAME_CONNECTIONS[777].keys()
     mock_receive_text.assert_called()
 
@@ -104,7 +109,10 @@ async def test_ws_broadcast_to_game_players_exception(mocker, test_client: TestC
 
     with test_client.websocket_connect("/ws/monolithic?token=valid") as ws1:
         ws1.send_text(message.model_dump_json())
+        sleep(0.5)
     mock_receive_text.assert_called()
+    # La conexion con error no queda registrada en la partida
+    assert 1 not in GAME_CONNECTIONS[777]
 
 
 @pytest.mark.asyncio
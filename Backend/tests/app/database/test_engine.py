@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import StaticPool, QueuePool
+from sqlmodel import SQLModel, Session, select
+
+from app.database.engine import create_db_engine, db_session, db_read_session, ReadOnlySession
+from app.main import base_app
+from app.models.game import Game, GameStatus
+from app.settings import Settings
+
+
+def test_sqlite_file_uses_wal(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'acdoc.db'}")
+
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+    assert isinstance(engine.pool, QueuePool)
+
+
+def test_sqlite_memory_shares_connection():
+    engine = create_db_engine("sqlite://")
+
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        conn.execute(text("INSERT INTO t VALUES (1)"))
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT x FROM t")).scalar() == 1
+    assert isinstance(engine.pool, StaticPool)
+
+
+def test_db_url_by_backend():
+    assert Settings(DB_BACKEND="sqlite", SQLITE_PATH=":memory:").db_url == "sqlite://"
+    assert Settings(DB_BACKEND="sqlite", SQLITE_PATH="data/acdoc.db").db_url == "sqlite:///data/acdoc.db"
+    assert Settings(DB_BACKEND="postgresql", DB_HOST="db").db_url.startswith("postgresql://")
+
+
+def test_db_replica_url():
+    assert Settings(DB_REPLICA_HOST=None).db_replica_url is None
+    assert Settings(DB_REPLICA_HOST="replica", DB_REPLICA_PORT=5433).db_replica_url.endswith("@replica:5433/takehome")
+    assert Settings(DB_BACKEND="sqlite", DB_REPLICA_HOST="replica").db_replica_url is None
+
+
+def test_read_only_session_rejects_writes(sqlite_engine):
+    with ReadOnlySession(sqlite_engine) as session:
+        assert session.exec(select(Game)).all() == []
+        session.add(Game(id=1, name="g1", status=GameStatus.WAITING, owner=None, player_in_action=None))
+        with pytest.raises(RuntimeError):
+            session.commit()
+
+
+def test_search_routes_read_from_replica(sqlite_engine, test_client):
+    replica_engine = create_db_engine("sqlite://")
+    SQLModel.metadata.create_all(replica_engine)
+    with Session(replica_engine) as session:
+        session.add(Game(id=1, name="en-replica", status=GameStatus.WAITING, owner=None, player_in_action=None))
+        session.commit()
+
+    def primary_session():
+        with Session(sqlite_engine) as session:
+            yield session
+
+    def replica_session():
+        with ReadOnlySession(replica_engine) as session:
+            yield session
+
+    base_app.dependency_overrides[db_session] = primary_session
+    base_app.dependency_overrides[db_read_session] = replica_session
+    try:
+        response = test_client.get('/api/game/1')
+    finally:
+        base_app.dependency_overrides.pop(db_session, None)
+        base_app.dependency_overrides.pop(db_read_session, None)
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "en-replica"
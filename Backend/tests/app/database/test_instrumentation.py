@@ -0,0 +1,53 @@
+import pytest
+from sqlmodel import Session, select
+
+from app.database.instrumentation import track_queries, query_budget, QUERY_STATS
+from app.models.game import Game, GameStatus
+from app.settings import settings
+
+
+def insert_game(session, game_id):
+    session.add(Game(id=game_id, name=f"game-{game_id}", status=GameStatus.WAITING, owner=None, player_in_action=None))
+    session.commit()
+
+
+def test_track_queries_counts_statements_and_commits(sqlite_engine, mocker):
+    mocker.patch.object(settings, "GAME_LOG_ENABLED", False)
+    with Session(sqlite_engine) as session:
+        with track_queries() as stats:
+            insert_game(session, 1)
+            session.exec(select(Game)).all()
+
+    assert stats.queries == 2
+    assert stats.commits == 1
+    assert stats.db_time > 0
+    assert QUERY_STATS.get() is None
+
+
+def test_queries_outside_tracking_are_ignored(sqlite_engine):
+    with Session(sqlite_engine) as session:
+        insert_game(session, 1)
+        with track_queries() as stats:
+            pass
+
+    assert stats.queries == 0
+
+
+def test_query_budget_exceeded(sqlite_engine):
+    with Session(sqlite_engine) as session:
+        with pytest.raises(AssertionError):
+            with query_budget(1):
+                insert_game(session, 1)
+                session.exec(select(Game)).all()
+
+
+def test_db_headers_in_response(db_test_client, sqlite_engine):
+    with Session(sqlite_engine) as session:
+        insert_game(session, 5)
+
+    response = db_test_client.get("/api/game/5")
+
+    assert response.status_code == 200
+    assert response.headers["X-DB-Queries"] == "1"
+    assert response.headers["X-DB-Commits"] == "0"
+    assert "X-DB-Time-Ms" in response.headers
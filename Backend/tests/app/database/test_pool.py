@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine
+
+from app.database.engine import db_read_session
+from app.database.pool import InstrumentedQueuePool, PoolTimeoutError, DB_POOL_TIMEOUTS, DB_POOL_CHECKOUTS, DB_POOL_WAIT
+from app.main import base_app
+
+
+def test_pool_times_out_when_exhausted(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool, pool_size=1,
+                           max_overflow=0, pool_timeout=0.05)
+    timeouts = DB_POOL_TIMEOUTS.values[()]
+    checkouts = DB_POOL_CHECKOUTS.values[()]
+    waits = sum(DB_POOL_WAIT.values[()][:-1])
+
+    with engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+    assert DB_POOL_TIMEOUTS.values[()] == timeouts + 1
+    assert DB_POOL_CHECKOUTS.values[()] == checkouts + 1
+    assert sum(DB_POOL_WAIT.values[()][:-1]) == waits + 1
+
+
+def test_pool_timeout_returns_503(test_client):
+    def exhausted_db_session():
+        raise PoolTimeoutError("QueuePool limit reached")
+        yield
+
+    base_app.dependency_overrides[db_read_session] = exhausted_db_session
+    try:
+        response = test_client.get('/api/game/1')
+    finally:
+        base_app.dependency_overrides.pop(db_read_session, None)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "2"
+
+
+@pytest.mark.asyncio
+async def test_pool_timeout_does_not_block_the_event_loop(tmp_path, mocker):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool, pool_size=1,
+                           max_overflow=0, pool_timeout=0.3)
+    mocker.patch("app.database.engine.db_engine", engine)
+    beats = 0
+
+    async def beat():
+        nonlocal beats
+        while True:
+            beats += 1
+            await asyncio.sleep(0.01)
+
+    with engine.connect():
+        task = asyncio.create_task(beat())
+        async with AsyncClient(transport=ASGITransport(app=base_app), base_url="http://test") as client:
+            # Endpoint async: la espera por la conexion tiene que ser en el threadpool
+            response = await client.request("DELETE", "/api/game/1", json={"token": "token"})
+        task.cancel()
+
+    assert response.status_code == 503
+    # Sin bloquear el loop late cada 10ms durante los 300ms del timeout
+    assert beats >= 15
@@ -0,0 +1,258 @@
+import random
+
+import pytest
+from sqlmodel import Session, select
+
+import bench.simulator
+from app.engine import (EngineCard, EnginePlayer, EngineSecret, GameState, RuleError, close_window, create_set,
+                        discard, end_turn, play_card, set_action, take_draft)
+from app.engine.setup import ACCOMPLICE_SECRET, DEFAULT_SECRET, MURDER_SECRET
+from app.models.card import CARD_CATALOGUE, CARD_DEF_IDS, Card
+from app.models.game import Game, GameStatus
+from app.models.player import Player
+from app.models.secret import Secret, SecretType
+from bench.simulator import SimulatedGame
+from tests.conftest import GameFactory, PlayerFactory
+
+# Los mismos comandos contra los endpoints (sobre sqlite) y contra el motor tienen que dejar la misma partida
+
+HANDS = {
+    1: ["card-trade", "another-victim", "cards-off-the-table", "look-into-the-ashes", "point-your-suspicions",
+        "hercule-poirot"],
+    2: ["blackmailed", "dead-card-folly", "social-faux-pas", "mr-satterthwaite", "tommy-beresford", "parker-pyne"],
+    3: ["miss-marple", "miss-marple", "miss-marple", "and-then-there-was-one-more", "tuppence-beresford",
+        "harley-quin-wildcard"],
+}
+DECK = ["hercule-poirot", "ariadne-oliver", "delay-the-murderers-escape", "not-so-fast", "another-victim"] * 4
+SECRETS = [(1, SecretType.OTHER), (1, SecretType.OTHER), (2, SecretType.MURDERER), (2, SecretType.OTHER),
+           (3, SecretType.OTHER), (3, SecretType.OTHER)]
+
+
+SECRET_ROWS = {SecretType.MURDERER: MURDER_SECRET, SecretType.ACCOMPLICE: ACCOMPLICE_SECRET}
+
+
+def initial_state() -> GameState:
+    names = [(name, None) for name in DECK] + [(name, pid) for pid, hand in HANDS.items() for name in hand]
+    cards = {cid: EngineCard(id=cid, name=name, card_type=CARD_CATALOGUE[CARD_DEF_IDS[name]].card_type,
+                             pile_order=cid - 1, owner=owner)
+             for cid, (name, owner) in enumerate(names, start=1)}
+    return GameState(status=GameStatus.TURN_START, current_turn=0, seating=list(HANDS), cards=cards,
+                     players={pid: EnginePlayer(id=pid, position=pid - 1) for pid in HANDS},
+                     secrets={sid: EngineSecret(id=sid, owner=owner, type=secret_type)
+                              for sid, (owner, secret_type) in enumerate(SECRETS, start=1)})
+
+
+def insert_state(session: Session, state: GameState):
+    session.add(GameFactory(id=1, status=state.status, current_turn=state.current_turn, owner=None, password=None,
+                            seating=state.seating))
+    session.flush()
+    session.add_all([PlayerFactory(id=p.id, game_id=1, position=p.position, token=f"token-{p.id}")
+                     for p in state.players.values()])
+    session.flush()
+    session.add_all([Card(id=c.id, game_id=1, name=c.name, pile_order=c.pile_order, owner=c.owner,
+                          turn_discarded=c.turn_discarded, discarded_order=c.discarded_order)
+                     for c in state.cards.values()])
+    for s in state.secrets.values():
+        secret = SECRET_ROWS.get(s.type, DEFAULT_SECRET)
+        session.add(Secret(id=s.id, game_id=1, owner=s.owner, name=secret["name"], content="", type=s.type))
+    session.get(Game, 1).owner = 1
+    session.commit()
+
+
+def db_snapshot(sqlite_engine):
+    with Session(sqlite_engine) as session:
+        game = session.get(Game, 1)
+        return ((game.status, game.current_turn, game.player_in_action),
+                {c.id: (c.owner, c.turn_discarded, c.discarded_order, c.turn_played, c.set_id, c.state, c.pile_order)
+                 for c in session.exec(select(Card))},
+                {s.id: (s.owner, s.revealed) for s in session.exec(select(Secret))},
+                {p.id: p.social_disgrace for p in session.exec(select(Player))})
+
+
+def engine_snapshot(state: GameState):
+    return ((state.status, state.current_turn, state.player_in_action),
+            {c.id: (c.owner, c.turn_discarded, c.discarded_order, c.turn_played, c.set_id, c.state, c.pile_order)
+             for c in state.cards.values()},
+            {s.id: (s.owner, s.revealed) for s in state.secrets.values()},
+            {p.id: p.social_disgrace for p in state.players.values()})
+
+
+def card_of(state, pid, name):
+    return next(c.id for c in state.hand(pid) if c.name == name)
+
+
+@pytest.fixture
+def game(db_test_client, sqlite_engine, mocker):
+    # Nadie juega NOT SO FAST: la ventana se cierra apenas se abre
+    mocker.patch("app.services.game.NOT_SO_FAST_TIME", 0)
+    state = initial_state()
+    with Session(sqlite_engine) as session:
+        insert_state(session, state)
+    return state
+
+
+def test_endpoints_and_engine_agree(db_test_client, sqlite_engine, game):
+    state = game
+
+    def step(request, command):
+        response = request()
+        assert response.status_code == 200, response.json()
+        command()
+        while state.window is not None:
+            close_window(state)
+        assert db_snapshot(sqlite_engine) == engine_snapshot(state)
+
+    def play(pid, cid, **targets):
+        order = targets.pop("player_order", None)
+        step(lambda: db_test_client.post(f"/api/card/play_card/{cid}", params={"token": f"token-{pid}"},
+                                         json={**targets, "player_order": order}),
+             lambda: play_card(state, pid, cid, clockwise=None if order is None else order == "clockwise", **targets))
+
+    def discard_one(pid, cid):
+        step(lambda: db_test_client.patch("/api/card", json={"cids": [cid], "dto": {
+                 "turn_discarded": state.current_turn, "token": f"token-{pid}"}}),
+             lambda: discard(state, pid, [cid]))
+
+    def take_top_of_draft(pid):
+        cid = state.draft()[0].id
+        step(lambda: db_test_client.patch(f"/api/card/{cid}", json={"owner": pid, "token": f"token-{pid}"}),
+             lambda: take_draft(state, pid, cid))
+
+    def finish_turn(pid):
+        step(lambda: db_test_client.patch("/api/game/1", json={"current_turn": state.current_turn + 1,
+                                                               "token": f"token-{pid}"}),
+             lambda: end_turn(state, pid))
+
+    # Turno de 1: CARD TRADE con 2, que le pasa un BLACKMAILED
+    trade, blackmailed = card_of(state, 1, "card-trade"), card_of(state, 2, "blackmailed")
+    play(1, trade)
+    play(1, trade, target_players=[2])
+    play(1, trade, target_cards=[card_of(state, 1, "another-victim")])
+    play(2, trade, target_cards=[blackmailed])
+    play(2, blackmailed, target_secrets=[1])
+    discard_one(1, card_of(state, 1, "cards-off-the-table"))
+    take_top_of_draft(1)
+    finish_turn(1)
+
+    # Turno de 2: DEAD CARD FOLLY a la derecha; el SOCIAL FAUX PAS le llega a 3
+    folly, faux_pas = card_of(state, 2, "dead-card-folly"), card_of(state, 2, "social-faux-pas")
+    play(2, folly)
+    play(2, folly, player_order="clockwise")
+    play(1, folly, target_cards=[card_of(state, 1, "look-into-the-ashes")])
+    play(2, folly, target_cards=[faux_pas])
+    play(3, folly, target_cards=[card_of(state, 3, "harley-quin-wildcard")])
+    play(3, faux_pas, target_secrets=[5])
+    finish_turn(2)
+
+    # Turno de 3: set de Miss Marple que revela un secreto de 1
+    marples = [c.id for c in state.hand(3) if c.name == "miss-marple"]
+    step(lambda: db_test_client.post("/api/detective_set/", params={"token": "token-3"}, json={"detectives": marples}),
+         lambda: create_set(state, 3, marples))
+    step(lambda: db_test_client.post("/api/detective_set/1", json={"target_secret": 2, "token": "token-3"}),
+         lambda: set_action(state, 3, 1, target_secret=2))
+    discard_one(3, card_of(state, 3, "tuppence-beresford"))
+    take_top_of_draft(3)
+    finish_turn(3)
+
+    # Turno de 1 otra vez: todos señalan a 2 con POINT YOUR SUSPICIONS
+    suspicions = card_of(state, 1, "point-your-suspicions")
+    play(1, suspicions)
+    for pid in (1, 2, 3):
+        play(pid, suspicions, target_players=[2])
+    play(2, suspicions, target_secrets=[4])
+    finish_turn(1)
+
+    assert state.current_turn == 4
+    assert [s.id for s in state.secrets.values() if s.revealed] == [2, 4, 5]
+
+
+class MirroredCommands:
+    """ Cada comando del motor se manda antes al endpoint equivalente, y despues se comparan la base y el estado """
+
+    def __init__(self, client, sqlite_engine, state: GameState):
+        self.client = client
+        self.sqlite_engine = sqlite_engine
+        self.state = state
+        self.commands = 0
+        self.last = None
+
+    def _token(self, pid):
+        return f"token-{pid}"
+
+    def _run(self, request, command):
+        response = request()
+        try:
+            result = command()
+        except RuleError as e:
+            assert response.status_code == e.status_code, (response.json(), e.detail)
+            raise
+        assert response.status_code == 200, response.json()
+        self.commands += 1
+        self.last = (response.request.method, response.request.url.path, response.request.content)
+        # Con NOT_SO_FAST_TIME en 0 el endpoint ya cerro la ventana: se compara cuando el motor tambien la cierra
+        if self.state.window is None:
+            self.compare()
+        return result
+
+    def compare(self):
+        db, engine = db_snapshot(self.sqlite_engine), engine_snapshot(self.state)
+        differences = [(part, key, db[i].get(key), engine[i].get(key)) for i, part in enumerate(("cards", "secrets", "players"), start=1)
+                       for key in db[i].keys() | engine[i].keys() if db[i].get(key) != engine[i].get(key)]
+        assert db[0] == engine[0] and not differences, (self.commands, self.last, db[0], engine[0], differences)
+
+    def discard(self, state, pid, cids):
+        return self._run(lambda: self.client.patch("/api/card", json={"cids": list(cids), "dto": {
+                             "turn_discarded": state.current_turn, "token": self._token(pid)}}),
+                         lambda: discard(state, pid, cids))
+
+    def take_draft(self, state, pid, cid):
+        return self._run(lambda: self.client.patch(f"/api/card/{cid}", json={"owner": pid, "token": self._token(pid)}),
+                         lambda: take_draft(state, pid, cid))
+
+    def end_turn(self, state, pid):
+        return self._run(lambda: self.client.patch("/api/game/1", json={"current_turn": state.current_turn + 1,
+                                                                        "token": self._token(pid)}),
+                         lambda: end_turn(state, pid))
+
+    def play_card(self, state, pid, cid, clockwise=None, **targets):
+        order = None if clockwise is None else ("clockwise" if clockwise else "counter-clockwise")
+        body = {key: list(targets.get(key, [])) for key in ("target_players", "target_secrets", "target_cards",
+                                                            "target_sets")}
+        return self._run(lambda: self.client.post(f"/api/card/play_card/{cid}", params={"token": self._token(pid)},
+                                                  json={**body, "player_order": order}),
+                         lambda: play_card(state, pid, cid, clockwise=clockwise, **targets))
+
+    def create_set(self, state, pid, cids):
+        return self._run(lambda: self.client.post("/api/detective_set/", params={"token": self._token(pid)},
+                                                  json={"detectives": list(cids)}),
+                         lambda: create_set(state, pid, cids))
+
+    def set_action(self, state, pid, sid, target_player=None, target_secret=None):
+        return self._run(lambda: self.client.post(f"/api/detective_set/{sid}", json={
+                             "target_player": target_player, "target_secret": target_secret,
+                             "token": self._token(pid)}),
+                         lambda: set_action(state, pid, sid, target_player=target_player,
+                                            target_secret=target_secret))
+
+    def close_window(self, state):
+        close_window(state)
+        if state.window is None:
+            self.compare()
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_simulated_games_agree(db_test_client, sqlite_engine, mocker, seed):
+    """ Partidas al azar del simulador, sin NOT SO FAST porque en el endpoint la ventana se cierra sola """
+    mocker.patch("app.services.game.NOT_SO_FAST_TIME", 0)
+    game = SimulatedGame(3 + seed % 3, random.Random(seed), nsf_probability=0, play_probability=0.8)
+    with Session(sqlite_engine) as session:
+        insert_state(session, game.state)
+
+    mirrored = MirroredCommands(db_test_client, sqlite_engine, game.state)
+    for name in ("discard", "take_draft", "end_turn", "play_card", "create_set", "set_action", "close_window"):
+        mocker.patch.object(bench.simulator, name, getattr(mirrored, name))
+
+    result = game.play()
+
+    assert result.result == "finished"
+    assert mirrored.commands > 0
@@ -0,0 +1,220 @@
+import pytest
+
+from app.engine import (EngineCard, EnginePlayer, EngineSecret, GameState, RuleError, cancel_action, close_window,
+                        create_set, discard, end_turn, play_card, set_action, take_draft)
+from app.models.card import CARD_CATALOGUE, CARD_DEF_IDS
+from app.models.game import GameStatus
+from app.models.secret import SecretType
+
+
+def make_card(cid, name, owner=None):
+    return EngineCard(id=cid, name=name, card_type=CARD_CATALOGUE[CARD_DEF_IDS[name]].card_type, pile_order=cid - 1,
+                      owner=owner)
+
+
+def make_state(hands, deck_size=10, secrets=None):
+    """ Jugadores 1..n sentados en orden, con las manos dadas y `deck_size` cartas en el mazo """
+    players = {pid: EnginePlayer(id=pid, position=pid - 1) for pid in hands}
+    cards = {}
+    for i in range(deck_size):
+        cards[i + 1] = make_card(i + 1, "hercule-poirot")
+    for pid, names in hands.items():
+        for name in names:
+            cid = len(cards) + 1
+            cards[cid] = make_card(cid, name, owner=pid)
+    secrets = secrets or [(pid, SecretType.OTHER) for pid in hands for _ in range(2)]
+    return GameState(status=GameStatus.TURN_START, current_turn=0, seating=list(hands), players=players, cards=cards,
+                     secrets={sid: EngineSecret(id=sid, owner=owner, type=secret_type)
+                              for sid, (owner, secret_type) in enumerate(secrets, start=1)})
+
+
+def card_of(state, pid, name):
+    return next(c.id for c in state.hand(pid) if c.name == name)
+
+
+def test_discard_draft_and_end_turn():
+    state = make_state({1: ["another-victim", "not-so-fast"], 2: []})
+
+    with pytest.raises(RuleError) as error:
+        discard(state, 2, [card_of(state, 1, "another-victim")])
+    assert error.value.status_code == 401
+
+    discard(state, 1, [card_of(state, 1, "another-victim")])
+    assert state.status == GameStatus.FINALIZE_TURN_DRAFT
+    assert state.discard_pile()[0].name == "another-victim"
+
+    take_draft(state, 1, state.draft()[0].id)
+    end_turn(state, 1)
+
+    assert len(state.hand(1)) == 6
+    assert state.current_turn == 1 and state.status == GameStatus.TURN_START
+    with pytest.raises(RuleError) as error:
+        discard(state, 1, [card_of(state, 1, "not-so-fast")])
+    assert error.value.status_code == 412
+
+
+def test_end_turn_with_the_deck_exhausted_finalizes():
+    state = make_state({1: ["another-victim"], 2: []}, deck_size=6)
+    discard(state, 1, [card_of(state, 1, "another-victim")])
+
+    end_turn(state, 1)
+
+    assert state.status == GameStatus.FINALIZED
+    assert state.outcome == "deck_exhausted"
+
+
+def test_set_reveals_a_secret_after_the_window():
+    state = make_state({1: ["mr-satterthwaite", "mr-satterthwaite"], 2: [], 3: []})
+
+    detective_set = create_set(state, 1, [c.id for c in state.hand(1)])
+    assert state.status == GameStatus.WAITING_FOR_CANCEL_ACTION
+    close_window(state)
+    assert state.status == GameStatus.WAITING_FOR_CHOOSE_PLAYER
+
+    with pytest.raises(RuleError) as error:
+        set_action(state, 1, detective_set.id, target_player=1)
+    assert error.value.status_code == 406
+
+    set_action(state, 1, detective_set.id, target_player=2)
+    secrets = [s.id for s in state.hidden_secrets(2)]
+    set_action(state, 2, detective_set.id, target_secret=secrets[0])
+    assert state.status == GameStatus.FINALIZE_TURN
+
+    state.status = GameStatus.WAITING_FOR_CHOOSE_SECRET
+    state.player_in_action = 2
+    set_action(state, 2, detective_set.id, target_secret=secrets[1])
+    assert state.players[2].social_disgrace
+
+
+def test_not_so_fast_cancels_with_odd_plays():
+    state = make_state({1: ["mr-satterthwaite", "mr-satterthwaite"], 2: ["not-so-fast"], 3: ["not-so-fast"]})
+
+    create_set(state, 1, [c.id for c in state.hand(1)])
+    cancel_action(state, 2, card_of(state, 2, "not-so-fast"))
+    cancel_action(state, 3, card_of(state, 3, "not-so-fast"))
+    close_window(state)
+
+    assert state.status == GameStatus.WAITING_FOR_CHOOSE_PLAYER
+    assert state.player_in_action == 1
+
+
+def test_canceled_lady_eileen_set_goes_back_to_the_hand():
+    state = make_state({1: ["lady-eileen-bundle-brent", "lady-eileen-bundle-brent"], 2: ["not-so-fast"]})
+
+    create_set(state, 1, [c.id for c in state.hand(1)])
+    cancel_action(state, 2, card_of(state, 2, "not-so-fast"))
+    close_window(state)
+
+    assert state.status == GameStatus.FINALIZE_TURN
+    assert state.sets == {}
+    assert len(state.hand(1)) == 2
+
+    # El NOT SO FAST jugado se descarta al terminar el turno
+    end_turn(state, 1)
+    assert state.discard_pile()[0].name == "not-so-fast"
+
+
+def test_tommy_and_tuppence_cannot_be_canceled():
+    state = make_state({1: ["tommy-beresford", "tuppence-beresford"], 2: []})
+
+    create_set(state, 1, [c.id for c in state.hand(1)])
+
+    assert state.window is None
+    assert state.status == GameStatus.WAITING_FOR_CHOOSE_PLAYER
+
+
+def test_point_your_suspicions_tie_is_broken_by_the_owner():
+    state = make_state({1: ["point-your-suspicions"], 2: [], 3: []})
+    card = card_of(state, 1, "point-your-suspicions")
+
+    play_card(state, 1, card)
+    close_window(state)
+    for voter, target in ((1, 2), (2, 3), (3, 1)):
+        play_card(state, voter, card, target_players=[target])
+    assert state.status == GameStatus.WAITING_FOR_CHOOSE_PLAYER
+    assert state.player_in_action == 1
+
+    play_card(state, 1, card, target_players=[3])
+    assert state.status == GameStatus.WAITING_FOR_CHOOSE_SECRET
+    assert state.player_in_action == 3
+
+    play_card(state, 3, card, target_secrets=[state.hidden_secrets(3)[0].id])
+    assert state.status == GameStatus.FINALIZE_TURN
+    assert state.cards[card].owner is None
+
+
+def test_revealing_the_murderer_finalizes():
+    state = make_state({1: ["hercule-poirot", "hercule-poirot"], 2: []},
+                       secrets=[(1, SecretType.OTHER), (2, SecretType.MURDERER), (2, SecretType.OTHER)])
+
+    detective_set = create_set(state, 1, [c.id for c in state.hand(1)])
+    close_window(state)
+    assert state.status == GameStatus.WAITING_FOR_CHOOSE_SECRET
+
+    set_action(state, 1, detective_set.id, target_secret=2)
+
+    assert state.status == GameStatus.FINALIZED
+    assert state.outcome == "murderer_revealed"
+
+
+def test_early_train_in_the_discard_burns_six_cards():
+    state = make_state({1: ["early-train-to-paddington"], 2: []}, deck_size=12)
+
+    discard(state, 1, [card_of(state, 1, "early-train-to-paddington")])
+    assert state.status == GameStatus.WAITING_FOR_CANCEL_ACTION
+    close_window(state)
+
+    assert state.status == GameStatus.FINALIZE_TURN_DRAFT
+    assert len(state.deck()) == 6
+    assert [c.turn_discarded for c in state.discard_pile()] == [-1] * 6
+    assert not any(c.name == "early-train-to-paddington" for c in state.cards.values())
+
+
+def test_card_trade_swaps_and_plays_a_received_blackmailed():
+    state = make_state({1: ["card-trade", "another-victim"], 2: ["blackmailed"], 3: []})
+    trade = card_of(state, 1, "card-trade")
+    given = card_of(state, 1, "another-victim")
+    received = card_of(state, 2, "blackmailed")
+
+    play_card(state, 1, trade)
+    close_window(state)
+    assert state.status == GameStatus.WAITING_FOR_CHOOSE_PLAYER and state.player_in_action == 1
+    with pytest.raises(RuleError) as error:
+        play_card(state, 1, trade, target_players=[1])
+    assert error.value.status_code == 400
+
+    play_card(state, 1, trade, target_players=[2])
+    play_card(state, 1, trade, target_cards=[given])
+    play_card(state, 2, trade, target_cards=[received])
+
+    assert state.cards[given].owner == 2 and state.cards[received].owner == 1
+    assert state.discard_pile()[0].id == trade
+    # Quien recibio el BLACKMAILED le muestra un secreto a quien se lo dio
+    assert state.status == GameStatus.WAITING_FOR_CHOOSE_SECRET and state.player_in_action == 2
+
+    play_card(state, 2, received, target_secrets=[1])
+    assert state.discard_pile()[0].id == received
+    assert state.status == GameStatus.FINALIZE_TURN
+
+
+def test_dead_card_folly_passes_cards_and_opens_social_faux_pas():
+    state = make_state({1: ["dead-card-folly", "another-victim"], 2: ["social-faux-pas"], 3: ["look-into-the-ashes"]})
+    folly = card_of(state, 1, "dead-card-folly")
+    faux_pas = card_of(state, 2, "social-faux-pas")
+
+    play_card(state, 1, folly)
+    close_window(state)
+    assert state.status == GameStatus.WAITING_TO_CHOOSE_DIRECTION
+    play_card(state, 1, folly, clockwise=True)
+    for pid, name in ((1, "another-victim"), (2, "social-faux-pas"), (3, "look-into-the-ashes")):
+        play_card(state, pid, folly, target_cards=[card_of(state, pid, name)])
+
+    assert [c.name for c in state.hand(1)] == ["look-into-the-ashes"]
+    assert [c.name for c in state.hand(2)] == ["another-victim"]
+    assert state.status == GameStatus.WAITING_FOR_CANCEL_ACTION and state.window.card_id == faux_pas
+    close_window(state)
+    assert state.status == GameStatus.WAITING_FOR_CHOOSE_SECRET and state.player_in_action == 3
+
+    play_card(state, 3, faux_pas, target_secrets=[5])
+    assert state.secrets[5].revealed
+    assert state.status == GameStatus.FINALIZE_TURN
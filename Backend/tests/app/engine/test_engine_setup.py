@@ -0,0 +1,42 @@
+import random
+from collections import Counter
+from datetime import date
+
+import pytest
+
+from app.engine import new_game
+from app.models.card import CARDS, INSTANT_CARDS
+from app.models.game import GameStatus
+from app.models.secret import SecretType
+
+
+@pytest.mark.parametrize("players_amount", [2, 5, 6])
+def test_new_game_deals_like_update_game(players_amount):
+    players = {pid: date(2000, 9, 10 + pid) for pid in range(1, players_amount + 1)}
+
+    state = new_game(players, random.Random(players_amount))
+
+    # Cumpleaños mas cerca del de Agatha (16/9) primero
+    assert state.seating == sorted(players, key=lambda pid: abs(players[pid].timetuple().tm_yday - 259))
+    assert state.status == GameStatus.TURN_START and state.current_turn == 0
+
+    expected = {c["name"]: c["amount"] for c in CARDS}
+    expected[INSTANT_CARDS["name"]] = INSTANT_CARDS["amount"]
+    assert Counter(c.name for c in state.cards.values()) == expected
+    assert all(len(state.hand(pid)) == 6 for pid in players)
+
+    pile = state.discard_pile()
+    assert len(pile) == 1 and pile[0].turn_discarded == -1 and pile[0].discarded_order == 0
+
+    assert all(len(state.hidden_secrets(pid)) == 3 for pid in players)
+    types = Counter(s.type for s in state.secrets.values())
+    assert types[SecretType.MURDERER] == 1
+    assert types[SecretType.ACCOMPLICE] == (1 if players_amount > 4 else 0)
+
+
+def test_new_game_is_reproducible_with_a_seed():
+    players = {1: date(2000, 1, 1), 2: date(2000, 6, 1), 3: date(2000, 12, 1)}
+
+    first, second = new_game(players, random.Random(7)), new_game(players, random.Random(7))
+
+    assert first == second
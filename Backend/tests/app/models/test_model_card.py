@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import StatementError
+from sqlmodel import Session, select
+
+from app.models.card import CARD_CATALOGUE, CARD_DEF_IDS, CARD_STATE_CODES, CARDS, INSTANT_CARDS, Card, CardState, CardType
+from app.models.game import Game, GameStatus
+
+
+@pytest.fixture
+def session(sqlite_engine):
+    with Session(sqlite_engine) as session:
+        session.add(Game(id=1, name="game-1", status=GameStatus.TURN_START, owner=None, player_in_action=None))
+        session.commit()
+        yield session
+
+
+def test_catalogue_ids_are_positions():
+    assert [card_def.id for card_def in CARD_CATALOGUE] == list(range(len(CARD_CATALOGUE)))
+    assert [card_def.name for card_def in CARD_CATALOGUE] == [c["name"] for c in [*CARDS, INSTANT_CARDS]]
+    assert CARD_CATALOGUE[CARD_DEF_IDS["not-so-fast"]].card_type == CardType.INSTANT
+
+
+def test_name_and_state_are_stored_as_small_integers(session):
+    session.add(Card(id=1, game_id=1, name="card-trade", pile_order=0, state=CardState.CANCELING))
+    session.commit()
+
+    stored = session.exec(text("SELECT card_def_id, state FROM card WHERE id = 1")).one()
+    card = session.exec(select(Card).where(Card.name == "card-trade", Card.state == CardState.CANCELING)).one()
+
+    assert tuple(stored) == (CARD_DEF_IDS["card-trade"], CARD_STATE_CODES[CardState.CANCELING])
+    assert card.name == "card-trade"
+    assert card.state is CardState.CANCELING
+
+
+def test_card_type_comes_from_the_catalogue(session):
+    session.add(Card(id=1, game_id=1, name="social-faux-pas", pile_order=0))
+    session.commit()
+
+    card = session.get(Card, 1)
+
+    assert "card_type" not in Card.__table__.columns
+    assert card.card_type is CardType.DEVIOUS
+    assert card.model_dump()["card_type"] is CardType.DEVIOUS
+
+
+def test_state_defaults_to_available(session):
+    session.add(Card(id=1, game_id=1, name="miss-marple", pile_order=0))
+    session.commit()
+
+    assert session.get(Card, 1).state is CardState.AVAILABLE
+
+
+def test_unknown_card_is_rejected(session):
+    session.add(Card(id=1, game_id=1, name="EjemploCarta", pile_order=0))
+
+    with pytest.raises(StatementError):
+        session.commit()
@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import StatementError
+from sqlmodel import Session, select
+
+from app.models.event_table import EVENT_ACTION_CODES, EventAction, EventTable
+from app.models.game import Game, GameStatus
+
+
+@pytest.fixture
+def session(sqlite_engine):
+    with Session(sqlite_engine) as session:
+        session.add(Game(id=1, name="game-1", status=GameStatus.TURN_START, owner=None, player_in_action=None))
+        session.commit()
+        yield session
+
+
+def test_action_is_stored_as_small_integer(session):
+    session.add(EventTable(id=1, game_id=1, action="card_trade", turn_played=1, player_id=None))
+    session.commit()
+
+    stored = session.exec(text("SELECT action FROM eventtable WHERE id = 1")).scalar()
+    event = session.exec(select(EventTable).where(EventTable.action == EventAction.CARD_TRADE)).one()
+
+    assert stored == EVENT_ACTION_CODES[EventAction.CARD_TRADE]
+    assert event.action is EventAction.CARD_TRADE
+    assert event.action == "card_trade"
+
+
+def test_every_action_has_a_unique_code():
+    assert set(EVENT_ACTION_CODES) == set(EventAction)
+    assert len(set(EVENT_ACTION_CODES.values())) == len(EventAction)
+
+
+def test_unknown_action_is_rejected(session):
+    session.add(EventTable(id=1, game_id=1, action="dead_card_folly", turn_played=1, player_id=None))
+
+    with pytest.raises(StatementError):
+        session.commit()
+
+
+def test_lookup_index(sqlite_engine):
+    indexes = {index["name"]: index["column_names"] for index in inspect(sqlite_engine).get_indexes("eventtable")}
+
+    assert indexes["ix_eventtable_game_turn_action"] == ["game_id", "turn_played", "action"]
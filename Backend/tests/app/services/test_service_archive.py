@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session, select, func
+
+from app.models.archived_game import ArchivedGame
+from app.models.card import Card
+from app.models.chat import Chat
+from app.models.detective_set import DetectiveSet
+from app.models.event_table import EventTable
+from app.models.game import Game, GameStatus
+from app.models.player import Player
+from app.models.secret import Secret
+from app.services.archive import ArchiveService
+from tests.conftest import insert_full_game
+
+
+def count(session, model):
+    return session.exec(select(func.count()).select_from(model)).one()
+
+
+@pytest.fixture
+def session(sqlite_engine):
+    with Session(sqlite_engine) as session:
+        yield session
+
+
+def test_archive_moves_game_out_of_hot_tables(session):
+    game = insert_full_game(session, 1)
+    insert_full_game(session, 2, status=GameStatus.TURN_START)
+
+    archived = ArchiveService().archive(session, game)
+
+    assert archived.players == 2
+    assert session.get(Game, 1) is None
+    for model in (Player, Card, Secret, EventTable, Chat, DetectiveSet):
+        assert session.exec(select(func.count()).select_from(model).where(model.game_id == 1)).one() == 0
+        assert session.exec(select(func.count()).select_from(model).where(model.game_id == 2)).one() > 0
+    assert count(session, ArchivedGame) == 1
+
+
+def test_archived_game_can_be_loaded_without_credentials(session):
+    game = insert_full_game(session, 1)
+    ArchiveService().archive(session, game)
+
+    content = ArchiveService.load(ArchiveService().read_by_game(session, 1))
+
+    assert content["game"]["name"] == "game-1"
+    assert "password" not in content["game"]
+    assert len(content["players"]) == 2
+    assert all("token" not in p for p in content["players"])
+    assert len(content["cards"]) == 5
+    assert content["cards"][0]["set_id"] == 1
+    assert content["chat"][0]["content"] == "gg"
+
+
+def test_archive_finished_only_takes_old_finalized_games(session):
+    insert_full_game(session, 1)
+    insert_full_game(session, 2, finished_at=datetime.now())
+    insert_full_game(session, 3, status=GameStatus.TURN_START)
+
+    archived_ids = ArchiveService().archive_finished(session, timedelta(minutes=30))
+
+    assert archived_ids == [1]
+    assert count(session, Game) == 2
+
+
+def test_archived_game_ids_are_not_reused(session):
+    ArchiveService().archive(session, insert_full_game(session, 1))
+
+    game = Game(name="nueva", owner=None, player_in_action=None)
+    session.add(game)
+    session.commit()
+
+    assert game.id == 2
+
+
+def test_archive_finished_skips_a_repeated_game_id(session):
+    ArchiveService().archive(session, insert_full_game(session, 1))
+    # Como en una base SQLite de antes de AUTOINCREMENT, que le volvio a dar el id 1 a otra partida
+    insert_full_game(session, 1)
+    insert_full_game(session, 2)
+
+    archived_ids = ArchiveService().archive_finished(session, timedelta(minutes=30))
+
+    assert archived_ids == [2]
+    assert session.get(Game, 1) is not None
+    assert count(session, ArchivedGame) == 2
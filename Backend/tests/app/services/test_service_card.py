@@ -44,14 +44,12 @@ def insert_game(session, game_id, status=GameStatus.TURN_START):
     return game
 
 
-def insert_card(session, card_id=1, game_id=1, owner=None, card_type=CardType.EVENT):
+def insert_card(session, card_id=1, game_id=1, owner=None):
     card = CardFactory(
         id=card_id,
         game_id=game_id,
         owner=owner,
-        name=f"card-{card_id}",
-        content="content",
-        card_type=card_type,
+        name="card-trade",
     )
     session.add(card)
     session.commit()
@@ -68,9 +66,7 @@ async def test_create_card(mocker, session, service):
         id=10,
         game_id=game.id,
         owner=None,
-        name="new-card",
-        content="body",
-        card_type=CardType.EVENT,
+        name="card-trade",
     )
 
     data = card.model_dump()
@@ -92,9 +88,7 @@ async def test_create_card_bulk(mocker, session, service):
         id=10 +  i,
         game_id=game.id,
         owner=None,
-        name="new-card",
-        content="body",
-        card_type=CardType.EVENT,
+        name="card-trade",
     ) for i in range(3)]
 
     data = [c.model_dump() for c in cards]
@@ -174,3 +168,33 @@ async def test_delete_card_and_removes(mocker, session, service):
     assert deleted_id == card.id
     assert session.get(Card, card.id) is None
     mock_notify.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_create_card_bulk_single_insert(mocker, engine, session, service):
+    from app.database.instrumentation import query_budget
+    from app.settings import settings
+
+    insert_game(session, game_id=1, status=GameStatus.TURN_START)
+    mocker.patch.object(settings, "GAME_LOG_ENABLED", False)
+    mock_notify = mocker.patch("app.services.card.notify_game_players", new=AsyncMock())
+    data = [{"game_id": 1, "name": "card-trade", "pile_order": i} for i in range(70)]
+
+    with query_budget(1, engine=engine, max_commits=1):
+        created = await service.create_bulk(session, data)
+
+    sent = mock_notify.await_args.args[1].data
+    assert len(sent) == 70
+    assert len({c["id"] for c in sent}) == 70
+    assert len(created) == 70
+
+
+def test_search_filters_card_type_through_the_catalogue(session, service):
+    insert_game(session, 1)
+    session.add_all([CardFactory(id=1, game_id=1, name="miss-marple"), CardFactory(id=2, game_id=1, name="blackmailed"),
+                     CardFactory(id=3, game_id=1, name="card-trade")])
+    session.commit()
+
+    cards = service.search(session, filterby={"game_id__eq": 1, "card_type__in": [CardType.DETECTIVE, CardType.DEVIOUS]})
+
+    assert sorted(c.id for c in cards) == [1, 2]
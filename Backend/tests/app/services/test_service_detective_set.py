@@ -1,9 +1,9 @@
 import pytest
 from sqlmodel import SQLModel, create_engine, Session, select
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock
 
 from app.models.detective_set import DetectiveSet
-from app.models.card import Card, CardType
+from app.models.card import Card
 from app.models.game import Game, GameStatus
 from app.services.detective_set import DetectiveSetService, CreateDetectiveSet, set_next_game_status
 from tests.conftest import CardFactory
@@ -24,7 +24,7 @@ def session(engine):
 
 @pytest.fixture
 def fake_card():
-    return CardFactory(id=1, game_id=10, owner=5, card_type=CardType.DETECTIVE)
+    return CardFactory(id=1, game_id=10, owner=5, name="miss-marple")
 
 
 @pytest.fixture
@@ -56,12 +56,8 @@ async def test_read_not_found(session, service):
 
 @pytest.mark.asyncio
 async def test_create_ok(mocker, session, service, fake_card):
-    mock_card_service = mocker.patch(
-        "app.services.detective_set.CardService", return_value=AsyncMock()
-    )
-    instance = mock_card_service.return_value
-    instance.read = MagicMock()
-    instance.read.side_effect = [fake_card, fake_card]
+    session.add(fake_card)
+    session.commit()
 
     mock_notify = mocker.patch("app.services.detective_set.notify_game_players", new=AsyncMock())
 
@@ -69,20 +65,13 @@ async def test_create_ok(mocker, session, service, fake_card):
     result = await service.create(session, data)
 
     assert result.id is not None
-    instance.read.assert_called()
-    mock_notify.assert_called()
+    assert [d.id for d in result.detectives] == [1]
+    mock_notify.assert_called_once()
     assert session.exec(select(DetectiveSet)).first() is not None
 
 
 @pytest.mark.asyncio
 async def test_create_no_valid_cards(mocker, session, service):
-    mock_card_service = mocker.patch(
-        "app.services.detective_set.CardService", return_value=AsyncMock()
-    )
-    instance = mock_card_service.return_value
-    instance.read = MagicMock()
-    instance.read.return_value = None
-
     mock_notify = mocker.patch("app.services.detective_set.notify_game_players", new=AsyncMock())
 
     data = CreateDetectiveSet(detectives=[99], owner=5,turn_played=3,game_id=1)
@@ -92,6 +81,24 @@ async def test_create_no_valid_cards(mocker, session, service):
     mock_notify.assert_not_called()
 
 
+@pytest.mark.asyncio
+async def test_create_batches_cards_and_notifies_once(mocker, engine, session, service):
+    from app.database.instrumentation import query_budget
+    from app.settings import settings
+
+    mocker.patch.object(settings, "GAME_LOG_ENABLED", False)
+    session.add_all([CardFactory(id=cid, game_id=1, owner=5, name="miss-marple") for cid in (1, 2, 3)])
+    session.commit()
+    mock_notify = mocker.patch("app.services.detective_set.notify_game_players", new=AsyncMock())
+
+    # SELECT ... IN de las cartas, INSERT del set, UPDATE de las cartas y el refresh del set
+    with query_budget(4, engine=engine, max_commits=1):
+        result = await service.create(session, CreateDetectiveSet(detectives=[1, 2, 3], owner=5, turn_played=2, game_id=1))
+
+    mock_notify.assert_awaited_once()
+    assert {c.set_id for c in session.exec(select(Card)).all()} == {result.id}
+
+
 @pytest.mark.asyncio
 async def test_update_found(mocker, session, service, fake_set, fake_card):
     fake_set.detectives = [fake_card]
@@ -104,7 +111,7 @@ async def test_update_found(mocker, session, service, fake_set, fake_card):
     updated = await service.update(session, {"owner": 99, "turn_played":2,"detectives":fake_card}, fake_set.id)
     assert updated.owner == 99
     assert updated.turn_played == 2
-    mock_notify.assert_called()
+    mock_notify.assert_called_once()
 
 
 @pytest.mark.asyncio
@@ -123,7 +130,7 @@ async def test_delete_found(mocker, session, service, fake_set, fake_card):
 
     result = await service.delete(session, fake_set.id)
     assert result == fake_set.id
-    mock_notify.assert_called()
+    mock_notify.assert_called_once()
     assert session.exec(select(DetectiveSet)).first() is None
 
 
@@ -140,8 +147,6 @@ def _build_detective_set_with_name(name: str) -> DetectiveSet:
         game_id=1,
         owner=1,
         name=name,
-        content="detective-card",
-        card_type=CardType.DETECTIVE,
     )
     return DetectiveSet(id=1, owner=1, turn_played=1, game_id=1, detectives=[detective_card])
 
@@ -46,7 +46,7 @@ def insert_event_table(
     session,
     event_id=1,
     game_id=1,
-    action="action_1",
+    action="to_cancel",
     turn_played=1,
     player_id=1,
     target_player=None,
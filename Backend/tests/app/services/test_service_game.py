@@ -1,12 +1,20 @@
 from datetime import datetime, UTC, timedelta
 
 import pytest
-from sqlmodel import SQLModel, create_engine, Session, select
+from sqlalchemy.orm.exc import StaleDataError
+from sqlmodel import SQLModel, create_engine, Session, select, func
 from unittest.mock import AsyncMock, call
 
+from app.database.instrumentation import query_budget
+from app.models.card import Card
+from app.models.chat import Chat
+from app.models.detective_set import DetectiveSet
+from app.models.event_table import EventTable
 from app.models.game import Game, GameStatus
 from app.models.player import Player
+from app.models.secret import Secret
 from app.services.game import GameService, not_so_fast_status
+from tests.conftest import insert_full_game
 from tests.conftest import GameFactory
 
 
@@ -84,6 +92,16 @@ async def test_update_game_service(mocker, session, service):
     mock_notify_players.assert_awaited_once()
 
 
+@pytest.mark.asyncio
+async def test_update_game_to_finalized_stamps_end_time(mocker, session, service):
+    game = insert_game(session, game_id=21, status=GameStatus.TURN_START)
+    mocker.patch("app.services.game.notify_game_players", new=AsyncMock())
+
+    updated = await service.update(session, game.id, {"status": GameStatus.FINALIZED})
+
+    assert datetime.now() - updated.timestamp < timedelta(seconds=5)
+
+
 
 @pytest.mark.asyncio
 async def test_delete_game_cleans_players(mocker, session, service):
@@ -108,6 +126,52 @@ async def test_delete_game_cleans_players(mocker, session, service):
     mock_notify_lobby.assert_awaited_once()
 
 
+@pytest.mark.asyncio
+async def test_delete_game_cascades_in_one_transaction(mocker, sqlite_engine, service):
+    mocker.patch("app.services.game.notify_game_players", new=AsyncMock())
+    mock_notify_lobby = mocker.patch("app.services.game.notify_lobby", new=AsyncMock())
+    with Session(sqlite_engine) as session:
+        insert_full_game(session, 1, status=GameStatus.TURN_START)
+        insert_full_game(session, 2, status=GameStatus.TURN_START)
+
+        with query_budget(12, max_commits=1):
+            assert await service.delete(session, 1) == 1
+
+        for model in (Player, Card, Secret, EventTable, Chat, DetectiveSet):
+            assert session.exec(select(func.count()).select_from(model).where(model.game_id == 1)).one() == 0
+            assert session.exec(select(func.count()).select_from(model).where(model.game_id == 2)).one() > 0
+        assert session.get(Game, 1) is None
+    mock_notify_lobby.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_delete_many_sends_one_lobby_message(mocker, sqlite_engine, service):
+    mock_notify_players = mocker.patch("app.services.game.notify_game_players", new=AsyncMock())
+    mock_notify_lobby = mocker.patch("app.services.game.notify_lobby", new=AsyncMock())
+    with Session(sqlite_engine) as session:
+        for gid in (1, 2, 3):
+            insert_full_game(session, gid, status=GameStatus.WAITING)
+
+        with query_budget(12, max_commits=1):
+            deleted = await service.delete_many(session, [1, 2, 99])
+
+        assert sorted(deleted) == [1, 2]
+        assert session.exec(select(Game.id)).all() == [3]
+    assert mock_notify_players.await_count == 2
+    mock_notify_lobby.assert_awaited_once()
+    message = mock_notify_lobby.await_args.args[0]
+    assert message.action == "delete_many"
+    assert sorted(message.data["ids"]) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_delete_many_without_existing_games_does_nothing(mocker, session, service):
+    mock_notify_lobby = mocker.patch("app.services.game.notify_lobby", new=AsyncMock())
+
+    assert await service.delete_many(session, [404]) == []
+    mock_notify_lobby.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_not_so_fast_status_returns_false_without_cancelation(mocker):
     fake_game = GameFactory(id=101, status=GameStatus.TURN_START, current_turn=5, timestamp=None,)
@@ -119,7 +183,7 @@ async def test_not_so_fast_status_returns_false_without_cancelation(mocker):
 
     mocker.patch("app.services.game.asyncio.sleep", new=AsyncMock())
     mocker.patch("app.services.game.NOT_SO_FAST_TIME", 0)
-    canceled_times_event = mocker.Mock(target_card=0)
+    canceled_times_event = mocker.Mock(counter=0)
     mocker.patch(
         "app.services.game.EventTableService.create",
         new=AsyncMock(side_effect=[canceled_times_event, mocker.Mock()]),
@@ -133,6 +197,7 @@ async def test_not_so_fast_status_returns_false_without_cancelation(mocker):
     assert session.refresh.call_args_list
     assert session.refresh.call_args_list[0] == call(updated_game)
     assert session.refresh.call_args_list[-1] == call(canceled_times_event)
+    session.expire_all.assert_called_once()
 
 
 @pytest.mark.asyncio
@@ -146,7 +211,7 @@ async def test_not_so_fast_status_emits_timer_updates(mocker):
 
     mocker.patch("app.services.game.asyncio.sleep", new=AsyncMock())
     mock_notify = mocker.patch("app.services.game.notify_game_players", new=AsyncMock())
-    canceled_times_event = mocker.Mock(target_card=1)
+    canceled_times_event = mocker.Mock(counter=1)
     mocker.patch("app.services.game.EventTableService.create", new=AsyncMock(side_effect=[canceled_times_event, mocker.Mock()]),)
     mocker.patch("app.services.game.GameService.update", new=AsyncMock(return_value=updated_game))
     mocker.patch("app.services.game.NOT_SO_FAST_TIME", 2)
@@ -164,3 +229,25 @@ async def test_not_so_fast_status_emits_timer_updates(mocker):
     assert result is True
     mock_notify.assert_awaited_once()
     session.refresh.assert_called_with(canceled_times_event)
+
+
+@pytest.mark.asyncio
+async def test_update_raises_conflict_over_newer_version(mocker, sqlite_engine, service):
+    mock_notify = mocker.patch("app.services.game.notify_game_players", new=AsyncMock())
+    with Session(sqlite_engine) as session, Session(sqlite_engine) as other:
+        session.add(GameFactory(id=1, status=GameStatus.TURN_START, owner=None))
+        session.commit()
+        game = session.get(Game, 1)
+        assert game.version == 1
+        other.get(Game, 1).name = "renombrada"
+        other.commit()
+
+        with pytest.raises(StaleDataError):
+            await service.update(session, 1, {"status": GameStatus.FINALIZE_TURN})
+
+    with Session(sqlite_engine) as session:
+        game = session.get(Game, 1)
+        assert game.status == GameStatus.TURN_START
+        assert game.name == "renombrada"
+        assert game.version == 2
+    mock_notify.assert_not_awaited()
@@ -0,0 +1,96 @@
+import pytest
+from sqlmodel import Session, select
+
+from app.models.card import Card
+from app.models.event_table import EventTable
+from app.models.game_log import GameLogEntry, GameSnapshot, LogOperation
+from app.models.player import Player
+from app.services.game import delete_game_rows
+from app.services.game_log import GameLogService, game_state
+from app.settings import settings
+from tests.conftest import play_turn, start_game
+
+
+@pytest.fixture
+def session(sqlite_engine, mocker):
+    mocker.patch.object(settings, "GAME_LOG_SNAPSHOT_EVERY_TURNS", 2)
+    with Session(sqlite_engine) as session:
+        yield session
+
+
+def test_every_change_is_logged_without_credentials(session):
+    game = start_game(session)
+    play_turn(session, game, 1)
+    session.delete(session.get(Card, 6))
+    session.commit()
+
+    entries = GameLogService().entries(session, 1)
+
+    inserts = [e for e in entries if e.operation == LogOperation.INSERT]
+    assert {e.table_name for e in inserts} == {"game", "player", "card"}
+    assert all("token" not in e.data and "password" not in e.data for e in entries)
+    card_update = next(e for e in entries if e.operation == LogOperation.UPDATE and e.table_name == "card")
+    assert card_update.data == {"owner": 2}
+    assert card_update.turn == 1
+    assert entries[-1].operation == LogOperation.DELETE and entries[-1].row_id == 6
+
+
+def test_snapshot_every_n_turns(session):
+    game = start_game(session)
+    for turn in range(1, 6):
+        play_turn(session, game, turn)
+
+    snapshots = session.exec(select(GameSnapshot).order_by(GameSnapshot.turn)).all()
+
+    assert [s.turn for s in snapshots] == [2, 4]
+    assert snapshots[0].data["game"]["1"]["current_turn"] == 2
+    assert "token" not in snapshots[0].data["player"]["1"]
+
+
+def test_replay_rebuilds_any_turn(session):
+    game = start_game(session)
+    states = {0: game_state(session.connection(), 1)}
+    for turn in range(1, 6):
+        play_turn(session, game, turn)
+        states[turn] = game_state(session.connection(), 1)
+
+    for turn, state in states.items():
+        assert GameLogService().replay(session, 1, turn=turn)["state"] == state
+    assert GameLogService().replay(session, 1)["state"] == states[5]
+
+
+def test_replay_includes_columns_left_unset(session):
+    start_game(session)
+    session.add(EventTable(id=1, game_id=1, action="canceled_times", turn_played=0, target_card=0))
+    session.commit()
+
+    assert GameLogService().replay(session, 1)["state"] == game_state(session.connection(), 1)
+
+
+def test_player_leaving_game_is_logged_as_delete(session):
+    start_game(session)
+    player = session.get(Player, 2)
+    player.game_id = None
+    session.commit()
+
+    state = GameLogService().replay(session, 1)["state"]
+
+    assert list(state["player"]) == ["1"]
+
+
+def test_delete_game_rows_removes_log(session):
+    game = start_game(session)
+    play_turn(session, game, 2)
+
+    delete_game_rows(session, [1])
+    session.commit()
+
+    assert session.exec(select(GameLogEntry)).all() == []
+    assert session.exec(select(GameSnapshot)).all() == []
+
+
+def test_log_can_be_disabled(session, mocker):
+    mocker.patch.object(settings, "GAME_LOG_ENABLED", False)
+    start_game(session)
+
+    assert session.exec(select(GameLogEntry)).all() == []
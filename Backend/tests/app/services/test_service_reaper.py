@@ -0,0 +1,95 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlmodel import Session, select, func
+
+from app.models.card import Card
+from app.models.game import Game, GameStatus
+from app.models.player import Player
+from app.services.reaper import Reaper
+from app.settings import settings
+from tests.conftest import insert_full_game
+from tests.conftest import PlayerFactory
+
+
+@pytest.fixture
+def session(sqlite_engine):
+    with Session(sqlite_engine) as session:
+        yield session
+
+
+@pytest.fixture(autouse=True)
+def ttls(mocker):
+    mocker.patch.object(settings, "REAPER_TTL_SECONDS", {"waiting": 60})
+    mocker.patch.object(settings, "REAPER_DEFAULT_TTL_SECONDS", 300)
+    mocker.patch.object(settings, "REAPER_ORPHAN_PLAYER_TTL_SECONDS", 60)
+
+
+def test_waiting_game_is_reaped_after_owner_left_for_ttl(session):
+    insert_full_game(session, 1, status=GameStatus.WAITING)
+    reaper = Reaper()
+
+    assert reaper.sweep(session, {1: {11}}, now=0) == ([], 0)
+    assert reaper.sweep(session, {1: {11}}, now=59) == ([], 0)
+    assert reaper.sweep(session, {1: {11}}, now=119) == ([(1, GameStatus.WAITING)], 0)
+    assert session.get(Game, 1) is None
+    assert session.exec(select(func.count()).select_from(Card)).one() == 0
+
+
+def test_owner_reconnecting_resets_the_clock(session):
+    insert_full_game(session, 1, status=GameStatus.WAITING)
+    reaper = Reaper()
+
+    reaper.sweep(session, {}, now=0)
+    reaper.sweep(session, {1: {10}}, now=30)
+    reaper.sweep(session, {}, now=40)
+
+    assert reaper.sweep(session, {}, now=90) == ([], 0)
+    assert reaper.sweep(session, {}, now=100) == ([(1, GameStatus.WAITING)], 0)
+
+
+def test_game_in_progress_needs_everyone_disconnected(session):
+    insert_full_game(session, 1, status=GameStatus.TURN_START)
+    insert_full_game(session, 2, status=GameStatus.TURN_START)
+    insert_full_game(session, 3, status=GameStatus.FINALIZED)
+    reaper = Reaper()
+
+    reaper.sweep(session, {1: {11}}, now=0)
+    expired, _ = reaper.sweep(session, {1: {11}}, now=300)
+
+    assert expired == [(2, GameStatus.TURN_START)]
+    assert session.get(Game, 1) is not None
+    assert session.get(Game, 3) is not None
+
+
+def test_orphan_players_are_reaped(session):
+    session.add(PlayerFactory(id=500, game_id=None, token="huerfano"))
+    session.commit()
+    session.add(Game(id=9, name="cortada", status=GameStatus.WAITING, owner=500, player_in_action=None))
+    session.commit()
+    reaper = Reaper()
+
+    assert reaper.sweep(session, {9: {500}}, now=0) == ([], 0)
+    assert reaper.sweep(session, {9: {500}}, now=60) == ([], 1)
+    assert session.get(Player, 500) is None
+    session.expire_all()
+    assert session.get(Game, 9).owner is None
+
+
+@pytest.mark.asyncio
+async def test_run_once_sends_a_single_lobby_diff(mocker, sqlite_engine, session):
+    for gid in (1, 2, 3):
+        insert_full_game(session, gid, status=GameStatus.TURN_START)
+    mocker.patch.object(settings, "REAPER_DEFAULT_TTL_SECONDS", 0)
+    mocker.patch("app.services.reaper.db_engine", sqlite_engine)
+    mocker.patch("app.services.reaper.GAME_CONNECTIONS", {})
+    mock_notify_lobby = mocker.patch("app.services.reaper.notify_lobby", new=AsyncMock())
+    mock_notify_players = mocker.patch("app.services.reaper.notify_game_players", new=AsyncMock())
+
+    await Reaper().run_once()
+
+    mock_notify_lobby.assert_awaited_once()
+    message = mock_notify_lobby.await_args.args[0]
+    assert message.action == "delete_many"
+    assert sorted(message.data["ids"]) == [1, 2, 3]
+    mock_notify_players.assert_not_called()
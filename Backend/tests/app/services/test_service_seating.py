@@ -0,0 +1,38 @@
+from sqlmodel import Session
+
+from app.database.instrumentation import query_budget
+from app.models.game import Game, GameStatus
+from app.services.seating import Seating, game_seating
+from tests.conftest import PlayerFactory
+
+
+def test_turn_owner_and_neighbours_wrap_around():
+    seating = Seating(((0, 30), (1, 10), (2, 20)))
+
+    assert len(seating) == 3
+    assert [seating.turn_owner(turn) for turn in range(4)] == [30, 10, 20, 30]
+    assert seating.positions[20] == 2
+    assert seating.neighbour(20, clockwise=True) == 30
+    assert seating.neighbour(30, clockwise=False) == 20
+    assert seating.neighbour(10, clockwise=False) == 30
+
+
+def test_stored_seating_needs_no_queries(sqlite_engine):
+    game = Game(id=1, name="game-1", status=GameStatus.TURN_START, owner=None, player_in_action=None, seating=[5, 3, 8])
+
+    with Session(sqlite_engine) as session, query_budget(0, engine=sqlite_engine):
+        seating = game_seating(session, game)
+
+    assert seating.turn_owner(4) == 3
+    assert seating.neighbour(8, clockwise=True) == 5
+
+
+def test_games_without_seating_use_player_positions(sqlite_engine):
+    game = Game(id=1, name="game-1", status=GameStatus.TURN_START, owner=None, player_in_action=None)
+    players = [PlayerFactory(id=7, position=1), PlayerFactory(id=9, position=0)]
+
+    with Session(sqlite_engine) as session:
+        seating = game_seating(session, game, players)
+
+    assert seating.turn_owner(0) == 9
+    assert seating.neighbour(9, clockwise=True) == 7
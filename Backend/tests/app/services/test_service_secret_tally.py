@@ -0,0 +1,84 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlmodel import Session
+
+from app.controllers.utils import reveal_secret
+from app.models.game import Game, GameStatus
+from app.models.player import Player
+from app.models.secret import Secret, SecretType
+from app.services.secret import SecretService
+from app.services.secret_tally import culprits_cornered, hidden_secrets, move_secret, tally_secrets
+from tests.conftest import PlayerFactory
+
+
+def make_secret(sid, owner, secret_type=SecretType.OTHER, revealed=False):
+    return Secret(id=sid, game_id=1, owner=owner, name=f"secret-{sid}", content="content", revealed=revealed, type=secret_type)
+
+
+def test_tally_counts_hidden_secrets_of_innocent_players():
+    secrets = [make_secret(1, 10, SecretType.MURDERER), make_secret(2, 10), make_secret(3, 20), make_secret(4, 20),
+               make_secret(5, 30, revealed=True)]
+
+    tally = tally_secrets(secrets)
+
+    assert tally == {"players": {"10": [2, 1], "20": [2, 0]}, "innocent": 2}
+    assert hidden_secrets(tally, 10) == 2
+    assert hidden_secrets(tally, 30) == 0
+    assert not culprits_cornered(tally)
+
+
+def test_move_secret_follows_reveals_and_transfers():
+    tally = tally_secrets([make_secret(1, 10, SecretType.MURDERER), make_secret(2, 20)])
+
+    revealed = move_secret(tally, (20, False, SecretType.OTHER), (20, True, SecretType.OTHER))
+    assert hidden_secrets(revealed, 20) == 0
+    assert culprits_cornered(revealed)
+
+    # El secreto del asesino pasa a otro jugador: el que lo tenia deja de ser culpable
+    moved = move_secret(tally, (10, False, SecretType.MURDERER), (20, False, SecretType.MURDERER))
+    assert moved["players"] == {"10": [0, 0], "20": [2, 1]}
+    assert culprits_cornered(moved)
+    assert tally["innocent"] == 1
+
+
+@pytest.fixture
+def started_game(sqlite_engine, mocker):
+    mocker.patch("app.services.secret.notify_game_players", new_callable=AsyncMock)
+    mocker.patch("app.services.game.notify_game_players", new_callable=AsyncMock)
+    mocker.patch("app.services.player.notify_game_players", new_callable=AsyncMock)
+    secrets = [make_secret(1, 1, SecretType.MURDERER), make_secret(2, 1), make_secret(3, 2), make_secret(4, 3),
+               make_secret(5, 3)]
+    with Session(sqlite_engine) as session:
+        session.add(Game(id=1, name="game-1", status=GameStatus.TURN_START, owner=None, player_in_action=None,
+                         secret_tally=tally_secrets(secrets)))
+        session.add_all([PlayerFactory(id=pid, game_id=1) for pid in (1, 2, 3)])
+        session.add_all(secrets)
+        session.commit()
+    return sqlite_engine
+
+
+@pytest.mark.asyncio
+async def test_secret_updates_keep_the_game_tally(started_game):
+    with Session(started_game) as session:
+        await SecretService().update(session=session, oid=4, data={"owner": 2})
+        await SecretService().update(session=session, oid=3, data={"revealed": True})
+
+        game = session.get(Game, 1)
+        assert game.secret_tally == tally_secrets(session.get(Secret, sid) for sid in range(1, 6))
+        assert hidden_secrets(game.secret_tally, 2) == 1
+
+
+@pytest.mark.asyncio
+async def test_reveal_secret_uses_the_tally(started_game, mocker):
+    search = mocker.spy(SecretService, "search")
+
+    with Session(started_game) as session:
+        assert await reveal_secret(session, session.get(Secret, 3)) == "effect_applied"
+        assert session.get(Player, 2).social_disgrace
+
+        await reveal_secret(session, session.get(Secret, 4))
+        assert await reveal_secret(session, session.get(Secret, 5)) == "game_finalized"
+        assert session.get(Game, 1).status == GameStatus.FINALIZED
+
+    search.assert_not_called()
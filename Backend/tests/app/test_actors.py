@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+
+from app.actors import GAME_ACTORS, GAME_COMMANDS, GameActors, serialized
+
+
+async def record(actors: GameActors, game_id: int, name: str, log: list, delay: float = 0.02):
+    async with actors.run(game_id, "test"):
+        log.append(("start", name))
+        await asyncio.sleep(delay)
+        log.append(("end", name))
+
+
+@pytest.mark.asyncio
+async def test_same_game_commands_run_one_at_a_time_in_order():
+    actors = GameActors()
+    log = []
+
+    tasks = [asyncio.create_task(record(actors, 1, name, log)) for name in ("a", "b", "c")]
+    await asyncio.gather(*tasks)
+
+    assert log == [("start", "a"), ("end", "a"), ("start", "b"), ("end", "b"), ("start", "c"), ("end", "c")]
+    assert actors.actors == {}
+
+
+@pytest.mark.asyncio
+async def test_different_games_run_in_parallel():
+    actors = GameActors()
+    log = []
+
+    await asyncio.gather(record(actors, 1, "a", log), record(actors, 2, "b", log))
+
+    assert log[:2] == [("start", "a"), ("start", "b")]
+
+
+@pytest.mark.asyncio
+async def test_nested_command_of_same_game_does_not_wait():
+    actors = GameActors()
+
+    async with actors.run(1, "outer") as outer_queued:
+        async with actors.run(1, "inner") as inner_queued:
+            assert actors.pending() == 1
+
+    assert not outer_queued and not inner_queued
+    assert actors.actors == {}
+
+
+@pytest.mark.asyncio
+async def test_queued_command_is_reported():
+    actors = GameActors()
+    queued = []
+
+    async def command(delay):
+        async with actors.run(1, "test") as was_queued:
+            queued.append(was_queued)
+            await asyncio.sleep(delay)
+
+    await asyncio.gather(command(0.02), command(0))
+
+    assert queued == [False, True]
+
+
+@pytest.mark.asyncio
+async def test_window_only_lets_its_commands_run():
+    actors = GameActors()
+    log = []
+
+    async def window():
+        async with actors.run(1, "play_card"):
+            log.append("window_open")
+            async with actors.window(1, frozenset({"cancel_action"})):
+                await asyncio.sleep(0.05)
+            log.append("window_closed")
+
+    async def command(name):
+        await asyncio.sleep(0.01)
+        async with actors.run(1, name) as queued:
+            log.append((name, queued))
+
+    await asyncio.wait_for(asyncio.gather(window(), command("discard"), command("cancel_action")), timeout=1)
+
+    assert log == ["window_open", ("cancel_action", True), "window_closed", ("discard", True)]
+    assert actors.actors == {}
+
+
+@pytest.mark.asyncio
+async def test_window_waits_for_commands_already_inside():
+    actors = GameActors()
+    log = []
+
+    async def window():
+        async with actors.run(1, "play_card"):
+            async with actors.window(1, frozenset({"cancel_action"})):
+                await asyncio.sleep(0.01)
+            log.append("window_closed")
+
+    async def cancel(name):
+        async with actors.run(1, "cancel_action"):
+            log.append(("start", name))
+            await asyncio.sleep(0.02)
+            log.append(("end", name))
+
+    async def cancels():
+        await asyncio.sleep(0.005)
+        await asyncio.gather(cancel("a"), cancel("b"))
+
+    await asyncio.wait_for(asyncio.gather(window(), cancels()), timeout=1)
+
+    assert log == [("start", "a"), ("end", "a"), ("start", "b"), ("end", "b"), "window_closed"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_queue():
+    actors = GameActors()
+    holder = asyncio.create_task(record(actors, 1, "holder", [], delay=0.05))
+    waiter = asyncio.create_task(record(actors, 1, "waiter", []))
+    await asyncio.sleep(0.01)
+
+    assert actors.pending() == 2
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert actors.pending() == 1
+
+    await holder
+    assert actors.pending() == 0
+    assert actors.actors == {}
+
+
+@pytest.mark.asyncio
+async def test_serialized_resolves_the_game_from_the_arguments():
+    class Row:
+        game_id = 7
+
+    async def load(cid, **kwargs):
+        return Row() if cid else None
+
+    @serialized(load)
+    async def handler(cid):
+        return GAME_ACTORS.actors.get(7)
+
+    before = GAME_COMMANDS.values.get(("handler",), 0)
+
+    assert await handler(cid=1) is not None
+    assert await handler(cid=0) is None
+    assert GAME_COMMANDS.values[("handler",)] == before + 1
@@ -0,0 +1,56 @@
+from app.metrics import Counter, Gauge, Histogram, Registry
+
+
+def test_counter_with_labels():
+    counter = Counter("frames_total", "Frames", ("model", "action"))
+    counter.inc("game", "update")
+    counter.inc("game", "update", amount=2)
+
+    lines = list(counter.collect())
+
+    assert "# TYPE frames_total counter" in lines
+    assert 'frames_total{model="game",action="update"} 3' in lines
+
+
+def test_gauge_without_labels_starts_in_zero():
+    gauge = Gauge("windows_open", "Ventanas")
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+
+    assert "windows_open 1" in list(gauge.collect())
+
+
+def test_gauge_collector():
+    gauge = Gauge("connections", "Conexiones", ("kind",), collector=lambda: {("lobby",): 4})
+
+    assert 'connections{kind="lobby"} 4' in list(gauge.collect())
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency_seconds", "Latencia", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "/api/game")
+    histogram.observe(0.5, "/api/game")
+    histogram.observe(3, "/api/game")
+
+    lines = list(histogram.collect())
+
+    assert 'latency_seconds_bucket{route="/api/game",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/api/game",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/api/game",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/api/game"} 3' in lines
+    assert 'latency_seconds_sum{route="/api/game"} 3.55' in lines
+
+
+def test_label_values_are_escaped():
+    counter = Counter("c", "C", ("name",))
+    counter.inc('a"b')
+
+    assert 'c{name="a\\"b"} 1' in list(counter.collect())
+
+
+def test_registry_render():
+    registry = Registry()
+    registry.register(Counter("a_total", "A")).inc()
+
+    assert registry.render().endswith("a_total 1\n")
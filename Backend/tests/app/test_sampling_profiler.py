@@ -0,0 +1,49 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.profiler import SamplingProfiler, call_site
+
+
+def blocking_query():
+    time.sleep(0.2)
+
+
+@pytest.mark.asyncio
+async def test_profiler_flags_event_loop_stall():
+    profiler = SamplingProfiler(threading.get_ident(), rate=200, stall_ms=50)
+
+    async def block_loop():
+        await asyncio.sleep(0.05)
+        blocking_query()
+
+    task = asyncio.create_task(block_loop())
+    profile = await profiler.run(0.5)
+    await task
+
+    assert profile.samples
+    assert len(profile.stalls) == 1
+    assert profile.stalls[0]["duration_ms"] >= 150
+    assert "blocking_query" in profile.stalls[0]["call_site"]
+    assert "blocking_query" in profile.collapsed()
+
+
+@pytest.mark.asyncio
+async def test_speedscope_output():
+    profile = await SamplingProfiler(threading.get_ident(), rate=100, stall_ms=100).run(0.1)
+
+    speedscope = profile.speedscope()
+    sampled = speedscope["profiles"][0]
+
+    assert sampled["type"] == "sampled"
+    assert len(sampled["samples"]) == len(sampled["weights"]) == len(profile.samples)
+    assert all(i < len(speedscope["shared"]["frames"]) for s in sampled["samples"] for i in s)
+
+
+def test_call_site_prefers_app_frames():
+    stack = (("main", "asyncio/runners.py", 10), ("CardService.search", "app/services/card.py", 40),
+             ("Session.execute", "sqlalchemy/orm/session.py", 2000))
+
+    assert call_site(stack) == "CardService.search (app/services/card.py:40) -> Session.execute"
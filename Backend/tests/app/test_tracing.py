@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from app.metrics import CARD_EFFECT_PHASE_SECONDS
+from app.settings import settings
+from app.tracing import CURRENT_SPAN, span, trace_card_effect, summarize
+
+
+def test_span_outside_trace_is_noop():
+    with span("notify_lobby", "broadcast") as current:
+        assert current is None
+    assert CURRENT_SPAN.get() is None
+
+
+@pytest.mark.asyncio
+async def test_phases_are_split_by_span_kind():
+    with trace_card_effect("test-card", "turn_start") as root:
+        with span("not_so_fast_window", "wait"):
+            await asyncio.sleep(0.05)
+            with span("notify_game_players", "broadcast"):
+                await asyncio.sleep(0.02)
+
+    phases = root.trace.phases()
+
+    assert phases["wait"] == pytest.approx(0.05, abs=0.02)
+    assert phases["broadcast"] == pytest.approx(0.02, abs=0.02)
+    assert sum(phases.values()) == pytest.approx(root.duration)
+    assert CARD_EFFECT_PHASE_SECONDS.values[("test-card", "turn_start", "wait")] >= phases["wait"]
+
+
+def test_queries_are_attributed_to_active_span(sqlite_engine):
+    with trace_card_effect("test-card", "turn_start") as root:
+        with sqlite_engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            with span("notify_lobby", "broadcast") as child:
+                conn.execute(text("SELECT 2"))
+
+    assert root.db_queries == 1
+    assert child.db_queries == 1
+    assert root.trace.phases()["db"] == root.db_time + child.db_time
+
+
+@pytest.mark.asyncio
+async def test_export_and_summarize(tmp_path, mocker):
+    traces_file = tmp_path / "traces.jsonl"
+    mocker.patch.object(settings, "TRACES_FILE", str(traces_file))
+
+    for _ in range(2):
+        with trace_card_effect("another-victim", "waiting_for_choose_player", game_id=1):
+            with span("not_so_fast_window", "wait"):
+                await asyncio.sleep(0.02)
+
+    totals = summarize(str(traces_file))
+    entry = totals[("another-victim", "waiting_for_choose_player")]
+
+    assert entry["count"] == 2
+    assert max(("db", "broadcast", "wait", "logic"), key=lambda p: entry[p]) == "wait"
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.metrics import Registry
+from app.profiler import HEARTBEAT, SamplingProfiler
+from app.watchdog import StallWatchdog, EVENT_LOOP_STALLS
+
+
+class SlowMetric:
+    def collect(self):
+        time.sleep(0.2)
+        yield "slow 1"
+
+
+@pytest.mark.asyncio
+async def test_watchdog_attributes_stall_to_call_site():
+    watchdog = StallWatchdog(threshold_ms=50)
+    registry = Registry()
+    registry.register(SlowMetric())
+
+    watchdog.start()
+    await asyncio.sleep(0.05)
+    registry.render()
+    await asyncio.sleep(0.1)
+    await watchdog.stop()
+
+    [stall] = watchdog.summary()
+    assert stall["count"] == 1
+    assert stall["max_ms"] >= 150
+    assert "app/metrics.py" in stall["call_site"]
+    assert "SlowMetric.collect" in stall["call_site"]
+    assert "SlowMetric.collect" in stall["stack"]
+    assert EVENT_LOOP_STALLS.values[(stall["call_site"],)] >= 1
+
+
+@pytest.mark.asyncio
+async def test_watchdog_ignores_short_pauses():
+    watchdog = StallWatchdog(threshold_ms=200)
+
+    watchdog.start()
+    time.sleep(0.02)
+    await asyncio.sleep(0.1)
+    await watchdog.stop()
+
+    assert watchdog.summary() == []
+
+
+@pytest.mark.asyncio
+async def test_watchdog_and_profiler_share_heartbeat_and_call_site():
+    watchdog = StallWatchdog(threshold_ms=50)
+    registry = Registry()
+    registry.register(SlowMetric())
+
+    async def block_loop():
+        await asyncio.sleep(0.05)
+        registry.render()
+
+    watchdog.start()
+    task = asyncio.create_task(block_loop())
+    profile = await SamplingProfiler(threading.get_ident(), rate=200, stall_ms=50).run(0.4)
+    await task
+    await watchdog.stop()
+
+    [stall] = watchdog.summary()
+    assert [s["call_site"] for s in profile.stalls] == [stall["call_site"]]
+    assert HEARTBEAT._task is None
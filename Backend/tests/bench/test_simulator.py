@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from app.engine import RuleError
+from bench.simulator import GameResult, SimulatedGame, SimulationStats, format_simulation, simulate
+
+
+def test_simulated_games_end_or_report_why():
+    for seed in range(20):
+        result = SimulatedGame(2 + seed % 5, random.Random(seed)).play()
+
+        assert result.result in {"finished", "truncated", "stuck"}
+        assert (result.outcome is not None) == (result.result == "finished")
+        assert (result.stuck_reason is not None) == (result.result == "stuck")
+
+
+def test_unexpected_rule_errors_are_raised(mocker):
+    game = SimulatedGame(4, random.Random(0))
+    mocker.patch.object(game, "turn", side_effect=RuleError(400, "Estado de partida invalido"))
+
+    with pytest.raises(RuleError):
+        game.play()
+
+
+def test_simulate_plays_every_card():
+    summary = simulate(200, [4], seed=3)
+
+    for name in ["card-trade", "dead-card-folly", "blackmailed", "social-faux-pas", "ariadne-oliver",
+                 "look-into-the-ashes", "not-so-fast"]:
+        assert name in summary["plays_per_game"]
+
+
+def test_simulate_is_reproducible_with_a_seed():
+    first = simulate(20, [3, 5], batch=7, seed=11)
+    second = simulate(20, [3, 5], batch=7, seed=11, policy="random")
+
+    assert first["games"] == 20
+    assert sum(first["results"].values()) == 20
+    assert {k: v for k, v in first.items() if "per_second" not in k} == \
+           {k: v for k, v in second.items() if "per_second" not in k}
+
+
+def test_stats_merge_and_rates():
+    stats, other = SimulationStats(), SimulationStats()
+    stats.record(GameResult(players=4, result="finished", outcome="murderer_revealed", turns=10,
+                            plays={"look-into-the-ashes": 2}))
+    other.record(GameResult(players=4, result="finished", outcome="deck_exhausted", turns=30))
+    other.record(GameResult(players=4, result="stuck", outcome=None, turns=20, stuck_reason="Sin cartas"))
+    other.busy_seconds = 0.5
+
+    stats.merge(other)
+    summary = stats.summary(elapsed=1.0)
+
+    assert summary["games"] == 3
+    # La trabada cuenta en el denominador y se informa aparte
+    assert summary["detectives_win_rate"] == 1 / 3
+    assert summary["culprits_win_rate"] == 1 / 3
+    assert summary["unfinished_rate"] == 1 / 3
+    assert summary["deck_exhaustion_rate"] == 1 / 3
+    assert summary["turns"]["p50"] == 20
+    assert summary["plays_per_game"] == {"look-into-the-ashes": 2 / 3}
+    assert summary["games_per_second_per_core"] == 6
+    assert "sin terminar: 33.3%" in format_simulation(summary)
+    assert "trabada: Sin cartas (1)" in format_simulation(summary)
+
+
+def test_simulate_with_a_process_pool():
+    summary = simulate(6, [4], workers=2, batch=3, policy="scripted", seed=1)
+
+    assert summary["games"] == 6
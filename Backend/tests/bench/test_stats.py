@@ -0,0 +1,53 @@
+from bench.stats import percentile, LatencyRecorder, PoolSampler, format_report, parse_gauges
+
+
+def test_percentile_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) is None
+
+
+def test_latency_recorder_summary():
+    recorder = LatencyRecorder()
+    recorder.record("GET /api/game/{gid}", 0.010)
+    recorder.record("GET /api/game/{gid}", 0.030, ok=False)
+
+    summary = recorder.summary()
+
+    assert summary["GET /api/game/{gid}"]["count"] == 2
+    assert summary["GET /api/game/{gid}"]["errors"] == 1
+    assert summary["GET /api/game/{gid}"]["max"] == 0.030
+
+
+def test_pool_sampler_saturation():
+    sampler = PoolSampler(capacity=2)
+    for checked_out in [0, 1, 2, 2]:
+        sampler.record(checked_out)
+
+    summary = sampler.summary()
+
+    assert summary["max_checked_out"] == 2
+    assert summary["saturated_ratio"] == 0.5
+    assert PoolSampler(capacity=2).summary() is None
+
+
+def test_format_report_without_pool():
+    recorder = LatencyRecorder()
+    recorder.record("POST /api/card/search", 0.005)
+    games = {"finished": 1, "truncated": 0, "stuck": 0, "turns": 12, "elapsed": 3.0}
+
+    report = format_report(recorder.summary(), None, games)
+
+    assert "POST /api/card/search" in report
+    assert "sin datos" in report
+
+
+def test_parse_gauges_ignores_labeled_series():
+    text = "# TYPE db_pool_size gauge\ndb_pool_size 30\ndb_pool_checked_out 4\ngames{status=\"waiting\"} 2\n"
+
+    gauges = parse_gauges(text)
+
+    assert gauges == {"db_pool_size": 30, "db_pool_checked_out": 4}
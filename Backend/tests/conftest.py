@@ -1,22 +1,28 @@
-from datetime import datetime, UTC
+from datetime import datetime, UTC, timedelta
 from typing import Optional
 
 import pytest
+from sqlmodel import SQLModel, Session, select
 from factory import LazyAttribute
 from factory.fuzzy import FuzzyInteger, FuzzyText, FuzzyDateTime
 from starlette.testclient import TestClient
 
 from app.controllers.game import CreateGameDTO, UpdateGameDTO, GameWithPlayerDTO
 from app.controllers.player import CreatePlayerDTO
+from app.database.engine import db_engine, db_session, db_read_session, create_db_engine
+from app.database.instrumentation import instrument_engine
 from app.main import base_app
 import factory
 import random
 
-from app.models.event_table import EventTable
+from app.models.chat import Chat
+from app.models.detective_set import DetectiveSet
+from app.models.event_table import EventTable, EventAction
 from app.models.game import Game, GameStatus
 from app.models.player import Player
+from app.models.secret import Secret, SecretType
 from app.services.game import GameFilter
-from app.models.card import Card, CardType
+from app.models.card import Card, CardState
 from app.controllers.card import UpdateCardDTO
 
 class GameFactory(factory.Factory):
@@ -58,13 +64,13 @@ class CardFactory(factory.Factory):
     id: int = FuzzyInteger(1,1000)
     game_id: int = FuzzyInteger(1, 1000)
     owner: Optional[int] = None
-    name: str = FuzzyText(length=12, prefix="card_")
-    content: str = ""
+    # Una carta del catalogo sin reglas especiales fuera de su efecto
+    name: str = "look-into-the-ashes"
+    state: CardState = CardState.AVAILABLE
     turn_discarded: Optional[int] = None
     discarded_order: Optional[int] = None
     turn_played: Optional[int] = None
     set_id: Optional[int] = None
-    card_type: CardType = LazyAttribute(lambda o: random.choice([CardType.INSTANT, CardType.DETECTIVE, CardType.DEVIOUS, CardType.EVENT]))
     pile_order: int = FuzzyInteger(1,100)
 
 
@@ -140,6 +146,82 @@ class EventTableFactory(factory.Factory):
     completed_action = False
 
 
+def lazy_db_session():
+    """ Sesion que recien pide una conexion en la primera consulta: los tests con services mockeados no llegan a la base """
+    with Session(db_engine) as session:
+        yield session
+
+
+@pytest.fixture
+def test_client(mocker):
+    base_app.dependency_overrides[db_session] = lazy_db_session
+    base_app.dependency_overrides[db_read_session] = lazy_db_session
+    mocker.patch("app.controllers.websocket.db_session", lazy_db_session)
+    yield TestClient(app=base_app)
+    base_app.dependency_overrides.pop(db_session, None)
+    base_app.dependency_overrides.pop(db_read_session, None)
+
+
+@pytest.fixture
+def sqlite_engine():
+    engine = create_db_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    instrument_engine(engine)
+    return engine
+
+
 @pytest.fixture
-def test_client():
-    return TestClient(app=base_app)
+def db_test_client(sqlite_engine):
+    """ TestClient con los endpoints usando una base sqlite en memoria, para contar sentencias reales """
+    def override_db_session():
+        with Session(sqlite_engine) as session:
+            yield session
+
+    base_app.dependency_overrides[db_session] = override_db_session
+    base_app.dependency_overrides[db_read_session] = override_db_session
+    yield TestClient(app=base_app)
+    base_app.dependency_overrides.pop(db_session, None)
+    base_app.dependency_overrides.pop(db_read_session, None)
+
+
+def insert_full_game(session, game_id, status=GameStatus.FINALIZED, finished_at=None):
+    game = Game(id=game_id, name=f"game-{game_id}", status=status, owner=None, player_in_action=None,
+                timestamp=finished_at or datetime.now() - timedelta(hours=1), password="secreta")
+    session.add(game)
+    session.flush()
+    players = [PlayerFactory(id=game_id * 10 + i, game_id=game_id, position=i, token=f"token-{game_id}-{i}") for i in range(2)]
+    session.add_all(players)
+    session.flush()
+    game.owner = players[0].id
+    detective_set = DetectiveSet(id=game_id, owner=players[0].id, game_id=game_id, turn_played=1)
+    session.add(detective_set)
+    session.flush()
+    session.add_all([Card(id=game_id * 100 + i, game_id=game_id, owner=players[i % 2].id, name="miss-marple", pile_order=i, set_id=detective_set.id if i == 0 else None)
+                     for i in range(5)])
+    session.add(Secret(id=game_id, game_id=game_id, owner=players[1].id, name="secret", content="", type=SecretType.MURDERER))
+    session.add(EventTable(id=game_id, game_id=game_id, action=EventAction.CARD_TRADE, turn_played=1, player_id=players[0].id))
+    session.add(Chat(id=game_id, game_id=game_id, owner_name="p0", content="gg", timestamp=datetime.now().isoformat()))
+    session.commit()
+    return game
+
+
+def start_game(session):
+    game = Game(id=1, name="game-1", status=GameStatus.STARTED, current_turn=0, owner=None, player_in_action=None,
+                password="secreta")
+    session.add(game)
+    session.flush()
+    session.add_all([PlayerFactory(id=i, game_id=1, position=i, token=f"token-{i}", date_of_birth=datetime(2000, 1, 1)) for i in (1, 2)])
+    session.add_all([Card(id=i, game_id=1, owner=None, name="card-trade", pile_order=i)
+                     for i in range(1, 7)])
+    session.flush()
+    game.owner = 1
+    session.commit()
+    return game
+
+
+def play_turn(session, game, turn):
+    """ El jugador de turno roba la carta de arriba del mazo y pasa el turno """
+    card = session.exec(select(Card).where(Card.owner.is_(None)).order_by(Card.pile_order)).first()
+    card.owner = turn % 2 + 1
+    game.current_turn = turn
+    session.commit()
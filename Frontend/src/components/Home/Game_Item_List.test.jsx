@@ -46,6 +46,7 @@ vi.mock("react-router-dom", async () => {
 
 const mockRegisterOnCreate = vi.fn();
 const mockRegisterOnDelete = vi.fn();
+const mockRegisterOnAction = vi.fn();
 const mockClose = vi.fn();
 
 vi.mock("../../services/Game", () => ({
@@ -59,6 +60,7 @@ vi.mock("../WebSocketManager.js", () => {
     default: vi.fn().mockImplementation(() => ({
       registerOnCreate: mockRegisterOnCreate,
       registerOnDelete: mockRegisterOnDelete,
+      registerOnAction: mockRegisterOnAction,
       close: mockClose,
     })),
   };
@@ -435,6 +437,32 @@ it("recibe evento 'delete'", async () => {
   });
 });
 
+it("recibe evento 'delete_many'", async () => {
+  let onDeleteManyCallback;
+  mockRegisterOnAction.mockImplementation((cb, model, action) => {
+    if (model === "game" && action === "delete_many") onDeleteManyCallback = cb;
+  });
+
+  const mockGames = [
+    { id: 1, name: "Partida 1", max_players: 4 },
+    { id: 2, name: "Partida 2", max_players: 4 },
+    { id: 3, name: "Partida 3", max_players: 4 },
+  ];
+
+  GameService.getGames.mockResolvedValueOnce(mockGames);
+  render(<Game_List />);
+
+  await screen.findByText(/Partida 1/i);
+
+  onDeleteManyCallback({ ids: [1, 3] });
+
+  await waitFor(() => {
+    expect(screen.queryByText(/Partida 1/i)).not.toBeInTheDocument();
+    expect(screen.queryByText(/Partida 2/i)).toBeInTheDocument();
+    expect(screen.queryByText(/Partida 3/i)).not.toBeInTheDocument();
+  });
+});
+
 it("elimina partida NO seleccionada sin afectar la selección de otra partida", async () => {
   let onDeleteCallback;
   mockRegisterOnDelete.mockImplementation((cb) => (onDeleteCallback = cb));
@@ -49,6 +49,13 @@ function Game_List({ prePlayerData }) {
       return currentSelected;
     });
   }, 'game');
+   wsmanager.registerOnAction(data => {
+    setGamesList(prevGames => prevGames.filter(game => !data.ids.includes(game.id)));
+    setSelectedgame(currentSelected => {
+      if (currentSelected && data.ids.includes(currentSelected.id)) {return null;}
+      return currentSelected;
+    });
+  }, 'game', 'delete_many');
     return () => {
         wsmanager.close();
     }
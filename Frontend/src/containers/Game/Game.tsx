@@ -157,7 +157,7 @@ const handleUpdateCards = async ( gameId, playerId, setCards, setDrawDeck, setDi
     game_id__eq: gameId,
     turn_discarded__is_null: true,
     owner__is_null: true,
-    content__eq:"",
+    state__eq:"available",
   });
   setDrawDeck(draw_cs);
   const discard_cs = await CardService.search({
@@ -336,7 +336,7 @@ export default function Game() {
       game_id__eq: game.id,
       turn_discarded__is_null: true,
       owner__is_null: true,
-      content__eq:"",
+      state__eq:"available",
     }).then((cs) => {
       setDrawDeck(cs); setTableCards(cs.slice(0, 3));
     });